@@ -28,6 +28,26 @@ class Settings(BaseSettings):
         os.getenv("MAUDE_DB_PATH", str(Path(__file__).parent.parent / "data" / "maude.duckdb"))
     )
 
+    # Concurrent read cursors on the database, and seconds a request waits for one
+    db_pool_size: int = int(os.getenv("MAUDE_DB_POOL_SIZE", "8"))
+    db_pool_timeout: float = float(os.getenv("MAUDE_DB_POOL_TIMEOUT", "30"))
+    # Seconds a snapshot swap waits for queries on the old snapshot to finish
+    db_drain_timeout: float = float(os.getenv("MAUDE_DB_DRAIN_TIMEOUT", "300"))
+    # Queries taking at least this many seconds are logged with SQL and
+    # parameters (see api.services.metrics); 0 disables the log
+    slow_query_seconds: float = float(os.getenv("MAUDE_SLOW_QUERY_SECONDS", "1.0"))
+    # EXPLAIN ANALYZE profiles kept for /api/admin/explain
+    explain_history: int = int(os.getenv("MAUDE_EXPLAIN_HISTORY", "20"))
+    # Replay hot dashboard queries in the background after startup and refreshes
+    # (see api.services.warmup); MAUDE_WARMUP_FILE replaces the default list
+    warmup_enabled: bool = os.getenv("MAUDE_WARMUP", "true").lower() == "true"
+    warmup_file: str = os.getenv("MAUDE_WARMUP_FILE", "")
+
+    # Worker threads for database work per endpoint class (see api.services.executor)
+    db_light_workers: int = int(os.getenv("MAUDE_DB_LIGHT_WORKERS", "4"))
+    db_heavy_workers: int = int(os.getenv("MAUDE_DB_HEAVY_WORKERS", "2"))
+    db_export_workers: int = int(os.getenv("MAUDE_DB_EXPORT_WORKERS", "1"))
+
     # CORS - configurable via environment variable
     cors_origins: list[str] = _parse_cors_origins()
 
@@ -37,6 +57,13 @@ class Settings(BaseSettings):
 
     # Cache
     cache_ttl_seconds: int = int(os.getenv("MAUDE_CACHE_TTL", "3600"))
+    # Seconds a request waits for an identical in-flight query before giving up
+    singleflight_timeout: float = float(os.getenv("MAUDE_SINGLEFLIGHT_TIMEOUT", "120"))
+
+    # Responses - orjson rendering of large results (see api.services.serialization)
+    # and gzip/brotli compression of bodies of at least compression_min_size bytes
+    fast_json: bool = os.getenv("MAUDE_FAST_JSON", "true").lower() == "true"
+    compression_min_size: int = int(os.getenv("MAUDE_COMPRESSION_MIN_SIZE", "1024"))
 
     # Production mode
     production: bool = os.getenv("MAUDE_PRODUCTION", "false").lower() == "true"
@@ -1,15 +1,19 @@
 """MAUDE Analyzer FastAPI Application."""
 
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, Request
+from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi.responses import JSONResponse, Response
 
 from api.config import get_settings
 from api.routers import events, analytics, admin, data_quality, filters, presets, entity_groups
+from api.services.cache import SingleFlightTimeout
+from api.services.database import PoolTimeout, db_session, get_db
+from api.services.executor import db_endpoint, shutdown_executors
+from api.services.warmup import cache_warmer
+from api.middleware.compression import CompressionMiddleware
+from api.middleware.headers import ResponseHeadersMiddleware
 from api.middleware.schema_validation import (
-    SchemaVersionMiddleware,
     validate_schema_on_startup,
     get_schema_info,
 )
@@ -23,8 +27,11 @@ async def lifespan(app: FastAPI):
     """Lifespan context manager for startup/shutdown events."""
     # Startup
     validate_schema_on_startup()
+    cache_warmer.start(app, "startup")  # runs in the background
     yield
-    # Shutdown (nothing to do)
+    # Shutdown
+    await cache_warmer.stop()
+    shutdown_executors(wait=False)
 
 
 app = FastAPI(
@@ -35,51 +42,24 @@ app = FastAPI(
 )
 
 
-class CacheHeaderMiddleware(BaseHTTPMiddleware):
-    """Middleware to add Cache-Control headers to responses."""
-
-    # Endpoints that can be cached
-    CACHEABLE_PATHS = {
-        "/api/events/manufacturers": 1800,  # 30 minutes
-        "/api/events/product-codes": 1800,  # 30 minutes
-        "/api/events/stats": 300,  # 5 minutes
-        "/api/analytics/trends": 600,  # 10 minutes
-        "/api/analytics/event-type-distribution": 600,  # 10 minutes
-        "/api/admin/status": 60,  # 1 minute
-        "/api/filters/brand-names": 1800,  # 30 minutes
-        "/api/filters/generic-names": 1800,  # 30 minutes
-        "/api/filters/device-manufacturers": 1800,  # 30 minutes
-        "/api/filters/model-numbers": 1800,  # 30 minutes
-        "/api/filters/device-product-codes": 1800,  # 30 minutes
-        "/api/presets": 60,  # 1 minute
-        "/api/entity-groups": 60,  # 1 minute
-    }
-
-    async def dispatch(self, request: Request, call_next):
-        response = await call_next(request)
+@app.exception_handler(PoolTimeout)
+async def pool_timeout_handler(request: Request, exc: PoolTimeout):
+    """Answer requests that could not get a database cursor with 503."""
+    return JSONResponse(status_code=503, content={"detail": f"Database busy: {exc}"})
 
-        # Only cache GET requests
-        if request.method != "GET":
-            return response
 
-        # Check if this path should be cached
-        path = request.url.path
-        for cacheable_path, max_age in self.CACHEABLE_PATHS.items():
-            if path.startswith(cacheable_path):
-                response.headers["Cache-Control"] = f"public, max-age={max_age}"
-                break
-        else:
-            # Default: no cache for other endpoints
-            response.headers["Cache-Control"] = "no-cache"
+@app.exception_handler(SingleFlightTimeout)
+async def singleflight_timeout_handler(request: Request, exc: SingleFlightTimeout):
+    """Answer requests whose shared computation did not finish in time with 503."""
+    return JSONResponse(status_code=503, content={"detail": f"Query still running: {exc}"})
 
-        return response
 
+# Add response header middleware (X-Schema-Version, Cache-Control and ETags;
+# answers If-None-Match with 304 before the endpoint runs)
+app.add_middleware(ResponseHeadersMiddleware)
 
-# Add schema version middleware (adds X-Schema-Version header)
-app.add_middleware(SchemaVersionMiddleware)
-
-# Add cache header middleware
-app.add_middleware(CacheHeaderMiddleware)
+# Add compression middleware (gzip/brotli for bodies of MAUDE_COMPRESSION_MIN_SIZE or more)
+app.add_middleware(CompressionMiddleware)
 
 # Configure CORS
 app.add_middleware(
@@ -90,12 +70,20 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Include routers
-app.include_router(events.router, prefix="/api/events", tags=["Events"])
-app.include_router(analytics.router, prefix="/api/analytics", tags=["Analytics"])
+# Include routers (database routers hold one pooled cursor per request;
+# admin and entity groups attach db_session per endpoint)
+db_dependencies = [Depends(db_session)]
+app.include_router(
+    events.router, prefix="/api/events", tags=["Events"], dependencies=db_dependencies
+)
+app.include_router(
+    analytics.router, prefix="/api/analytics", tags=["Analytics"], dependencies=db_dependencies
+)
 app.include_router(admin.router, prefix="/api/admin", tags=["Admin"])
 app.include_router(data_quality.router, prefix="/api", tags=["Data Quality"])
-app.include_router(filters.router, prefix="/api/filters", tags=["Filters"])
+app.include_router(
+    filters.router, prefix="/api/filters", tags=["Filters"], dependencies=db_dependencies
+)
 app.include_router(presets.router, prefix="/api/presets", tags=["Presets"])
 app.include_router(entity_groups.router, prefix="/api/entity-groups", tags=["Entity Groups"])
 
@@ -123,10 +111,10 @@ async def api_root():
 
 
 @app.get("/health")
-async def health_check():
+@app.get("/api/health")
+@db_endpoint("light")
+def health_check():
     """Health check endpoint."""
-    from api.services.database import get_db
-
     try:
         db = get_db()
         count = db.execute("SELECT COUNT(*) FROM master_events").fetchone()[0]
@@ -1,13 +1,15 @@
 """API Middleware package."""
 
 from api.middleware.schema_validation import (
-    SchemaVersionMiddleware,
     validate_schema_on_startup,
     get_schema_info,
 )
+from api.middleware.headers import ResponseHeadersMiddleware
+from api.middleware.compression import CompressionMiddleware
 
 __all__ = [
-    "SchemaVersionMiddleware",
     "validate_schema_on_startup",
     "get_schema_info",
+    "ResponseHeadersMiddleware",
+    "CompressionMiddleware",
 ]
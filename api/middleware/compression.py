@@ -0,0 +1,176 @@
+"""Response compression middleware.
+
+Compresses response bodies of at least ``compression_min_size`` bytes with
+brotli when the client accepts it and the ``brotli`` package is installed,
+otherwise with gzip. Streaming responses (exports) are compressed and
+flushed chunk by chunk as they are produced, so clients receive each chunk
+without waiting for the compressor's buffer to fill. Large chunks are
+compressed on a worker thread so the event loop stays free.
+
+Compression changes the bytes of the representation, so strong ETags are
+weakened on compressed responses (as nginx does); If-None-Match uses weak
+comparison, so conditional requests keep working.
+"""
+
+import zlib
+from typing import Optional
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from api.config import get_settings
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+# Chunks at least this large are compressed off the event loop
+THREAD_MIN_SIZE = 64 * 1024
+
+# Already compressed or binary formats
+EXCLUDED_CONTENT_TYPES = (
+    "application/gzip",
+    "application/zip",
+    "application/vnd.apache.parquet",
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "image/",
+    "text/event-stream",
+)
+
+
+class GzipCompressor:
+    """Incremental gzip compressor."""
+
+    encoding = "gzip"
+
+    def __init__(self, level: int = 6):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class BrotliCompressor:
+    """Incremental brotli compressor."""
+
+    encoding = "br"
+
+    def __init__(self, quality: int = 5):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick the content coding for an Accept-Encoding header, or None."""
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.partition(";")
+        name, _, value = params.partition("=")
+        try:
+            if name.strip() == "q" and float(value) == 0:
+                continue
+        except ValueError:
+            continue
+        accepted.add(coding.strip())
+
+    if BROTLI_AVAILABLE and "br" in accepted:
+        return "br"
+    if "gzip" in accepted or "*" in accepted:
+        return "gzip"
+    return None
+
+
+class CompressionMiddleware:
+    """Pure ASGI middleware compressing large responses with brotli or gzip."""
+
+    COMPRESSORS = {"br": BrotliCompressor, "gzip": GzipCompressor}
+
+    def __init__(self, app: ASGIApp, minimum_size: Optional[int] = None):
+        self.app = app
+        self.minimum_size = (
+            get_settings().compression_min_size if minimum_size is None else minimum_size
+        )
+
+    def should_compress(self, status: int, headers: Headers) -> bool:
+        if status < 200 or status in (204, 206, 304):
+            return False
+        if "content-encoding" in headers:
+            return False
+        if headers.get("content-type", "").lower().startswith(EXCLUDED_CONTENT_TYPES):
+            return False
+        content_length = headers.get("content-length")
+        # Streaming responses have no length and are always compressed
+        return content_length is None or int(content_length) >= self.minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        compressor = None
+        start: Optional[Message] = None
+
+        async def compress(data: bytes) -> bytes:
+            if len(data) >= THREAD_MIN_SIZE:
+                return await run_in_threadpool(compressor.compress, data)
+            return compressor.compress(data)
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal compressor, start
+            if message["type"] == "http.response.start":
+                # Held until the first body message: a complete body gets an
+                # exact Content-Length, a streamed one none
+                headers = Headers(raw=message["headers"])
+                if self.should_compress(message["status"], headers):
+                    start = message
+                    compressor = self.COMPRESSORS[encoding]()
+                else:
+                    await send(message)
+                return
+
+            if message["type"] != "http.response.body" or compressor is None:
+                await send(message)
+                return
+
+            more_body = message.get("more_body", False)
+            data = await compress(message.get("body", b""))
+            data += compressor.flush() if more_body else compressor.finish()
+
+            if start is not None:
+                headers = MutableHeaders(scope=start)
+                del headers["content-length"]
+                if not more_body:
+                    headers["Content-Length"] = str(len(data))
+                headers["Content-Encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                etag = headers.get("etag")
+                if etag and not etag.startswith("W/"):
+                    headers["ETag"] = f"W/{etag}"
+                await send(start)
+                start = None
+
+            await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
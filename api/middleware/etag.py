@@ -0,0 +1,38 @@
+"""Conditional GET support for data endpoints.
+
+Responses from ETAG_PATHS carry a strong ETag derived from the database
+data version (snapshot and latest ingestion run) and the request's path,
+query parameters and Accept header. A request whose If-None-Match matches the current tag is
+answered with 304 before the endpoint runs, so no query is executed
+(see ResponseHeadersMiddleware).
+"""
+
+import hashlib
+from typing import Optional
+
+# Endpoints whose responses depend only on the data and query parameters
+ETAG_PATHS = (
+    "/api/events/stats",
+    "/api/analytics/trends",
+    "/api/filters/",
+)
+
+
+def make_etag(data_version: str, path: str, query_params, accept: str = "") -> str:
+    """Strong ETag for a path, its (order-insensitive) query parameters and
+    the Accept header (which selects JSON, Arrow or Parquet)."""
+    query = "&".join(f"{k}={v}" for k, v in sorted(query_params.multi_items()))
+    digest = hashlib.sha256(f"{data_version}|{path}|{query}|{accept}".encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header value matches the current ETag.
+
+    Uses weak comparison, so the weakened tags of compressed responses
+    (see CompressionMiddleware) still match.
+    """
+    if not if_none_match:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in candidates or etag.removeprefix("W/") in candidates
@@ -0,0 +1,101 @@
+"""Response header middleware.
+
+One pure ASGI middleware sets every per-response header the API adds:
+
+- ``X-Schema-Version`` on all responses, so the frontend can detect schema
+  version mismatches;
+- ``Cache-Control`` on GET responses (CACHEABLE_PATHS get a max-age,
+  everything else ``no-cache``);
+- data-version ``ETag``s on ETAG_PATHS, answering a matching If-None-Match
+  with 304 before the endpoint runs (see api.middleware.etag).
+
+Headers are added to the ``http.response.start`` message as it passes
+through and the body is never wrapped, so streaming responses are sent
+chunk by chunk as the endpoint produces them.
+"""
+
+from typing import List, Optional, Tuple
+
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from api.middleware.etag import ETAG_PATHS, etag_matches, make_etag
+from api.services.database import get_db
+from config.logging_config import get_logger
+from config.unified_schema import SCHEMA_VERSION
+
+logger = get_logger("response_headers")
+
+# Cache-Control max-age (seconds) of GET responses by path prefix
+CACHEABLE_PATHS = {
+    "/api/events/manufacturers": 1800,  # 30 minutes
+    "/api/events/product-codes": 1800,  # 30 minutes
+    "/api/events/stats": 300,  # 5 minutes
+    "/api/analytics/trends": 600,  # 10 minutes
+    "/api/analytics/event-type-distribution": 600,  # 10 minutes
+    "/api/admin/status": 60,  # 1 minute
+    "/api/filters/brand-names": 1800,  # 30 minutes
+    "/api/filters/generic-names": 1800,  # 30 minutes
+    "/api/filters/device-manufacturers": 1800,  # 30 minutes
+    "/api/filters/model-numbers": 1800,  # 30 minutes
+    "/api/filters/device-product-codes": 1800,  # 30 minutes
+    "/api/presets": 60,  # 1 minute
+    "/api/entity-groups": 60,  # 1 minute
+}
+
+
+def cache_control(path: str) -> str:
+    """Cache-Control value of a GET response for ``path``."""
+    for cacheable_path, max_age in CACHEABLE_PATHS.items():
+        if path.startswith(cacheable_path):
+            return f"public, max-age={max_age}"
+    return "no-cache"
+
+
+class ResponseHeadersMiddleware:
+    """Pure ASGI middleware adding schema version, Cache-Control and ETag headers."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    def _etag(self, scope: Scope) -> Optional[str]:
+        request = Request(scope)
+        try:
+            return make_etag(
+                get_db().data_version, scope["path"], request.query_params,
+                request.headers.get("accept", ""),
+            )
+        except Exception as e:
+            # Database unavailable: let the endpoint report it
+            logger.debug(f"No ETag for {scope['path']}: {e}")
+            return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        is_get = scope["method"] == "GET"
+        headers: List[Tuple[str, str]] = [("X-Schema-Version", SCHEMA_VERSION)]
+        if is_get:
+            headers.append(("Cache-Control", cache_control(path)))
+
+        etag = self._etag(scope) if is_get and path.startswith(ETAG_PATHS) else None
+        if etag is not None and etag_matches(Request(scope).headers.get("if-none-match"), etag):
+            response = Response(status_code=304, headers={"ETag": etag, **dict(headers)})
+            await response(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                response_headers = MutableHeaders(scope=message)
+                for name, value in headers:
+                    response_headers[name] = value
+                if etag is not None and message["status"] == 200:
+                    response_headers["ETag"] = etag
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
@@ -1,28 +1,22 @@
 """
-Schema Validation Middleware for MAUDE Analyzer API.
+Schema Validation for MAUDE Analyzer API.
 
-This middleware provides:
+This module provides:
 1. Startup validation - Compares database schema against registry
-2. X-Schema-Version header - Added to all responses
+2. Schema info for the X-Schema-Version header (set on all responses by
+   ResponseHeadersMiddleware) and the API root
 3. Runtime schema change detection
 
 Usage in api/main.py:
-    from api.middleware.schema_validation import (
-        SchemaVersionMiddleware,
-        validate_schema_on_startup
-    )
+    from api.middleware.schema_validation import validate_schema_on_startup
 
-    app.add_middleware(SchemaVersionMiddleware)
-
-    @app.on_event("startup")
-    async def startup():
+    @asynccontextmanager
+    async def lifespan(app):
         validate_schema_on_startup()
+        yield
 """
 
 from typing import Optional, List, Dict, Any
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
 
 from config.unified_schema import get_schema_registry, SCHEMA_VERSION
 from config.logging_config import get_logger
@@ -30,23 +24,6 @@ from config.logging_config import get_logger
 logger = get_logger("schema_validation")
 
 
-class SchemaVersionMiddleware(BaseHTTPMiddleware):
-    """
-    Middleware that adds X-Schema-Version header to all responses.
-
-    This allows the frontend to detect schema version mismatches
-    and warn users or trigger type regeneration.
-    """
-
-    async def dispatch(self, request: Request, call_next):
-        response = await call_next(request)
-
-        # Add schema version header to all responses
-        response.headers["X-Schema-Version"] = SCHEMA_VERSION
-
-        return response
-
-
 class SchemaValidationResult:
     """Result of schema validation."""
 
@@ -1,7 +1,7 @@
 """Pydantic schemas for API request/response validation."""
 
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Optional, Union
 from datetime import date
 from enum import Enum
 
@@ -27,11 +27,19 @@ class EventFilters(BaseModel):
 
 
 class PaginationInfo(BaseModel):
-    """Pagination metadata."""
-    page: int
+    """Pagination metadata.
+
+    page is None for keyset (cursor) pages; next_cursor continues after
+    this page, None on the last one. count_mode says how total was
+    counted: "exact", "estimate" (sampled), or "none" (total and
+    total_pages are None).
+    """
+    page: Optional[int] = None
     page_size: int
-    total: int
-    total_pages: int
+    total: Optional[int] = None
+    total_pages: Optional[int] = None
+    next_cursor: Optional[str] = None
+    count_mode: Optional[str] = None
 
 
 class EventSummary(BaseModel):
@@ -144,6 +152,18 @@ class ProductCodeItem(BaseModel):
     count: int
 
 
+class WarmupStatus(BaseModel):
+    """Progress of background cache warming."""
+    state: str  # idle, running, completed, cancelled
+    reason: Optional[str] = None  # startup or refresh
+    total: int = 0
+    completed: int = 0
+    failed: int = 0
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    errors: list[str] = []
+
+
 class DatabaseStatus(BaseModel):
     """Database status information."""
     total_events: int
@@ -153,6 +173,7 @@ class DatabaseStatus(BaseModel):
     date_range_start: Optional[str] = None
     date_range_end: Optional[str] = None
     last_refresh: Optional[str] = None
+    warmup: Optional[WarmupStatus] = None
 
 
 class IngestionLogEntry(BaseModel):
@@ -167,6 +188,14 @@ class IngestionLogEntry(BaseModel):
     status: str
 
 
+class ExplainRequest(BaseModel):
+    """API request to profile with EXPLAIN ANALYZE."""
+    path: str = Field(..., description="API path, e.g. /api/analytics/signals")
+    params: dict[str, Union[str, list[str]]] = Field(
+        default_factory=dict, description="Query parameters of the request"
+    )
+
+
 class TextFrequencyResult(BaseModel):
     """Text frequency analysis result."""
     term: str
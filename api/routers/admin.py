@@ -1,15 +1,31 @@
 """Admin API router."""
 
 import os
+import sys
 import json
 import subprocess
 from pathlib import Path
 from datetime import datetime
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends, Request
+from fastapi.responses import Response
 from typing import Optional
 
-from api.services.database import get_db, close_db, reconnect_db
-from api.models.schemas import DatabaseStatus, IngestionLogEntry
+from api.config import get_settings
+from api.services.cache import clear_all_caches, flight, get_cache_stats
+from api.services.database import get_db, swap_db, db_session
+from api.services.executor import db_endpoint, executor_stats
+from api.services.explain import profile_request, profile_store
+from api.services.metrics import PROMETHEUS_MEDIA_TYPE, render_prometheus
+from api.services.warmup import cache_warmer
+from api.models.schemas import DatabaseStatus, ExplainRequest, IngestionLogEntry
+from src.database.snapshots import (
+    create_snapshot,
+    discard_snapshot,
+    prune_snapshots,
+    publish_snapshot,
+    resolve_snapshot,
+    validate_snapshot,
+)
 
 router = APIRouter()
 
@@ -43,19 +59,32 @@ def _set_refresh_status(status: str, message: str = None):
         json.dump(data, f)
 
 
+def _records_loaded(stdout: str) -> int:
+    """Record count the refresh subprocess prints as its last JSON line."""
+    for line in reversed(stdout.strip().splitlines()):
+        try:
+            return json.loads(line)["records_loaded"]
+        except (ValueError, KeyError, TypeError):
+            continue
+    return 0
+
+
 def _run_refresh_task():
-    """Run the refresh task in a separate subprocess to avoid connection conflicts."""
-    project_dir = Path(__file__).parent.parent.parent
+    """Refresh into a new database snapshot and swap the API over to it.
 
-    import time
-    import gc
+    The live database is copied to a snapshot, the ADD files are loaded into
+    the copy by a subprocess, and the snapshot is validated and published
+    (see src.database.snapshots). The API keeps serving the previous
+    snapshot throughout and drains it once the new one is live.
+    """
+    project_dir = Path(__file__).parent.parent.parent
+    db_path = get_settings().database_path
+    snapshot = None
 
     try:
-        # Close API's database connection to release lock
-        _set_refresh_status("running", "Releasing database lock...")
-        close_db()
-        gc.collect()  # Force garbage collection to release any lingering references
-        time.sleep(2)  # Give DuckDB time to fully release the lock
+        _set_refresh_status("running", "Creating database snapshot...")
+        snapshot = create_snapshot(db_path)
+        baseline = validate_snapshot(snapshot)
 
         _set_refresh_status("running", "Starting refresh subprocess...")
 
@@ -63,15 +92,12 @@ def _run_refresh_task():
         refresh_script = '''
 import sys
 import json
-import urllib.request
-import zipfile
-import io
 from pathlib import Path
 
 project_dir = Path("{project_dir}")
 sys.path.insert(0, str(project_dir))
 
-status_file = project_dir / "data" / ".refresh_status.json"
+status_file = Path("{status_file}")
 
 def set_status(status, message):
     from datetime import datetime
@@ -82,24 +108,34 @@ def set_status(status, message):
         json.dump(data, f)
 
 try:
-    data_dir = project_dir / "data" / "raw"
-
-    # Download ADD files
-    add_files = ["mdrfoiAdd", "foidevAdd", "foitextAdd", "patientAdd"]
-    for filename in add_files:
-        set_status("running", f"Downloading {{filename}}.zip...")
-        url = f"https://www.accessdata.fda.gov/MAUDE/ftparea/{{filename}}.zip"
-        with urllib.request.urlopen(url, timeout=300) as response:
-            zip_data = response.read()
-            with zipfile.ZipFile(io.BytesIO(zip_data)) as zf:
-                zf.extractall(data_dir)
+    from config import config
+    from src.ingestion.download import MAUDEDownloader
+
+    data_dir = config.data.raw_path
+
+    # Download ADD files (base URL honours FDA_DOWNLOAD_BASE)
+    set_status("running", "Downloading ADD files...")
+    downloader = MAUDEDownloader(output_dir=data_dir)
+    add_files = [
+        ("mdrfoiAdd.zip", "master"),
+        ("foidevAdd.zip", "device"),
+        ("foitextAdd.zip", "text"),
+        ("patientAdd.zip", "patient"),
+    ]
+    results = downloader.download_many(
+        [(downloader.base_url + filename, file_type) for filename, file_type in add_files],
+        force=True,
+    )
+    failed = [r.filename for r in results if not r.success]
+    if failed:
+        raise RuntimeError(f"Download failed: {{', '.join(failed)}}")
 
     # Load ADD files
     set_status("running", "Loading ADD files into database...")
     from src.ingestion.loader import MAUDELoader
 
     loader = MAUDELoader(
-        db_path=project_dir / "data" / "maude.duckdb",
+        db_path=Path("{db_path}"),
         batch_size=10000,
         enable_transaction_safety=True,
         enable_validation=True,
@@ -118,16 +154,21 @@ try:
         result = loader.load_file(filepath, file_type=file_type)
         total_loaded += result.records_loaded
 
-    set_status("completed", f"Refresh completed. Loaded {{total_loaded:,}} records.")
+    set_status("running", f"Loaded {{total_loaded:,}} records. Validating snapshot...")
+    print(json.dumps({{"records_loaded": total_loaded}}))
 
 except Exception as e:
     set_status("failed", f"Refresh error: {{str(e)}}")
     sys.exit(1)
-'''.format(project_dir=str(project_dir))
+'''.format(
+            project_dir=str(project_dir),
+            db_path=str(snapshot),
+            status_file=str(REFRESH_STATUS_FILE),
+        )
 
         # Run in subprocess
         result = subprocess.run(
-            ["python3", "-c", refresh_script],
+            [sys.executable, "-c", refresh_script],
             cwd=str(project_dir),
             capture_output=True,
             text=True,
@@ -135,24 +176,36 @@ except Exception as e:
         )
 
         if result.returncode != 0:
+            discard_snapshot(snapshot)
             # Check if status was set by the script
             current = _get_refresh_status()
             if current.get("status") != "failed":
                 _set_refresh_status("failed", f"Subprocess failed: {result.stderr[:500]}")
+            return
+
+        total_loaded = _records_loaded(result.stdout)
+        validate_snapshot(snapshot, baseline)
 
-        # Reconnect API's database
-        reconnect_db()
+        # Publish the snapshot and move the API over to it
+        publish_snapshot(snapshot, db_path)
+        swap_db()
+        clear_all_caches()  # entries for the old data version can no longer hit
+        cache_warmer.start_threadsafe("refresh")  # re-fill them in the background
+        prune_snapshots(db_path)
+        _set_refresh_status("completed", f"Refresh completed. Loaded {total_loaded:,} records.")
 
     except subprocess.TimeoutExpired:
-        reconnect_db()
+        discard_snapshot(snapshot)
         _set_refresh_status("failed", "Refresh timed out after 30 minutes")
     except Exception as e:
-        reconnect_db()
+        if snapshot is not None and snapshot.resolve() != resolve_snapshot(db_path):
+            discard_snapshot(snapshot)
         _set_refresh_status("failed", f"Refresh error: {str(e)}")
 
 
-@router.get("/status", response_model=DatabaseStatus)
-async def get_database_status():
+@router.get("/status", response_model=DatabaseStatus, dependencies=[Depends(db_session)])
+@db_endpoint("light")
+def get_database_status():
     """Get database status and statistics."""
     db = get_db()
 
@@ -191,11 +244,17 @@ async def get_database_status():
         "date_range_start": str(dates[0]) if dates[0] else None,
         "date_range_end": str(dates[1]) if dates[1] else None,
         "last_refresh": str(last_refresh[0]) if last_refresh and last_refresh[0] else None,
+        "warmup": cache_warmer.status(),
     }
 
 
-@router.get("/history", response_model=list[IngestionLogEntry])
-async def get_ingestion_history(
+@router.get(
+    "/history",
+    response_model=list[IngestionLogEntry],
+    dependencies=[Depends(db_session)],
+)
+@db_endpoint("light")
+def get_ingestion_history(
     limit: int = 50,
     file_type: Optional[str] = None,
 ):
@@ -239,8 +298,9 @@ async def get_ingestion_history(
     ]
 
 
-@router.get("/data-quality")
-async def get_data_quality_report():
+@router.get("/data-quality", dependencies=[Depends(db_session)])
+@db_endpoint("heavy")
+def get_data_quality_report():
     """Get comprehensive data quality report."""
     db = get_db()
 
@@ -314,29 +374,30 @@ async def trigger_refresh(background_tasks: BackgroundTasks):
 
 
 @router.get("/refresh/status")
-async def get_refresh_status():
+@db_endpoint("light")
+def get_refresh_status():
     """Get the current status of data refresh."""
     status = _get_refresh_status()
 
-    # Only check database if not currently refreshing (to avoid reopening connection)
-    if status.get("status") not in ["running", "starting"]:
-        try:
-            db = get_db()
-            freshness = db.fetch_one("""
-                SELECT MAX(date_added) as latest_date
-                FROM master_events
-                WHERE date_added IS NOT NULL
-            """)
-            if freshness and freshness[0]:
-                status["data_freshness"] = str(freshness[0])
-        except:
-            pass
+    # The live snapshot stays readable while a refresh loads the next one
+    try:
+        db = get_db()
+        freshness = db.fetch_one("""
+            SELECT MAX(date_added) as latest_date
+            FROM master_events
+            WHERE date_added IS NOT NULL
+        """)
+        if freshness and freshness[0]:
+            status["data_freshness"] = str(freshness[0])
+    except:
+        pass
 
     return status
 
 
-@router.get("/table-counts")
-async def get_table_counts():
+@router.get("/table-counts", dependencies=[Depends(db_session)])
+@db_endpoint("light")
+def get_table_counts():
     """Get row counts for all tables."""
     db = get_db()
 
@@ -354,3 +415,69 @@ async def get_table_counts():
             counts[table] = f"Error: {str(e)}"
 
     return counts
+
+
+@router.get("/db-pool")
+async def get_db_pool_stats():
+    """Get database cursor pool usage and wait-time metrics."""
+    return get_db().pool_stats()
+
+
+@router.get("/executors")
+async def get_executor_stats():
+    """Get queue and worker metrics for the database executors."""
+    return executor_stats()
+
+
+@router.get("/metrics", response_class=Response)
+async def get_metrics():
+    """Get query latency, rows and errors, and pool, executor and cache
+    metrics, in Prometheus text format."""
+    return Response(render_prometheus(), media_type=PROMETHEUS_MEDIA_TYPE)
+
+
+@router.post("/explain")
+async def explain_request(body: ExplainRequest, request: Request):
+    """Replay a GET request and profile its queries with EXPLAIN ANALYZE.
+
+    Returns each query's SQL, parameters, overall timings and operators
+    with their timings and cardinalities. Profiles are kept for comparison
+    (see GET /explain).
+    """
+    try:
+        return await profile_request(request.app, body.path, body.params)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/explain")
+async def list_explain_profiles():
+    """List recent EXPLAIN ANALYZE profiles, newest first, with per-query latency."""
+    return profile_store.summaries()
+
+
+@router.get("/explain/{profile_id}")
+async def get_explain_profile(profile_id: int):
+    """Get a stored EXPLAIN ANALYZE profile."""
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return profile
+
+
+@router.get("/cache")
+@db_endpoint("light")
+def get_result_cache_stats():
+    """Get result cache sizes and hit/miss counts."""
+    return {
+        "data_version": get_db().data_version,
+        "caches": get_cache_stats(),
+        "singleflight": flight.stats(),
+    }
+
+
+@router.delete("/cache")
+async def clear_result_caches():
+    """Clear all result caches."""
+    clear_all_caches()
+    return {"status": "cleared"}
@@ -1,6 +1,6 @@
 """Analytics API router."""
 
-from fastapi import APIRouter, Query, HTTPException
+from fastapi import APIRouter, Header, Query, HTTPException
 from typing import Optional
 from datetime import date
 import re
@@ -8,7 +8,11 @@ from collections import Counter
 
 from api.services.queries import QueryService
 from api.services.database import get_db
+from api.services.cache import cached, signals_cache, stats_cache
 from api.services.signals import SignalDetectionService
+from api.services.executor import db_endpoint
+from api.services.formats import negotiate_format, tabular_response
+from api.services.serialization import fast_json
 from api.models.schemas import (
     TrendData,
     ManufacturerComparison,
@@ -20,7 +24,9 @@ router = APIRouter()
 
 
 @router.get("/trends", response_model=list[TrendData])
-async def get_trends(
+@db_endpoint("heavy")
+@fast_json
+def get_trends(
     manufacturers: Optional[str] = Query(None, description="Comma-separated manufacturer names"),
     product_codes: Optional[str] = Query(None, description="Comma-separated product codes"),
     event_types: Optional[str] = Query(None, description="Comma-separated event types (D,I,M,O)"),
@@ -38,6 +44,9 @@ async def get_trends(
     model_numbers: Optional[str] = Query(None, description="Comma-separated device model numbers"),
     implant_flag: Optional[str] = Query(None, description="Implant flag (Y/N)"),
     device_product_codes: Optional[str] = Query(None, description="Comma-separated device product codes"),
+    # Response format
+    format: Optional[str] = Query(None, description="Response format: json (default), arrow or parquet"),
+    accept: Optional[str] = Header(None, include_in_schema=False),
 ):
     """Get event trends over time.
 
@@ -45,6 +54,9 @@ async def get_trends(
     - date_received: When FDA received the report (default). Best for tracking reporting patterns.
     - date_of_event: When the event actually occurred. Better for understanding actual event timing,
       but note that this field may be NULL or inaccurate for some reports.
+
+    Arrow and Parquet responses (``format`` or the Accept header) keep the
+    period as a date.
     """
     from api.services.filters import DeviceFilters
 
@@ -57,6 +69,7 @@ async def get_trends(
             detail="date_field must be date_received or date_of_event"
         )
 
+    response_format = negotiate_format(format, accept)
     query_service = QueryService()
 
     mfr_list = manufacturers.split(",") if manufacturers else None
@@ -75,7 +88,7 @@ async def get_trends(
             device_product_codes=device_product_codes.split(",") if device_product_codes else None,
         )
 
-    return query_service.get_trends(
+    trend_args = dict(
         manufacturers=mfr_list,
         product_codes=code_list,
         event_types=type_list,
@@ -86,9 +99,16 @@ async def get_trends(
         device_filters=device_filters,
     )
 
+    if response_format != "json":
+        query, params = query_service.trends_query(**trend_args)
+        return tabular_response(query, params, response_format, workload="heavy")
+
+    return query_service.get_trends(**trend_args)
+
 
 @router.get("/compare", response_model=list[ManufacturerComparison])
-async def compare_manufacturers(
+@db_endpoint("heavy")
+def compare_manufacturers(
     manufacturers: str = Query(..., description="Comma-separated manufacturer names to compare"),
     date_from: Optional[date] = Query(None, description="Start date"),
     date_to: Optional[date] = Query(None, description="End date"),
@@ -110,7 +130,10 @@ async def compare_manufacturers(
 
 
 @router.get("/signals")
-async def detect_signals(
+@db_endpoint("heavy")
+@fast_json
+@cached(signals_cache, "signals")
+def detect_signals(
     # Core filters
     manufacturers: Optional[str] = Query(None, description="Comma-separated manufacturer names"),
     product_codes: Optional[str] = Query(None, description="Comma-separated product codes"),
@@ -308,7 +331,10 @@ async def detect_signals(
 
 
 @router.post("/signals/advanced", response_model=SignalResponse)
-async def detect_advanced_signals(request: SignalRequest):
+@db_endpoint("heavy")
+@fast_json
+@cached(signals_cache, "advanced_signals")
+def detect_advanced_signals(request: SignalRequest):
     """Advanced safety signal detection with multiple methods and drill-down.
 
     Supports multiple detection methods:
@@ -329,7 +355,8 @@ async def detect_advanced_signals(request: SignalRequest):
 
 
 @router.get("/text-frequency", response_model=list[TextFrequencyResult])
-async def analyze_text_frequency(
+@db_endpoint("heavy")
+def analyze_text_frequency(
     manufacturers: Optional[str] = Query(None, description="Comma-separated manufacturer names"),
     product_codes: Optional[str] = Query(None, description="Comma-separated product codes"),
     event_types: Optional[str] = Query(None, description="Comma-separated event types"),
@@ -426,7 +453,9 @@ async def analyze_text_frequency(
 
 
 @router.get("/event-type-distribution")
-async def get_event_type_distribution(
+@db_endpoint("heavy")
+@cached(stats_cache, "event_type_distribution")
+def get_event_type_distribution(
     manufacturers: Optional[str] = Query(None, description="Comma-separated manufacturer names"),
     product_codes: Optional[str] = Query(None, description="Comma-separated product codes"),
     date_from: Optional[date] = Query(None, description="Start date"),
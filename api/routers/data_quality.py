@@ -21,6 +21,8 @@ sys.path.insert(0, str(PROJECT_ROOT))
 
 from config import config
 from src.database import get_connection
+from api.services.executor import db_endpoint
+from api.services.serialization import fast_json
 
 router = APIRouter(prefix="/data-quality", tags=["Data Quality"])
 
@@ -106,7 +108,8 @@ class GapsResponse(BaseModel):
 # =============================================================================
 
 @router.get("/completeness", response_model=CompletenessResponse)
-async def get_completeness(
+@db_endpoint("heavy")
+def get_completeness(
     start_year: Optional[int] = Query(None, description="Start year filter"),
     end_year: Optional[int] = Query(None, description="End year filter"),
 ):
@@ -213,7 +216,8 @@ async def get_completeness(
 
 
 @router.get("/file-status", response_model=FileStatusResponse)
-async def get_file_status():
+@db_endpoint("light")
+def get_file_status():
     """
     Get status of loaded files from ingestion log.
 
@@ -280,7 +284,8 @@ async def get_file_status():
 
 
 @router.get("/coverage", response_model=CoverageResponse)
-async def get_coverage():
+@db_endpoint("heavy")
+def get_coverage():
     """
     Get detailed coverage metrics for key fields.
 
@@ -388,7 +393,8 @@ async def get_coverage():
 
 
 @router.get("/gaps", response_model=GapsResponse)
-async def get_gaps():
+@db_endpoint("heavy")
+def get_gaps():
     """
     Identify data gaps by year.
 
@@ -478,7 +484,8 @@ async def get_gaps():
 
 
 @router.get("/summary")
-async def get_summary():
+@db_endpoint("heavy")
+def get_summary():
     """
     Get a quick summary of database health.
 
@@ -572,7 +579,8 @@ class SchemaHealthResponse(BaseModel):
 
 
 @router.get("/schema-health", response_model=SchemaHealthResponse)
-async def get_schema_health(
+@db_endpoint("heavy")
+def get_schema_health(
     check_coverage: bool = Query(True, description="Check column coverage thresholds"),
 ):
     """
@@ -715,7 +723,9 @@ async def get_schema_health(
 
 
 @router.get("/column-coverage/{table_name}")
-async def get_column_coverage(
+@db_endpoint("heavy")
+@fast_json
+def get_column_coverage(
     table_name: str,
     min_coverage: float = Query(0.0, ge=0, le=1, description="Minimum coverage filter"),
 ):
@@ -4,7 +4,7 @@ CRUD endpoints for managing entity groups (manufacturers, brands, etc.).
 Groups are stored in a local SQLite database for persistence.
 """
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from typing import Optional
 from datetime import datetime
 import uuid
@@ -24,7 +24,8 @@ from api.models.entity_group_schemas import (
     AvailableEntity,
     AvailableEntitiesResponse,
 )
-from api.services.database import get_db
+from api.services.database import get_db, db_session
+from api.services.executor import db_endpoint
 
 router = APIRouter()
 
@@ -210,8 +211,13 @@ async def suggest_group_name(
     )
 
 
-@router.get("/available-entities", response_model=AvailableEntitiesResponse)
-async def get_available_entities(
+@router.get(
+    "/available-entities",
+    response_model=AvailableEntitiesResponse,
+    dependencies=[Depends(db_session)],
+)
+@db_endpoint("heavy")
+def get_available_entities(
     entity_type: EntityType = Query(default=EntityType.MANUFACTURER),
     product_codes: Optional[str] = Query(None, description="Comma-separated product codes filter"),
     event_types: Optional[str] = Query(None, description="Comma-separated event types filter"),
@@ -1,21 +1,14 @@
 """Events API router."""
 
-from fastapi import APIRouter, Query, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Header, Query, HTTPException
 from typing import Optional
 from datetime import date
-import io
-import csv
-
-try:
-    from openpyxl import Workbook
-    from openpyxl.styles import Font, PatternFill, Alignment
-    EXCEL_AVAILABLE = True
-except ImportError:
-    EXCEL_AVAILABLE = False
-
-from api.services.queries import QueryService
-from api.services.filters import DeviceFilters
+
+from api.services.queries import COUNT_MODES, QueryService
+from api.services.filters import DeviceFilters, decode_cursor
+from api.services.executor import db_endpoint
+from api.services.formats import export_response, negotiate_format, tabular_response
+from api.services.serialization import fast_json
 from api.models.schemas import (
     EventListResponse,
     EventDetail,
@@ -26,6 +19,12 @@ from api.models.schemas import (
 
 router = APIRouter()
 
+EXPORT_HEADERS = [
+    "MDR Report Key", "Report Number", "Date Received", "Date of Event",
+    "Event Type", "Manufacturer", "Product Code"
+]
+EXPORT_COLUMN_WIDTHS = [15, 20, 15, 15, 12, 50, 12]
+
 
 def parse_device_filters(
     brand_names: Optional[str] = None,
@@ -55,7 +54,9 @@ def parse_device_filters(
 
 
 @router.get("", response_model=EventListResponse)
-async def list_events(
+@db_endpoint("light")
+@fast_json
+def list_events(
     # Core filters
     manufacturers: Optional[str] = Query(None, description="Comma-separated manufacturer names"),
     product_codes: Optional[str] = Query(None, description="Comma-separated product codes"),
@@ -73,9 +74,32 @@ async def list_events(
     # Pagination
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(50, ge=1, le=1000, description="Results per page"),
+    cursor: Optional[str] = Query(
+        None, description="next_cursor of the previous page (keyset pagination; page is ignored)"
+    ),
+    count_mode: Optional[str] = Query(
+        None,
+        description="Total count: exact, estimate or none (default exact for numbered pages, none for cursor pages)",
+    ),
+    # Response format
+    format: Optional[str] = Query(None, description="Response format: json (default), arrow or parquet"),
+    accept: Optional[str] = Header(None, include_in_schema=False),
 ):
-    """List MDR events with filtering and pagination."""
+    """List MDR events with filtering and pagination.
+
+    Pages are numbered (``page``) or, for deep paging, follow the previous
+    page's ``next_cursor`` (``cursor``), which costs the same at any depth.
+
+    Totals are cached per filter set. ``count_mode=estimate`` samples the
+    table instead of counting every match, and ``count_mode=none`` skips the
+    total; the pagination info reports the mode used.
+
+    Arrow and Parquet responses (``format`` or the Accept header) hold the
+    page's rows, with the total in the X-Total-Count header and its mode in
+    X-Count-Mode.
+    """
     query_service = QueryService()
+    response_format = negotiate_format(format, accept)
 
     # Parse comma-separated values
     mfr_list = manufacturers.split(",") if manufacturers else None
@@ -92,7 +116,7 @@ async def list_events(
         device_product_codes=device_product_codes,
     )
 
-    result = query_service.get_events(
+    filter_args = dict(
         manufacturers=mfr_list,
         product_codes=code_list,
         event_types=type_list,
@@ -102,13 +126,48 @@ async def list_events(
         device_filters=device_filters,
         page=page,
         page_size=page_size,
+        cursor=cursor,
     )
 
-    return result
+    if cursor is not None:
+        try:
+            decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    if count_mode is None:
+        count_mode = "none" if cursor is not None else "exact"
+    elif count_mode not in COUNT_MODES:
+        raise HTTPException(
+            status_code=400, detail=f"count_mode must be one of: {', '.join(COUNT_MODES)}"
+        )
+
+    if response_format != "json":
+        events_query, params, _, _ = query_service.events_query(**filter_args)
+        headers = {}
+        if count_mode != "none":
+            counted = query_service.count_events(
+                manufacturers=mfr_list,
+                product_codes=code_list,
+                event_types=type_list,
+                date_from=date_from,
+                date_to=date_to,
+                search_text=search_text,
+                device_filters=device_filters,
+                count_mode=count_mode,
+            )
+            headers["X-Total-Count"] = str(counted["total"])
+            headers["X-Count-Mode"] = counted["count_mode"]
+        return tabular_response(
+            events_query, params, response_format, workload="light", headers=headers,
+        )
+
+    return query_service.get_events(**filter_args, count_mode=count_mode)
 
 
 @router.get("/stats", response_model=StatsResponse)
-async def get_stats(
+@db_endpoint("light")
+def get_stats(
     # Core filters
     manufacturers: Optional[str] = Query(None, description="Comma-separated manufacturer names"),
     product_codes: Optional[str] = Query(None, description="Comma-separated product codes"),
@@ -151,7 +210,8 @@ async def get_stats(
 
 
 @router.get("/manufacturers", response_model=list[ManufacturerItem])
-async def list_manufacturers(
+@db_endpoint("light")
+def list_manufacturers(
     search: Optional[str] = Query(None, description="Search term"),
     limit: int = Query(100, ge=1, le=500, description="Max results"),
 ):
@@ -161,7 +221,8 @@ async def list_manufacturers(
 
 
 @router.get("/product-codes", response_model=list[ProductCodeItem])
-async def list_product_codes(
+@db_endpoint("light")
+def list_product_codes(
     search: Optional[str] = Query(None, description="Search term"),
     limit: int = Query(100, ge=1, le=500, description="Max results"),
 ):
@@ -171,7 +232,8 @@ async def list_product_codes(
 
 
 @router.get("/export")
-async def export_events(
+@db_endpoint("export")
+def export_events(
     # Core filters
     manufacturers: Optional[str] = Query(None, description="Comma-separated manufacturer names"),
     product_codes: Optional[str] = Query(None, description="Comma-separated product codes"),
@@ -187,10 +249,15 @@ async def export_events(
     implant_flag: Optional[str] = Query(None, description="Implant flag (Y/N)"),
     device_product_codes: Optional[str] = Query(None, description="Comma-separated device product codes"),
     # Export options
-    format: str = Query("csv", description="Export format (csv or xlsx)"),
-    max_records: int = Query(10000, ge=1, le=100000, description="Maximum records to export"),
+    format: str = Query("csv", description="Export format (csv, xlsx, arrow or parquet)"),
+    max_records: Optional[int] = Query(None, ge=1, description="Maximum records to export (default: all)"),
 ):
-    """Export events to CSV or Excel format."""
+    """Export events to CSV, Excel, Arrow IPC stream or Parquet format.
+
+    The export is streamed from the database in chunks, so any number of
+    records can be exported with flat server memory. Excel sheets are
+    limited to 1,048,575 records.
+    """
     query_service = QueryService()
 
     mfr_list = manufacturers.split(",") if manufacturers else None
@@ -207,8 +274,7 @@ async def export_events(
         device_product_codes=device_product_codes,
     )
 
-    # Get events (limited to max_records)
-    result = query_service.get_events(
+    events_query, params, _, _ = query_service.events_query(
         manufacturers=mfr_list,
         product_codes=code_list,
         event_types=type_list,
@@ -219,89 +285,28 @@ async def export_events(
         page=1,
         page_size=max_records,
     )
+    filename = f"maude_events_{date.today().isoformat()}"
 
-    events = result["events"]
-    headers = [
-        "MDR Report Key", "Report Number", "Date Received", "Date of Event",
-        "Event Type", "Manufacturer", "Product Code"
-    ]
+    if format in ("arrow", "parquet"):
+        extension = "arrows" if format == "arrow" else "parquet"
+        return tabular_response(
+            events_query, params, format, workload="export",
+            filename=f"{filename}.{extension}",
+        )
 
     if format == "xlsx":
-        if not EXCEL_AVAILABLE:
-            raise HTTPException(status_code=400, detail="Excel export not available (openpyxl not installed)")
-
-        # Create Excel workbook
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "MAUDE Events"
-
-        # Style header row
-        header_font = Font(bold=True, color="FFFFFF")
-        header_fill = PatternFill(start_color="3B82F6", end_color="3B82F6", fill_type="solid")
-
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col, value=header)
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.alignment = Alignment(horizontal="center")
-
-        # Add data rows
-        for row_idx, event in enumerate(events, 2):
-            ws.cell(row=row_idx, column=1, value=event["mdr_report_key"])
-            ws.cell(row=row_idx, column=2, value=event["report_number"])
-            ws.cell(row=row_idx, column=3, value=event["date_received"])
-            ws.cell(row=row_idx, column=4, value=event["date_of_event"])
-            ws.cell(row=row_idx, column=5, value=event["event_type"])
-            ws.cell(row=row_idx, column=6, value=event["manufacturer"])
-            ws.cell(row=row_idx, column=7, value=event["product_code"])
-
-        # Adjust column widths
-        column_widths = [15, 20, 15, 15, 12, 50, 12]
-        for col_idx, width in enumerate(column_widths, 1):
-            ws.column_dimensions[chr(64 + col_idx)].width = width
-
-        # Save to bytes
-        output = io.BytesIO()
-        wb.save(output)
-        output.seek(0)
-
-        return StreamingResponse(
-            iter([output.getvalue()]),
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={
-                "Content-Disposition": f"attachment; filename=maude_events_{date.today().isoformat()}.xlsx"
-            },
+        return export_response(
+            events_query, params, "xlsx", EXPORT_HEADERS, f"{filename}.xlsx",
+            column_widths=EXPORT_COLUMN_WIDTHS,
         )
 
     # Default: CSV format
-    output = io.StringIO()
-    writer = csv.writer(output)
-    writer.writerow(headers)
-
-    for event in events:
-        writer.writerow([
-            event["mdr_report_key"],
-            event["report_number"],
-            event["date_received"],
-            event["date_of_event"],
-            event["event_type"],
-            event["manufacturer"],
-            event["product_code"],
-        ])
-
-    output.seek(0)
-
-    return StreamingResponse(
-        iter([output.getvalue()]),
-        media_type="text/csv",
-        headers={
-            "Content-Disposition": f"attachment; filename=maude_events_{date.today().isoformat()}.csv"
-        },
-    )
+    return export_response(events_query, params, "csv", EXPORT_HEADERS, f"{filename}.csv")
 
 
 @router.get("/{mdr_report_key}", response_model=EventDetail)
-async def get_event(mdr_report_key: str):
+@db_endpoint("light")
+def get_event(mdr_report_key: str):
     """Get detailed information for a single event."""
     query_service = QueryService()
     event = query_service.get_event_detail(mdr_report_key)
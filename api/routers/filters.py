@@ -8,12 +8,16 @@ from fastapi import APIRouter, Query
 from typing import Optional
 
 from api.services.database import get_db
+from api.services.cache import cached, filter_cache
+from api.services.executor import db_endpoint
 
 router = APIRouter()
 
 
 @router.get("/brand-names")
-async def list_brand_names(
+@db_endpoint("light")
+@cached(filter_cache, "brand_names")
+def list_brand_names(
     search: Optional[str] = Query(None, description="Search term"),
     limit: int = Query(50, ge=1, le=200, description="Max results"),
 ):
@@ -49,7 +53,9 @@ async def list_brand_names(
 
 
 @router.get("/generic-names")
-async def list_generic_names(
+@db_endpoint("light")
+@cached(filter_cache, "generic_names")
+def list_generic_names(
     search: Optional[str] = Query(None, description="Search term"),
     limit: int = Query(50, ge=1, le=200, description="Max results"),
 ):
@@ -85,7 +91,9 @@ async def list_generic_names(
 
 
 @router.get("/device-manufacturers")
-async def list_device_manufacturers(
+@db_endpoint("light")
+@cached(filter_cache, "device_manufacturers")
+def list_device_manufacturers(
     search: Optional[str] = Query(None, description="Search term"),
     limit: int = Query(50, ge=1, le=200, description="Max results"),
 ):
@@ -121,7 +129,9 @@ async def list_device_manufacturers(
 
 
 @router.get("/model-numbers")
-async def list_model_numbers(
+@db_endpoint("light")
+@cached(filter_cache, "model_numbers")
+def list_model_numbers(
     search: Optional[str] = Query(None, description="Search term"),
     limit: int = Query(50, ge=1, le=200, description="Max results"),
 ):
@@ -157,7 +167,9 @@ async def list_model_numbers(
 
 
 @router.get("/device-product-codes")
-async def list_device_product_codes(
+@db_endpoint("light")
+@cached(filter_cache, "device_product_codes")
+def list_device_product_codes(
     search: Optional[str] = Query(None, description="Search term"),
     limit: int = Query(50, ge=1, le=200, description="Max results"),
 ):
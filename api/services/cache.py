@@ -1,5 +1,13 @@
-"""Caching utilities for API responses."""
+"""Caching utilities for API responses.
 
+Cache keys include the data version of the database snapshot being read
+(see DatabaseService.data_version), so a refresh invalidates every entry
+exactly; the TTL only bounds how long unused entries occupy memory.
+"""
+
+import dataclasses
+import inspect
+import threading
 import time
 from functools import wraps
 from typing import Any, Callable, TypeVar, ParamSpec
@@ -7,6 +15,9 @@ from collections import OrderedDict
 import hashlib
 import json
 
+from api.config import get_settings
+from api.services.metrics import capturing
+
 P = ParamSpec("P")
 R = TypeVar("R")
 
@@ -24,32 +35,41 @@ class TTLCache:
         self.maxsize = maxsize
         self.ttl = ttl
         self._cache: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
 
     def get(self, key: str) -> Any | None:
         """Get item from cache if not expired."""
-        if key not in self._cache:
-            return None
+        with self._lock:
+            if key not in self._cache:
+                self.misses += 1
+                return None
 
-        timestamp, value = self._cache[key]
-        if time.time() - timestamp > self.ttl:
-            del self._cache[key]
-            return None
+            timestamp, value = self._cache[key]
+            if time.time() - timestamp > self.ttl:
+                del self._cache[key]
+                self.misses += 1
+                return None
 
-        # Move to end (most recently used)
-        self._cache.move_to_end(key)
-        return value
+            # Move to end (most recently used)
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return value
 
     def set(self, key: str, value: Any) -> None:
         """Set item in cache."""
-        # Remove oldest items if at capacity
-        while len(self._cache) >= self.maxsize:
-            self._cache.popitem(last=False)
+        with self._lock:
+            # Remove oldest items if at capacity
+            while len(self._cache) >= self.maxsize:
+                self._cache.popitem(last=False)
 
-        self._cache[key] = (time.time(), value)
+            self._cache[key] = (time.time(), value)
 
     def clear(self) -> None:
         """Clear all cached items."""
-        self._cache.clear()
+        with self._lock:
+            self._cache.clear()
 
     def invalidate(self, pattern: str) -> int:
         """Invalidate cache entries matching pattern.
@@ -60,28 +80,160 @@ class TTLCache:
         Returns:
             Number of entries invalidated
         """
-        keys_to_remove = [k for k in self._cache.keys() if pattern in k]
-        for key in keys_to_remove:
-            del self._cache[key]
+        with self._lock:
+            keys_to_remove = [k for k in self._cache.keys() if pattern in k]
+            for key in keys_to_remove:
+                del self._cache[key]
         return len(keys_to_remove)
 
+    def stats(self) -> dict[str, Any]:
+        """Size and hit/miss counts."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._cache),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+class SingleFlightTimeout(TimeoutError):
+    """Waited too long for another caller's identical computation."""
+
+
+class _Call:
+    """One in-flight computation and the callers waiting on it."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """Coalesce concurrent identical calls into one execution.
 
-# Global cache instances
-stats_cache = TTLCache(maxsize=50, ttl=300)  # 5 minutes for stats
-manufacturer_cache = TTLCache(maxsize=100, ttl=1800)  # 30 minutes for manufacturer list
-product_code_cache = TTLCache(maxsize=100, ttl=1800)  # 30 minutes for product codes
-trends_cache = TTLCache(maxsize=50, ttl=600)  # 10 minutes for trends
+    The first caller for a key runs the function; callers arriving while it
+    runs wait for and share its result, or its exception.
+    """
+
+    def __init__(self, timeout: float = 60.0):
+        """Initialize.
+
+        Args:
+            timeout: Seconds a waiting caller waits for the running call
+        """
+        self.timeout = timeout
+        self._calls: dict[str, _Call] = {}
+        self._lock = threading.Lock()
+        self.executions = 0
+        self.shared = 0
+        self.timeouts = 0
+
+    def do(self, key: str, func: Callable[[], R], timeout: float | None = None) -> R:
+        """Run func for key, or wait for the identical call already running.
+
+        Raises:
+            SingleFlightTimeout: If the running call did not finish in time.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+
+        if leader:
+            try:
+                call.result = func()
+                return call.result
+            except BaseException as e:
+                call.error = e
+                raise
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+
+        if not call.done.wait(self.timeout if timeout is None else timeout):
+            with self._lock:
+                self.timeouts += 1
+            raise SingleFlightTimeout(f"Timed out waiting for in-flight computation of {key}")
+        with self._lock:
+            self.shared += 1
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def stats(self) -> dict[str, Any]:
+        """In-flight, executed, shared and timed-out call counts."""
+        with self._lock:
+            return {
+                "in_flight": len(self._calls),
+                "executions": self.executions,
+                "shared": self.shared,
+                "timeouts": self.timeouts,
+                "timeout": self.timeout,
+            }
+
+
+# Global cache instances (entries are invalidated by data version, see module docstring)
+_ttl = get_settings().cache_ttl_seconds
+stats_cache = TTLCache(maxsize=50, ttl=_ttl)
+manufacturer_cache = TTLCache(maxsize=100, ttl=_ttl)
+product_code_cache = TTLCache(maxsize=100, ttl=_ttl)
+trends_cache = TTLCache(maxsize=50, ttl=_ttl)
+filter_cache = TTLCache(maxsize=200, ttl=_ttl)
+signals_cache = TTLCache(maxsize=50, ttl=_ttl)
+count_cache = TTLCache(maxsize=500, ttl=_ttl)
+
+CACHES = {
+    "stats_cache": stats_cache,
+    "manufacturer_cache": manufacturer_cache,
+    "product_code_cache": product_code_cache,
+    "trends_cache": trends_cache,
+    "filter_cache": filter_cache,
+    "signals_cache": signals_cache,
+    "count_cache": count_cache,
+}
+
+# Concurrent misses for the same cache key share one computation
+flight = SingleFlight(timeout=get_settings().singleflight_timeout)
+
+
+def _key_default(value: Any) -> Any:
+    """JSON fallback for cache key arguments (models, dataclasses, dates)."""
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json")
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    return str(value)
+
+
+def data_version() -> str:
+    """Version token of the database snapshot the current request reads."""
+    from api.services.database import get_db
+
+    return get_db().data_version
 
 
 def make_cache_key(*args: Any, **kwargs: Any) -> str:
     """Create a cache key from function arguments."""
-    key_data = json.dumps({"args": args, "kwargs": kwargs}, sort_keys=True, default=str)
+    key_data = json.dumps({"args": args, "kwargs": kwargs}, sort_keys=True, default=_key_default)
     return hashlib.md5(key_data.encode()).hexdigest()
 
 
 def cached(cache: TTLCache, key_prefix: str = "") -> Callable[[Callable[P, R]], Callable[P, R]]:
     """Decorator for caching function results.
 
+    Keys are built from the arguments (excluding ``self`` for methods) and
+    the current data version. Concurrent misses for the same key run the
+    function once and share the result (see SingleFlight). Calls made while
+    queries are captured (see api.services.metrics) bypass the cache.
+
     Args:
         cache: Cache instance to use
         key_prefix: Prefix for cache keys
@@ -90,54 +242,42 @@ def cached(cache: TTLCache, key_prefix: str = "") -> Callable[[Callable[P, R]],
         Decorated function
     """
     def decorator(func: Callable[P, R]) -> Callable[P, R]:
+        params = list(inspect.signature(func).parameters)
+        is_method = bool(params) and params[0] == "self"
+
         @wraps(func)
         def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
-            cache_key = f"{key_prefix}:{make_cache_key(*args, **kwargs)}"
+            # Profiled requests must run their queries (see capture_queries)
+            if capturing():
+                return func(*args, **kwargs)
+
+            key_args = args[1:] if is_method else args
+            cache_key = f"{key_prefix}:{data_version()}:{make_cache_key(*key_args, **kwargs)}"
 
             # Try to get from cache
             cached_value = cache.get(cache_key)
             if cached_value is not None:
                 return cached_value
 
-            # Compute and cache result
-            result = func(*args, **kwargs)
-            cache.set(cache_key, result)
-            return result
+            # Compute and cache result, once for all concurrent callers
+            def compute() -> R:
+                result = func(*args, **kwargs)
+                cache.set(cache_key, result)
+                return result
+
+            return flight.do(cache_key, compute)
 
         return wrapper
 
     return decorator
 
 
-def get_cache_stats() -> dict[str, dict[str, int]]:
+def get_cache_stats() -> dict[str, dict[str, Any]]:
     """Get statistics about cache usage."""
-    return {
-        "stats_cache": {
-            "size": len(stats_cache._cache),
-            "maxsize": stats_cache.maxsize,
-            "ttl": stats_cache.ttl,
-        },
-        "manufacturer_cache": {
-            "size": len(manufacturer_cache._cache),
-            "maxsize": manufacturer_cache.maxsize,
-            "ttl": manufacturer_cache.ttl,
-        },
-        "product_code_cache": {
-            "size": len(product_code_cache._cache),
-            "maxsize": product_code_cache.maxsize,
-            "ttl": product_code_cache.ttl,
-        },
-        "trends_cache": {
-            "size": len(trends_cache._cache),
-            "maxsize": trends_cache.maxsize,
-            "ttl": trends_cache.ttl,
-        },
-    }
+    return {name: cache.stats() for name, cache in CACHES.items()}
 
 
 def clear_all_caches() -> None:
     """Clear all cache instances."""
-    stats_cache.clear()
-    manufacturer_cache.clear()
-    product_code_cache.clear()
-    trends_cache.clear()
+    for cache in CACHES.values():
+        cache.clear()
@@ -1,69 +1,457 @@
-"""Database connection service for FastAPI."""
+"""Database connection service for FastAPI.
 
-import duckdb
-from functools import lru_cache
-from typing import Optional
+The API opens one read-only DuckDB connection per database file and serves
+queries from a bounded pool of cursors on it (``conn.cursor()``), so
+requests running on different threads execute in parallel instead of
+queueing on a single connection.
+
+Requests opened with the ``db_session`` dependency check out one cursor on
+their first query and hold it until the response is sent, so every
+DatabaseService call made on the request's behalf (including from
+QueryService and other services that use ``get_db()``) runs on the same
+cursor. Calls made outside a request check a cursor out for the duration of
+the call.
+
+Every query is timed and recorded under the name of the function that
+issued it, or the ``name`` passed in (see api.services.metrics).
+"""
+
+import hashlib
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
 from pathlib import Path
 
+import duckdb
+
 from api.config import get_settings
+from api.services.metrics import caller_name, timed_query
+from config.logging_config import get_logger
+
+logger = get_logger("api_database")
+
+
+class PoolTimeout(Exception):
+    """No cursor became available within the pool timeout."""
+
+
+class PoolClosed(PoolTimeout):
+    """The pool was retired (closed or swapped out) before a cursor was free."""
+
+
+class CursorPool:
+    """Bounded pool of DuckDB cursors on one connection."""
+
+    def __init__(
+        self,
+        connection: duckdb.DuckDBPyConnection,
+        size: int,
+        timeout: float,
+        data_version: str = "",
+    ):
+        """Initialize pool.
+
+        Args:
+            connection: Connection the cursors are created from.
+            size: Maximum number of cursors.
+            timeout: Seconds acquire() waits for a free cursor.
+            data_version: Version token of the data the connection reads.
+        """
+        self.connection = connection
+        self.data_version = data_version
+        self.size = max(1, size)
+        self.timeout = timeout
+        self._idle: List[duckdb.DuckDBPyConnection] = []
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._created = 0
+        self._in_use = 0
+        self._closed = False
+        self._stats = {
+            "checkouts": 0,
+            "waits": 0,
+            "timeouts": 0,
+            "wait_seconds_total": 0.0,
+            "wait_seconds_max": 0.0,
+        }
+
+    def acquire(self, timeout: Optional[float] = None) -> duckdb.DuckDBPyConnection:
+        """Check out a cursor, creating one if the pool is below its size.
+
+        Args:
+            timeout: Seconds to wait for a free cursor (default: pool timeout).
+
+        Returns:
+            A cursor for exclusive use until release().
+
+        Raises:
+            PoolTimeout: If no cursor became free in time.
+            PoolClosed: If the pool was closed before one did.
+        """
+        started = time.perf_counter()
+        deadline = started + (self.timeout if timeout is None else timeout)
+        waited = False
+        with self._lock:
+            while True:
+                if self._closed:
+                    raise PoolClosed("Database pool is closed")
+                if self._idle:
+                    cursor = self._idle.pop()
+                    break
+                if self._created < self.size:
+                    cursor = self.connection.cursor()
+                    self._created += 1
+                    break
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    self._stats["timeouts"] += 1
+                    raise PoolTimeout(
+                        f"No database cursor available after {time.perf_counter() - started:.1f}s"
+                    )
+                waited = True
+                self._changed.wait(remaining)
+
+            wait = time.perf_counter() - started
+            self._in_use += 1
+            self._stats["checkouts"] += 1
+            if waited:
+                self._stats["waits"] += 1
+            self._stats["wait_seconds_total"] += wait
+            self._stats["wait_seconds_max"] = max(self._stats["wait_seconds_max"], wait)
+        return cursor
+
+    def release(self, cursor: duckdb.DuckDBPyConnection) -> None:
+        """Return a cursor to the pool (closing it if the pool was closed)."""
+        with self._lock:
+            self._in_use -= 1
+            closed = self._closed
+            if not closed:
+                self._idle.append(cursor)
+            self._changed.notify_all()
+        if closed:
+            cursor.close()
+
+    @contextmanager
+    def checkout(self, timeout: Optional[float] = None) -> Iterator[duckdb.DuckDBPyConnection]:
+        """Context manager around acquire()/release()."""
+        cursor = self.acquire(timeout)
+        try:
+            yield cursor
+        finally:
+            self.release(cursor)
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool size, usage and wait-time metrics."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats.update({
+                "size": self.size,
+                "created": self._created,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+            })
+        checkouts = stats["checkouts"]
+        stats["wait_seconds_avg"] = stats["wait_seconds_total"] / checkouts if checkouts else 0.0
+        return stats
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """Wait until no cursor is checked out.
+
+        Args:
+            timeout: Seconds to wait (None waits indefinitely).
+
+        Returns:
+            True if the pool drained, False on timeout.
+        """
+        with self._lock:
+            return self._changed.wait_for(lambda: self._in_use == 0, timeout)
+
+    def close(self) -> None:
+        """Close idle cursors; cursors still checked out are closed on release."""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._changed.notify_all()
+        for cursor in idle:
+            cursor.close()
+
+
+class RequestSession:
+    """Cursor held by one request, checked out on first use."""
+
+    def __init__(self):
+        self.pool: Optional[CursorPool] = None
+        self.cursor: Optional[duckdb.DuckDBPyConnection] = None
+        self.released = False
+        self._lock = threading.Lock()
+
+    def get_cursor(self, db: "DatabaseService") -> duckdb.DuckDBPyConnection:
+        """Check out the request's cursor if not done yet and return it.
+
+        Raises:
+            RuntimeError: If the session was already released; a cursor
+                checked out now would never be returned.
+        """
+        with self._lock:
+            if self.released:
+                raise RuntimeError("Request session already released")
+            if self.cursor is None:
+                self.pool, self.cursor = db.acquire()
+            return self.cursor
+
+    def release(self) -> None:
+        """Return the cursor, if one was checked out, and refuse further checkouts."""
+        with self._lock:
+            self.released = True
+            if self.cursor is not None:
+                self.pool.release(self.cursor)
+                self.cursor = None
+
+
+# Session of the current request (see db_session)
+_request_session: ContextVar[Optional[RequestSession]] = ContextVar(
+    "request_session", default=None
+)
+
+
+class QueryResult:
+    """Materialized result of DatabaseService.execute()."""
+
+    def __init__(self, rows: List[tuple], description: Optional[list]):
+        self.rows = rows
+        self.description = description
+        self._position = 0
+
+    def fetchone(self) -> Optional[tuple]:
+        if self._position >= len(self.rows):
+            return None
+        row = self.rows[self._position]
+        self._position += 1
+        return row
+
+    def fetchall(self) -> List[tuple]:
+        rows = self.rows[self._position:]
+        self._position = len(self.rows)
+        return rows
+
+    def df(self):
+        import pandas as pd
+
+        columns = [d[0] for d in self.description or []]
+        return pd.DataFrame(self.fetchall(), columns=columns)
+
+    fetchdf = df
+
+
+def _ingestion_marker(connection: duckdb.DuckDBPyConnection) -> str:
+    """Latest ingestion_log id and change_log run id of a database."""
+    marker = []
+    for query in ("SELECT MAX(id) FROM ingestion_log", "SELECT MAX(run_id) FROM change_log"):
+        try:
+            marker.append(str(connection.execute(query).fetchone()[0]))
+        except duckdb.Error:
+            marker.append("")
+    return ":".join(marker)
 
 
 class DatabaseService:
     """Manages DuckDB database connections for FastAPI."""
 
-    def __init__(self, db_path: Optional[Path] = None):
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        pool_size: Optional[int] = None,
+        pool_timeout: Optional[float] = None,
+    ):
         """Initialize database service.
 
         Args:
             db_path: Path to database file.
+            pool_size: Maximum concurrent cursors (default settings.db_pool_size).
+            pool_timeout: Seconds to wait for a cursor (default settings.db_pool_timeout).
         """
         settings = get_settings()
         self.db_path = db_path or settings.database_path
+        self.pool_size = pool_size or settings.db_pool_size
+        self.pool_timeout = settings.db_pool_timeout if pool_timeout is None else pool_timeout
+        self.snapshot: Optional[Path] = None
         self._connection: Optional[duckdb.DuckDBPyConnection] = None
+        self._pool: Optional[CursorPool] = None
+        self._lock = threading.Lock()
+
+    def _open(self):
+        """Open the file db_path currently points at, with its cursor pool.
+
+        The path is resolved so each published snapshot (see
+        src.database.snapshots) is opened under its own file name.
+        """
+        snapshot = Path(self.db_path).resolve()
+        connection = duckdb.connect(str(snapshot), read_only=True)
+        self._configure(connection)
+        stat = snapshot.stat()
+        version = hashlib.sha1(
+            f"{snapshot}:{stat.st_mtime_ns}:{stat.st_size}:{_ingestion_marker(connection)}".encode()
+        ).hexdigest()[:16]
+        pool = CursorPool(connection, self.pool_size, self.pool_timeout, data_version=version)
+        return snapshot, connection, pool
 
     def connect(self) -> duckdb.DuckDBPyConnection:
         """Get or create database connection."""
-        if self._connection is None:
-            self._connection = duckdb.connect(str(self.db_path), read_only=True)
-            self._configure()
-        return self._connection
+        with self._lock:
+            if self._connection is None:
+                self.snapshot, self._connection, self._pool = self._open()
+            return self._connection
+
+    @property
+    def pool(self) -> CursorPool:
+        """Cursor pool, opening the connection if needed."""
+        self.connect()
+        return self._pool
+
+    @property
+    def data_version(self) -> str:
+        """Token identifying the data this request's queries read.
 
-    def _configure(self) -> None:
+        It is derived from the snapshot file and its latest ingestion run,
+        and changes whenever a different snapshot (or a modified file) is
+        opened, so caches and ETags keyed on it never serve data from a
+        previous refresh.
+        """
+        session = _request_session.get()
+        if session is not None and session.pool is not None:
+            return session.pool.data_version
+        return self.pool.data_version
+
+    def _configure(self, connection: duckdb.DuckDBPyConnection) -> None:
         """Configure connection for optimal read performance."""
-        if self._connection:
-            self._connection.execute("SET memory_limit = '4GB'")
-            self._connection.execute("SET threads = 4")
-
-    def execute(self, query: str, params: Optional[list] = None):
-        """Execute a query and return results."""
-        conn = self.connect()
-        if params:
-            return conn.execute(query, params)
-        return conn.execute(query)
-
-    def fetch_one(self, query: str, params: Optional[list] = None):
+        connection.execute("SET memory_limit = '4GB'")
+        connection.execute("SET threads = 4")
+
+    def acquire(self):
+        """Check a cursor out of the current pool.
+
+        Returns:
+            (pool, cursor); the cursor must be released to that pool.
+        """
+        while True:
+            pool = self.pool
+            try:
+                return pool, pool.acquire()
+            except PoolClosed:
+                # Swapped to a new snapshot while waiting; use its pool
+                continue
+
+    @contextmanager
+    def cursor(self) -> Iterator[duckdb.DuckDBPyConnection]:
+        """Cursor for the current request, or one checked out for this block."""
+        session = _request_session.get()
+        if session is not None:
+            yield session.get_cursor(self)
+            return
+        pool, cursor = self.acquire()
+        try:
+            yield cursor
+        finally:
+            pool.release(cursor)
+
+    def execute(self, query: str, params: Optional[list] = None, name: Optional[str] = None):
+        """Execute a query and return its rows as a QueryResult.
+
+        The rows are fetched right away, so later queries on the same cursor
+        (a request's session cursor, or a pooled one once it is returned)
+        cannot discard rows the caller has not read yet.
+
+        Args:
+            query: SQL to run.
+            params: Query parameters.
+            name: Name the query's metrics are recorded under (default: the
+                caller's qualified name).
+        """
+        with self.cursor() as cursor, timed_query(name or caller_name(), query, params) as timing:
+            result = cursor.execute(query, params) if params else cursor.execute(query)
+            rows = result.fetchall()
+            timing.rows = len(rows)
+            return QueryResult(rows, result.description)
+
+    def fetch_one(self, query: str, params: Optional[list] = None, name: Optional[str] = None):
         """Execute query and fetch one result."""
-        return self.execute(query, params).fetchone()
+        with self.cursor() as cursor, timed_query(name or caller_name(), query, params) as timing:
+            row = (cursor.execute(query, params) if params else cursor.execute(query)).fetchone()
+            timing.rows = 0 if row is None else 1
+            return row
 
-    def fetch_all(self, query: str, params: Optional[list] = None):
+    def fetch_all(self, query: str, params: Optional[list] = None, name: Optional[str] = None):
         """Execute query and fetch all results."""
-        return self.execute(query, params).fetchall()
+        with self.cursor() as cursor, timed_query(name or caller_name(), query, params) as timing:
+            rows = (cursor.execute(query, params) if params else cursor.execute(query)).fetchall()
+            timing.rows = len(rows)
+            return rows
 
-    def fetch_df(self, query: str, params: Optional[list] = None):
+    def fetch_df(self, query: str, params: Optional[list] = None, name: Optional[str] = None):
         """Execute query and return as DataFrame."""
-        return self.execute(query, params).df()
+        with self.cursor() as cursor, timed_query(name or caller_name(), query, params) as timing:
+            df = (cursor.execute(query, params) if params else cursor.execute(query)).df()
+            timing.rows = len(df)
+            return df
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Cursor pool metrics (empty if the database was never opened)."""
+        return self._pool.stats() if self._pool else {}
 
     def close(self) -> None:
         """Close the database connection."""
-        if self._connection:
-            self._connection.close()
-            self._connection = None
+        with self._lock:
+            if self._pool:
+                self._pool.close()
+                self._pool = None
+            if self._connection:
+                self._connection.close()
+                self._connection = None
 
     def reconnect(self) -> duckdb.DuckDBPyConnection:
         """Close and reopen the database connection."""
         self.close()
         return self.connect()
 
+    def swap(self, drain_timeout: Optional[float] = None) -> bool:
+        """Switch to the snapshot db_path now points at without downtime.
+
+        New queries go to the new connection at once; queries already
+        running on the old one finish before it is closed.
+
+        Args:
+            drain_timeout: Seconds to wait for in-flight queries
+                (default settings.db_drain_timeout).
+
+        Returns:
+            False if in-flight queries were still running at the timeout
+            (the old connection is closed regardless).
+        """
+        if drain_timeout is None:
+            drain_timeout = get_settings().db_drain_timeout
+
+        with self._lock:
+            if self._connection is not None and Path(self.db_path).resolve() == self.snapshot:
+                return True
+            old_connection, old_pool = self._connection, self._pool
+            self.snapshot, self._connection, self._pool = self._open()
+
+        if old_connection is None:
+            return True
+
+        drained = old_pool.drain(drain_timeout)
+        if not drained:
+            logger.warning(
+                f"{old_pool.stats()['in_use']} queries still running on the previous "
+                f"snapshot after {drain_timeout}s; closing it anyway"
+            )
+        old_pool.close()
+        old_connection.close()
+        logger.info(f"Swapped API database to {self.snapshot.name}")
+        return drained
+
 
 # Global database instance
 _db_service: Optional[DatabaseService] = None
@@ -77,6 +465,22 @@ def get_db() -> DatabaseService:
     return _db_service
 
 
+async def db_session() -> AsyncIterator[DatabaseService]:
+    """FastAPI dependency: hold one pooled cursor for the whole request.
+
+    The cursor is checked out by the request's first query and returned
+    after the response is sent. Queries that cannot get a cursor within the
+    pool timeout raise PoolTimeout, which the app answers with 503.
+    """
+    session = RequestSession()
+    token = _request_session.set(session)
+    try:
+        yield get_db()
+    finally:
+        _request_session.reset(token)
+        session.release()
+
+
 def close_db() -> None:
     """Close the global database connection."""
     global _db_service
@@ -89,3 +493,11 @@ def reconnect_db() -> None:
     global _db_service
     if _db_service is not None:
         _db_service.reconnect()
+
+
+def swap_db() -> bool:
+    """Move the global database to the newly published snapshot."""
+    global _db_service
+    if _db_service is not None:
+        return _db_service.swap()
+    return True
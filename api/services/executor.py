@@ -0,0 +1,167 @@
+"""Bounded executors for database work in async endpoints.
+
+Endpoint handlers are plain functions that call the synchronous query
+services; ``db_endpoint(workload)`` wraps them so FastAPI awaits them on a
+dedicated thread pool instead of running them on the event loop (or in
+Starlette's shared threadpool). Each workload class gets its own pool, so a
+burst of heavy analytics or exports queues behind its own workers while
+light lookups and ``/health`` keep being served:
+
+    light   lookups, lists, filters and status     (MAUDE_DB_LIGHT_WORKERS)
+    heavy   analytics aggregations and reports     (MAUDE_DB_HEAVY_WORKERS)
+    export  file exports                           (MAUDE_DB_EXPORT_WORKERS)
+
+Work runs in a copy of the caller's context, so the request's database
+session (see ``db_session``) follows it onto the worker thread.
+"""
+
+import asyncio
+import contextvars
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from api.config import get_settings
+
+WORKLOADS = ("light", "heavy", "export")
+
+
+class DBExecutor:
+    """Thread pool for one workload class, with queue and run metrics."""
+
+    def __init__(self, name: str, max_workers: int):
+        """Initialize executor.
+
+        Args:
+            name: Workload class name (used for thread names).
+            max_workers: Maximum concurrent tasks.
+        """
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix=f"db-{name}"
+        )
+        self._lock = threading.Lock()
+        self._stats = {
+            "submitted": 0,
+            "active": 0,
+            "completed": 0,
+            "failed": 0,
+            "queue_seconds_total": 0.0,
+            "queue_seconds_max": 0.0,
+        }
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """Run ``func(*args, **kwargs)`` on this executor and await its result.
+
+        If the awaiting task is cancelled, the cancellation is raised only
+        once ``func`` has returned.
+        """
+        context = contextvars.copy_context()
+        submitted = time.perf_counter()
+        with self._lock:
+            self._stats["submitted"] += 1
+
+        def task():
+            queued = time.perf_counter() - submitted
+            with self._lock:
+                self._stats["active"] += 1
+                self._stats["queue_seconds_total"] += queued
+                self._stats["queue_seconds_max"] = max(self._stats["queue_seconds_max"], queued)
+            failed = True
+            try:
+                result = context.run(func, *args, **kwargs)
+                failed = False
+                return result
+            finally:
+                with self._lock:
+                    self._stats["active"] -= 1
+                    self._stats["failed" if failed else "completed"] += 1
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._executor, task)
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            # The thread cannot be interrupted; let it finish so the request's
+            # cursor is not returned to the pool while it is still in use
+            await asyncio.wait([future])
+            raise
+
+    def stats(self) -> Dict[str, Any]:
+        """Worker count, queue depth and queue-wait metrics."""
+        with self._lock:
+            stats = dict(self._stats)
+        started = stats["completed"] + stats["failed"] + stats["active"]
+        stats["max_workers"] = self.max_workers
+        stats["queued"] = stats["submitted"] - started
+        stats["queue_seconds_avg"] = stats["queue_seconds_total"] / started if started else 0.0
+        return stats
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting work and release the worker threads."""
+        self._executor.shutdown(wait=wait)
+
+
+_executors: Dict[str, DBExecutor] = {}
+_executors_lock = threading.Lock()
+
+
+def get_executor(workload: str) -> DBExecutor:
+    """Get (creating on first use) the executor for a workload class."""
+    if workload not in WORKLOADS:
+        raise ValueError(f"Unknown workload {workload!r}; expected one of {WORKLOADS}")
+
+    with _executors_lock:
+        executor = _executors.get(workload)
+        if executor is None:
+            settings = get_settings()
+            workers = {
+                "light": settings.db_light_workers,
+                "heavy": settings.db_heavy_workers,
+                "export": settings.db_export_workers,
+            }[workload]
+            executor = _executors[workload] = DBExecutor(workload, workers)
+        return executor
+
+
+async def run_db(workload: str, func: Callable, *args, **kwargs) -> Any:
+    """Run blocking database work on the executor for ``workload``."""
+    return await get_executor(workload).run(func, *args, **kwargs)
+
+
+def db_endpoint(workload: str = "light") -> Callable:
+    """Decorator turning a blocking handler into one run on a DB executor.
+
+    The wrapper keeps the handler's signature, so FastAPI resolves
+    parameters and dependencies exactly as for the undecorated function.
+    """
+    if workload not in WORKLOADS:
+        raise ValueError(f"Unknown workload {workload!r}; expected one of {WORKLOADS}")
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            return await run_db(workload, func, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def executor_stats() -> Dict[str, Dict[str, Any]]:
+    """Metrics for every executor started so far."""
+    with _executors_lock:
+        executors = dict(_executors)
+    return {name: executor.stats() for name, executor in executors.items()}
+
+
+def shutdown_executors(wait: bool = True) -> None:
+    """Shut down all executors (they are recreated on next use)."""
+    with _executors_lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for executor in executors:
+        executor.shutdown(wait=wait)
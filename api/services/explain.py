@@ -0,0 +1,172 @@
+"""On-demand EXPLAIN ANALYZE profiles of API requests.
+
+``profile_request`` replays a GET request against the app in-process with
+query capture on (see api.services.metrics.capture_queries): every query
+DatabaseService runs for it is recorded with its exact SQL and parameters,
+bypassing the result caches so the queries really run. Each
+captured query is then re-run under ``EXPLAIN (ANALYZE, FORMAT JSON)`` and
+its profile reduced to a list of operators with their timings and
+cardinalities:
+
+    profile = await profile_request(request.app, "/api/events", {"manufacturers": "X"})
+
+The last settings.explain_history profiles are kept in ``profile_store``
+for comparison (served at /api/admin/explain).
+"""
+
+import itertools
+import json
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import duckdb
+import httpx
+
+from api.config import get_settings
+from api.services.database import get_db
+from api.services.executor import run_db
+from api.services.metrics import capture_queries
+
+# Paths that cannot be profiled (replaying them would recurse or write)
+EXCLUDED_PREFIXES = ("/api/admin",)
+
+
+def _operators(node: Dict[str, Any], depth: int = 0) -> List[Dict[str, Any]]:
+    """Operators of a JSON profile tree, depth first."""
+    operators = []
+    operator_type = node.get("operator_type", node.get("name"))
+    if operator_type and operator_type != "EXPLAIN_ANALYZE":
+        operators.append({
+            "depth": depth,
+            "operator": operator_type,
+            "name": node.get("operator_name", operator_type),
+            "timing_seconds": node.get("operator_timing", node.get("timing")),
+            "cardinality": node.get("operator_cardinality", node.get("cardinality")),
+            "rows_scanned": node.get("operator_rows_scanned"),
+            "extra_info": node.get("extra_info") or {},
+        })
+        depth += 1
+    for child in node.get("children", []):
+        operators.extend(_operators(child, depth))
+    return operators
+
+
+def explain_analyze(cursor: duckdb.DuckDBPyConnection, query: str, params: Optional[list]) -> Dict[str, Any]:
+    """Run a query under EXPLAIN ANALYZE and summarize its profile.
+
+    DuckDB versions without JSON EXPLAIN output return the text plan only.
+    """
+    try:
+        sql = f"EXPLAIN (ANALYZE, FORMAT JSON) {query}"
+        row = (cursor.execute(sql, params) if params else cursor.execute(sql)).fetchone()
+    except duckdb.ParserException:
+        sql = f"EXPLAIN ANALYZE {query}"
+        row = (cursor.execute(sql, params) if params else cursor.execute(sql)).fetchone()
+        return {"plan_text": row[1]}
+
+    plan = json.loads(row[1])
+    if isinstance(plan, list):
+        plan = plan[0]
+    operators = _operators(plan)
+    return {
+        "latency_seconds": plan.get("latency", plan.get("timing")),
+        "cpu_seconds": plan.get("cpu_time"),
+        "rows_scanned": plan.get("cumulative_rows_scanned"),
+        "rows_returned": operators[0]["cardinality"] if operators else None,
+        "peak_buffer_memory": plan.get("system_peak_buffer_memory"),
+        "operators": operators,
+        "plan": plan,
+    }
+
+
+class ProfileStore:
+    """The most recent profiles, by id."""
+
+    def __init__(self, maxsize: int):
+        self._profiles: deque = deque(maxlen=max(1, maxsize))
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def add(self, profile: Dict[str, Any]) -> Dict[str, Any]:
+        """Store a profile, assigning its id."""
+        with self._lock:
+            profile["id"] = next(self._ids)
+            self._profiles.append(profile)
+        return profile
+
+    def get(self, profile_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return next((p for p in self._profiles if p["id"] == profile_id), None)
+
+    def summaries(self) -> List[Dict[str, Any]]:
+        """Newest first, with per-query latencies instead of plans."""
+        with self._lock:
+            profiles = list(self._profiles)
+        return [
+            {
+                "id": p["id"],
+                "path": p["path"],
+                "params": p["params"],
+                "captured_at": p["captured_at"],
+                "status_code": p["status_code"],
+                "latency_seconds": p["latency_seconds"],
+                "queries": [
+                    {"name": q["name"], "latency_seconds": q.get("latency_seconds")}
+                    for q in p["queries"]
+                ],
+            }
+            for p in reversed(profiles)
+        ]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._profiles.clear()
+
+
+# Global store of recent profiles
+profile_store = ProfileStore(get_settings().explain_history)
+
+
+def _explain_all(captured: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    with get_db().cursor() as cursor:
+        return [
+            {**query, **explain_analyze(cursor, query["sql"], query["params"])}
+            for query in captured
+        ]
+
+
+async def profile_request(app, path: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Replay ``GET path?params`` and profile the queries it ran.
+
+    Args:
+        app: ASGI app to replay the request against.
+        path: API path, e.g. "/api/analytics/signals".
+        params: Query parameters (values may be lists for repeated keys).
+
+    Returns:
+        The stored profile: the replayed response's status, and each
+        query's name, SQL, parameters and EXPLAIN ANALYZE summary.
+
+    Raises:
+        ValueError: If the path cannot be profiled.
+    """
+    if not path.startswith("/api/") or path.startswith(EXCLUDED_PREFIXES):
+        raise ValueError(f"Cannot profile {path}; expected an /api/ path outside /api/admin")
+
+    params = params or {}
+    transport = httpx.ASGITransport(app=app)
+    with capture_queries() as captured:
+        async with httpx.AsyncClient(transport=transport, base_url="http://explain") as client:
+            response = await client.get(path, params=params)
+
+    queries = await run_db("heavy", _explain_all, captured)
+    return profile_store.add({
+        "path": path,
+        "params": params,
+        "captured_at": datetime.now().isoformat(),
+        "status_code": response.status_code,
+        "latency_seconds": sum(q.get("latency_seconds") or 0 for q in queries),
+        "queries": queries,
+    })
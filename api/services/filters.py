@@ -1,5 +1,7 @@
 """Filter building utilities for SQL queries."""
 
+import base64
+import json
 from typing import Optional
 from datetime import date
 from dataclasses import dataclass
@@ -233,6 +235,31 @@ def has_device_filters(device_filters: Optional[DeviceFilters]) -> bool:
     ])
 
 
+def normalize_filter_values(values: Optional[list[str]]) -> Optional[list[str]]:
+    """Strip, de-duplicate and sort filter values; None if none remain.
+
+    Equivalent filter sets then build identical queries and cache keys.
+    """
+    if not values:
+        return None
+    normalized = sorted({value.strip() for value in values if value and value.strip()})
+    return normalized or None
+
+
+def normalize_device_filters(device_filters: Optional[DeviceFilters]) -> Optional[DeviceFilters]:
+    """Normalized copy of device filters (see normalize_filter_values); None if inactive."""
+    if not has_device_filters(device_filters):
+        return None
+    return DeviceFilters(
+        brand_names=normalize_filter_values(device_filters.brand_names),
+        generic_names=normalize_filter_values(device_filters.generic_names),
+        device_manufacturers=normalize_filter_values(device_filters.device_manufacturers),
+        model_numbers=normalize_filter_values(device_filters.model_numbers),
+        implant_flag=device_filters.implant_flag if device_filters.implant_flag in ("Y", "N") else None,
+        device_product_codes=normalize_filter_values(device_filters.device_product_codes),
+    )
+
+
 def build_count_query(
     base_table: str = "master_events",
     where_clause: str = "1=1",
@@ -258,7 +285,7 @@ def build_paginated_query(
     order_by: str = "date_received DESC",
     table_alias: str = "m",
     page: int = 1,
-    page_size: int = 50,
+    page_size: Optional[int] = 50,
 ) -> str:
     """Build a paginated SELECT query.
 
@@ -269,16 +296,114 @@ def build_paginated_query(
         order_by: ORDER BY clause.
         table_alias: Table alias.
         page: Page number (1-indexed).
-        page_size: Results per page.
+        page_size: Results per page; None for all rows.
 
     Returns:
         SQL query string.
     """
-    offset = (page - 1) * page_size
-    return f"""
+    query = f"""
         SELECT {select_clause}
         FROM {base_table} {table_alias}
         WHERE {where_clause}
         ORDER BY {order_by}
-        LIMIT {page_size} OFFSET {offset}
     """
+    if page_size is None:
+        return query
+    offset = (page - 1) * page_size
+    return f"{query}    LIMIT {page_size} OFFSET {offset}\n"
+
+
+# Total order of event listings: newest first, ties broken by report key.
+# Offset and keyset pages share it, so a cursor taken from an offset page
+# continues where that page ended.
+EVENT_ORDER = "m.date_received DESC NULLS LAST, m.mdr_report_key DESC"
+
+
+def encode_cursor(date_received: Optional[date], mdr_report_key: str) -> str:
+    """Opaque keyset cursor for the position after an event.
+
+    Args:
+        date_received: The event's date_received (None if missing).
+        mdr_report_key: The event's MDR report key.
+
+    Returns:
+        URL-safe cursor token.
+    """
+    position = {
+        "d": date_received.isoformat() if date_received else None,
+        "k": mdr_report_key,
+    }
+    raw = json.dumps(position, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[Optional[date], str]:
+    """Decode a cursor from encode_cursor.
+
+    Returns:
+        Tuple of (date_received, mdr_report_key).
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        position = json.loads(raw)
+        received = date.fromisoformat(position["d"]) if position["d"] else None
+        key = position["k"]
+    except (ValueError, TypeError, KeyError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+    if not isinstance(key, str):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return received, key
+
+
+def build_keyset_query(
+    select_clause: str,
+    base_table: str = "master_events",
+    where_clause: str = "1=1",
+    table_alias: str = "m",
+    cursor: Optional[str] = None,
+    page_size: int = 50,
+) -> tuple[str, list]:
+    """Build a keyset (seek) paginated SELECT query in EVENT_ORDER.
+
+    Rather than skipping OFFSET rows, the page starts right after the cursor
+    position, so every page costs the same however deep it is.
+
+    Args:
+        select_clause: Columns to select.
+        base_table: Table to query.
+        where_clause: WHERE conditions.
+        table_alias: Table alias (EVENT_ORDER expects "m").
+        cursor: Token from encode_cursor; None for the first page.
+        page_size: Rows to return.
+
+    Returns:
+        Tuple of (SQL query string, parameters to append to the WHERE
+        clause's parameters).
+    """
+    params = []
+    seek = "1=1"
+    if cursor is not None:
+        received, key = decode_cursor(cursor)
+        if received is None:
+            # Missing dates sort last, so only later keys remain
+            seek = "m.date_received IS NULL AND m.mdr_report_key < ?"
+            params = [key]
+        else:
+            seek = """(
+                m.date_received < ?
+                OR (m.date_received = ? AND m.mdr_report_key < ?)
+                OR m.date_received IS NULL
+            )"""
+            params = [received, received, key]
+
+    query = f"""
+        SELECT {select_clause}
+        FROM {base_table} {table_alias}
+        WHERE ({where_clause}) AND {seek}
+        ORDER BY {EVENT_ORDER}
+        LIMIT {page_size}
+    """
+    return query, params
@@ -0,0 +1,295 @@
+"""Streaming tabular responses: Arrow IPC, Parquet, CSV and Excel.
+
+Endpoints returning rows (events, trends, exports) can answer in Arrow IPC
+stream or Parquet format instead of JSON, chosen with ``?format=arrow`` /
+``?format=parquet`` or an ``Accept`` header of ARROW_MEDIA_TYPE or
+PARQUET_MEDIA_TYPE:
+
+    fmt = negotiate_format(format, accept)
+    if fmt != "json":
+        return tabular_response(query, params, fmt, workload="heavy")
+
+The query runs on a cursor checked out for the response and its result is
+encoded and sent chunk by chunk as it is fetched, so memory stays flat
+however many rows match: DuckDB's Arrow record batches for Arrow and
+Parquet, ``fetchmany`` chunks for CSV, and an openpyxl write-only workbook
+spooled to a temporary file for Excel (a zip needs its directory written
+last). Each fetch runs on the endpoint's workload executor, and the cursor
+goes back to the pool when the stream ends or the client disconnects.
+"""
+
+import csv
+import io
+import os
+import tempfile
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional, Sequence
+
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+
+from api.services.database import get_db
+from api.services.executor import run_db
+from api.services.metrics import timed_query
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+
+try:
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font, PatternFill, Alignment
+    EXCEL_AVAILABLE = True
+except ImportError:
+    EXCEL_AVAILABLE = False
+
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+PARQUET_MEDIA_TYPE = "application/vnd.apache.parquet"
+CSV_MEDIA_TYPE = "text/csv"
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+FORMATS = ("json", "arrow", "parquet")
+MEDIA_TYPES = {"arrow": ARROW_MEDIA_TYPE, "parquet": PARQUET_MEDIA_TYPE}
+
+# Rows per Arrow record batch (and Parquet row group)
+BATCH_SIZE = 64 * 1024
+
+# Rows per fetchmany chunk for CSV and Excel
+CHUNK_ROWS = 10_000
+
+# Excel sheets hold at most 1,048,576 rows, one of them the header
+XLSX_MAX_ROWS = 1_048_575
+
+# Bytes per chunk when sending a spooled file
+FILE_CHUNK_SIZE = 1024 * 1024
+
+
+def negotiate_format(format: Optional[str], accept: Optional[str]) -> str:
+    """Response format from the format parameter, else the Accept header."""
+    if format:
+        format = format.lower()
+        if format not in FORMATS:
+            raise HTTPException(
+                status_code=400, detail=f"format must be one of: {', '.join(FORMATS)}"
+            )
+        return format
+
+    accept = (accept or "").lower()
+    for fmt, media_type in MEDIA_TYPES.items():
+        if media_type in accept:
+            return fmt
+    return "json"
+
+
+class BatchEncoder:
+    """Encodes a record batch reader as Arrow IPC stream or Parquet bytes."""
+
+    def __init__(self, reader, fmt: str):
+        self.reader = reader
+        self._sink = io.BytesIO()
+        if fmt == "parquet":
+            self._writer = pq.ParquetWriter(self._sink, reader.schema)
+        else:
+            self._writer = pa.ipc.new_stream(self._sink, reader.schema)
+        self._done = False
+
+    def _drain(self) -> bytes:
+        data = self._sink.getvalue()
+        self._sink.seek(0)
+        self._sink.truncate()
+        return data
+
+    def next_chunk(self) -> Optional[bytes]:
+        """Bytes for the next record batch; None once the stream is complete."""
+        if self._done:
+            return None
+        try:
+            self._writer.write_batch(self.reader.read_next_batch())
+        except StopIteration:
+            self._writer.close()
+            self._done = True
+        return self._drain()
+
+
+def _execute(cursor, query: str, params: Optional[list], name: str):
+    with timed_query(name, query, params):
+        return cursor.execute(query, params) if params else cursor.execute(query)
+
+
+@asynccontextmanager
+async def response_cursor(workload: str):
+    """Cursor checked out for a streamed response, independent of the request's."""
+    pool, cursor = await run_db(workload, get_db().acquire)
+    try:
+        yield cursor
+    finally:
+        pool.release(cursor)
+
+
+async def stream_query(
+    query: str, params: Optional[list], fmt: str, workload: str = "export"
+) -> AsyncIterator[bytes]:
+    """Run a query and yield its result encoded in ``fmt``, batch by batch."""
+    async with response_cursor(workload) as cursor:
+        def open_encoder():
+            result = _execute(cursor, query, params, "stream_query")
+            # to_arrow_reader replaces fetch_record_batch in DuckDB 1.4+
+            reader = getattr(result, "to_arrow_reader", None) or result.fetch_record_batch
+            return BatchEncoder(reader(BATCH_SIZE), fmt)
+
+        encoder = await run_db(workload, open_encoder)
+        while (chunk := await run_db(workload, encoder.next_chunk)) is not None:
+            if chunk:
+                yield chunk
+
+
+async def stream_csv(
+    query: str, params: Optional[list], header: Sequence[str], workload: str = "export"
+) -> AsyncIterator[bytes]:
+    """Run a query and yield CSV, one ``fetchmany`` chunk at a time.
+
+    Rows are cut to the header's width, so queries may select extra columns.
+    """
+    width = len(header)
+
+    def encode(rows) -> bytes:
+        output = io.StringIO()
+        writer = csv.writer(output)
+        writer.writerows(row[:width] for row in rows)
+        return output.getvalue().encode("utf-8")
+
+    async with response_cursor(workload) as cursor:
+        await run_db(workload, _execute, cursor, query, params, "stream_csv")
+        yield encode([header])
+
+        def next_chunk() -> Optional[bytes]:
+            rows = cursor.fetchmany(CHUNK_ROWS)
+            return encode(rows) if rows else None
+
+        while (chunk := await run_db(workload, next_chunk)) is not None:
+            yield chunk
+
+
+def _write_xlsx(cursor, header: Sequence[str], column_widths: Sequence[int], path: str) -> None:
+    """Write a query result to an .xlsx file in openpyxl write-only mode."""
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("MAUDE Events")
+    for index, width in enumerate(column_widths):
+        ws.column_dimensions[chr(65 + index)].width = width
+
+    header_font = Font(bold=True, color="FFFFFF")
+    header_fill = PatternFill(start_color="3B82F6", end_color="3B82F6", fill_type="solid")
+    header_cells = []
+    for title in header:
+        cell = WriteOnlyCell(ws, value=title)
+        cell.font = header_font
+        cell.fill = header_fill
+        cell.alignment = Alignment(horizontal="center")
+        header_cells.append(cell)
+    ws.append(header_cells)
+
+    width = len(header)
+    remaining = XLSX_MAX_ROWS
+    while remaining > 0:
+        rows = cursor.fetchmany(min(CHUNK_ROWS, remaining))
+        if not rows:
+            break
+        for row in rows:
+            ws.append(row[:width])
+        remaining -= len(rows)
+
+    wb.save(path)
+
+
+async def stream_xlsx(
+    query: str,
+    params: Optional[list],
+    header: Sequence[str],
+    column_widths: Sequence[int] = (),
+    workload: str = "export",
+) -> AsyncIterator[bytes]:
+    """Run a query, spool it to a write-only workbook and yield the file.
+
+    Sheets are capped at XLSX_MAX_ROWS data rows.
+    """
+    fd, path = tempfile.mkstemp(suffix=".xlsx", prefix="maude_export_")
+    os.close(fd)
+    try:
+        async with response_cursor(workload) as cursor:
+            await run_db(workload, _execute, cursor, query, params, "stream_xlsx")
+            await run_db(workload, _write_xlsx, cursor, header, column_widths, path)
+
+        with open(path, "rb") as f:
+            while chunk := await run_db(workload, f.read, FILE_CHUNK_SIZE):
+                yield chunk
+    finally:
+        os.unlink(path)
+
+
+def tabular_response(
+    query: str,
+    params: Optional[list],
+    fmt: str,
+    workload: str = "export",
+    filename: Optional[str] = None,
+    headers: Optional[dict] = None,
+) -> StreamingResponse:
+    """Streaming Arrow or Parquet response for a query.
+
+    Args:
+        query: SELECT whose result is sent.
+        params: Query parameters.
+        fmt: "arrow" or "parquet".
+        workload: Executor the fetches run on.
+        filename: Sent as an attachment with this name if given.
+        headers: Extra response headers.
+    """
+    if not ARROW_AVAILABLE:
+        raise HTTPException(status_code=400, detail="Arrow formats not available (pyarrow not installed)")
+
+    headers = {"Vary": "Accept", **(headers or {})}
+    if filename:
+        headers["Content-Disposition"] = f"attachment; filename={filename}"
+    return StreamingResponse(
+        stream_query(query, params, fmt, workload),
+        media_type=MEDIA_TYPES[fmt],
+        headers=headers,
+    )
+
+
+def export_response(
+    query: str,
+    params: Optional[list],
+    fmt: str,
+    header: Sequence[str],
+    filename: str,
+    column_widths: Sequence[int] = (),
+) -> StreamingResponse:
+    """Streaming CSV or Excel attachment for a query, run on the export executor.
+
+    Args:
+        query: SELECT whose result is sent.
+        params: Query parameters.
+        fmt: "csv" or "xlsx".
+        header: Column titles; rows are cut to this width.
+        filename: Attachment file name.
+        column_widths: Excel column widths.
+    """
+    if fmt == "xlsx":
+        if not EXCEL_AVAILABLE:
+            raise HTTPException(status_code=400, detail="Excel export not available (openpyxl not installed)")
+        body = stream_xlsx(query, params, header, column_widths)
+        media_type = XLSX_MEDIA_TYPE
+    else:
+        body = stream_csv(query, params, header)
+        media_type = CSV_MEDIA_TYPE
+
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    )
@@ -0,0 +1,319 @@
+"""SQL timing, slow-query log and Prometheus metrics.
+
+Every query DatabaseService runs is timed by ``timed_query`` and recorded
+under a name, by default the qualified name of the function that issued it
+(``QueryService.get_events``, ``SignalDetectionService.detect_signals``):
+
+    with timed_query("QueryService.get_events", sql, params) as timing:
+        rows = cursor.execute(sql, params).fetchall()
+        timing.rows = len(rows)
+
+Each name gets a latency histogram, a count of rows returned and a count of
+errors. Queries taking settings.slow_query_seconds or longer are logged to
+the ``api_slow_queries`` logger with their SQL and parameters.
+
+Inside ``capture_queries()`` the name, SQL and parameters of each query are
+also collected, and result caches are bypassed so every query really runs
+(used to profile requests, see api.services.explain).
+
+``render_prometheus()`` exposes the query metrics, together with cursor
+pool, executor and result cache metrics, in the Prometheus text format
+(served at /api/admin/metrics).
+"""
+
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from api.config import get_settings
+from config.logging_config import get_logger
+
+slow_logger = get_logger("api_slow_queries")
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Characters of SQL and parameters written per slow-query log entry
+SLOW_LOG_MAX_CHARS = 4000
+
+PROMETHEUS_MEDIA_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class QueryStats:
+    """Latency histogram, rows and errors of one named query."""
+
+    def __init__(self):
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+        self.count = 0
+        self.seconds_total = 0.0
+        self.rows_total = 0
+        self.errors = 0
+        self.slow = 0
+
+    def observe(self, seconds: float, rows: Optional[int], error: bool, slow: bool) -> None:
+        for index, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                self.buckets[index] += 1
+                break
+        self.count += 1
+        self.seconds_total += seconds
+        if rows is not None:
+            self.rows_total += rows
+        if error:
+            self.errors += 1
+        if slow:
+            self.slow += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Counts as a dict, with cumulative bucket counts keyed by bound."""
+        cumulative, running = {}, 0
+        for bound, count in zip(LATENCY_BUCKETS, self.buckets):
+            running += count
+            cumulative[bound] = running
+        return {
+            "buckets": cumulative,
+            "count": self.count,
+            "seconds_total": self.seconds_total,
+            "rows_total": self.rows_total,
+            "errors": self.errors,
+            "slow": self.slow,
+        }
+
+
+class QueryMetrics:
+    """Thread-safe registry of QueryStats by query name."""
+
+    def __init__(self):
+        self._stats: Dict[str, QueryStats] = {}
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        name: str,
+        seconds: float,
+        rows: Optional[int] = None,
+        error: bool = False,
+        slow: bool = False,
+    ) -> None:
+        """Record one execution of the query ``name``."""
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = QueryStats()
+            stats.observe(seconds, rows, error, slow)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Snapshot of every named query's counts."""
+        with self._lock:
+            return {name: stats.snapshot() for name, stats in sorted(self._stats.items())}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+# Global registry of query metrics
+query_metrics = QueryMetrics()
+
+
+class QueryTiming:
+    """Handle yielded by timed_query; set ``rows`` once they are fetched."""
+
+    def __init__(self):
+        self.rows: Optional[int] = None
+
+
+# Queries collected by the enclosing capture_queries() block, if any
+_captured: ContextVar[Optional[List[Dict[str, Any]]]] = ContextVar("captured_queries", default=None)
+
+
+@contextmanager
+def capture_queries() -> Iterator[List[Dict[str, Any]]]:
+    """Collect the name, SQL and parameters of the queries run in this block."""
+    captured: List[Dict[str, Any]] = []
+    token = _captured.set(captured)
+    try:
+        yield captured
+    finally:
+        _captured.reset(token)
+
+
+def capturing() -> bool:
+    """Whether queries are being captured (result caches are then bypassed)."""
+    return _captured.get() is not None
+
+
+def caller_name(depth: int = 1) -> str:
+    """Qualified name of the function ``depth`` frames above the caller."""
+    code = sys._getframe(depth + 1).f_code
+    return code.co_qualname
+
+
+def _log_text(value: Any) -> str:
+    text = re.sub(r"\s+", " ", str(value)).strip()
+    if len(text) > SLOW_LOG_MAX_CHARS:
+        return f"{text[:SLOW_LOG_MAX_CHARS]}..."
+    return text
+
+
+@contextmanager
+def timed_query(name: str, query: str, params: Optional[list] = None) -> Iterator[QueryTiming]:
+    """Time the query run in this block and record it under ``name``.
+
+    Errors raised in the block are counted and re-raised. Slow queries are
+    logged with their SQL and parameters.
+    """
+    captured = _captured.get()
+    if captured is not None:
+        captured.append({"name": name, "sql": query, "params": list(params or [])})
+
+    timing = QueryTiming()
+    error = False
+    started = time.perf_counter()
+    try:
+        yield timing
+    except BaseException:
+        error = True
+        raise
+    finally:
+        seconds = time.perf_counter() - started
+        threshold = get_settings().slow_query_seconds
+        slow = threshold > 0 and seconds >= threshold
+        query_metrics.record(name, seconds, timing.rows, error, slow)
+        if slow:
+            slow_logger.warning(
+                f"Slow query {name} took {seconds:.3f}s"
+                f" (rows={timing.rows}, error={error}):"
+                f" {_log_text(query)} params={_log_text(params or [])}"
+            )
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, Any]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _format_value(value: Any) -> str:
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value))
+
+
+class _Family:
+    """One metric family: HELP/TYPE lines and its samples."""
+
+    def __init__(self, name: str, kind: str, help_text: str):
+        self.name = name
+        self.kind = kind
+        self.help_text = help_text
+        self.samples: List[Tuple[str, Dict[str, Any], Any]] = []
+
+    def add(self, value: Any, suffix: str = "", **labels: Any) -> None:
+        self.samples.append((suffix, labels, value))
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, labels, value in self.samples:
+            lines.append(f"{self.name}{suffix}{_format_labels(labels)} {_format_value(value)}")
+        return lines
+
+
+def _query_families() -> List[_Family]:
+    duration = _Family(
+        "maude_db_query_duration_seconds", "histogram", "Database query latency by query name."
+    )
+    rows = _Family("maude_db_query_rows_total", "counter", "Rows returned by query name.")
+    errors = _Family("maude_db_query_errors_total", "counter", "Failed queries by query name.")
+    slow = _Family(
+        "maude_db_slow_queries_total", "counter", "Queries at or above the slow-query threshold."
+    )
+    for name, stats in query_metrics.stats().items():
+        for bound, count in stats["buckets"].items():
+            duration.add(count, "_bucket", query=name, le=repr(bound))
+        duration.add(stats["count"], "_bucket", query=name, le="+Inf")
+        duration.add(stats["seconds_total"], "_sum", query=name)
+        duration.add(stats["count"], "_count", query=name)
+        rows.add(stats["rows_total"], query=name)
+        errors.add(stats["errors"], query=name)
+        slow.add(stats["slow"], query=name)
+    return [duration, rows, errors, slow]
+
+
+def _pool_families() -> List[_Family]:
+    from api.services.database import get_db
+
+    stats = get_db().pool_stats()
+    families = []
+    for key, kind, help_text in (
+        ("size", "gauge", "Maximum cursors in the pool."),
+        ("in_use", "gauge", "Cursors checked out."),
+        ("idle", "gauge", "Idle cursors."),
+        ("checkouts", "counter", "Cursor checkouts."),
+        ("waits", "counter", "Checkouts that waited for a free cursor."),
+        ("timeouts", "counter", "Checkouts that timed out."),
+        ("wait_seconds_total", "counter", "Seconds spent waiting for cursors."),
+    ):
+        if key in stats:
+            name = key if kind == "gauge" or key.endswith("_total") else f"{key}_total"
+            family = _Family(f"maude_db_pool_{name}", kind, help_text)
+            family.add(stats[key])
+            families.append(family)
+    return families
+
+
+def _executor_families() -> List[_Family]:
+    from api.services.executor import executor_stats
+
+    families = {
+        key: _Family(f"maude_executor_{name}", kind, help_text)
+        for key, name, kind, help_text in (
+            ("max_workers", "max_workers", "gauge", "Worker threads per workload."),
+            ("active", "active", "gauge", "Tasks running per workload."),
+            ("queued", "queued", "gauge", "Tasks waiting for a worker per workload."),
+            ("completed", "completed_total", "counter", "Tasks completed per workload."),
+            ("failed", "failed_total", "counter", "Tasks failed per workload."),
+            ("queue_seconds_total", "queue_seconds_total", "counter", "Seconds tasks waited for a worker."),
+        )
+    }
+    for workload, stats in executor_stats().items():
+        for key, family in families.items():
+            family.add(stats[key], workload=workload)
+    return list(families.values())
+
+
+def _cache_families() -> List[_Family]:
+    from api.services.cache import get_cache_stats
+
+    families = {
+        key: _Family(f"maude_cache_{name}", kind, help_text)
+        for key, name, kind, help_text in (
+            ("size", "entries", "gauge", "Entries per result cache."),
+            ("hits", "hits_total", "counter", "Result cache hits."),
+            ("misses", "misses_total", "counter", "Result cache misses."),
+        )
+    }
+    for cache, stats in get_cache_stats().items():
+        for key, family in families.items():
+            family.add(stats[key], cache=cache)
+    return list(families.values())
+
+
+def render_prometheus() -> str:
+    """Query, pool, executor and cache metrics in Prometheus text format."""
+    lines = []
+    for family in (
+        _query_families() + _pool_families() + _executor_families() + _cache_families()
+    ):
+        lines.extend(family.render())
+    return "\n".join(lines) + "\n"
@@ -4,16 +4,41 @@ from typing import Optional
 from datetime import date
 
 from api.services.database import get_db
+from api.services.cache import (
+    cached,
+    count_cache,
+    manufacturer_cache,
+    product_code_cache,
+    stats_cache,
+    trends_cache,
+)
 from api.services.filters import (
     build_filter_clause,
     build_extended_filter_clause,
     build_count_query,
+    build_keyset_query,
     build_paginated_query,
+    encode_cursor,
+    normalize_device_filters,
+    normalize_filter_values,
     DeviceFilters,
+    EVENT_ORDER,
 )
 from api.services.query_builder import SchemaAwareQueryBuilder
 from config.unified_schema import EVENT_TYPES, get_schema_registry
 
+# How event listings count their total (see QueryService.count_events)
+COUNT_MODES = ("exact", "estimate", "none")
+
+# Tables smaller than this are counted exactly even when an estimate is asked for
+ESTIMATE_MIN_ROWS = 1_000_000
+
+# Percentage of master_events blocks scanned for an estimate
+COUNT_SAMPLE_PERCENT = 10
+
+# Fewer matches in the sample than this are too few to scale; count exactly
+ESTIMATE_MIN_MATCHES = 100
+
 
 class QueryService:
     """Service for executing common queries."""
@@ -21,6 +46,7 @@ class QueryService:
     def __init__(self):
         self.db = get_db()
 
+    @cached(stats_cache, "event_stats")
     def get_event_stats(
         self,
         manufacturers: Optional[list[str]] = None,
@@ -81,7 +107,7 @@ class QueryService:
             "other": result[4],
         }
 
-    def get_events(
+    def events_query(
         self,
         manufacturers: Optional[list[str]] = None,
         product_codes: Optional[list[str]] = None,
@@ -91,12 +117,22 @@ class QueryService:
         search_text: Optional[str] = None,
         device_filters: Optional[DeviceFilters] = None,
         page: int = 1,
-        page_size: int = 50,
-    ) -> dict:
-        """Get paginated list of events.
+        page_size: Optional[int] = 50,
+        cursor: Optional[str] = None,
+    ) -> tuple[str, list, str, list]:
+        """Build the event list queries.
+
+        Events are ordered by EVENT_ORDER. With a cursor (see encode_cursor)
+        the page is the page_size events after it (keyset pagination) and
+        ``page`` is ignored; otherwise it is the page'th page (offset
+        pagination). A page_size of None selects every matching event (for
+        exports).
 
         Returns:
-            Dictionary with events list and pagination info.
+            Tuple of (page query, its parameters, count query, its parameters).
+
+        Raises:
+            ValueError: If the cursor is malformed.
         """
         where_clause, params = build_extended_filter_clause(
             manufacturers=manufacturers,
@@ -108,30 +144,182 @@ class QueryService:
             device_filters=device_filters,
         )
 
-        # Get total count
         count_query = build_count_query(where_clause=where_clause)
-        total = self.db.fetch_one(count_query, params)[0]
-
-        # Get paginated results
         select_clause = """
             m.mdr_report_key,
             m.report_number,
             m.date_received,
             m.date_of_event,
             m.event_type,
-            m.manufacturer_clean,
+            m.manufacturer_clean AS manufacturer,
             m.product_code,
             m.manufacturer_name
         """
+        if cursor is not None:
+            events_query, seek_params = build_keyset_query(
+                select_clause=select_clause,
+                where_clause=where_clause,
+                cursor=cursor,
+                page_size=page_size,
+            )
+            return events_query, params + seek_params, count_query, params
+
         events_query = build_paginated_query(
             select_clause=select_clause,
             where_clause=where_clause,
+            order_by=EVENT_ORDER,
             page=page,
             page_size=page_size,
         )
+        return events_query, params, count_query, params
+
+    def count_events(
+        self,
+        manufacturers: Optional[list[str]] = None,
+        product_codes: Optional[list[str]] = None,
+        event_types: Optional[list[str]] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        search_text: Optional[str] = None,
+        device_filters: Optional[DeviceFilters] = None,
+        count_mode: str = "exact",
+    ) -> dict:
+        """Count the events matching a filter set.
 
+        Counts are cached per normalized filter set (see
+        normalize_filter_values) and data version, so filter lists in any
+        order or with repeats share one entry.
+
+        An estimate scales the matches in a COUNT_SAMPLE_PERCENT block
+        sample of master_events to the table's size. Unfiltered counts,
+        tables under ESTIMATE_MIN_ROWS and samples with fewer than
+        ESTIMATE_MIN_MATCHES matches are counted exactly instead.
+
+        Returns:
+            Dictionary with total and the count_mode actually used.
+        """
+        return self._count_events(
+            manufacturers=normalize_filter_values(manufacturers),
+            product_codes=normalize_filter_values(product_codes),
+            event_types=normalize_filter_values(event_types),
+            date_from=date_from,
+            date_to=date_to,
+            search_text=search_text or None,
+            device_filters=normalize_device_filters(device_filters),
+            count_mode=count_mode,
+        )
+
+    @cached(count_cache, "event_count")
+    def _count_events(
+        self,
+        manufacturers: Optional[list[str]],
+        product_codes: Optional[list[str]],
+        event_types: Optional[list[str]],
+        date_from: Optional[date],
+        date_to: Optional[date],
+        search_text: Optional[str],
+        device_filters: Optional[DeviceFilters],
+        count_mode: str,
+    ) -> dict:
+        where_clause, params = build_extended_filter_clause(
+            manufacturers=manufacturers,
+            product_codes=product_codes,
+            event_types=event_types,
+            date_from=date_from,
+            date_to=date_to,
+            search_text=search_text,
+            device_filters=device_filters,
+        )
+
+        if count_mode == "estimate" and where_clause != "1=1":
+            table_rows = self.db.fetch_one("SELECT COUNT(*) FROM master_events")[0]
+            if table_rows >= ESTIMATE_MIN_ROWS:
+                matched, sampled = self.db.fetch_one(f"""
+                    SELECT COUNT(*) FILTER (WHERE {where_clause}), COUNT(*)
+                    FROM master_events m
+                    TABLESAMPLE {COUNT_SAMPLE_PERCENT}% (system, 42)
+                """, params)
+                if matched >= ESTIMATE_MIN_MATCHES:
+                    return {
+                        "total": round(matched * table_rows / sampled),
+                        "count_mode": "estimate",
+                    }
+
+        total = self.db.fetch_one(build_count_query(where_clause=where_clause), params)[0]
+        return {"total": total, "count_mode": "exact"}
+
+    def get_events(
+        self,
+        manufacturers: Optional[list[str]] = None,
+        product_codes: Optional[list[str]] = None,
+        event_types: Optional[list[str]] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        search_text: Optional[str] = None,
+        device_filters: Optional[DeviceFilters] = None,
+        page: int = 1,
+        page_size: int = 50,
+        cursor: Optional[str] = None,
+        count_mode: Optional[str] = None,
+    ) -> dict:
+        """Get paginated list of events.
+
+        Pages are addressed by number (offset pagination) or, given the
+        ``next_cursor`` of a previous page, by cursor (keyset pagination).
+        Keyset pages cost the same at any depth.
+
+        The total is counted per ``count_mode`` (see count_events), "exact"
+        by default for numbered pages and "none" for cursor pages.
+
+        Returns:
+            Dictionary with events list and pagination info.
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        keyset = cursor is not None
+        if count_mode is None:
+            count_mode = "none" if keyset else "exact"
+        events_query, params, _, _ = self.events_query(
+            manufacturers=manufacturers,
+            product_codes=product_codes,
+            event_types=event_types,
+            date_from=date_from,
+            date_to=date_to,
+            search_text=search_text,
+            device_filters=device_filters,
+            page=page,
+            # One extra row tells whether another keyset page follows
+            page_size=page_size + 1 if keyset else page_size,
+            cursor=cursor,
+        )
+
+        # Get paginated results
         results = self.db.fetch_all(events_query, params)
 
+        total = None
+        if count_mode != "none":
+            counted = self.count_events(
+                manufacturers=manufacturers,
+                product_codes=product_codes,
+                event_types=event_types,
+                date_from=date_from,
+                date_to=date_to,
+                search_text=search_text,
+                device_filters=device_filters,
+                count_mode=count_mode,
+            )
+            total, count_mode = counted["total"], counted["count_mode"]
+
+        if keyset:
+            has_more = len(results) > page_size
+            results = results[:page_size]
+        elif count_mode == "exact":
+            has_more = page * page_size < total
+        else:
+            # Without an exact total a full page is taken to have a successor
+            has_more = len(results) == page_size
+
         events = [
             {
                 "mdr_report_key": row[0],
@@ -146,13 +334,16 @@ class QueryService:
             for row in results
         ]
 
+        last = results[-1] if results else None
         return {
             "events": events,
             "pagination": {
-                "page": page,
+                "page": None if keyset else page,
                 "page_size": page_size,
                 "total": total,
-                "total_pages": (total + page_size - 1) // page_size,
+                "total_pages": None if total is None else (total + page_size - 1) // page_size,
+                "next_cursor": encode_cursor(last[2], last[0]) if has_more and last else None,
+                "count_mode": count_mode,
             },
         }
 
@@ -254,6 +445,7 @@ class QueryService:
             ],
         }
 
+    @cached(manufacturer_cache, "manufacturers")
     def get_manufacturer_list(self, search: Optional[str] = None, limit: int = 100) -> list[dict]:
         """Get list of manufacturers for autocomplete.
 
@@ -291,6 +483,7 @@ class QueryService:
         results = self.db.fetch_all(query, params)
         return [{"name": r[0], "count": r[1]} for r in results]
 
+    @cached(product_code_cache, "product_codes")
     def get_product_code_list(self, search: Optional[str] = None, limit: int = 100) -> list[dict]:
         """Get list of product codes for autocomplete.
 
@@ -329,7 +522,7 @@ class QueryService:
         results = self.db.fetch_all(query, params)
         return [{"code": r[0], "name": r[1], "count": r[2]} for r in results]
 
-    def get_trends(
+    def trends_query(
         self,
         manufacturers: Optional[list[str]] = None,
         product_codes: Optional[list[str]] = None,
@@ -339,8 +532,8 @@ class QueryService:
         group_by: str = "month",
         date_field: str = "date_received",
         device_filters: Optional[DeviceFilters] = None,
-    ) -> list[dict]:
-        """Get event trends over time.
+    ) -> tuple[str, list]:
+        """Build the event trends query.
 
         Args:
             group_by: "day", "month", or "year".
@@ -350,7 +543,8 @@ class QueryService:
             device_filters: Optional device filters to apply.
 
         Returns:
-            List of time periods with counts.
+            Tuple of (query, parameters); columns period, total, deaths,
+            injuries, malfunctions.
         """
         # Validate date_field
         if date_field not in ("date_received", "date_of_event"):
@@ -412,7 +606,37 @@ class QueryService:
         builder._group_by.append(date_expr_full)
         builder._order_by.append("period ASC")
 
-        query, params = builder.build()
+        return builder.build()
+
+    @cached(trends_cache, "trends")
+    def get_trends(
+        self,
+        manufacturers: Optional[list[str]] = None,
+        product_codes: Optional[list[str]] = None,
+        event_types: Optional[list[str]] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        group_by: str = "month",
+        date_field: str = "date_received",
+        device_filters: Optional[DeviceFilters] = None,
+    ) -> list[dict]:
+        """Get event trends over time.
+
+        See trends_query for the arguments.
+
+        Returns:
+            List of time periods with counts.
+        """
+        query, params = self.trends_query(
+            manufacturers=manufacturers,
+            product_codes=product_codes,
+            event_types=event_types,
+            date_from=date_from,
+            date_to=date_to,
+            group_by=group_by,
+            date_field=date_field,
+            device_filters=device_filters,
+        )
         results = self.db.fetch_all(query, params)
         return [
             {
@@ -425,6 +649,7 @@ class QueryService:
             for r in results
         ]
 
+    @cached(trends_cache, "manufacturer_comparison")
     def get_manufacturer_comparison(
         self,
         manufacturers: list[str],
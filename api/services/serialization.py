@@ -0,0 +1,99 @@
+"""Fast JSON responses for large result payloads.
+
+By default FastAPI validates an endpoint's return value against its
+``response_model``, passes it through ``jsonable_encoder`` and then
+``json.dumps``, which is slow for lists of thousands of models. Results
+built by our own query services are already well formed, so endpoints
+returning large payloads are decorated with ``fast_json``: the result is
+rendered straight to bytes with orjson (or the standard library when orjson
+is not installed) and returned as a ``FastJSONResponse``, which FastAPI
+sends as is. The ``response_model`` still documents the endpoint.
+
+``fast_json`` sits under ``db_endpoint`` so rendering happens on the
+workload's executor thread, not on the event loop, and above ``cached`` so
+the cache keeps results rather than responses:
+
+    @router.get("/trends", response_model=list[TrendData])
+    @db_endpoint("heavy")
+    @fast_json
+    def get_trends(...):
+        ...
+
+Set MAUDE_FAST_JSON=false to fall back to FastAPI's default serialization.
+"""
+
+import dataclasses
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from functools import wraps
+from typing import Any, Callable
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+from starlette.responses import Response
+
+from api.config import get_settings
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _default(obj: Any) -> Any:
+    """Convert values orjson does not serialize natively."""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    if isinstance(obj, (datetime, date, time)):
+        # pandas.Timestamp and other subclasses orjson rejects
+        return obj.isoformat()
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def render_json(content: Any) -> bytes:
+    """Serialize content to compact UTF-8 JSON bytes."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(
+            content,
+            default=_default,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+        )
+    return json.dumps(
+        jsonable_encoder(content),
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+class FastJSONResponse(Response):
+    """JSON response rendered with ``render_json``."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return render_json(content)
+
+
+def fast_json(func: Callable) -> Callable:
+    """Return the endpoint's result as a pre-rendered FastJSONResponse.
+
+    Skips FastAPI's response_model validation and encoding, so only use it
+    on results built by our own services.
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        result = func(*args, **kwargs)
+        if isinstance(result, Response) or not get_settings().fast_json:
+            return result
+        return FastJSONResponse(result)
+
+    return wrapper
@@ -0,0 +1,204 @@
+"""Background cache warming for hot dashboard queries.
+
+After startup and after every successful refresh, the requests in the
+warm-up list are replayed against the app in-process, one at a time, so
+DuckDB's buffers and the result caches hold the new data version before
+users arrive. Going through the app means warmed entries have exactly the
+cache keys real requests for the same URLs use.
+
+The list defaults to DEFAULT_WARMUP_REQUESTS and can be replaced with a
+JSON file (settings.warmup_file) of the same shape:
+
+    [{"path": "/api/analytics/trends", "params": {"group_by": "year"}}, ...]
+
+Warming runs as a task on the app's event loop and never delays startup.
+Starting a new run (after a refresh) stops the one in progress between
+requests, never by cancelling one mid-flight: a cancelled request would
+leave its worker thread running on a cursor the request already returned.
+Progress is reported by ``cache_warmer.status()`` (shown on
+/api/admin/status).
+"""
+
+import asyncio
+import json
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from api.config import get_settings
+from config.logging_config import get_logger
+
+logger = get_logger("cache_warmup")
+
+DEFAULT_WARMUP_REQUESTS = [
+    {"path": "/api/events/stats", "params": {}},
+    {"path": "/api/analytics/trends", "params": {}},
+    {"path": "/api/analytics/trends", "params": {"group_by": "year"}},
+    {"path": "/api/events", "params": {}},
+    {"path": "/api/events/manufacturers", "params": {}},
+    {"path": "/api/events/product-codes", "params": {}},
+    {"path": "/api/filters/brand-names", "params": {}},
+    {"path": "/api/filters/generic-names", "params": {}},
+    {"path": "/api/filters/device-manufacturers", "params": {}},
+    {"path": "/api/filters/model-numbers", "params": {}},
+    {"path": "/api/filters/device-product-codes", "params": {}},
+]
+
+# Failed requests listed in the status
+MAX_ERRORS = 20
+
+
+def load_warmup_requests() -> List[Dict[str, Any]]:
+    """The warm-up list: settings.warmup_file if set, else the defaults.
+
+    Entries without an /api/ path are skipped; an unreadable file warms
+    nothing (and is logged).
+    """
+    path = get_settings().warmup_file
+    if not path:
+        return DEFAULT_WARMUP_REQUESTS
+
+    try:
+        with open(path) as f:
+            entries = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.error(f"Could not read warm-up list {path}: {e}")
+        return []
+
+    requests = []
+    for entry in entries:
+        if not isinstance(entry, dict) or not str(entry.get("path", "")).startswith("/api/"):
+            logger.warning(f"Skipping warm-up entry {entry!r}: expected an /api/ path")
+            continue
+        requests.append({"path": entry["path"], "params": entry.get("params") or {}})
+    return requests
+
+
+class CacheWarmer:
+    """Replays the warm-up list in the background and tracks its progress."""
+
+    def __init__(self):
+        self._app = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stop: Optional[asyncio.Event] = None
+        self._lock = threading.Lock()
+        self._status: Dict[str, Any] = {"state": "idle"}
+
+    def status(self) -> Dict[str, Any]:
+        """State (idle, running, completed, cancelled), request counts and errors."""
+        with self._lock:
+            status = dict(self._status)
+            if "errors" in status:
+                status["errors"] = list(status["errors"])
+            return status
+
+    def _update(self, **changes: Any) -> None:
+        with self._lock:
+            self._status.update(changes)
+
+    def start(self, app, reason: str) -> None:
+        """Start warming on the running event loop, stopping any run in progress.
+
+        Does nothing when settings.warmup_enabled is off.
+
+        Args:
+            app: ASGI app the requests are replayed against.
+            reason: Why warming runs ("startup", "refresh"), for the status.
+        """
+        if not get_settings().warmup_enabled:
+            return
+        self._app = app
+        self._loop = asyncio.get_running_loop()
+        previous = self._task
+        if self._stop is not None:
+            self._stop.set()
+        self._stop = asyncio.Event()
+        self._task = self._loop.create_task(self._run(reason, self._stop, previous))
+
+    def start_threadsafe(self, reason: str) -> None:
+        """start() from another thread, on the loop of the previous start().
+
+        Does nothing if warming never started (disabled, or no app running).
+        """
+        if self._loop is None or self._loop.is_closed():
+            return
+        self._loop.call_soon_threadsafe(self.start, self._app, reason)
+
+    async def stop(self) -> None:
+        """Stop a run in progress after its current request and wait for it."""
+        task, self._task = self._task, None
+        if self._stop is not None:
+            self._stop.set()
+        if task is not None and not task.done():
+            await asyncio.wait([task])
+
+    async def _run(
+        self, reason: str, stop: asyncio.Event, previous: Optional[asyncio.Task]
+    ) -> None:
+        if previous is not None and not previous.done():
+            # Let the stopped run finish its in-flight request first
+            await asyncio.wait([previous])
+
+        requests = load_warmup_requests()
+        started = datetime.now()
+        with self._lock:
+            self._status = {
+                "state": "running",
+                "reason": reason,
+                "total": len(requests),
+                "completed": 0,
+                "failed": 0,
+                "started_at": started.isoformat(),
+                "finished_at": None,
+                "errors": [],
+            }
+        logger.info(f"Warming {len(requests)} queries ({reason})")
+
+        try:
+            transport = httpx.ASGITransport(app=self._app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://warmup") as client:
+                for request in requests:
+                    if stop.is_set():
+                        self._update(state="cancelled", finished_at=datetime.now().isoformat())
+                        logger.info(f"Warm-up stopped ({reason})")
+                        return
+                    await self._warm(client, request)
+        except asyncio.CancelledError:
+            self._update(state="cancelled", finished_at=datetime.now().isoformat())
+            raise
+
+        finished = datetime.now()
+        self._update(state="completed", finished_at=finished.isoformat())
+        status = self.status()
+        logger.info(
+            f"Warmed {status['completed']}/{status['total']} queries in "
+            f"{(finished - started).total_seconds():.1f}s ({reason})"
+        )
+
+    async def _warm(self, client: httpx.AsyncClient, request: Dict[str, Any]) -> None:
+        path = request["path"]
+        try:
+            response = await client.get(
+                path, params=request["params"], headers={"Accept-Encoding": "identity"}
+            )
+            error = f"HTTP {response.status_code}" if response.status_code >= 400 else None
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            error = str(e)
+
+        with self._lock:
+            if error is None:
+                self._status["completed"] += 1
+                return
+            self._status["failed"] += 1
+            if len(self._status["errors"]) < MAX_ERRORS:
+                self._status["errors"].append(f"{path}: {error}")
+        logger.warning(f"Warm-up request {path} failed: {error}")
+
+
+# Global warmer
+cache_warmer = CacheWarmer()
@@ -46,6 +46,23 @@ class APIConfig:
 
     max_results_per_call: int = 1000
     max_total_results: int = 25000
+    max_workers: int = field(
+        default_factory=lambda: int(os.getenv("OPENFDA_WORKERS", "4"))
+    )
+    cache_enabled: bool = field(
+        default_factory=lambda: os.getenv("OPENFDA_CACHE_ENABLED", "true").lower() == "true"
+    )
+    cache_path: Path = field(
+        default_factory=lambda: Path(
+            os.getenv("OPENFDA_CACHE_PATH", str(PROJECT_ROOT / "data" / "cache" / "openfda.sqlite"))
+        )
+    )
+    cache_ttl: int = field(
+        default_factory=lambda: int(os.getenv("OPENFDA_CACHE_TTL_SECONDS", "86400"))
+    )
+    cache_max_mb: int = field(
+        default_factory=lambda: int(os.getenv("OPENFDA_CACHE_MAX_MB", "256"))
+    )
 
 
 @dataclass
@@ -68,6 +85,14 @@ class DataConfig:
     exports_path: Path = field(
         default_factory=lambda: PROJECT_ROOT / "data" / "exports"
     )
+    fda_download_base: str = field(
+        default_factory=lambda: os.getenv(
+            "FDA_DOWNLOAD_BASE", "https://www.accessdata.fda.gov/MAUDE/ftparea/"
+        ).rstrip("/") + "/"
+    )
+    download_workers: int = field(
+        default_factory=lambda: int(os.getenv("DOWNLOAD_WORKERS", "4"))
+    )
 
 
 @dataclass
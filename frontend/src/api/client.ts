@@ -95,6 +95,8 @@ export interface PaginationInfo {
   page_size: number
   total: number
   total_pages: number
+  next_cursor?: string | null
+  count_mode?: 'exact' | 'estimate' | 'none'
 }
 
 export interface EventListResponse {
@@ -129,6 +131,17 @@ export interface ProductCodeItem {
   count: number
 }
 
+export interface WarmupStatus {
+  state: 'idle' | 'running' | 'completed' | 'cancelled'
+  reason: 'startup' | 'refresh' | null
+  total: number
+  completed: number
+  failed: number
+  started_at: string | null
+  finished_at: string | null
+  errors: string[]
+}
+
 export interface DatabaseStatus {
   total_events: number
   total_devices: number
@@ -137,6 +150,7 @@ export interface DatabaseStatus {
   date_range_start: string | null
   date_range_end: string | null
   last_refresh: string | null
+  warmup?: WarmupStatus | null
 }
 
 function buildQueryString(filters: EventFilters): string {
@@ -0,0 +1,185 @@
+#!/usr/bin/env python
+"""
+Middleware overhead benchmark: pure ASGI vs BaseHTTPMiddleware.
+
+Sends requests to /api/health in-process (httpx over ASGI, no network)
+through the app's current middleware (ResponseHeadersMiddleware and
+CompressionMiddleware, both pure ASGI) and through the stack it replaced:
+the same headers set by four BaseHTTPMiddleware classes, each of which runs
+the rest of the app in a separate task and relays the body through a
+memory stream. Reports requests per second for both.
+
+Usage:
+    python scripts/benchmark_middleware.py [options]
+
+Options:
+    --requests N        Requests per run (default 5000)
+    --concurrency N     Requests in flight at once (default 32)
+    --path PATH         Path to request (default /api/health)
+    --repeat N          Timed runs per stack, best is reported (default 3)
+    --json              Output in JSON format
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import duckdb
+import httpx
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+from starlette.middleware import Middleware
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import Response
+
+import api.services.database as database
+from api.main import app, settings
+from api.middleware.compression import choose_encoding
+from api.middleware.etag import ETAG_PATHS, etag_matches, make_etag
+from api.middleware.headers import cache_control
+from api.services.database import DatabaseService
+from config.unified_schema import SCHEMA_VERSION
+from src.database.schema import initialize_database
+
+
+class LegacySchemaVersionMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        response = await call_next(request)
+        response.headers["X-Schema-Version"] = SCHEMA_VERSION
+        return response
+
+
+class LegacyETagMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        path = request.url.path
+        if request.method != "GET" or not path.startswith(ETAG_PATHS):
+            return await call_next(request)
+        etag = make_etag(
+            database.get_db().data_version, path, request.query_params,
+            request.headers.get("accept", ""),
+        )
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers={"ETag": etag})
+        response = await call_next(request)
+        if response.status_code == 200:
+            response.headers["ETag"] = etag
+        return response
+
+
+class LegacyCacheHeaderMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        response = await call_next(request)
+        if request.method == "GET":
+            response.headers["Cache-Control"] = cache_control(request.url.path)
+        return response
+
+
+class LegacyCompressionMiddleware(BaseHTTPMiddleware):
+    """Passes small responses (like /api/health) through, as before."""
+
+    async def dispatch(self, request, call_next):
+        response = await call_next(request)
+        choose_encoding(request.headers.get("accept-encoding", ""))
+        return response
+
+
+def build_legacy_app() -> FastAPI:
+    """The app's routes behind the BaseHTTPMiddleware stack."""
+    legacy = FastAPI()
+    legacy.router = app.router
+    legacy.exception_handlers = dict(app.exception_handlers)
+    # Outermost first, as in app.user_middleware
+    legacy.user_middleware = [
+        Middleware(CORSMiddleware, allow_origins=settings.cors_origins, allow_credentials=True,
+                   allow_methods=["*"], allow_headers=["*"]),
+        Middleware(LegacyCompressionMiddleware),
+        Middleware(LegacyCacheHeaderMiddleware),
+        Middleware(LegacyETagMiddleware),
+        Middleware(LegacySchemaVersionMiddleware),
+    ]
+    return legacy
+
+
+def build_database(path: Path) -> None:
+    conn = duckdb.connect(str(path))
+    initialize_database(conn)
+    conn.execute("""
+        INSERT INTO master_events (mdr_report_key, event_type)
+        SELECT CAST(i AS VARCHAR), 'M' FROM range(10000) t(i)
+    """)
+    conn.close()
+
+
+async def requests_per_second(asgi_app, path: str, requests: int, concurrency: int) -> float:
+    transport = httpx.ASGITransport(app=asgi_app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        remaining = iter(range(requests))
+
+        async def worker():
+            for _ in remaining:
+                response = await client.get(path, headers={"Accept-Encoding": "gzip"})
+                response.raise_for_status()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return requests / (time.perf_counter() - started)
+
+
+def run(path: str, requests: int, concurrency: int, repeat: int) -> Dict[str, Any]:
+    stacks = {"base_http_middleware": build_legacy_app(), "pure_asgi": app}
+    results = {}
+    for name, asgi_app in stacks.items():
+        # Warm up connections, executors and caches
+        asyncio.run(requests_per_second(asgi_app, path, min(requests, 200), concurrency))
+        results[name] = round(max(
+            asyncio.run(requests_per_second(asgi_app, path, requests, concurrency))
+            for _ in range(repeat)
+        ), 1)
+    results["speedup"] = round(results["pure_asgi"] / results["base_http_middleware"], 2)
+    return results
+
+
+def print_results(path: str, requests: int, concurrency: int, results: Dict[str, Any]) -> None:
+    print(f"GET {path}: {requests:,} requests, {concurrency} concurrent")
+    print()
+    print(f"{'Stack':<24} {'Requests/s':>12}")
+    print("-" * 37)
+    print(f"{'BaseHTTPMiddleware':<24} {results['base_http_middleware']:>12,.1f}")
+    print(f"{'Pure ASGI':<24} {results['pure_asgi']:>12,.1f}")
+    print()
+    print(f"Speedup: {results['speedup']:.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark middleware overhead")
+    parser.add_argument("--requests", type=int, default=5000, help="Requests per run")
+    parser.add_argument("--concurrency", type=int, default=32, help="Requests in flight")
+    parser.add_argument("--path", default="/api/health", help="Path to request")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per stack")
+    parser.add_argument("--json", action="store_true", help="Output in JSON format")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "maude.duckdb"
+        build_database(path)
+        database._db_service = DatabaseService(db_path=path)
+        try:
+            results = run(args.path, args.requests, args.concurrency, args.repeat)
+        finally:
+            database.close_db()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_results(args.path, args.requests, args.concurrency, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+"""
+Events list pagination benchmark: offset vs keyset (cursor) pages.
+
+Builds a synthetic database and times QueryService.get_events for page N
+in both modes. Offset pages make DuckDB produce and discard every earlier
+row and re-count the filtered set, so their latency grows with N; keyset
+pages seek past the cursor and should stay flat.
+
+Usage:
+    python scripts/benchmark_pagination.py [options]
+
+Options:
+    --rows N            Events in the synthetic database (default 2000000)
+    --page-size N       Events per page (default 50)
+    --pages N [N ...]   Page numbers to time (default 1 10 100 1000 10000)
+    --repeat N          Timed runs per page, best is reported (default 5)
+    --json              Output in JSON format
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import duckdb
+
+from api.services.database import DatabaseService
+from api.services.filters import EVENT_ORDER, encode_cursor
+from api.services.queries import QueryService
+from src.database.schema import initialize_database
+
+
+def build_database(path: Path, rows: int) -> None:
+    """Synthetic master_events: ~25 years of reports, four event types."""
+    conn = duckdb.connect(str(path))
+    initialize_database(conn)
+    conn.execute(f"""
+        INSERT INTO master_events (
+            mdr_report_key, report_number, date_received, event_type,
+            manufacturer_clean, product_code
+        )
+        SELECT CAST(i AS VARCHAR), 'RPT-' || i,
+               DATE '2000-01-01' + CAST(i * 9000 // {rows} AS INTEGER),
+               ['D', 'IN', 'M', 'O'][i % 4 + 1], 'MANUFACTURER ' || (i % 500), 'LGW'
+        FROM range({rows}) t(i)
+    """)
+    conn.close()
+
+
+def best_of(repeat: int, func: Callable) -> float:
+    """Best wall time in milliseconds over ``repeat`` runs."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return min(timings)
+
+
+def cursor_before_page(db: DatabaseService, page: int, page_size: int) -> str:
+    """Cursor a client following next_cursor would hold for ``page``."""
+    if page == 1:
+        return None
+    row = db.fetch_one(f"""
+        SELECT m.date_received, m.mdr_report_key FROM master_events m
+        ORDER BY {EVENT_ORDER} LIMIT 1 OFFSET {(page - 1) * page_size - 1}
+    """)
+    return encode_cursor(row[0], row[1])
+
+
+def run(db: DatabaseService, pages: List[int], page_size: int, repeat: int) -> List[Dict[str, Any]]:
+    query_service = QueryService()
+    query_service.db = db
+    results = []
+    for page in pages:
+        cursor = cursor_before_page(db, page, page_size)
+
+        def offset_page():
+            return query_service.get_events(page=page, page_size=page_size)
+
+        def keyset_page():
+            if cursor is None:
+                return query_service.get_events(page=1, page_size=page_size)
+            return query_service.get_events(page_size=page_size, cursor=cursor)
+
+        offset_events = offset_page()["events"]
+        assert offset_events == keyset_page()["events"]
+
+        results.append({
+            "page": page,
+            "offset_ms": round(best_of(repeat, offset_page), 2),
+            "keyset_ms": round(best_of(repeat, keyset_page), 2),
+        })
+    return results
+
+
+def print_results(rows: int, page_size: int, results: List[Dict[str, Any]]) -> None:
+    print(f"{rows:,} events, {page_size} per page")
+    print()
+    print(f"{'Page':>8} {'Offset ms':>10} {'Keyset ms':>10}")
+    print("-" * 30)
+    for r in results:
+        print(f"{r['page']:>8} {r['offset_ms']:>10.2f} {r['keyset_ms']:>10.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark offset vs keyset pagination")
+    parser.add_argument("--rows", type=int, default=2_000_000, help="Events in the database")
+    parser.add_argument("--page-size", type=int, default=50, help="Events per page")
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 10, 100, 1000, 10000],
+                        help="Page numbers to time")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per page")
+    parser.add_argument("--json", action="store_true", help="Output in JSON format")
+    args = parser.parse_args()
+
+    pages = [p for p in args.pages if (p - 1) * args.page_size < args.rows]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "maude.duckdb"
+        build_database(path, args.rows)
+        db = DatabaseService(db_path=path)
+        try:
+            results = run(db, pages, args.page_size, args.repeat)
+        finally:
+            db.close()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_results(args.rows, args.page_size, results)
+
+
+if __name__ == "__main__":
+    main()
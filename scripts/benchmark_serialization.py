@@ -0,0 +1,185 @@
+#!/usr/bin/env python
+"""
+Serialization and compression benchmark for large API payloads.
+
+Builds payloads shaped like the large responses (an events page, daily
+trends, signals, column coverage) and reports, per payload:
+
+  - serialization time with FastAPI's default path (response_model
+    validation, jsonable_encoder, json.dumps) and with the fast path
+    (api.services.serialization.render_json)
+  - bytes on the wire uncompressed, gzipped and (when the brotli package is
+    installed) brotli-compressed, as CompressionMiddleware sends them
+
+Runs in-process; no server or database is needed.
+
+Usage:
+    python scripts/benchmark_serialization.py [options]
+
+Options:
+    --scale N       Multiply payload sizes (default 1)
+    --repeat N      Timed runs per measurement, best is reported (default 5)
+    --json          Output in JSON format
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from api.middleware.compression import BROTLI_AVAILABLE, BrotliCompressor, GzipCompressor
+from api.models.schemas import EventListResponse, EventSummary, PaginationInfo, TrendData
+from api.services.serialization import ORJSON_AVAILABLE, render_json
+
+
+def build_payloads(scale: int) -> Dict[str, tuple]:
+    """Payloads keyed by endpoint, with the response model FastAPI validates against."""
+    events = EventListResponse(
+        events=[
+            EventSummary(
+                mdr_report_key=str(10_000_000 + i),
+                report_number=f"3005099803-2024-{i:05d}",
+                date_received="2024-03-15",
+                date_of_event="2024-02-28",
+                event_type="MDIO"[i % 4],
+                manufacturer="ABBOTT MEDICAL",
+                product_code="LGW",
+                manufacturer_name="Abbott Medical",
+            )
+            for i in range(1000 * scale)
+        ],
+        pagination=PaginationInfo(page=1, page_size=1000 * scale, total=250_000, total_pages=250),
+    )
+    trends = [
+        TrendData(
+            period=f"{2000 + i // 365}-{(i // 31) % 12 + 1:02d}-{i % 28 + 1:02d}",
+            total=i * 7 % 311,
+            deaths=i % 3,
+            injuries=i * 3 % 97,
+            malfunctions=i * 5 % 211,
+        )
+        for i in range(3650 * scale)
+    ]
+    signals = {
+        "lookback_months": 12,
+        "signals": [
+            {
+                "manufacturer": f"MANUFACTURER {i}",
+                "avg_monthly": 12.5 + i,
+                "std_monthly": 3.25,
+                "total_events": 150 + i,
+                "total_deaths": i % 4,
+                "latest_month": 20 + i % 9,
+                "z_score": round(1.7 + i / 1000, 4),
+                "signal_type": "elevated",
+            }
+            for i in range(500 * scale)
+        ],
+    }
+    coverage = {
+        "timestamp": "2024-03-15T12:00:00",
+        "table": "devices",
+        "row_count": 1_000_000,
+        "column_count": 200 * scale,
+        "columns": [
+            {
+                "name": f"column_{i}",
+                "type": "VARCHAR",
+                "non_null_count": 1_000_000 - i * 1000,
+                "null_count": i * 1000,
+                "coverage_pct": round(100 - i / 10, 2),
+                "is_sparse": False,
+                "is_well_populated": True,
+            }
+            for i in range(200 * scale)
+        ],
+    }
+    return {
+        "/api/events": (events, EventListResponse),
+        "/api/analytics/trends": (trends, list[TrendData]),
+        "/api/analytics/signals": (signals, None),
+        "/api/data-quality/column-coverage/{table}": (coverage, None),
+    }
+
+
+def default_render(content: Any, adapter: Optional[TypeAdapter]) -> bytes:
+    """FastAPI's default path: validate against the response model, encode, dump."""
+    data = jsonable_encoder(content)
+    if adapter is not None:
+        data = adapter.dump_python(adapter.validate_python(data), mode="json")
+    return json.dumps(
+        data, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def best_of(repeat: int, func: Callable, *args) -> float:
+    """Best wall time in milliseconds over ``repeat`` runs."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(*args)
+        timings.append((time.perf_counter() - started) * 1000)
+    return min(timings)
+
+
+def compressed_size(compressor_class, body: bytes) -> int:
+    compressor = compressor_class()
+    return len(compressor.compress(body) + compressor.finish())
+
+
+def run(scale: int, repeat: int) -> List[Dict[str, Any]]:
+    results = []
+    for path, (content, response_model) in build_payloads(scale).items():
+        adapter = TypeAdapter(response_model) if response_model is not None else None
+        body = render_json(content)
+        assert json.loads(body) == json.loads(default_render(content, adapter))
+
+        result = {
+            "endpoint": path,
+            "default_ms": round(best_of(repeat, default_render, content, adapter), 2),
+            "fast_ms": round(best_of(repeat, render_json, content), 2),
+            "bytes": len(body),
+            "gzip_bytes": compressed_size(GzipCompressor, body),
+            "br_bytes": compressed_size(BrotliCompressor, body) if BROTLI_AVAILABLE else None,
+        }
+        result["speedup"] = round(result["default_ms"] / max(result["fast_ms"], 1e-3), 1)
+        results.append(result)
+    return results
+
+
+def print_results(results: List[Dict[str, Any]]) -> None:
+    print(f"orjson: {'yes' if ORJSON_AVAILABLE else 'no (stdlib json)'}, "
+          f"brotli: {'yes' if BROTLI_AVAILABLE else 'no'}")
+    print()
+    print(f"{'Endpoint':<44} {'Default ms':>10} {'Fast ms':>8} {'Speedup':>8} "
+          f"{'Bytes':>10} {'Gzip':>9} {'Brotli':>9}")
+    print("-" * 104)
+    for r in results:
+        br = str(r["br_bytes"]) if r["br_bytes"] is not None else "-"
+        print(f"{r['endpoint']:<44} {r['default_ms']:>10.2f} {r['fast_ms']:>8.2f} "
+              f"{r['speedup']:>7.1f}x {r['bytes']:>10} {r['gzip_bytes']:>9} {br:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark API serialization and compression")
+    parser.add_argument("--scale", type=int, default=1, help="Multiply payload sizes")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per measurement")
+    parser.add_argument("--json", action="store_true", help="Output in JSON format")
+    args = parser.parse_args()
+
+    results = run(args.scale, args.repeat)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_results(results)
+
+
+if __name__ == "__main__":
+    main()
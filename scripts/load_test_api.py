@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+"""
+Dashboard load test for the MAUDE Analyzer API.
+
+Replays the requests the dashboard issues on page load against a running
+API server with an increasing number of concurrent users, and reports
+throughput and latency per level plus the server's database pool metrics.
+Throughput should rise with users until the database pool
+(MAUDE_DB_POOL_SIZE) or the CPUs are saturated.
+
+Usage:
+    python scripts/load_test_api.py [options]
+
+Options:
+    --base-url URL      API server (default http://localhost:8000)
+    --users N [N ...]   Concurrency levels (default 1 2 4 8 16)
+    --requests N        Requests per level (default 200)
+    --json              Output in JSON format
+"""
+
+import argparse
+import json
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import cycle, islice
+from typing import Any, Dict, List
+
+import requests
+
+DASHBOARD_PATHS = [
+    "/api/events/stats",
+    "/api/analytics/trends?group_by=month",
+    "/api/analytics/event-type-distribution",
+    "/api/events/manufacturers?limit=20",
+    "/api/events/product-codes?limit=20",
+]
+
+
+def run_level(base_url: str, users: int, total: int) -> Dict[str, Any]:
+    """Issue ``total`` dashboard requests from ``users`` concurrent sessions."""
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_maxsize=users)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    def fetch(path: str) -> tuple:
+        started = time.perf_counter()
+        response = session.get(base_url + path, headers={"Cache-Control": "no-cache"})
+        return time.perf_counter() - started, response.status_code
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=users) as executor:
+        results = list(executor.map(fetch, islice(cycle(DASHBOARD_PATHS), total)))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency for latency, _ in results)
+    return {
+        "users": users,
+        "requests": total,
+        "errors": sum(1 for _, status in results if status != 200),
+        "requests_per_second": round(total / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 1),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 1),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Dashboard load test")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--users", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    base_url = args.base_url.rstrip("/")
+    levels: List[Dict[str, Any]] = [
+        run_level(base_url, users, args.requests) for users in args.users
+    ]
+    pool = requests.get(f"{base_url}/api/admin/db-pool").json()
+
+    if args.json:
+        print(json.dumps({"levels": levels, "db_pool": pool}, indent=2))
+        return 0
+
+    print(f"{'users':>6} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'errors':>7}")
+    for level in levels:
+        print(
+            f"{level['users']:>6} {level['requests_per_second']:>8} {level['p50_ms']:>8} "
+            f"{level['p95_ms']:>8} {level['errors']:>7}"
+        )
+    if pool:
+        print(
+            f"\nDB pool: size {pool['size']}, {pool['checkouts']:,} checkouts, "
+            f"{pool['waits']:,} waited (avg {pool['wait_seconds_avg'] * 1000:.1f} ms, "
+            f"max {pool['wait_seconds_max'] * 1000:.1f} ms), {pool['timeouts']} timed out"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
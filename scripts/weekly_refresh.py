@@ -26,6 +26,7 @@ Options:
     --force             Force re-download even if files unchanged
     --dry-run           Check for updates without downloading
     --all-products      Load all products (not just SCS codes)
+    --full-integrity    Run post-load checks against whole tables (nightly mode)
     --notify            Send notification on completion (requires config)
     --data-dir PATH     Custom data directory
     --db PATH           Custom database path
@@ -53,6 +54,7 @@ from src.ingestion import (
 )
 from src.ingestion.fda_discovery import FDADiscovery, DiscoveryResult
 from src.ingestion.change_processor import ChangeProcessor, process_all_change_files
+from src.ingestion.validation_framework import SCOPE_FILE, SCOPE_FULL
 from scripts.validate_schema import SchemaValidator, format_validation_report
 
 
@@ -113,36 +115,36 @@ def download_files(
 
     files_by_category = discovery_result.by_category()
 
-    for category, files in files_by_category.items():
-        if not files:
-            continue
-
-        logger.info(f"\nDownloading {category.upper()} files...")
-
-        for file_info in files:
-            logger.info(f"  Downloading {file_info.filename}...")
+    # Fetch every category on the downloader's worker pool, then report in order
+    queued = [
+        (category, file_info)
+        for category, files in files_by_category.items()
+        for file_info in files
+    ]
+    logger.info(f"\nDownloading {len(queued)} files ({downloader.max_workers} workers)...")
+    download_results = downloader.download_many(
+        [(file_info.url, file_info.file_type) for _, file_info in queued],
+        force=force,
+    )
 
-            result = downloader._download_file(
-                file_info.url,
-                file_info.file_type,
-                force=force,
+    for (category, file_info), result in zip(queued, download_results):
+        logger.info(f"  {category.upper()} {file_info.filename}")
+        results[category].append(result)
+
+        if result.success:
+            # Mark file as downloaded in discovery state
+            discovery.mark_downloaded(
+                file_info.filename,
+                file_info.last_modified_remote,
+                file_info.size_bytes,
+                etag=file_info.etag,
             )
-
-            results[category].append(result)
-
-            if result.success:
-                # Mark file as downloaded in discovery state
-                discovery.mark_downloaded(
-                    file_info.filename,
-                    file_info.last_modified_remote,
-                    file_info.size_bytes,
-                )
-                logger.info(
-                    f"    Downloaded: {result.size_bytes / 1024 / 1024:.1f} MB, "
-                    f"extracted {len(result.extracted_files)} files"
-                )
-            else:
-                logger.warning(f"    Failed: {result.error}")
+            logger.info(
+                f"    Downloaded: {result.size_bytes / 1024 / 1024:.1f} MB, "
+                f"extracted {len(result.extracted_files)} files"
+            )
+        else:
+            logger.warning(f"    Failed: {result.error}")
 
     return results
 
@@ -151,6 +153,7 @@ def process_change_files(
     data_dir: Path,
     db_path: Path,
     logger,
+    run_id: Optional[int] = None,
 ) -> List[Any]:
     """
     Process CHANGE files (updates to existing records).
@@ -159,6 +162,7 @@ def process_change_files(
         data_dir: Directory containing data files.
         db_path: Path to database.
         logger: Logger instance.
+        run_id: change_log run id of the preceding ADD file load.
 
     Returns:
         List of ChangeResult objects.
@@ -166,7 +170,7 @@ def process_change_files(
     logger.info("\nProcessing CHANGE files...")
 
     with get_connection(db_path) as conn:
-        results = process_all_change_files(data_dir, conn)
+        results = process_all_change_files(data_dir, conn, run_id=run_id)
 
     if results:
         total_updated = sum(r.records_updated for r in results)
@@ -186,6 +190,7 @@ def load_data_files(
     filter_codes: Optional[List[str]],
     logger,
     add_only: bool = True,
+    validation_scope: str = SCOPE_FILE,
 ) -> Dict[str, Any]:
     """
     Load data files (ADD files and optionally current year files).
@@ -196,9 +201,10 @@ def load_data_files(
         filter_codes: Optional list of product codes to filter by (None = all).
         logger: Logger instance.
         add_only: If True, only load ADD files (default). If False, load all files.
+        validation_scope: Post-load validation scope passed to MAUDELoader.
 
     Returns:
-        Dictionary with load statistics.
+        Dictionary with load statistics and the change_log run id.
     """
     if add_only:
         logger.info("\nLoading ADD files only (use --full-refresh to load all)...")
@@ -208,6 +214,7 @@ def load_data_files(
     loader = MAUDELoader(
         db_path=db_path,
         filter_product_codes=filter_codes,
+        validation_scope=validation_scope,
     )
 
     # File patterns to load
@@ -277,6 +284,7 @@ def load_data_files(
         "records_loaded": total_loaded,
         "records_skipped": total_skipped,
         "records_errors": total_errors,
+        "run_id": loader.run_id,
     }
 
 
@@ -549,6 +557,13 @@ def main():
         default=config.database.path,
         help="Custom database path",
     )
+    parser.add_argument(
+        "--base-url",
+        type=str,
+        default=config.data.fda_download_base,
+        help="Base URL of the FDA file area (e.g. a local mirror). "
+             "Default: FDA_DOWNLOAD_BASE or accessdata.fda.gov",
+    )
     parser.add_argument(
         "--log-level",
         choices=["DEBUG", "INFO", "WARNING", "ERROR"],
@@ -567,6 +582,13 @@ def main():
         default=False,
         help="Load all files including historical (use for monthly rebuilds)",
     )
+    parser.add_argument(
+        "--full-integrity",
+        action="store_true",
+        default=False,
+        help="Run post-load integrity checks against whole tables instead of "
+             "just the loaded files (use for nightly runs)",
+    )
 
     args = parser.parse_args()
 
@@ -604,8 +626,11 @@ def main():
 
     try:
         # Initialize components
-        discovery = FDADiscovery(state_file=args.data_dir / ".fda_discovery_state.json")
-        downloader = MAUDEDownloader(output_dir=args.data_dir)
+        discovery = FDADiscovery(
+            state_file=args.data_dir / ".fda_discovery_state.json",
+            base_url=args.base_url,
+        )
+        downloader = MAUDEDownloader(output_dir=args.data_dir, base_url=args.base_url)
 
         # Step 1: Check for updates
         logger.info("\n" + "-" * 40)
@@ -652,6 +677,7 @@ def main():
             filter_codes=filter_codes,
             logger=logger,
             add_only=args.add_only,
+            validation_scope=SCOPE_FULL if args.full_integrity else SCOPE_FILE,
         )
 
         # Step 4: Process CHANGE files (updates to existing records)
@@ -659,7 +685,9 @@ def main():
         logger.info("STEP 4: Processing CHANGE files")
         logger.info("-" * 40)
 
-        change_results = process_change_files(args.data_dir, args.db, logger)
+        change_results = process_change_files(
+            args.data_dir, args.db, logger, run_id=load_results.get("run_id")
+        )
 
         # Step 5: Validate
         if not args.skip_validation:
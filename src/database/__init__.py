@@ -14,6 +14,12 @@ from .schema import (
     get_table_counts,
     drop_all_tables,
 )
+from .change_log import (
+    start_run,
+    record_changes,
+    get_latest_run_id,
+    get_changed_keys,
+)
 from .maintenance import (
     MaintenanceResult,
     vacuum_database,
@@ -27,6 +33,16 @@ from .maintenance import (
     clear_all_data,
     run_full_maintenance,
 )
+from .snapshots import (
+    SnapshotError,
+    resolve_snapshot,
+    create_snapshot,
+    validate_snapshot,
+    publish_snapshot,
+    discard_snapshot,
+    list_snapshots,
+    prune_snapshots,
+)
 
 __all__ = [
     # Connection
@@ -41,6 +57,11 @@ __all__ = [
     "create_all_indexes",
     "get_table_counts",
     "drop_all_tables",
+    # Change log
+    "start_run",
+    "record_changes",
+    "get_latest_run_id",
+    "get_changed_keys",
     # Maintenance
     "MaintenanceResult",
     "vacuum_database",
@@ -53,4 +74,13 @@ __all__ = [
     "get_ingestion_history",
     "clear_all_data",
     "run_full_maintenance",
+    # Snapshots
+    "SnapshotError",
+    "resolve_snapshot",
+    "create_snapshot",
+    "validate_snapshot",
+    "publish_snapshot",
+    "discard_snapshot",
+    "list_snapshots",
+    "prune_snapshots",
 ]
@@ -0,0 +1,198 @@
+"""Change-data-capture log for MAUDE ingestion.
+
+Every load and CHANGE transaction appends one row per MDR key it touched to
+the ``change_log`` table, tagged with a run id drawn from
+``change_log_run_seq``. Downstream consumers (aggregate refreshes, caches,
+derived tables) remember the last run they processed and ask for the keys
+changed since then instead of rescanning whole tables.
+
+The log is append-only: rows are written in the same transaction as the data
+change they describe, so a rolled-back batch leaves no log entries behind.
+"""
+
+from typing import TYPE_CHECKING, List, Optional, Sequence, Union
+import duckdb
+
+from config.logging_config import get_logger
+from .schema import CREATE_CHANGE_LOG
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = get_logger("change_log")
+
+OP_INSERT = "insert"
+OP_UPDATE = "update"
+OP_DELETE = "delete"
+
+# Tables keyed by mdr_report_key whose changes are logged
+TRACKED_TABLES = (
+    "master_events",
+    "devices",
+    "patients",
+    "mdr_text",
+    "device_problems",
+)
+
+RUN_SEQUENCE = "change_log_run_seq"
+
+# Name a DataFrame source is registered under while it is being logged
+_SOURCE_VIEW = "_change_log_source"
+
+
+def ensure_change_log(conn: duckdb.DuckDBPyConnection) -> None:
+    """
+    Create the change_log table and run sequence if they do not exist.
+
+    Args:
+        conn: DuckDB connection.
+    """
+    conn.execute(f"CREATE SEQUENCE IF NOT EXISTS {RUN_SEQUENCE}")
+    conn.execute(CREATE_CHANGE_LOG)
+
+
+def start_run(conn: duckdb.DuckDBPyConnection) -> int:
+    """
+    Allocate a new run id.
+
+    Run ids increase monotonically, so "changed since run N" is simply
+    ``run_id > N``.
+
+    Args:
+        conn: DuckDB connection.
+
+    Returns:
+        The new run id.
+    """
+    ensure_change_log(conn)
+    run_id = conn.execute(f"SELECT nextval('{RUN_SEQUENCE}')").fetchone()[0]
+    logger.debug(f"Started change log run {run_id}")
+    return run_id
+
+
+def record_changes(
+    conn: duckdb.DuckDBPyConnection,
+    run_id: int,
+    table_name: str,
+    source: Union[str, "pd.DataFrame"],
+    operation: Optional[str] = None,
+) -> int:
+    """
+    Append one change_log row per distinct MDR key in ``source``.
+
+    Call this before writing the rows to ``table_name`` and inside the same
+    transaction. When ``operation`` is None, each key is logged as an update
+    if ``table_name`` already holds it and as an insert otherwise.
+
+    ``date_received`` is taken from the source when it has that column and
+    falls back to master_events, so child-table changes are still dated.
+
+    Args:
+        conn: DuckDB connection.
+        run_id: Run id from start_run().
+        table_name: Table the changes are applied to.
+        source: Table name, parenthesized subquery, or DataFrame exposing
+            mdr_report_key (and optionally date_received).
+        operation: OP_INSERT, OP_UPDATE or OP_DELETE; derived when None.
+
+    Returns:
+        Number of change_log rows written.
+    """
+    registered = not isinstance(source, str)
+    if registered:
+        conn.register(_SOURCE_VIEW, source)
+        relation = _SOURCE_VIEW
+    else:
+        relation = source
+
+    try:
+        columns = {
+            d[0] for d in conn.execute(f"SELECT * FROM {relation} src LIMIT 0").description
+        }
+        received = (
+            "TRY_CAST(MAX(src.date_received) AS DATE)"
+            if "date_received" in columns else "NULL::DATE"
+        )
+
+        if operation is None:
+            op_sql = f"""
+                CASE WHEN EXISTS (
+                    SELECT 1 FROM {table_name} t WHERE t.mdr_report_key = k.mdr_report_key
+                ) THEN '{OP_UPDATE}' ELSE '{OP_INSERT}' END
+            """
+            params = [run_id, table_name]
+        else:
+            op_sql = "?"
+            params = [run_id, table_name, operation]
+
+        row = conn.execute(f"""
+            INSERT INTO change_log (run_id, table_name, mdr_report_key, operation, date_received)
+            SELECT ?, ?, k.mdr_report_key, {op_sql},
+                   COALESCE(k.date_received, m.date_received)
+            FROM (
+                SELECT CAST(src.mdr_report_key AS VARCHAR) AS mdr_report_key,
+                       {received} AS date_received
+                FROM {relation} src
+                WHERE src.mdr_report_key IS NOT NULL
+                GROUP BY 1
+            ) k
+            LEFT JOIN master_events m ON m.mdr_report_key = k.mdr_report_key
+        """, params).fetchone()
+        return row[0] if row else 0
+    finally:
+        if registered:
+            conn.unregister(_SOURCE_VIEW)
+
+
+def get_latest_run_id(conn: duckdb.DuckDBPyConnection) -> Optional[int]:
+    """
+    Get the most recent run id that logged any change.
+
+    Args:
+        conn: DuckDB connection.
+
+    Returns:
+        Latest run id, or None if the log is empty or missing.
+    """
+    try:
+        return conn.execute("SELECT MAX(run_id) FROM change_log").fetchone()[0]
+    except duckdb.CatalogException:
+        return None
+
+
+def get_changed_keys(
+    conn: duckdb.DuckDBPyConnection,
+    since_run: int,
+    table_name: Optional[str] = None,
+    operations: Optional[Sequence[str]] = None,
+) -> List[str]:
+    """
+    Get distinct MDR keys changed in runs after ``since_run``.
+
+    Args:
+        conn: DuckDB connection.
+        since_run: Last run id the caller has already processed (0 for all).
+        table_name: Limit to changes in this table.
+        operations: Limit to these operations (e.g. [OP_INSERT]).
+
+    Returns:
+        Sorted list of MDR report keys.
+    """
+    conditions = ["run_id > ?"]
+    params: list = [since_run]
+
+    if table_name:
+        conditions.append("table_name = ?")
+        params.append(table_name)
+
+    if operations:
+        conditions.append(f"operation IN ({', '.join('?' for _ in operations)})")
+        params.extend(operations)
+
+    rows = conn.execute(f"""
+        SELECT DISTINCT mdr_report_key
+        FROM change_log
+        WHERE {" AND ".join(conditions)}
+        ORDER BY mdr_report_key
+    """, params).fetchall()
+    return [r[0] for r in rows]
@@ -713,6 +713,22 @@ CREATE TABLE IF NOT EXISTS download_state (
 )
 """
 
+# Append-only change-data-capture log. One row per MDR key touched by a load
+# or CHANGE transaction; run_id comes from change_log_run_seq so consumers
+# can ask for "keys changed since run N". Rows are appended in run order, so
+# DuckDB's min/max zonemaps prune run_id filters without a separate index.
+CREATE_CHANGE_LOG = """
+CREATE TABLE IF NOT EXISTS change_log (
+    run_id BIGINT NOT NULL,
+    table_name VARCHAR NOT NULL,
+    mdr_report_key VARCHAR NOT NULL,
+    operation VARCHAR NOT NULL CHECK (operation IN ('insert', 'update', 'delete')),
+    date_received DATE,
+
+    logged_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
 # =============================================================================
 # DATA FRESHNESS TRACKING TABLE
 # =============================================================================
@@ -915,6 +931,7 @@ def create_all_tables(conn: duckdb.DuckDBPyConnection) -> None:
         "asr_patient_problems_id_seq",
         "den_reports_id_seq",
         "manufacturer_disclaimers_id_seq",
+        "change_log_run_seq",
     ]
     for seq_name in sequences:
         try:
@@ -941,6 +958,7 @@ def create_all_tables(conn: duckdb.DuckDBPyConnection) -> None:
         ("saved_queries", CREATE_SAVED_QUERIES),
         ("app_settings", CREATE_APP_SETTINGS),
         ("download_state", CREATE_DOWNLOAD_STATE),
+        ("change_log", CREATE_CHANGE_LOG),
         ("data_freshness", CREATE_DATA_FRESHNESS),
         ("daily_aggregates", CREATE_DAILY_AGGREGATES),
         # Audit and quality tracking tables
@@ -1064,6 +1082,7 @@ def drop_all_tables(conn: duckdb.DuckDBPyConnection) -> None:
     """
     tables = [
         "daily_aggregates",
+        "change_log",
         "download_state",
         "app_settings",
         "saved_queries",
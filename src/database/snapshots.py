@@ -0,0 +1,176 @@
+"""Blue/green database snapshots for zero-downtime refreshes.
+
+The database path (``config.database.path``) is either a regular file or a
+symlink to a snapshot file beside it (``maude.<timestamp>.duckdb``). A
+refresh copies the live database to a new snapshot, loads into the copy,
+validates it and publishes it by atomically repointing the symlink, so
+readers never see a half-loaded database. Connections already open keep
+reading their old file until they are closed; each snapshot has its own
+file name, so DuckDB never hands a new connection the old cached instance.
+"""
+
+import os
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+import sys
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from config import config
+from config.logging_config import get_logger
+from src.database.connection import get_connection
+from src.database.schema import get_table_counts
+
+logger = get_logger("snapshots")
+
+# Tables a snapshot must contain to be published
+REQUIRED_TABLES = ("master_events", "devices", "patients", "mdr_text")
+
+
+class SnapshotError(Exception):
+    """A snapshot failed validation or could not be published."""
+
+
+def resolve_snapshot(db_path: Optional[Path] = None) -> Path:
+    """
+    Resolve the database path to the file currently published.
+
+    Args:
+        db_path: Database path (default config.database.path).
+
+    Returns:
+        Absolute path of the live database file.
+    """
+    return Path(db_path or config.database.path).resolve()
+
+
+def create_snapshot(db_path: Optional[Path] = None) -> Path:
+    """
+    Copy the live database to a new snapshot file for loading.
+
+    Args:
+        db_path: Database path (default config.database.path).
+
+    Returns:
+        Path of the new, unpublished snapshot.
+    """
+    db_path = Path(db_path or config.database.path)
+    source = resolve_snapshot(db_path)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+    snapshot = db_path.with_name(f"{db_path.stem}.{timestamp}{db_path.suffix}")
+
+    shutil.copy2(source, snapshot)
+    wal = source.with_name(source.name + ".wal")
+    if wal.exists():
+        shutil.copy2(wal, snapshot.with_name(snapshot.name + ".wal"))
+
+    logger.info(f"Created snapshot {snapshot.name} from {source.name}")
+    return snapshot
+
+
+def validate_snapshot(
+    snapshot: Path,
+    baseline: Optional[Dict[str, int]] = None,
+) -> Dict[str, int]:
+    """
+    Check a loaded snapshot before it is published.
+
+    The snapshot must open, contain REQUIRED_TABLES and not have fewer
+    master_events rows than the baseline.
+
+    Args:
+        snapshot: Snapshot file.
+        baseline: Table counts of the live database.
+
+    Returns:
+        Table counts of the snapshot.
+
+    Raises:
+        SnapshotError: If a check fails.
+    """
+    try:
+        with get_connection(snapshot, read_only=True) as conn:
+            tables = {
+                row[0]
+                for row in conn.execute(
+                    "SELECT table_name FROM information_schema.tables"
+                ).fetchall()
+            }
+            missing = [t for t in REQUIRED_TABLES if t not in tables]
+            if missing:
+                raise SnapshotError(f"Snapshot is missing tables: {', '.join(missing)}")
+            counts = get_table_counts(conn)
+    except SnapshotError:
+        raise
+    except Exception as e:
+        raise SnapshotError(f"Snapshot {snapshot.name} cannot be opened: {e}") from e
+
+    if baseline and counts["master_events"] < baseline.get("master_events", 0):
+        raise SnapshotError(
+            f"Snapshot has {counts['master_events']:,} events, "
+            f"fewer than the live {baseline['master_events']:,}"
+        )
+    return counts
+
+
+def publish_snapshot(snapshot: Path, db_path: Optional[Path] = None) -> Path:
+    """
+    Atomically point the database path at a snapshot.
+
+    Args:
+        snapshot: Validated snapshot in the database directory.
+        db_path: Database path (default config.database.path).
+
+    Returns:
+        The previously published file (already unlinked if it was not a
+        snapshot, but still readable by connections that have it open).
+    """
+    db_path = Path(db_path or config.database.path)
+    if snapshot.parent.resolve() != db_path.parent.resolve():
+        raise SnapshotError("Snapshot must be in the same directory as the database")
+
+    previous = resolve_snapshot(db_path)
+    link = db_path.with_name(f".{db_path.name}.swap")
+    if link.is_symlink() or link.exists():
+        link.unlink()
+    os.symlink(snapshot.name, link)
+    os.replace(link, db_path)
+
+    logger.info(f"Published snapshot {snapshot.name} (was {previous.name})")
+    return previous
+
+
+def list_snapshots(db_path: Optional[Path] = None) -> List[Path]:
+    """Snapshot files of a database, oldest first."""
+    db_path = Path(db_path or config.database.path)
+    return sorted(db_path.parent.glob(f"{db_path.stem}.*_*{db_path.suffix}"))
+
+
+def discard_snapshot(snapshot: Path) -> None:
+    """Delete a snapshot file and its WAL."""
+    for path in (snapshot, snapshot.with_name(snapshot.name + ".wal")):
+        if path.exists():
+            path.unlink()
+
+
+def prune_snapshots(db_path: Optional[Path] = None, keep: int = 2) -> List[Path]:
+    """
+    Delete old snapshots, keeping the live one and the newest others.
+
+    Args:
+        db_path: Database path (default config.database.path).
+        keep: Snapshots to keep, including the live one.
+
+    Returns:
+        Deleted snapshot paths.
+    """
+    live = resolve_snapshot(db_path)
+    others = [s for s in list_snapshots(db_path) if s.resolve() != live]
+    stale = others[: max(0, len(others) - (keep - 1))]
+    for snapshot in stale:
+        discard_snapshot(snapshot)
+        logger.info(f"Deleted old snapshot {snapshot.name}")
+    return stale
@@ -12,7 +12,14 @@ from .parser import MAUDEParser, ParseResult, SchemaInfo, parse_all_files, FILE_
 from .transformer import DataTransformer, SchemaAwareTransformer, transform_record
 from .loader import MAUDELoader, LoadResult, load_lookup_tables
 from .validator import DataValidator, ValidationReport, print_validation_report
-from .openfda import OpenFDAClient, OpenFDAResult, fetch_recent_updates
+from .openfda import (
+    OpenFDAClient,
+    OpenFDAResult,
+    RateLimiter,
+    RateLimitExceeded,
+    fetch_recent_updates,
+)
+from .openfda_cache import OpenFDACache
 from .updater import (
     DataUpdater,
     DataStatus,
@@ -63,7 +70,10 @@ __all__ = [
     # openFDA (DEPRECATED for data ingestion - use for queries only)
     "OpenFDAClient",
     "OpenFDAResult",
+    "RateLimiter",
+    "RateLimitExceeded",
     "fetch_recent_updates",
+    "OpenFDACache",
     # Updater
     "DataUpdater",
     "DataStatus",
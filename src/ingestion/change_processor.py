@@ -21,6 +21,7 @@ sys.path.insert(0, str(PROJECT_ROOT))
 from config import config
 from config.logging_config import get_logger
 from src.database import get_connection
+from src.database.change_log import OP_UPDATE, start_run, record_changes
 from src.ingestion.parser import MAUDEParser
 from src.ingestion.transformer import DataTransformer, transform_record
 
@@ -109,6 +110,13 @@ PRIMARY_KEY_COLUMNS = {
 }
 
 
+# Temp table the parsed CHANGE file is staged into before being applied
+STAGING_TABLE = "_change_staging"
+
+# Column recording each staged record's position in the CHANGE file
+STAGING_SEQ_COLUMN = "_change_seq"
+
+
 class ChangeProcessor:
     """Process FDA CHANGE files to update existing records."""
 
@@ -116,16 +124,24 @@ class ChangeProcessor:
         self,
         db_path: Optional[Path] = None,
         batch_size: int = 1000,
+        track_changes: bool = True,
+        run_id: Optional[int] = None,
     ):
         """
         Initialize the change processor.
 
         Args:
             db_path: Path to database file.
-            batch_size: Number of records to process per batch.
+            batch_size: Number of parsed records appended to the staging table at once.
+            track_changes: Append updated MDR keys to change_log in the same
+                transaction as the UPDATE.
+            run_id: change_log run id to record under. Allocated on first use
+                when None; pass the loader's run id to share one run.
         """
         self.db_path = db_path or config.database.path
         self.batch_size = batch_size
+        self.track_changes = track_changes
+        self.run_id = run_id
         self.parser = MAUDEParser()
         self.transformer = DataTransformer()
 
@@ -141,6 +157,10 @@ class ChangeProcessor:
         CHANGE files have the same structure as regular files but contain
         corrections to existing records. We UPDATE rather than INSERT.
 
+        The whole file is parsed into a temp staging table first, then applied
+        with one set-based UPDATE ... FROM per target table, so the number of
+        statements does not grow with the number of changed records.
+
         Args:
             filepath: Path to the CHANGE file.
             file_type: Type of file (auto-detected if None).
@@ -167,12 +187,16 @@ class ChangeProcessor:
         # Detect schema from file header
         schema = self.parser.detect_schema_from_header(filepath, file_type)
 
+        pk_columns = PRIMARY_KEY_COLUMNS.get(file_type, ["mdr_report_key"])
+
         own_connection = conn is None
         if own_connection:
             conn = duckdb.connect(str(self.db_path))
 
         try:
+            self._create_staging_table(conn, file_type)
             batch = []
+            staged = 0
 
             for record in self.parser.parse_file_dynamic(
                 filepath,
@@ -197,13 +221,15 @@ class ChangeProcessor:
                         filepath.name,
                     )
 
+                    # Records without a complete primary key cannot be matched
+                    if any(transformed.get(col) is None for col in pk_columns):
+                        continue
+
                     batch.append(transformed)
 
-                    # Process batch when full
+                    # Stage batch when full
                     if len(batch) >= self.batch_size:
-                        stats = self._update_batch(conn, file_type, batch)
-                        result.records_updated += stats["updated"]
-                        result.records_not_found += stats["not_found"]
+                        staged += self._stage_batch(conn, file_type, batch, staged)
                         batch = []
 
                 except Exception as e:
@@ -211,13 +237,19 @@ class ChangeProcessor:
                     if len(result.error_messages) < 10:
                         result.error_messages.append(str(e))
 
-            # Process remaining records
+            # Stage remaining records
             if batch:
-                stats = self._update_batch(conn, file_type, batch)
-                result.records_updated += stats["updated"]
-                result.records_not_found += stats["not_found"]
+                staged += self._stage_batch(conn, file_type, batch, staged)
+
+            stats = self._apply_staged_changes(conn, file_type)
+            result.records_updated += stats["updated"]
+            result.records_not_found += stats["not_found"]
 
         finally:
+            try:
+                conn.execute(f"DROP TABLE IF EXISTS {STAGING_TABLE}")
+            except Exception:
+                pass
             if own_connection:
                 conn.close()
 
@@ -231,31 +263,97 @@ class ChangeProcessor:
 
         return result
 
-    def _update_batch(
+    def _staging_columns(self, file_type: str) -> List[str]:
+        """Get key and updateable columns staged for a file type."""
+        pk_columns = PRIMARY_KEY_COLUMNS.get(file_type, ["mdr_report_key"])
+        updateable = UPDATEABLE_COLUMNS.get(file_type, [])
+        return pk_columns + [c for c in updateable if c not in pk_columns]
+
+    def _create_staging_table(
+        self,
+        conn: duckdb.DuckDBPyConnection,
+        file_type: str,
+    ) -> None:
+        """
+        Create an empty temp staging table typed like the target table.
+
+        Args:
+            conn: Database connection.
+            file_type: Type of records being staged.
+        """
+        table_name = self._get_table_name(file_type)
+        columns = ", ".join(self._staging_columns(file_type))
+        conn.execute(f"""
+            CREATE OR REPLACE TEMP TABLE {STAGING_TABLE} AS
+            SELECT {columns}, 0::BIGINT AS {STAGING_SEQ_COLUMN}, NULL::VARCHAR AS _match
+            FROM {table_name}
+            LIMIT 0
+        """)
+
+    def _stage_batch(
         self,
         conn: duckdb.DuckDBPyConnection,
         file_type: str,
         batch: List[Dict[str, Any]],
+        seq_start: int,
+    ) -> int:
+        """
+        Append a batch of transformed records to the staging table.
+
+        Args:
+            conn: Database connection.
+            file_type: Type of records.
+            batch: List of record dictionaries.
+            seq_start: File position of the first record in the batch.
+
+        Returns:
+            Number of records staged.
+        """
+        import pandas as pd
+
+        columns = self._staging_columns(file_type)
+        rows = []
+        for offset, record in enumerate(batch):
+            row = {}
+            for col in columns:
+                val = record.get(col)
+                # Convert date objects to strings for DuckDB
+                if isinstance(val, date):
+                    val = val.isoformat()
+                row[col] = val
+            row[STAGING_SEQ_COLUMN] = seq_start + offset
+            rows.append(row)
+
+        df = pd.DataFrame(rows, columns=columns + [STAGING_SEQ_COLUMN])
+        col_names = ", ".join(columns + [STAGING_SEQ_COLUMN])
+        conn.execute(f"INSERT INTO {STAGING_TABLE} ({col_names}) SELECT {col_names} FROM df")
+        return len(df)
+
+    def _apply_staged_changes(
+        self,
+        conn: duckdb.DuckDBPyConnection,
+        file_type: str,
     ) -> Dict[str, int]:
         """
-        Update a batch of records in the database.
+        Apply the staged CHANGE records to the target table.
 
         Handles both simple primary keys (master) and composite primary keys
-        (device, text, patient).
+        (device, text, patient). Staged rows are first matched against the
+        target with a semi-join; unmatched rows are reported as not found.
+        Matched rows are collapsed per key, keeping for each column the last
+        non-null value in file order, and applied with one UPDATE ... FROM.
+        Patient rows with sequence 1 that only match a historical row with a
+        NULL sequence number are applied to that row by a second UPDATE.
 
         Args:
             conn: Database connection.
             file_type: Type of records.
-            batch: List of record dictionaries.
 
         Returns:
             Dictionary with 'updated' and 'not_found' counts.
         """
         stats = {"updated": 0, "not_found": 0}
 
-        if not batch:
-            return stats
-
         table_name = self._get_table_name(file_type)
         updateable = UPDATEABLE_COLUMNS.get(file_type, [])
         pk_columns = PRIMARY_KEY_COLUMNS.get(file_type, ["mdr_report_key"])
@@ -265,84 +363,126 @@ class ChangeProcessor:
             logger.warning(f"No updateable columns defined for {file_type}")
             return stats
 
-        for record in batch:
-            # Get primary key values
-            pk_values = []
-            pk_valid = True
-            for pk_col in pk_columns:
-                pk_val = record.get(pk_col)
-                if pk_val is None:
-                    pk_valid = False
-                    break
-                pk_values.append(pk_val)
-
-            if not pk_valid:
-                continue
-
-            # Build WHERE clause for composite keys
-            where_parts = [f"{col} = ?" for col in pk_columns]
-            where_clause = " AND ".join(where_parts)
-
-            # Check if record exists
-            existing = conn.execute(
-                f"SELECT 1 FROM {table_name} WHERE {where_clause}",
-                pk_values
-            ).fetchone()
-
-            # For patient records: try fallback to NULL sequence if exact match not found
-            # (Historical data may have NULL patient_sequence_number)
-            use_null_seq_fallback = False
-            if not existing and file_type == "patient" and pk_values[1] == 1:
-                fallback_result = conn.execute(
-                    f"SELECT 1 FROM {table_name} WHERE mdr_report_key = ? AND patient_sequence_number IS NULL",
-                    [pk_values[0]]
-                ).fetchone()
-                if fallback_result:
-                    existing = fallback_result
-                    use_null_seq_fallback = True
-                    where_clause = "mdr_report_key = ? AND patient_sequence_number IS NULL"
-                    pk_values = [pk_values[0]]  # Only use mdr_report_key for WHERE
-
-            if not existing:
-                stats["not_found"] += 1
-                continue
-
-            # Build UPDATE statement with only non-null values
-            set_parts = []
-            values = []
-
-            for col in updateable:
-                value = record.get(col)
-                if value is not None:
-                    set_parts.append(f"{col} = ?")
-                    # Convert date objects to strings
-                    if isinstance(value, date):
-                        value = value.isoformat()
-                    values.append(value)
-
-            if not set_parts:
-                continue
-
-            # Update timestamp column to track changes
-            if file_type == "master":
-                set_parts.append("date_changed = CURRENT_TIMESTAMP")
-            elif file_type in ["device", "text", "patient"]:
-                set_parts.append("updated_at = CURRENT_TIMESTAMP")
-
-            # Add primary key values for WHERE clause
-            values.extend(pk_values)
-
-            sql = f"UPDATE {table_name} SET {', '.join(set_parts)} WHERE {where_clause}"
+        staged = conn.execute(f"SELECT COUNT(*) FROM {STAGING_TABLE}").fetchone()[0]
+        if staged == 0:
+            return stats
 
-            try:
-                conn.execute(sql, values)
-                stats["updated"] += 1
-            except Exception as e:
-                pk_str = ", ".join(f"{c}={v}" for c, v in zip(pk_columns, pk_values))
-                logger.debug(f"Error updating {pk_str}: {e}")
+        key_match = " AND ".join(f"t.{col} = s.{col}" for col in pk_columns)
+        has_values = " OR ".join(f"{col} IS NOT NULL" for col in updateable)
+
+        conn.execute(f"""
+            UPDATE {STAGING_TABLE} s SET _match = 'exact'
+            WHERE EXISTS (SELECT 1 FROM {table_name} t WHERE {key_match})
+        """)
+
+        # For patient records: fall back to NULL sequence if exact match not found
+        # (Historical data may have NULL patient_sequence_number)
+        if file_type == "patient":
+            conn.execute(f"""
+                UPDATE {STAGING_TABLE} s SET _match = 'null_seq'
+                WHERE s._match IS NULL
+                  AND s.patient_sequence_number = 1
+                  AND EXISTS (
+                      SELECT 1 FROM {table_name} t
+                      WHERE t.mdr_report_key = s.mdr_report_key
+                        AND t.patient_sequence_number IS NULL
+                  )
+            """)
+
+        # Anti-join result: staged records with no target row
+        stats["not_found"], stats["updated"] = conn.execute(f"""
+            SELECT
+                COUNT(*) FILTER (WHERE _match IS NULL),
+                COUNT(*) FILTER (WHERE _match IS NOT NULL AND ({has_values}))
+            FROM {STAGING_TABLE}
+        """).fetchone()
+
+        if stats["updated"] == 0:
+            return stats
+
+        # Only non-null staged values overwrite existing data
+        set_parts = [f"{col} = COALESCE(s.{col}, t.{col})" for col in updateable]
+        target_columns = self._get_table_columns(conn, table_name)
+        if "updated_at" in target_columns:
+            set_parts.append("updated_at = CURRENT_TIMESTAMP")
+        set_clause = ", ".join(set_parts)
+
+        if self.track_changes and self.run_id is None:
+            self.run_id = start_run(conn)
+
+        conn.execute("BEGIN TRANSACTION")
+        try:
+            if self.track_changes:
+                record_changes(
+                    conn,
+                    self.run_id,
+                    table_name,
+                    f"""(
+                        SELECT * FROM {STAGING_TABLE}
+                        WHERE _match IS NOT NULL AND ({has_values})
+                    )""",
+                    operation=OP_UPDATE,
+                )
+
+            conn.execute(f"""
+                UPDATE {table_name} AS t SET {set_clause}
+                FROM ({self._collapse_staged_sql(pk_columns, updateable, "exact")}) s
+                WHERE {key_match}
+            """)
+
+            if file_type == "patient":
+                conn.execute(f"""
+                    UPDATE {table_name} AS t SET {set_clause}
+                    FROM ({self._collapse_staged_sql(["mdr_report_key"], updateable, "null_seq")}) s
+                    WHERE t.mdr_report_key = s.mdr_report_key
+                      AND t.patient_sequence_number IS NULL
+                """)
+
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
 
         return stats
 
+    def _collapse_staged_sql(
+        self,
+        key_columns: List[str],
+        updateable: List[str],
+        match: str,
+    ) -> str:
+        """
+        Build SQL collapsing matched staged rows to one row per key.
+
+        For each column the last non-null value in file order wins, which is
+        what applying the records one by one would have produced.
+        """
+        keys = ", ".join(key_columns)
+        values = ", ".join(
+            f"arg_max({col}, {STAGING_SEQ_COLUMN}) FILTER (WHERE {col} IS NOT NULL) AS {col}"
+            for col in updateable
+            if col not in key_columns
+        )
+        return f"""
+            SELECT {keys}, {values}
+            FROM {STAGING_TABLE}
+            WHERE _match = '{match}'
+              AND ({" OR ".join(f"{col} IS NOT NULL" for col in updateable)})
+            GROUP BY {keys}
+        """
+
+    def _get_table_columns(
+        self,
+        conn: duckdb.DuckDBPyConnection,
+        table_name: str,
+    ) -> set:
+        """Get the column names of a table."""
+        rows = conn.execute(
+            "SELECT column_name FROM information_schema.columns WHERE table_name = ?",
+            [table_name],
+        ).fetchall()
+        return {r[0] for r in rows}
+
     def _get_table_name(self, file_type: str) -> str:
         """Get database table name for file type."""
         table_map = {
@@ -393,6 +533,7 @@ def process_change_file(
 def process_all_change_files(
     data_dir: Path,
     conn: duckdb.DuckDBPyConnection,
+    run_id: Optional[int] = None,
 ) -> List[ChangeResult]:
     """
     Process all CHANGE files in a directory.
@@ -400,12 +541,13 @@ def process_all_change_files(
     Args:
         data_dir: Directory containing CHANGE files.
         conn: Database connection.
+        run_id: change_log run id shared with the ADD file load, if any.
 
     Returns:
         List of ChangeResult objects.
     """
     results = []
-    processor = ChangeProcessor()
+    processor = ChangeProcessor(run_id=run_id)
 
     # Find all CHANGE files
     # Pattern: *Change.txt (e.g., mdrfoiChange.txt, patientChange.txt, deviceChange.txt, foitextChange.txt)
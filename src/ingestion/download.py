@@ -2,17 +2,20 @@
 
 import hashlib
 import json
+import os
 import re
+import shutil
+import threading
+import time
 import requests
 from pathlib import Path
-from typing import List, Optional, Dict, Tuple
+from typing import BinaryIO, List, Optional, Dict, Tuple, Union
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
 from urllib.parse import urljoin
 import zipfile
-import io
 from tqdm import tqdm
-from tenacity import retry, stop_after_attempt, wait_exponential
 import sys
 
 PROJECT_ROOT = Path(__file__).parent.parent.parent
@@ -27,8 +30,80 @@ logger = get_logger("download")
 # FDA MAUDE download page URL
 FDA_MAUDE_URL = "https://www.fda.gov/medical-devices/maude-database/download-maude-data"
 
-# Base URL for file downloads
-FDA_DOWNLOAD_BASE = "https://www.accessdata.fda.gov/MAUDE/ftparea/"
+# Base URL for file downloads (FDA_DOWNLOAD_BASE env var points it at a mirror)
+FDA_DOWNLOAD_BASE = config.data.fda_download_base
+
+# Bytes read from the network / copied out of ZIP members at a time.
+# Downloads and extraction stream through this buffer so peak memory does
+# not depend on file size.
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Suffix for files being written; renamed into place only when complete
+PARTIAL_SUFFIX = ".part"
+
+# Bytes written between saves of partial download progress to the tracker
+PROGRESS_SAVE_BYTES = 64 * 1024 * 1024
+
+# Connection-level failures that are retried, resuming the partial file when
+# the server supports byte ranges
+RESUMABLE_ERRORS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.ChunkedEncodingError,
+    requests.exceptions.Timeout,
+)
+
+# Seconds to wait before the second attempt at a file; doubles per attempt
+RETRY_BACKOFF_SECONDS = 1.0
+
+
+class IncompleteDownloadError(IOError):
+    """Raised when fewer bytes arrive than the server announced."""
+
+
+HTTP_DATE_FORMAT = "%a, %d %b %Y %H:%M:%S GMT"
+
+
+def parse_http_date(value: Optional[str]) -> Optional[datetime]:
+    """Parse an HTTP date header (e.g. Last-Modified), or return None."""
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, "%a, %d %b %Y %H:%M:%S %Z")
+    except ValueError:
+        return None
+
+
+def conditional_headers(
+    etag: Optional[str] = None,
+    last_modified: Optional[datetime] = None,
+) -> Dict[str, str]:
+    """
+    Build conditional request headers from stored validators.
+
+    A server answers such a request with 304 Not Modified when the file is
+    unchanged, which costs no body and no header parsing beyond the status.
+
+    Args:
+        etag: ETag recorded when the file was last fetched.
+        last_modified: Last-Modified recorded when the file was last fetched.
+
+    Returns:
+        Dictionary with If-None-Match and/or If-Modified-Since.
+    """
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified.strftime(HTTP_DATE_FORMAT)
+    return headers
+
+
+def _parse_content_range_total(value: Optional[str]) -> Optional[int]:
+    """Get the complete length from a 'bytes start-end/total' Content-Range."""
+    if not value or "/" not in value:
+        return None
+    total = value.rsplit("/", 1)[1].strip()
+    return int(total) if total.isdigit() else None
 
 # =============================================================================
 # Complete FDA MAUDE File Lists
@@ -223,6 +298,8 @@ class DownloadTracker:
         """
         self.state_file = state_file or (config.data.raw_path / ".download_state.json")
         self._state: Dict[str, Dict] = {}
+        # Downloads run on a worker pool; serialize state updates and saves
+        self._lock = threading.RLock()
         self._load_state()
 
     def _load_state(self) -> None:
@@ -238,21 +315,54 @@ class DownloadTracker:
     def _save_state(self) -> None:
         """Save state to file."""
         try:
-            self.state_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.state_file, "w") as f:
-                json.dump(self._state, f, indent=2, default=str)
+            with self._lock:
+                self.state_file.parent.mkdir(parents=True, exist_ok=True)
+                tmp_file = self.state_file.with_suffix(self.state_file.suffix + PARTIAL_SUFFIX)
+                with open(tmp_file, "w") as f:
+                    json.dump(self._state, f, indent=2, default=str)
+                os.replace(tmp_file, self.state_file)
         except Exception as e:
             logger.warning(f"Could not save download state: {e}")
 
     def mark_started(self, filename: str, file_type: str, url: str) -> None:
-        """Mark a download as started."""
-        self._state[filename] = {
-            "file_type": file_type,
-            "url": url,
-            "status": "downloading",
-            "started": datetime.now().isoformat(),
-        }
-        self._save_state()
+        """Mark a download as started, keeping any partial progress."""
+        with self._lock:
+            previous = self._state.get(filename, {})
+            self._state[filename] = {
+                "file_type": file_type,
+                "url": url,
+                "status": "downloading",
+                "started": datetime.now().isoformat(),
+            }
+            if previous.get("partial") and previous.get("url") == url:
+                self._state[filename]["partial"] = previous["partial"]
+            self._save_state()
+
+    def mark_progress(self, filename: str, **progress) -> None:
+        """
+        Record partial download progress.
+
+        Keys are merged into the file's ``partial`` entry: bytes_downloaded,
+        content_length, etag, last_modified and accept_ranges. These are the
+        validators used to resume the download with a Range request.
+        """
+        with self._lock:
+            state = self._state.setdefault(filename, {})
+            partial = state.setdefault("partial", {})
+            partial.update(progress)
+            partial["updated"] = datetime.now().isoformat()
+            self._save_state()
+
+    def get_partial(self, filename: str) -> Dict:
+        """Get recorded partial progress for a file (empty if none)."""
+        with self._lock:
+            return dict(self._state.get(filename, {}).get("partial", {}))
+
+    def clear_partial(self, filename: str) -> None:
+        """Forget partial progress for a file."""
+        with self._lock:
+            if self._state.get(filename, {}).pop("partial", None) is not None:
+                self._save_state()
 
     def mark_complete(
         self,
@@ -263,26 +373,30 @@ class DownloadTracker:
         last_modified_remote: Optional[datetime] = None,
     ) -> None:
         """Mark a download as complete."""
-        if filename in self._state:
-            self._state[filename].update({
-                "status": "completed",
-                "checksum": checksum,
-                "size_bytes": size_bytes,
-                "completed": datetime.now().isoformat(),
-                "extracted_files": extracted_files,
-                "last_modified_remote": last_modified_remote.isoformat() if last_modified_remote else None,
-            })
-            self._save_state()
+        with self._lock:
+            if filename in self._state:
+                partial = self._state[filename].pop("partial", None) or {}
+                self._state[filename].update({
+                    "status": "completed",
+                    "etag": partial.get("etag"),
+                    "checksum": checksum,
+                    "size_bytes": size_bytes,
+                    "completed": datetime.now().isoformat(),
+                    "extracted_files": extracted_files,
+                    "last_modified_remote": last_modified_remote.isoformat() if last_modified_remote else None,
+                })
+                self._save_state()
 
     def mark_failed(self, filename: str, error: str) -> None:
         """Mark a download as failed."""
-        if filename in self._state:
-            self._state[filename].update({
-                "status": "failed",
-                "error": error,
-                "failed_at": datetime.now().isoformat(),
-            })
-            self._save_state()
+        with self._lock:
+            if filename in self._state:
+                self._state[filename].update({
+                    "status": "failed",
+                    "error": error,
+                    "failed_at": datetime.now().isoformat(),
+                })
+                self._save_state()
 
     def is_downloaded(self, filename: str) -> bool:
         """Check if a file has been successfully downloaded."""
@@ -309,6 +423,10 @@ class DownloadTracker:
             return datetime.fromisoformat(last_mod)
         return None
 
+    def get_etag(self, filename: str) -> Optional[str]:
+        """Get the ETag the completed download of a file was served with."""
+        return self._state.get(filename, {}).get("etag")
+
     def needs_refresh(self, filename: str, remote_last_modified: datetime) -> bool:
         """
         Check if a file needs to be re-downloaded based on remote Last-Modified.
@@ -327,11 +445,12 @@ class DownloadTracker:
 
     def clear_state(self, filename: Optional[str] = None) -> None:
         """Clear state for a file or all files."""
-        if filename:
-            self._state.pop(filename, None)
-        else:
-            self._state = {}
-        self._save_state()
+        with self._lock:
+            if filename:
+                self._state.pop(filename, None)
+            else:
+                self._state = {}
+            self._save_state()
 
 
 class MAUDEDownloader:
@@ -340,7 +459,10 @@ class MAUDEDownloader:
     def __init__(
         self,
         output_dir: Optional[Path] = None,
-        use_extended_files: bool = False
+        use_extended_files: bool = False,
+        max_workers: Optional[int] = None,
+        max_attempts: int = 3,
+        base_url: Optional[str] = None,
     ):
         """
         Initialize the downloader.
@@ -348,24 +470,26 @@ class MAUDEDownloader:
         Args:
             output_dir: Directory to save downloaded files.
             use_extended_files: If True, include all annual files.
+            max_workers: Files fetched concurrently (default config.data.download_workers).
+            max_attempts: Attempts per file on connection errors; later attempts
+                resume the partial file when the server supports ranges.
+            base_url: Base URL of the FDA file area (default FDA_DOWNLOAD_BASE).
         """
+        self.base_url = (base_url or FDA_DOWNLOAD_BASE).rstrip("/") + "/"
         self.output_dir = output_dir or config.data.raw_path
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.max_workers = max(1, max_workers or config.data.download_workers)
+        self.max_attempts = max_attempts
         self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=self.max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
         self.session.headers.update({
             "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
         })
         self.tracker = DownloadTracker(self.output_dir / ".download_state.json")
         self.known_files = KNOWN_FILES_EXTENDED if use_extended_files else KNOWN_FILES
 
-    def _compute_checksum(self, content: bytes) -> str:
-        """Compute MD5 checksum of content."""
-        return hashlib.md5(content).hexdigest()
-
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=60),
-    )
     def _download_file(
         self,
         url: str,
@@ -376,6 +500,10 @@ class MAUDEDownloader:
         """
         Download a single file with retry logic and progress tracking.
 
+        The response is streamed to a temp file while its MD5 is computed
+        incrementally, then renamed into place (or extracted) on success, so
+        memory use stays flat for multi-GB archives.
+
         Args:
             url: URL to download.
             file_type: Type of MAUDE file.
@@ -402,52 +530,34 @@ class MAUDEDownloader:
 
         logger.info(f"Downloading: {filename}")
         self.tracker.mark_started(filename, file_type, url)
+        partial_path = self.output_dir / (filename + PARTIAL_SUFFIX)
 
         try:
-            response = self.session.get(url, stream=True, timeout=300)
-            response.raise_for_status()
-
-            total_size = int(response.headers.get("content-length", 0))
-
-            # Capture Last-Modified header for freshness tracking
-            last_modified_remote = None
-            if "Last-Modified" in response.headers:
+            for attempt in range(1, self.max_attempts + 1):
                 try:
-                    last_modified_remote = datetime.strptime(
-                        response.headers["Last-Modified"],
-                        "%a, %d %b %Y %H:%M:%S %Z"
+                    size_bytes, checksum, last_modified_remote = self._fetch_to_partial(
+                        url, filename, partial_path
+                    )
+                    break
+                except (*RESUMABLE_ERRORS, IncompleteDownloadError) as e:
+                    if attempt == self.max_attempts:
+                        raise
+                    action = "resuming" if self._can_resume(filename, partial_path) else "restarting"
+                    logger.warning(
+                        f"Download of {filename} interrupted ({e}); {action} "
+                        f"(attempt {attempt + 1}/{self.max_attempts})"
                     )
-                except ValueError:
-                    pass
-
-            # Download with progress bar
-            content = io.BytesIO()
-            with tqdm(
-                total=total_size,
-                unit="iB",
-                unit_scale=True,
-                desc=filename,
-            ) as pbar:
-                for chunk in response.iter_content(chunk_size=8192):
-                    content.write(chunk)
-                    pbar.update(len(chunk))
-
-            content.seek(0)
-            raw_content = content.read()
-            size_bytes = len(raw_content)
-            checksum = self._compute_checksum(raw_content)
-
-            content.seek(0)
+                    time.sleep(RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1))
+
             extracted_files = []
 
             if extract and filename.endswith(".zip"):
-                # Extract ZIP file
-                extracted_files = self._extract_zip(content, filename)
+                # Extract ZIP file from disk; the archive itself is not kept
+                extracted_files = self._extract_zip(partial_path, filename)
+                partial_path.unlink()
             else:
-                # Save raw file
-                output_path = self.output_dir / filename
-                with open(output_path, "wb") as f:
-                    f.write(raw_content)
+                # Atomically move the complete file into place
+                os.replace(partial_path, self.output_dir / filename)
                 extracted_files = [filename]
 
             duration = (datetime.now() - start_time).total_seconds()
@@ -468,6 +578,10 @@ class MAUDEDownloader:
 
         except Exception as e:
             logger.error(f"Error downloading {filename}: {e}")
+            # Keep a resumable partial file for the next run
+            if not self._can_resume(filename, partial_path):
+                partial_path.unlink(missing_ok=True)
+                self.tracker.clear_partial(filename)
             self.tracker.mark_failed(filename, str(e))
             return DownloadResult(
                 filename=filename,
@@ -475,12 +589,169 @@ class MAUDEDownloader:
                 error=str(e),
             )
 
-    def _extract_zip(self, content: io.BytesIO, zip_filename: str) -> List[str]:
+    def _can_resume(self, filename: str, partial_path: Path) -> bool:
+        """Check whether a partial file can be continued with a Range request."""
+        if not partial_path.exists() or partial_path.stat().st_size == 0:
+            return False
+        partial = self.tracker.get_partial(filename)
+        return bool(
+            partial.get("accept_ranges")
+            and (partial.get("etag") or partial.get("last_modified"))
+        )
+
+    def _fetch_to_partial(
+        self,
+        url: str,
+        filename: str,
+        partial_path: Path,
+    ) -> Tuple[int, str, Optional[datetime]]:
+        """
+        Stream a URL into the partial file, resuming it when possible.
+
+        A resumed request sends ``Range`` with ``If-Range`` set to the stored
+        ETag (or Last-Modified), so a file that changed on the server comes
+        back whole as a 200 and the partial file is restarted. The checksum
+        always covers the complete file, and the final size is checked
+        against the length the server announced.
+
+        Args:
+            url: URL to download.
+            filename: Name of the file (tracker key).
+            partial_path: Temp file the download is written to.
+
+        Returns:
+            Tuple of (size in bytes, MD5 checksum, remote Last-Modified).
+
+        Raises:
+            IncompleteDownloadError: If the body ended before the announced length.
+        """
+        headers = {}
+        offset = 0
+        partial = self.tracker.get_partial(filename)
+        if self._can_resume(filename, partial_path):
+            offset = partial_path.stat().st_size
+            headers["Range"] = f"bytes={offset}-"
+            headers["If-Range"] = partial.get("etag") or partial["last_modified"]
+
+        response = self.session.get(url, stream=True, timeout=300, headers=headers)
+        try:
+            etag = response.headers.get("ETag")
+            resumed = response.status_code == 206
+            # Partial file no longer matches the remote file (416, or a range of
+            # a new version from a server ignoring If-Range); start over
+            if response.status_code == 416 or (
+                resumed and partial.get("etag") and etag and etag != partial["etag"]
+            ):
+                logger.info(f"Discarding stale partial download of {filename}")
+                response.close()
+                partial_path.unlink(missing_ok=True)
+                self.tracker.clear_partial(filename)
+                return self._fetch_to_partial(url, filename, partial_path)
+
+            response.raise_for_status()
+
+            hasher = hashlib.md5()
+
+            if resumed:
+                total_size = _parse_content_range_total(response.headers.get("Content-Range"))
+                # Hash the bytes already on disk so the checksum covers the whole file
+                with open(partial_path, "rb") as f:
+                    for block in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b""):
+                        hasher.update(block)
+                logger.info(f"Resuming {filename} at {offset:,} bytes")
+            else:
+                offset = 0
+                content_length = response.headers.get("content-length")
+                total_size = int(content_length) if content_length else None
+
+            # Capture Last-Modified header for freshness tracking
+            last_modified = response.headers.get("Last-Modified") or partial.get("last_modified")
+            last_modified_remote = parse_http_date(last_modified)
+
+            self.tracker.mark_progress(
+                filename,
+                bytes_downloaded=offset,
+                content_length=total_size,
+                etag=etag,
+                last_modified=last_modified,
+                accept_ranges=resumed or response.headers.get("Accept-Ranges", "").lower() == "bytes",
+            )
+
+            # Stream to a temp file next to the target, hashing as we go
+            size_bytes = offset
+            saved_bytes = offset
+            try:
+                with open(partial_path, "ab" if resumed else "wb") as f, tqdm(
+                    total=total_size or 0,
+                    initial=offset,
+                    unit="iB",
+                    unit_scale=True,
+                    desc=filename,
+                ) as pbar:
+                    for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                        f.write(chunk)
+                        hasher.update(chunk)
+                        size_bytes += len(chunk)
+                        pbar.update(len(chunk))
+                        if size_bytes - saved_bytes >= PROGRESS_SAVE_BYTES:
+                            self.tracker.mark_progress(filename, bytes_downloaded=size_bytes)
+                            saved_bytes = size_bytes
+            finally:
+                self.tracker.mark_progress(filename, bytes_downloaded=size_bytes)
+
+            if total_size is not None and size_bytes != total_size:
+                raise IncompleteDownloadError(
+                    f"Received {size_bytes:,} of {total_size:,} bytes for {filename}"
+                )
+
+            return size_bytes, hasher.hexdigest(), last_modified_remote
+        finally:
+            response.close()
+
+    def download_many(
+        self,
+        downloads: List[Tuple[str, str]],
+        extract: bool = True,
+        force: bool = False,
+    ) -> List[DownloadResult]:
+        """
+        Download several files concurrently on a bounded worker pool.
+
+        Args:
+            downloads: (url, file_type) pairs.
+            extract: Whether to extract ZIP files.
+            force: Force re-download even if already downloaded.
+
+        Returns:
+            DownloadResult objects in the same order as ``downloads``.
+        """
+        if not downloads:
+            return []
+        if self.max_workers == 1 or len(downloads) == 1:
+            return [
+                self._download_file(url, file_type, extract=extract, force=force)
+                for url, file_type in downloads
+            ]
+
+        workers = min(self.max_workers, len(downloads))
+        logger.info(f"Downloading {len(downloads)} files with {workers} workers")
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="download") as pool:
+            futures = [
+                pool.submit(self._download_file, url, file_type, extract, force)
+                for url, file_type in downloads
+            ]
+            return [future.result() for future in futures]
+
+    def _extract_zip(self, content: Union[Path, BinaryIO], zip_filename: str) -> List[str]:
         """
         Extract a ZIP file to the output directory.
 
+        Members are copied in DOWNLOAD_CHUNK_SIZE pieces to a temp file and
+        renamed into place, so a partially extracted file never replaces a
+        good one.
+
         Args:
-            content: ZIP file content as BytesIO.
+            content: Path to the ZIP file, or a binary file object.
             zip_filename: Name of the ZIP file (for logging).
 
         Returns:
@@ -496,9 +767,15 @@ class MAUDEDownloader:
 
                     # Extract file
                     output_path = self.output_dir / member
-                    with zf.open(member) as source:
-                        with open(output_path, "wb") as target:
-                            target.write(source.read())
+                    partial_path = self.output_dir / (member + PARTIAL_SUFFIX)
+                    try:
+                        with zf.open(member) as source:
+                            with open(partial_path, "wb") as target:
+                                shutil.copyfileobj(source, target, DOWNLOAD_CHUNK_SIZE)
+                        os.replace(partial_path, output_path)
+                    except Exception:
+                        partial_path.unlink(missing_ok=True)
+                        raise
                     extracted.append(member)
                     logger.debug(f"  Extracted: {member}")
 
@@ -525,10 +802,17 @@ class MAUDEDownloader:
         Returns:
             List of DownloadResult objects.
         """
+        files_to_download = self._select_files(file_type, years)
+        return self.download_many(
+            [(self.base_url + filename, file_type) for filename in files_to_download],
+            force=force,
+        )
+
+    def _select_files(self, file_type: str, years: Optional[List[int]] = None) -> List[str]:
+        """Get the known files of a type, optionally limited to some years."""
         if file_type not in self.known_files:
             raise ValueError(f"Unknown file type: {file_type}")
 
-        results = []
         files_to_download = self.known_files[file_type].copy()
 
         # Filter by years if specified
@@ -547,12 +831,7 @@ class MAUDEDownloader:
                         break
             files_to_download = filtered_files
 
-        for filename in files_to_download:
-            url = FDA_DOWNLOAD_BASE + filename
-            result = self._download_file(url, file_type, force=force)
-            results.append(result)
-
-        return results
+        return files_to_download
 
     def download_all(
         self,
@@ -574,12 +853,19 @@ class MAUDEDownloader:
         if file_types is None:
             file_types = list(self.known_files.keys())
 
-        all_results = {}
-        for file_type in file_types:
-            logger.info(f"\nDownloading {file_type} files...")
-            results = self.download_file_type(file_type, years, force=force)
-            all_results[file_type] = results
+        # Queue every file up front so the worker pool stays busy across types
+        downloads = [
+            (self.base_url + filename, file_type)
+            for file_type in file_types
+            for filename in self._select_files(file_type, years)
+        ]
+        results_in_order = self.download_many(downloads, force=force)
 
+        all_results = {file_type: [] for file_type in file_types}
+        for (_, file_type), result in zip(downloads, results_in_order):
+            all_results[file_type].append(result)
+
+        for file_type, results in all_results.items():
             # Summary
             success = sum(1 for r in results if r.success)
             failed = sum(1 for r in results if not r.success)
@@ -674,7 +960,9 @@ class MAUDEDownloader:
         """
         Check freshness of files by comparing local state with remote Last-Modified headers.
 
-        Uses HTTP HEAD requests to check without downloading.
+        Uses conditional HTTP HEAD requests (If-None-Match / If-Modified-Since
+        from the tracker's stored validators), issued concurrently on the
+        downloader's worker pool, so unchanged files cost a 304.
 
         Args:
             filenames: List of filenames to check. If None, checks all known files.
@@ -686,57 +974,76 @@ class MAUDEDownloader:
                 - local_modified: datetime or None
                 - remote_modified: datetime or None
                 - size_bytes: int or None
+                - etag: str or None
+                - not_modified: bool (server answered 304)
         """
-        result = {}
-
         if filenames is None:
             filenames = []
             for files in self.known_files.values():
                 filenames.extend(files)
 
-        for filename in filenames:
-            url = FDA_DOWNLOAD_BASE + filename
-            info = {
-                "needs_update": False,
-                "local_modified": self.tracker.get_last_modified_remote(filename),
-                "remote_modified": None,
-                "size_bytes": None,
-            }
+        workers = min(self.max_workers, len(filenames)) or 1
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="freshness") as pool:
+            checked = list(pool.map(
+                lambda filename: self._check_file_freshness(filename, timeout),
+                filenames,
+            ))
 
-            try:
-                response = self.session.head(url, timeout=timeout, allow_redirects=True)
+        return {
+            filename: info
+            for filename, info in zip(filenames, checked)
+            if info is not None
+        }
+
+    def _check_file_freshness(self, filename: str, timeout: int) -> Optional[Dict]:
+        """Check one file for check_remote_freshness; None if it is not on the server."""
+        url = self.base_url + filename
+        info = {
+            "needs_update": False,
+            "local_modified": self.tracker.get_last_modified_remote(filename),
+            "remote_modified": None,
+            "size_bytes": None,
+            "etag": self.tracker.get_etag(filename),
+            "not_modified": False,
+        }
 
-                if response.status_code == 404:
-                    logger.debug(f"File not found on server: {filename}")
-                    continue
+        try:
+            response = self.session.head(
+                url,
+                timeout=timeout,
+                allow_redirects=True,
+                headers=conditional_headers(info["etag"], info["local_modified"]),
+            )
 
-                response.raise_for_status()
+            if response.status_code == 404:
+                logger.debug(f"File not found on server: {filename}")
+                return None
 
-                # Parse Last-Modified header
-                if "Last-Modified" in response.headers:
-                    info["remote_modified"] = datetime.strptime(
-                        response.headers["Last-Modified"],
-                        "%a, %d %b %Y %H:%M:%S %Z"
-                    )
+            if response.status_code == 304:
+                info["not_modified"] = True
+                info["remote_modified"] = info["local_modified"]
+                return info
 
-                # Get content length
-                content_length = response.headers.get("Content-Length")
-                info["size_bytes"] = int(content_length) if content_length else None
+            response.raise_for_status()
 
-                # Check if update needed
-                if info["remote_modified"]:
-                    if info["local_modified"] is None:
-                        info["needs_update"] = True
-                    elif info["remote_modified"] > info["local_modified"]:
-                        info["needs_update"] = True
+            info["remote_modified"] = parse_http_date(response.headers.get("Last-Modified"))
+            info["etag"] = response.headers.get("ETag")
 
-                result[filename] = info
+            # Get content length
+            content_length = response.headers.get("Content-Length")
+            info["size_bytes"] = int(content_length) if content_length else None
 
-            except Exception as e:
-                logger.warning(f"Could not check freshness for {filename}: {e}")
-                result[filename] = info
+            # Check if update needed
+            if info["remote_modified"]:
+                if info["local_modified"] is None:
+                    info["needs_update"] = True
+                elif info["remote_modified"] > info["local_modified"]:
+                    info["needs_update"] = True
+
+        except Exception as e:
+            logger.warning(f"Could not check freshness for {filename}: {e}")
 
-        return result
+        return info
 
     def get_incremental_files(self, file_type: Optional[str] = None) -> Dict[str, Dict[str, List[str]]]:
         """
@@ -779,26 +1086,21 @@ class MAUDEDownloader:
         if categories is None:
             categories = ["add", "change"]
 
-        all_results = {}
-
+        downloads = []
         for file_type in file_types:
-            type_results = []
             type_files = INCREMENTAL_FILES.get(file_type, {})
-
             for category in categories:
                 for filename in type_files.get(category, []):
-                    url = FDA_DOWNLOAD_BASE + filename
-                    result = self._download_file(url, file_type, force=force)
+                    downloads.append((self.base_url + filename, file_type))
 
-                    # Don't treat 404 as failure for incremental files
-                    # (they may not exist every week)
-                    if result.error and "404" in str(result.error):
-                        logger.debug(f"Incremental file not available: {filename}")
-                    else:
-                        type_results.append(result)
-
-            if type_results:
-                all_results[file_type] = type_results
+        all_results = {}
+        for (_, file_type), result in zip(downloads, self.download_many(downloads, force=force)):
+            # Don't treat 404 as failure for incremental files
+            # (they may not exist every week)
+            if result.error and "404" in str(result.error):
+                logger.debug(f"Incremental file not available: {result.filename}")
+            else:
+                all_results.setdefault(file_type, []).append(result)
 
         return all_results
 
@@ -850,7 +1152,7 @@ def download_sample_data(output_dir: Optional[Path] = None) -> Dict[str, List[Do
     for file_type, files in sample_files.items():
         results[file_type] = []
         for filename in files:
-            url = FDA_DOWNLOAD_BASE + filename
+            url = downloader.base_url + filename
             result = downloader._download_file(url, file_type)
             results[file_type].append(result)
 
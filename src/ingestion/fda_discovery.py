@@ -1,7 +1,9 @@
 """FDA File Discovery Module.
 
 Detects new FDA MAUDE files automatically using HTTP HEAD requests
-to check Last-Modified headers without downloading entire files.
+to check Last-Modified headers without downloading entire files. Checks are
+issued concurrently and are conditional on the stored ETag/Last-Modified,
+so unchanged files cost a 304.
 
 FDA File Patterns:
 - Weekly current: mdrfoi.zip, foidev.zip, patient.zip, foitext.zip
@@ -12,6 +14,7 @@ FDA File Patterns:
 
 import json
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Any
@@ -23,11 +26,12 @@ sys.path.insert(0, str(PROJECT_ROOT))
 
 from config import config
 from config.logging_config import get_logger
+from src.ingestion.download import conditional_headers, parse_http_date
 
 logger = get_logger("fda_discovery")
 
-# FDA MAUDE FTP area base URL
-FDA_FTP_BASE = "https://www.accessdata.fda.gov/MAUDE/ftparea/"
+# FDA MAUDE FTP area base URL (FDA_DOWNLOAD_BASE env var points it at a mirror)
+FDA_FTP_BASE = config.data.fda_download_base
 
 # Current year for dynamic file detection
 CURRENT_YEAR = datetime.now().year
@@ -44,6 +48,7 @@ class FileInfo:
     last_modified_remote: Optional[datetime] = None
     last_modified_local: Optional[datetime] = None
     size_bytes: Optional[int] = None
+    etag: Optional[str] = None
     needs_update: bool = False
     is_new: bool = False
 
@@ -114,6 +119,8 @@ class FDADiscovery:
         self,
         state_file: Optional[Path] = None,
         timeout: int = 30,
+        max_workers: int = 8,
+        base_url: Optional[str] = None,
     ):
         """
         Initialize the FDA discovery module.
@@ -121,13 +128,21 @@ class FDADiscovery:
         Args:
             state_file: Path to JSON file tracking file states.
             timeout: HTTP request timeout in seconds.
+            max_workers: Concurrent HEAD requests issued by check_for_updates.
+            base_url: Base URL of the FDA file area (default FDA_FTP_BASE).
         """
+        self.base_url = (base_url or FDA_FTP_BASE).rstrip("/") + "/"
         self.state_file = state_file or (config.data.raw_path / ".fda_discovery_state.json")
         self.timeout = timeout
+        self.max_workers = max(1, max_workers)
         self._state: Dict[str, Dict] = {}
         self._load_state()
 
+        # One pooled session shared by the worker threads
         self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=self.max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
         self.session.headers.update({
             "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
         })
@@ -151,37 +166,56 @@ class FDADiscovery:
         except Exception as e:
             logger.warning(f"Could not save discovery state: {e}")
 
-    def _get_remote_info(self, url: str) -> Optional[Dict[str, Any]]:
+    def _get_remote_info(
+        self,
+        url: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[datetime] = None,
+    ) -> Optional[Dict[str, Any]]:
         """
         Get file info from FDA server using HTTP HEAD request.
 
+        When validators from a previous download are given the request is
+        conditional, and an unchanged file comes back as a 304.
+
         Args:
             url: URL to check.
+            etag: Stored ETag for If-None-Match.
+            last_modified: Stored Last-Modified for If-Modified-Since.
 
         Returns:
-            Dict with last_modified and content_length, or None if not found.
+            Dict with last_modified, size_bytes, etag and not_modified,
+            or None if not found.
         """
         try:
-            response = self.session.head(url, timeout=self.timeout, allow_redirects=True)
+            response = self.session.head(
+                url,
+                timeout=self.timeout,
+                allow_redirects=True,
+                headers=conditional_headers(etag, last_modified),
+            )
 
             if response.status_code == 404:
                 return None
 
-            response.raise_for_status()
+            if response.status_code == 304:
+                return {
+                    "last_modified": last_modified,
+                    "size_bytes": None,
+                    "etag": etag,
+                    "not_modified": True,
+                }
 
-            last_modified = None
-            if "Last-Modified" in response.headers:
-                last_modified = datetime.strptime(
-                    response.headers["Last-Modified"],
-                    "%a, %d %b %Y %H:%M:%S %Z"
-                )
+            response.raise_for_status()
 
             content_length = response.headers.get("Content-Length")
             size_bytes = int(content_length) if content_length else None
 
             return {
-                "last_modified": last_modified,
+                "last_modified": parse_http_date(response.headers.get("Last-Modified")),
                 "size_bytes": size_bytes,
+                "etag": response.headers.get("ETag"),
+                "not_modified": False,
             }
 
         except requests.exceptions.RequestException as e:
@@ -215,6 +249,8 @@ class FDADiscovery:
         """
         Check FDA servers for new or updated files.
 
+        All candidate files are checked concurrently on a bounded pool.
+
         Args:
             check_annual: Whether to check for new annual archive files.
             check_add_change: Whether to check ADD/CHANGE files.
@@ -225,6 +261,7 @@ class FDADiscovery:
         result = DiscoveryResult()
         annual_files = self._get_annual_files() if check_annual else {}
 
+        candidates = []
         for file_type, categories in self.DISCOVERABLE_FILES.items():
             for category, filenames in categories.items():
                 # Skip ADD/CHANGE if not requested
@@ -236,66 +273,85 @@ class FDADiscovery:
                     filenames = annual_files.get(file_type, [])
 
                 for filename in filenames:
-                    url = FDA_FTP_BASE + filename
-                    result.files_checked += 1
-
-                    logger.debug(f"Checking {filename}...")
-
-                    remote_info = self._get_remote_info(url)
-
-                    if remote_info is None:
-                        # File doesn't exist on server (normal for ADD/CHANGE files
-                        # which only exist during certain weeks)
-                        continue
-
-                    file_info = FileInfo(
-                        filename=filename,
-                        file_type=file_type,
-                        file_category=category,
-                        url=url,
-                        last_modified_remote=remote_info["last_modified"],
-                        size_bytes=remote_info["size_bytes"],
-                    )
-
-                    # Check local state
-                    local_state = self._state.get(filename, {})
-                    if local_state:
-                        local_modified_str = local_state.get("last_modified_remote")
-                        if local_modified_str:
-                            file_info.last_modified_local = datetime.fromisoformat(
-                                local_modified_str
-                            )
-
-                    # Determine if file needs download
-                    if file_info.last_modified_local is None:
-                        file_info.is_new = True
-                        file_info.needs_update = True
-                        result.new_files.append(file_info)
-                        logger.info(f"New file found: {filename}")
-
-                    elif (
-                        file_info.last_modified_remote
-                        and file_info.last_modified_remote > file_info.last_modified_local
-                    ):
-                        file_info.needs_update = True
-                        result.updated_files.append(file_info)
-                        logger.info(
-                            f"Updated file found: {filename} "
-                            f"(remote: {file_info.last_modified_remote}, "
-                            f"local: {file_info.last_modified_local})"
-                        )
+                    candidates.append((file_type, category, filename))
+
+        result.files_checked = len(candidates)
+
+        # Issue the HEAD requests concurrently; results keep candidate order
+        workers = min(self.max_workers, len(candidates)) or 1
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="discovery") as pool:
+            remote_infos = list(pool.map(
+                lambda candidate: self._check_remote(candidate[2]),
+                candidates,
+            ))
+
+        for (file_type, category, filename), remote_info in zip(candidates, remote_infos):
+            if remote_info is None:
+                # File doesn't exist on server (normal for ADD/CHANGE files
+                # which only exist during certain weeks)
+                continue
+
+            local_state = self._state.get(filename, {})
+            file_info = FileInfo(
+                filename=filename,
+                file_type=file_type,
+                file_category=category,
+                url=self.base_url + filename,
+                last_modified_remote=remote_info["last_modified"],
+                size_bytes=remote_info["size_bytes"] or local_state.get("size_bytes"),
+                etag=remote_info["etag"],
+                last_modified_local=self._get_local_modified(filename),
+            )
+
+            # Determine if file needs download
+            if remote_info["not_modified"]:
+                result.unchanged_files.append(file_info)
+                logger.debug(f"File unchanged (304): {filename}")
+
+            elif file_info.last_modified_local is None:
+                file_info.is_new = True
+                file_info.needs_update = True
+                result.new_files.append(file_info)
+                logger.info(f"New file found: {filename}")
+
+            elif (
+                file_info.last_modified_remote
+                and file_info.last_modified_remote > file_info.last_modified_local
+            ):
+                file_info.needs_update = True
+                result.updated_files.append(file_info)
+                logger.info(
+                    f"Updated file found: {filename} "
+                    f"(remote: {file_info.last_modified_remote}, "
+                    f"local: {file_info.last_modified_local})"
+                )
 
-                    else:
-                        result.unchanged_files.append(file_info)
-                        logger.debug(f"File unchanged: {filename}")
+            else:
+                result.unchanged_files.append(file_info)
+                logger.debug(f"File unchanged: {filename}")
 
         return result
 
+    def _get_local_modified(self, filename: str) -> Optional[datetime]:
+        """Get the stored remote Last-Modified of a downloaded file."""
+        local_modified_str = self._state.get(filename, {}).get("last_modified_remote")
+        return datetime.fromisoformat(local_modified_str) if local_modified_str else None
+
+    def _check_remote(self, filename: str) -> Optional[Dict[str, Any]]:
+        """HEAD a discoverable file, conditional on its stored validators."""
+        logger.debug(f"Checking {filename}...")
+        return self._get_remote_info(
+            self.base_url + filename,
+            etag=self._state.get(filename, {}).get("etag"),
+            last_modified=self._get_local_modified(filename),
+        )
+
     def mark_downloaded(
         self,
         filename: str,
         last_modified: Optional[datetime] = None,
         size_bytes: Optional[int] = None,
+        etag: Optional[str] = None,
     ) -> None:
         """
         Mark a file as downloaded, updating local state.
@@ -304,10 +360,12 @@ class FDADiscovery:
             filename: Name of the downloaded file.
             last_modified: Last-Modified timestamp from server.
             size_bytes: File size in bytes.
+            etag: ETag from server, used for later conditional checks.
         """
         self._state[filename] = {
             "last_modified_remote": last_modified.isoformat() if last_modified else None,
             "size_bytes": size_bytes,
+            "etag": etag,
             "downloaded_at": datetime.now().isoformat(),
         }
         self._save_state()
@@ -323,7 +381,7 @@ class FDADiscovery:
         for file_type, files in self._get_annual_files().items():
             for filename in files:
                 if filename not in self._state:
-                    url = FDA_FTP_BASE + filename
+                    url = self.base_url + filename
                     remote_info = self._get_remote_info(url)
 
                     if remote_info:
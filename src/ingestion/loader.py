@@ -16,9 +16,18 @@ sys.path.insert(0, str(PROJECT_ROOT))
 from config import config
 from config.logging_config import get_logger
 from src.database import get_connection, initialize_database
+from src.database.change_log import TRACKED_TABLES, start_run, record_changes
 from src.ingestion.parser import MAUDEParser, FILE_COLUMNS, SchemaInfo
 from src.ingestion.transformer import DataTransformer, transform_record
-from src.ingestion.validation_framework import ValidationPipeline, StageValidationResult
+from src.ingestion.validation_framework import (
+    ValidationPipeline,
+    StageValidationResult,
+    SCOPE_FILE,
+    SCOPE_FULL,
+    SCOPE_KEY_TABLE,
+    create_scope_key_table,
+    drop_scope_key_table,
+)
 
 logger = get_logger("loader")
 
@@ -371,6 +380,7 @@ def validate_after_file_load(
     file_type: str,
     filename: str,
     expected_min: int = 0,
+    scope: str = SCOPE_FILE,
 ) -> tuple[bool, List[str]]:
     """
     Validate data integrity immediately after each file loads.
@@ -378,11 +388,17 @@ def validate_after_file_load(
     This provides real-time validation during loading rather than only at the end,
     catching issues early before they compound.
 
+    In file scope (the default) the quality and orphan checks only look at the
+    MDR keys loaded from ``filename``, gathered once into a temp key table, so a
+    small weekly file is validated in time proportional to its own size. Full
+    scope re-checks the whole table and is meant for nightly integrity runs.
+
     Args:
         conn: Database connection.
         file_type: Type of file just loaded (master, device, patient, text, problem).
         filename: Name of the file that was just loaded.
         expected_min: Minimum expected record count (0 = no minimum check).
+        scope: SCOPE_FILE (rows from this file) or SCOPE_FULL (whole table).
 
     Returns:
         Tuple of (passed, list_of_issues).
@@ -400,6 +416,8 @@ def validate_after_file_load(
     if not table_name:
         return True, []
 
+    scoped = scope != SCOPE_FULL
+
     try:
         # Check 1: Record count is reasonable
         count = conn.execute(f"SELECT COUNT(*) FROM {table_name}").fetchone()[0]
@@ -410,68 +428,72 @@ def validate_after_file_load(
                 f"CRITICAL: {table_name} has {count:,} records, expected at least {expected_min:,}"
             )
 
+        if scoped:
+            scope_keys = create_scope_key_table(conn, table_name, filename)
+            logger.debug(f"Validation: {scope_keys:,} MDR keys in scope for {filename}")
+            # Restricts a query on alias "x" to the keys loaded from this file
+            key_filter = f"x.mdr_report_key IN (SELECT mdr_report_key FROM {SCOPE_KEY_TABLE})"
+        else:
+            key_filter = "1=1"
+
         if file_type == "master":
             # Check 2: No NULL mdr_report_keys
             null_keys = conn.execute(
-                "SELECT COUNT(*) FROM master_events WHERE mdr_report_key IS NULL"
+                "SELECT COUNT(*) FROM master_events x WHERE x.mdr_report_key IS NULL"
+                + (" AND x.source_file = ?" if scoped else ""),
+                [filename] if scoped else None,
             ).fetchone()[0]
             if null_keys > 0:
                 issues.append(f"CRITICAL: {null_keys:,} NULL mdr_report_keys in master_events")
 
             # Check 3: Date range is reasonable (should span 1991-current)
-            date_range = conn.execute("""
+            date_range = conn.execute(f"""
                 SELECT MIN(date_received), MAX(date_received)
-                FROM master_events
-                WHERE date_received IS NOT NULL
+                FROM master_events x
+                WHERE date_received IS NOT NULL AND {key_filter}
             """).fetchone()
             if date_range[0] and date_range[1]:
                 logger.info(f"Validation: master_events date range: {date_range[0]} to {date_range[1]}")
 
             # Check 4: Duplicate MDR keys (should be zero with proper dedup)
-            dup_count = conn.execute("""
+            dup_count = conn.execute(f"""
                 SELECT COUNT(*) - COUNT(DISTINCT mdr_report_key) as duplicates
-                FROM master_events
+                FROM master_events x
+                WHERE {key_filter}
             """).fetchone()[0]
             if dup_count > 0:
                 issues.append(f"WARNING: {dup_count:,} duplicate mdr_report_keys in master_events")
 
-        elif file_type == "patient":
-            # Check orphaned patients (no matching master record)
+        elif file_type in ("patient", "text"):
+            # Check orphaned child records (no matching master record)
             # Only check if master_events has data
-            master_count = conn.execute("SELECT COUNT(*) FROM master_events").fetchone()[0]
-            if master_count > 0:
-                orphans = conn.execute("""
-                    SELECT COUNT(*) FROM patients p
-                    WHERE NOT EXISTS (
+            has_master = conn.execute("SELECT 1 FROM master_events LIMIT 1").fetchone()
+            if has_master:
+                orphans = conn.execute(f"""
+                    SELECT COUNT(*) FROM {table_name} x
+                    WHERE {key_filter}
+                      AND NOT EXISTS (
                         SELECT 1 FROM master_events m
-                        WHERE m.mdr_report_key = p.mdr_report_key
+                        WHERE m.mdr_report_key = x.mdr_report_key
                     )
                 """).fetchone()[0]
                 if orphans > 0:
                     # This is a warning, not critical - some orphans expected
-                    logger.warning(f"Validation: {orphans:,} orphaned patient records (no matching master)")
-
-        elif file_type == "text":
-            # Check orphaned text records
-            master_count = conn.execute("SELECT COUNT(*) FROM master_events").fetchone()[0]
-            if master_count > 0:
-                orphans = conn.execute("""
-                    SELECT COUNT(*) FROM mdr_text t
-                    WHERE NOT EXISTS (
-                        SELECT 1 FROM master_events m
-                        WHERE m.mdr_report_key = t.mdr_report_key
+                    logger.warning(
+                        f"Validation: {orphans:,} orphaned {file_type} records (no matching master)"
                     )
-                """).fetchone()[0]
-                if orphans > 0:
-                    logger.warning(f"Validation: {orphans:,} orphaned text records (no matching master)")
 
         elif file_type == "device":
             # Check device data quality
-            null_product_codes = conn.execute("""
-                SELECT COUNT(*) FROM devices
-                WHERE device_report_product_code IS NULL OR device_report_product_code = ''
-            """).fetchone()[0]
-            total_devices = conn.execute("SELECT COUNT(*) FROM devices").fetchone()[0]
+            null_product_codes, total_devices = conn.execute(f"""
+                SELECT
+                    COUNT(*) FILTER (
+                        WHERE device_report_product_code IS NULL OR device_report_product_code = ''
+                    ),
+                    COUNT(*)
+                FROM devices x
+                WHERE {key_filter}
+            """).fetchone()
             if total_devices > 0:
                 pct_null = (null_product_codes / total_devices) * 100
                 if pct_null > 10:  # More than 10% missing is concerning
@@ -483,6 +505,9 @@ def validate_after_file_load(
     except Exception as e:
         issues.append(f"Validation error: {e}")
         logger.error(f"Error during post-load validation: {e}")
+    finally:
+        if scoped:
+            drop_scope_key_table(conn)
 
     passed = len([i for i in issues if i.startswith("CRITICAL")]) == 0
     return passed, issues
@@ -501,6 +526,9 @@ class MAUDELoader:
         detect_duplicates: bool = True,
         enable_validation: bool = True,
         commit_every_n_batches: int = 50,
+        validation_scope: str = SCOPE_FILE,
+        track_changes: bool = True,
+        run_id: Optional[int] = None,
     ):
         """
         Initialize the loader.
@@ -518,6 +546,13 @@ class MAUDELoader:
             commit_every_n_batches: Commit transaction after this many batches to prevent OOM.
                 Default 50 batches (500K records with default batch_size). Set to 0 to
                 disable incremental commits (single transaction for entire file).
+            validation_scope: Scope of post-load checks. SCOPE_FILE (default) checks
+                only the keys loaded from each file; SCOPE_FULL re-checks whole
+                tables and is intended for nightly integrity runs.
+            track_changes: Append touched MDR keys to change_log in the same
+                transaction as each batch.
+            run_id: change_log run id to record under. Allocated on the first
+                load when None; pass one in to share a run with other steps.
         """
         self.db_path = db_path or config.database.path
         self.batch_size = batch_size
@@ -527,6 +562,9 @@ class MAUDELoader:
         self.detect_duplicates = detect_duplicates
         self.enable_validation = enable_validation
         self.commit_every_n_batches = commit_every_n_batches
+        self.validation_scope = validation_scope
+        self.track_changes = track_changes
+        self.run_id = run_id
         self.parser = MAUDEParser()
         self.transformer = DataTransformer()
 
@@ -793,6 +831,10 @@ class MAUDELoader:
             # Reduce threads to lower memory pressure
             conn.execute("SET threads=4")
 
+        if self.track_changes and self.run_id is None:
+            self.run_id = start_run(conn)
+            logger.info(f"Recording changes under change_log run {self.run_id}")
+
         transaction_started = False
         parse_result = None  # Track parse result for column mismatch stats
         batches_in_current_transaction = 0  # Track batches for incremental commit
@@ -881,7 +923,9 @@ class MAUDELoader:
                     # Insert batch when full
                     if len(batch) >= self.batch_size:
                         try:
-                            inserted = self._insert_batch(conn, file_type, batch)
+                            inserted = self._insert_batch(
+                                conn, file_type, batch, in_transaction=transaction_started
+                            )
                             result.records_loaded += inserted
                             result.batches_committed += 1
                             batches_in_current_transaction += 1
@@ -905,7 +949,7 @@ class MAUDELoader:
                                 skipped = 0
                                 for record in batch:
                                     try:
-                                        # Use autocommit for single records
+                                        # Own transaction per record (see _insert_batch)
                                         self._insert_batch(conn, file_type, [record])
                                         salvaged += 1
                                     except Exception:
@@ -961,7 +1005,9 @@ class MAUDELoader:
             # Insert remaining records
             if batch:
                 try:
-                    inserted = self._insert_batch(conn, file_type, batch)
+                    inserted = self._insert_batch(
+                        conn, file_type, batch, in_transaction=transaction_started
+                    )
                     result.records_loaded += inserted
                     result.batches_committed += 1
                 except Exception as batch_err:
@@ -1025,6 +1071,8 @@ class MAUDELoader:
                     expected_count=result.source_record_count or 0,
                     loaded_count=result.records_loaded,
                     physical_line_count=physical_line_count,
+                    conn=conn,
+                    scope=self.validation_scope,
                 )
                 if not result.stage3_validation.passed:
                     logger.warning(
@@ -1047,7 +1095,8 @@ class MAUDELoader:
             # Real-time validation after file load
             # This catches data integrity issues immediately rather than at the end
             validation_passed, validation_issues = validate_after_file_load(
-                conn, file_type, filepath.name, expected_min=0
+                conn, file_type, filepath.name, expected_min=0,
+                scope=self.validation_scope,
             )
             if validation_issues:
                 for issue in validation_issues:
@@ -1113,6 +1162,7 @@ class MAUDELoader:
         conn: duckdb.DuckDBPyConnection,
         file_type: str,
         batch: List[Dict[str, Any]],
+        in_transaction: bool = False,
     ) -> int:
         """
         Insert a batch of records into the database using fast bulk insert.
@@ -1129,10 +1179,15 @@ class MAUDELoader:
            DELETE existing records for MDR keys in batch, then INSERT.
            This prevents duplicates when re-loading files.
 
+        The change_log rows, DELETE and INSERT commit or roll back together:
+        outside a caller's transaction the batch runs in its own, so a batch
+        that fails to insert leaves no change_log rows behind.
+
         Args:
             conn: Database connection.
             file_type: Type of records.
             batch: List of record dictionaries.
+            in_transaction: The caller has a transaction open on ``conn``.
 
         Returns:
             Number of records inserted (after deduplication).
@@ -1174,7 +1229,17 @@ class MAUDELoader:
         col_names = ", ".join(columns)
         select_cols = ", ".join([f'"{c}"' for c in columns])
 
+        if not in_transaction:
+            conn.execute("BEGIN TRANSACTION")
         try:
+            # Log touched keys before the write so inserts and updates can be told apart
+            if (
+                self.track_changes
+                and self.run_id is not None
+                and table_name in TRACKED_TABLES
+            ):
+                record_changes(conn, self.run_id, table_name, df)
+
             # For child tables, DELETE existing records first to prevent duplicates
             # This is necessary because:
             # 1. Child tables don't have unique constraints on (mdr_report_key + sequence)
@@ -1219,14 +1284,18 @@ class MAUDELoader:
                 insert_cmd = "INSERT INTO"
 
             conn.execute(f"{insert_cmd} {table_name} ({col_names}) SELECT {select_cols} FROM df")
-            return len(df)
         except Exception as e:
+            if not in_transaction:
+                conn.execute("ROLLBACK")
             # Log error details for debugging
             if len(df) > 0:
                 logger.debug(f"Batch insert error: {e}")
                 logger.debug(f"First record mdr_report_key: {df.iloc[0].get('mdr_report_key', 'N/A')}")
             # Re-raise to allow caller to handle (single-record recovery)
             raise
+        if not in_transaction:
+            conn.execute("COMMIT")
+        return len(df)
 
     def _get_table_name(self, file_type: str) -> str:
         """Get database table name for file type."""
@@ -18,11 +18,13 @@ Use this module ONLY for:
 For data ingestion, use FDA download files via the download.py module.
 """
 
+import threading
 import time
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Generator
+from typing import Any, Callable, Dict, Iterator, List, Optional, Generator, Tuple
 from dataclasses import dataclass, field
 import sys
 
@@ -31,15 +33,110 @@ sys.path.insert(0, str(PROJECT_ROOT))
 
 from config import config
 from config.logging_config import get_logger
+from src.ingestion.download import conditional_headers, parse_http_date
+from src.ingestion.openfda_cache import OpenFDACache, make_cache_key
 
 logger = get_logger("openfda")
 
-# openFDA API endpoints
-OPENFDA_BASE_URL = "https://api.fda.gov/device/event.json"
-
 # Rate limiting
 DEFAULT_RATE_LIMIT = 40  # requests per minute without API key
 API_KEY_RATE_LIMIT = 240  # requests per minute with API key
+DEFAULT_DAILY_LIMIT = 1000  # requests per day without API key
+API_KEY_DAILY_LIMIT = 120000  # requests per day with API key
+
+# Pagination
+PAGE_SIZE = 100  # records per request
+MAX_SKIP = 25000  # openFDA rejects larger skip values
+
+
+class RateLimitExceeded(RuntimeError):
+    """The daily openFDA request quota has been used up."""
+
+
+class TokenBucket:
+    """
+    Token bucket refilled at ``rate`` tokens per ``period`` seconds.
+
+    Not thread-safe on its own; RateLimiter serializes access.
+    """
+
+    def __init__(self, rate: float, period: float, capacity: Optional[float] = None):
+        self.refill_rate = rate / period
+        self.capacity = capacity if capacity is not None else rate
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def wait_time(self, now: float) -> float:
+        """Seconds until a token is available (0 if one is available now)."""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.refill_rate)
+        self.updated = now
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.refill_rate
+
+    def take(self) -> None:
+        self.tokens -= 1
+
+
+class RateLimiter:
+    """
+    Thread-safe limiter enforcing openFDA's per-minute and per-day quotas.
+
+    One limiter is shared by all workers of an OpenFDAClient, and can be
+    shared between clients that use the same API key.
+    """
+
+    def __init__(
+        self,
+        per_minute: int,
+        per_day: int,
+        burst: Optional[int] = None,
+        max_wait: float = 120.0,
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            per_minute: Requests allowed per minute.
+            per_day: Requests allowed per day.
+            burst: Requests that may be sent back to back (default per_minute / 10).
+            max_wait: Longest acquire() will block before giving up on the
+                daily quota.
+        """
+        self.minute = TokenBucket(per_minute, 60.0, burst or max(1, per_minute // 10))
+        self.day = TokenBucket(per_day, 86400.0)
+        self.max_wait = max_wait
+        self._lock = threading.Lock()
+        self._paused_until = 0.0
+
+    def acquire(self) -> None:
+        """
+        Block until a request may be sent.
+
+        Raises:
+            RateLimitExceeded: If the daily quota will not allow a request
+                within max_wait seconds.
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                day_wait = self.day.wait_time(now)
+                if day_wait > self.max_wait:
+                    raise RateLimitExceeded(
+                        f"openFDA daily quota exhausted; next request allowed in "
+                        f"{day_wait / 60:.0f} minutes"
+                    )
+                wait = max(day_wait, self.minute.wait_time(now), self._paused_until - now)
+                if wait <= 0:
+                    self.minute.take()
+                    self.day.take()
+                    return
+            time.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every caller for ``seconds`` (e.g. after HTTP 429)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
 
 
 @dataclass
@@ -60,6 +157,13 @@ class OpenFDAClient:
         self,
         api_key: Optional[str] = None,
         rate_limit: Optional[int] = None,
+        daily_limit: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        base_url: Optional[str] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        max_skip: int = MAX_SKIP,
+        cache: Optional[OpenFDACache] = None,
+        use_cache: Optional[bool] = None,
     ):
         """
         Initialize the openFDA client.
@@ -67,21 +171,75 @@ class OpenFDAClient:
         Args:
             api_key: FDA API key (optional, but recommended for higher rate limits).
             rate_limit: Requests per minute (auto-detected based on API key).
+            daily_limit: Requests per day (auto-detected based on API key).
+            max_workers: Pages fetched concurrently (default config.api.max_workers).
+            base_url: Endpoint URL (default config.api.base_url).
+            rate_limiter: Limiter to share with other clients; one is created
+                from rate_limit and daily_limit if omitted.
+            max_skip: Largest skip value the endpoint accepts.
+            cache: Response cache to use; one is opened at config.api.cache_path
+                if omitted and caching is enabled.
+            use_cache: Enable the response cache (default config.api.cache_enabled).
         """
         self.api_key = api_key or config.api.fda_api_key
         self.rate_limit = rate_limit or (
             API_KEY_RATE_LIMIT if self.api_key else DEFAULT_RATE_LIMIT
         )
+        self.daily_limit = daily_limit or (
+            API_KEY_DAILY_LIMIT if self.api_key else DEFAULT_DAILY_LIMIT
+        )
+        self.base_url = base_url or config.api.base_url
+        self.max_workers = max(1, max_workers or config.api.max_workers)
+        self.max_skip = max_skip
+        self.rate_limiter = rate_limiter or RateLimiter(self.rate_limit, self.daily_limit)
         self.session = requests.Session()
-        self.last_request_time = 0.0
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=self.max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.use_cache = config.api.cache_enabled if use_cache is None else use_cache
+        self._cache = cache
+        self._count_lock = threading.Lock()
         self._request_count = 0
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._cache_revalidated = 0
+
+    @property
+    def cache(self) -> Optional[OpenFDACache]:
+        """Response cache, opened on first use (None when caching is disabled)."""
+        if not self.use_cache:
+            return None
+        if self._cache is None:
+            with self._count_lock:
+                if self._cache is None:
+                    self._cache = OpenFDACache()
+        return self._cache
+
+    def _count_cache(self, outcome: str) -> None:
+        with self._count_lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
 
-    def _wait_for_rate_limit(self) -> None:
-        """Wait if necessary to respect rate limits."""
-        min_interval = 60.0 / self.rate_limit
-        elapsed = time.time() - self.last_request_time
-        if elapsed < min_interval:
-            time.sleep(min_interval - elapsed)
+    def cache_stats(self) -> Dict[str, Any]:
+        """
+        Response cache statistics for this client.
+
+        Returns:
+            Dictionary with hits (served without a request), revalidated
+            (answered 304), misses, network requests and hit_rate, plus the
+            cache's entry count and size when caching is enabled.
+        """
+        with self._count_lock:
+            stats = {
+                "hits": self._cache_hits,
+                "revalidated": self._cache_revalidated,
+                "misses": self._cache_misses,
+                "requests": self._request_count,
+            }
+        lookups = stats["hits"] + stats["revalidated"] + stats["misses"]
+        stats["hit_rate"] = (stats["hits"] + stats["revalidated"]) / lookups if lookups else 0.0
+        if self.cache:
+            stats.update(self.cache.stats())
+        return stats
 
     def _make_request(
         self,
@@ -92,6 +250,10 @@ class OpenFDAClient:
         """
         Make a single API request.
 
+        Safe to call from several threads; every network request draws from
+        the shared rate limiter. With a cache, fresh entries are returned
+        without a request and stale ones are revalidated conditionally.
+
         Args:
             search: Search query string.
             skip: Number of records to skip.
@@ -100,11 +262,19 @@ class OpenFDAClient:
         Returns:
             API response as dictionary.
         """
-        self._wait_for_rate_limit()
+        key = entry = None
+        if self.cache:
+            key = make_cache_key(self.base_url, search, skip, limit)
+            entry = self.cache.get(key)
+            if entry and entry.is_fresh(self.cache.ttl):
+                self._count_cache("_cache_hits")
+                return entry.data
+
+        self.rate_limiter.acquire()
 
         params = {
             "skip": skip,
-            "limit": min(limit, 100),  # API max is 100
+            "limit": min(limit, PAGE_SIZE),  # API max is 100
         }
 
         if search:
@@ -116,28 +286,184 @@ class OpenFDAClient:
         logger.debug(f"API request: skip={skip}, limit={limit}")
 
         try:
+            headers = (
+                conditional_headers(entry.etag, parse_http_date(entry.last_modified))
+                if entry else {}
+            )
             response = self.session.get(
-                OPENFDA_BASE_URL,
+                self.base_url,
                 params=params,
+                headers=headers,
                 timeout=60,
             )
-            self.last_request_time = time.time()
-            self._request_count += 1
+            with self._count_lock:
+                self._request_count += 1
+
+            if response.status_code == 304 and entry:
+                self.cache.touch(key)
+                self._count_cache("_cache_revalidated")
+                return entry.data
 
             if response.status_code == 404:
                 # No results found
-                return {"meta": {"results": {"total": 0}}, "results": []}
-
-            response.raise_for_status()
-            return response.json()
+                data = {"meta": {"results": {"total": 0}}, "results": []}
+            else:
+                response.raise_for_status()
+                data = response.json()
+
+            if self.cache:
+                self._count_cache("_cache_misses")
+                self.cache.put(
+                    key, data, search=search, skip=skip, limit=limit,
+                    etag=response.headers.get("ETag"),
+                    last_modified=response.headers.get("Last-Modified"),
+                )
+            return data
 
         except requests.exceptions.HTTPError as e:
             if response.status_code == 429:
-                logger.warning("Rate limit exceeded, waiting 60 seconds...")
-                time.sleep(60)
+                retry_after = response.headers.get("Retry-After", "")
+                wait = int(retry_after) if retry_after.isdigit() else 60
+                logger.warning(f"Rate limit exceeded, pausing requests for {wait} seconds...")
+                self.rate_limiter.pause(wait)
                 return self._make_request(search, skip, limit)
             raise
 
+    def _build_search_query(
+        self,
+        product_codes: Optional[List[str]],
+        manufacturers: Optional[List[str]],
+        event_type: Optional[str],
+        date_received_start: Optional[date],
+        date_received_end: Optional[date],
+    ) -> Optional[str]:
+        """Build the openFDA search expression (None matches everything)."""
+        # Note: openFDA uses space as AND, and quotes for exact matches
+        search_parts = []
+
+        if product_codes:
+            # Use OR for multiple product codes
+            codes_query = " OR ".join([f'device.device_report_product_code:{c}' for c in product_codes])
+            if len(product_codes) > 1:
+                codes_query = f"({codes_query})"
+            search_parts.append(codes_query)
+
+        if manufacturers:
+            mfr_query = " OR ".join([f'device.manufacturer_d_name:"{m}"' for m in manufacturers])
+            if len(manufacturers) > 1:
+                mfr_query = f"({mfr_query})"
+            search_parts.append(mfr_query)
+
+        if date_received_start or date_received_end:
+            start_str = date_received_start.strftime("%Y%m%d") if date_received_start else "*"
+            end_str = date_received_end.strftime("%Y%m%d") if date_received_end else "*"
+            search_parts.append(f"date_received:[{start_str} TO {end_str}]")
+
+        if event_type:
+            search_parts.append(f'event_type:{event_type}')
+
+        return " AND ".join(search_parts) if search_parts else None
+
+    def _imap(self, func: Callable, items: List[Any], name: str) -> Iterator[Any]:
+        """Apply func to items on the worker pool, yielding results in order."""
+        if self.max_workers == 1 or len(items) <= 1:
+            for item in items:
+                yield func(item)
+            return
+
+        workers = min(self.max_workers, len(items))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=name) as pool:
+            futures = [pool.submit(func, item) for item in items]
+            try:
+                for future in futures:
+                    yield future.result()
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    def _count(self, search: Optional[str]) -> int:
+        """Number of records matching a search."""
+        response = self._make_request(search=search, skip=0, limit=1)
+        return response.get("meta", {}).get("results", {}).get("total", 0)
+
+    def _plan_windows(
+        self,
+        query_for: Callable[[Optional[date], Optional[date]], Optional[str]],
+        start: Optional[date],
+        end: Optional[date],
+    ) -> List[Tuple[Optional[str], int]]:
+        """
+        Split a date range until every window's matches are reachable by skip.
+
+        openFDA refuses skip values above max_skip, so a window matching more
+        records than max_skip + PAGE_SIZE is divided into day-aligned
+        sub-windows, which are counted concurrently and split again if needed.
+
+        Returns:
+            (search query, total) for each non-empty window, in date order.
+        """
+        ceiling = self.max_skip + PAGE_SIZE
+        total = self._count(query_for(start, end))
+        pending = [(start, end, total)]
+        windows = []
+
+        while pending:
+            to_count = []
+            for win_start, win_end, matches in pending:
+                if matches == 0:
+                    continue
+                if matches <= ceiling or not (win_start and win_end) or win_start >= win_end:
+                    if matches > ceiling:
+                        logger.warning(
+                            f"{matches:,} records match a single window; only the "
+                            f"first {ceiling:,} can be paged"
+                        )
+                    windows.append((win_start, query_for(win_start, win_end), matches))
+                    continue
+
+                days = (win_end - win_start).days + 1
+                parts = min(days, -(-matches // ceiling))
+                step = -(-days // parts)
+                for offset in range(0, days, step):
+                    sub_start = win_start + timedelta(days=offset)
+                    sub_end = min(win_end, sub_start + timedelta(days=step - 1))
+                    to_count.append((sub_start, sub_end))
+
+            if to_count:
+                logger.debug(f"Counting {len(to_count)} date sub-windows")
+            counts = self._imap(lambda w: self._count(query_for(*w)), to_count, "openfda-count")
+            pending = [(s, e, n) for (s, e), n in zip(to_count, counts)]
+
+        windows.sort(key=lambda w: w[0] or date.min)
+        return [(query, matches) for _, query, matches in windows]
+
+    def _fetch_pages(
+        self,
+        windows: List[Tuple[Optional[str], int]],
+        max_records: int,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Fetch up to max_records from the planned windows, page by page, in order."""
+        ceiling = self.max_skip + PAGE_SIZE
+        pages = []
+        remaining = max_records
+
+        for query, matches in windows:
+            take = min(matches, remaining, ceiling)
+            for skip in range(0, take, PAGE_SIZE):
+                pages.append((query, skip, min(PAGE_SIZE, take - skip)))
+            remaining -= take
+            if remaining <= 0:
+                break
+
+        logger.debug(f"Fetching {len(pages)} pages with up to {self.max_workers} workers")
+        responses = self._imap(
+            lambda page: self._make_request(search=page[0], skip=page[1], limit=page[2]),
+            pages,
+            "openfda",
+        )
+        for response in responses:
+            yield response.get("results", [])
+
     def search(
         self,
         product_codes: Optional[List[str]] = None,
@@ -150,6 +476,10 @@ class OpenFDAClient:
         """
         Search for device adverse events.
 
+        Pages are fetched concurrently within the client's rate limits. When
+        more records match than a single query can page through, the date
+        range is split into sub-windows.
+
         Args:
             product_codes: Filter by product codes.
             manufacturers: Filter by manufacturer names.
@@ -164,37 +494,12 @@ class OpenFDAClient:
         start_time = datetime.now()
         result = OpenFDAResult()
 
-        # Build search query
-        # Note: openFDA uses space as AND, and quotes for exact matches
-        search_parts = []
-
-        if product_codes:
-            # Use OR for multiple product codes
-            codes_query = " OR ".join([f'device.device_report_product_code:{c}' for c in product_codes])
-            if len(product_codes) > 1:
-                codes_query = f"({codes_query})"
-            search_parts.append(codes_query)
-
-        if manufacturers:
-            mfr_query = " OR ".join([f'device.manufacturer_d_name:"{m}"' for m in manufacturers])
-            if len(manufacturers) > 1:
-                mfr_query = f"({mfr_query})"
-            search_parts.append(mfr_query)
-
-        if date_received_start or date_received_end:
-            start_str = date_received_start.strftime("%Y%m%d") if date_received_start else "*"
-            end_str = date_received_end.strftime("%Y%m%d") if date_received_end else "*"
-            search_parts.append(f"date_received:[{start_str} TO {end_str}]")
-
-        if event_type:
-            search_parts.append(f'event_type:{event_type}')
-
-        search_query = " AND ".join(search_parts) if search_parts else None
+        def query_for(start: Optional[date], end: Optional[date]) -> Optional[str]:
+            return self._build_search_query(product_codes, manufacturers, event_type, start, end)
 
         try:
-            # First request to get total count
-            response = self._make_request(search=search_query, skip=0, limit=1)
-            result.total_records = response.get("meta", {}).get("results", {}).get("total", 0)
+            windows = self._plan_windows(query_for, date_received_start, date_received_end)
+            result.total_records = sum(matches for _, matches in windows)
 
             if result.total_records == 0:
                 logger.info("No records found matching search criteria")
@@ -204,23 +509,9 @@ class OpenFDAClient:
 
             # Fetch records in batches
             records_to_fetch = min(result.total_records, max_records)
-            skip = 0
-
-            while result.records_fetched < records_to_fetch:
-                batch_size = min(100, records_to_fetch - result.records_fetched)
-                response = self._make_request(
-                    search=search_query,
-                    skip=skip,
-                    limit=batch_size,
-                )
-
-                batch = response.get("results", [])
-                if not batch:
-                    break
-
+            for batch in self._fetch_pages(windows, records_to_fetch):
                 result.records.extend(batch)
                 result.records_fetched += len(batch)
-                skip += len(batch)
 
                 logger.debug(f"Fetched {result.records_fetched}/{records_to_fetch} records")
 
@@ -0,0 +1,259 @@
+"""Persistent response cache for the openFDA API client.
+
+Responses are stored in a SQLite file (``config.api.cache_path``) keyed by
+the normalized search expression, skip and limit, so identical pages are
+not re-requested across runs, retries or processes. Each entry carries the
+server's validators: once its TTL has passed it is revalidated with a
+conditional request instead of being fetched again. The file is kept under
+a size cap by evicting the least recently used entries.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from config import config
+from config.logging_config import get_logger
+
+logger = get_logger("openfda_cache")
+
+CREATE_RESPONSES = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    search TEXT,
+    skip INTEGER,
+    page_limit INTEGER,
+    body BLOB NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    fetched_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    size INTEGER NOT NULL
+)
+"""
+
+
+def _split_top_level(search: str, separator: str = " AND ") -> List[str]:
+    """Split on separator where it is outside parentheses and quotes."""
+    parts, depth, quoted, start, i = [], 0, False, 0, 0
+    while i < len(search):
+        char = search[i]
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char == "(":
+            depth += 1
+        elif not quoted and char == ")":
+            depth -= 1
+        elif not quoted and depth == 0 and search.startswith(separator, i):
+            parts.append(search[start:i])
+            i += len(separator)
+            start = i
+            continue
+        i += 1
+    parts.append(search[start:])
+    return parts
+
+
+def normalize_search(search: Optional[str]) -> str:
+    """
+    Normalize an openFDA search expression for use in a cache key.
+
+    Whitespace is collapsed and top-level AND clauses are sorted, so
+    queries that differ only in spacing or clause order share an entry.
+
+    Args:
+        search: openFDA search expression (None matches everything).
+
+    Returns:
+        Normalized expression ("" for None).
+    """
+    if not search:
+        return ""
+    collapsed = " ".join(search.split())
+    return " AND ".join(sorted(part.strip() for part in _split_top_level(collapsed)))
+
+
+def make_cache_key(base_url: str, search: Optional[str], skip: int, limit: int) -> str:
+    """Cache key for one page of an endpoint."""
+    key_data = json.dumps(
+        [base_url, normalize_search(search), int(skip), int(limit)], separators=(",", ":")
+    )
+    return hashlib.sha256(key_data.encode()).hexdigest()
+
+
+@dataclass
+class CacheEntry:
+    """A cached openFDA response."""
+
+    data: Dict[str, Any]
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+
+    def is_fresh(self, ttl: int, now: Optional[float] = None) -> bool:
+        """Whether the entry may be used without revalidation."""
+        return ((now or time.time()) - self.fetched_at) < ttl
+
+
+class OpenFDACache:
+    """SQLite-backed openFDA response cache with TTL and size cap."""
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        ttl: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ):
+        """
+        Open (or create) the cache.
+
+        Args:
+            path: SQLite file (default config.api.cache_path).
+            ttl: Seconds an entry is used without revalidation
+                (default config.api.cache_ttl).
+            max_bytes: Size cap for stored bodies (default config.api.cache_max_mb).
+        """
+        self.path = Path(path or config.api.cache_path)
+        self.ttl = config.api.cache_ttl if ttl is None else ttl
+        self.max_bytes = max_bytes or config.api.cache_max_mb * 1024 * 1024
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(CREATE_RESPONSES)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed_at)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """
+        Look up an entry, fresh or stale, and mark it recently used.
+
+        Args:
+            key: Key from make_cache_key().
+
+        Returns:
+            CacheEntry, or None if the key is not cached.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, etag, last_modified, fetched_at FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key)
+            )
+            self._conn.commit()
+
+        body, etag, last_modified, fetched_at = row
+        return CacheEntry(
+            data=json.loads(zlib.decompress(body)),
+            etag=etag,
+            last_modified=last_modified,
+            fetched_at=fetched_at,
+        )
+
+    def put(
+        self,
+        key: str,
+        data: Dict[str, Any],
+        search: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 0,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        """
+        Store a response, then evict least recently used entries over the cap.
+
+        Args:
+            key: Key from make_cache_key().
+            data: Decoded JSON response.
+            search: Search expression (stored for inspection only).
+            skip: Skip of the request.
+            limit: Limit of the request.
+            etag: ETag response header.
+            last_modified: Last-Modified response header.
+        """
+        body = zlib.compress(json.dumps(data, separators=(",", ":")).encode())
+        if len(body) > self.max_bytes:
+            logger.debug(f"Response of {len(body):,} bytes exceeds cache size cap; not cached")
+            return
+
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO responses
+                    (key, search, skip, page_limit, body, etag, last_modified,
+                     fetched_at, accessed_at, size)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (key, search, skip, limit, body, etag, last_modified, now, now, len(body)),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def touch(self, key: str) -> None:
+        """Restart an entry's TTL after a successful revalidation."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE responses SET fetched_at = ?, accessed_at = ? WHERE key = ?",
+                (now, now, key),
+            )
+            self._conn.commit()
+
+    def _evict(self) -> int:
+        """Delete least recently used entries until under max_bytes (lock held)."""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return 0
+
+        evicted = 0
+        rows = self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at, fetched_at"
+        ).fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            evicted += 1
+
+        logger.debug(f"Evicted {evicted} openFDA cache entries")
+        return evicted
+
+    def stats(self) -> Dict[str, Any]:
+        """Entry count and stored size."""
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        return {
+            "entries": entries,
+            "size_bytes": size,
+            "max_bytes": self.max_bytes,
+            "ttl": self.ttl,
+        }
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Close the underlying SQLite connection."""
+        with self._lock:
+            self._conn.close()
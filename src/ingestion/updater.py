@@ -1,6 +1,7 @@
 """Incremental update module for MAUDE data."""
 
 import duckdb
+import time
 from datetime import datetime, date, timedelta
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
@@ -14,12 +15,37 @@ sys.path.insert(0, str(PROJECT_ROOT))
 from config import config, MANUFACTURER_MAPPINGS
 from config.logging_config import get_logger
 from src.database import get_connection, get_table_counts
-from src.ingestion.download import MAUDEDownloader, FDA_DOWNLOAD_BASE
+from src.database.change_log import OP_INSERT, record_changes, start_run
+from src.ingestion.download import MAUDEDownloader
 from src.ingestion.loader import MAUDELoader, LoadResult
 from src.ingestion.openfda import OpenFDAClient, OpenFDAResult
 
 logger = get_logger("updater")
 
+# Columns written for openFDA records (everything else stays NULL)
+OPENFDA_MASTER_COLUMNS = [
+    "mdr_report_key", "event_key", "report_number", "date_received", "date_of_event",
+    "manufacturer_name", "manufacturer_clean", "product_code", "event_type",
+    "type_of_report", "product_problem_flag", "adverse_event_flag",
+    "report_source_code", "event_location", "pma_pmn_number",
+]
+OPENFDA_DEVICE_COLUMNS = [
+    "mdr_report_key", "device_event_key", "device_sequence_number",
+    "brand_name", "generic_name", "manufacturer_d_name", "manufacturer_d_clean",
+    "manufacturer_d_city", "manufacturer_d_state", "manufacturer_d_country",
+    "device_report_product_code", "model_number", "catalog_number", "lot_number",
+    "device_availability", "device_age_text",
+]
+OPENFDA_TEXT_COLUMNS = ["mdr_report_key", "text_type_code", "text_content"]
+
+# openFDA spells out narrative types; mdr_text stores the MAUDE code
+OPENFDA_TEXT_TYPE_CODES = {
+    "Description of Event or Problem": "D",
+    "Manufacturer Evaluation Summary": "E",
+    "Additional Manufacturer Narrative": "N",
+}
+MAUDE_TEXT_TYPE_CODES = {"D", "E", "N", "H", "A", "B", "C", "F", "R", ""}
+
 
 class UpdateSource(Enum):
     """Source of update data."""
@@ -40,6 +66,7 @@ class UpdateStatus:
     records_skipped: int = 0
     errors: List[str] = field(default_factory=list)
     success: bool = False
+    timings: Dict[str, float] = field(default_factory=dict)
 
     @property
     def duration_seconds(self) -> float:
@@ -68,6 +95,7 @@ class DataUpdater:
         self,
         db_path: Optional[Path] = None,
         data_dir: Optional[Path] = None,
+        track_changes: bool = True,
     ):
         """
         Initialize the updater.
@@ -75,9 +103,11 @@ class DataUpdater:
         Args:
             db_path: Path to database file.
             data_dir: Path to raw data directory.
+            track_changes: Record openFDA inserts in the change_log table.
         """
         self.db_path = db_path or config.database.path
         self.data_dir = data_dir or config.data.raw_path
+        self.track_changes = track_changes
         self.downloader = MAUDEDownloader(output_dir=self.data_dir)
         self.loader = MAUDELoader(db_path=self.db_path)
         self.openfda_client = OpenFDAClient()
@@ -164,14 +194,9 @@ class DataUpdater:
                 continue
 
             logger.info(f"Downloading {len(files)} new {file_type} files...")
-            type_results = []
-
-            for filename in files:
-                url = FDA_DOWNLOAD_BASE + filename
-                result = self.downloader._download_file(url)
-                type_results.append(result)
-
-            results[file_type] = type_results
+            results[file_type] = self.downloader.download_many(
+                [(self.downloader.base_url + filename, file_type) for filename in files]
+            )
 
         return results
 
@@ -277,10 +302,12 @@ class DataUpdater:
         try:
             # Fetch from API
             logger.info(f"Fetching records from openFDA (last {days} days)...")
+            started = time.perf_counter()
             api_result = self.openfda_client.get_recent_events(
                 days=days,
                 max_records=max_records,
             )
+            status.timings["fetch"] = time.perf_counter() - started
 
             if api_result.error:
                 status.errors.append(api_result.error)
@@ -296,34 +323,7 @@ class DataUpdater:
 
             # Load into database
             with get_connection(self.db_path) as conn:
-                for record in api_result.records:
-                    try:
-                        transformed = self.openfda_client.transform_to_maude_format(record)
-
-                        # Check if record exists
-                        mdr_key = transformed["master"].get("mdr_report_key")
-                        if not mdr_key:
-                            status.records_skipped += 1
-                            continue
-
-                        existing = conn.execute(
-                            "SELECT 1 FROM master_events WHERE mdr_report_key = ?",
-                            [mdr_key]
-                        ).fetchone()
-
-                        if existing:
-                            # Update existing record
-                            self._update_record(conn, transformed)
-                            status.records_updated += 1
-                        else:
-                            # Insert new record
-                            self._insert_record(conn, transformed)
-                            status.records_added += 1
-
-                    except Exception as e:
-                        status.records_skipped += 1
-                        if len(status.errors) < 10:
-                            status.errors.append(str(e))
+                self._merge_openfda_records(conn, api_result.records, status)
 
                 # Log ingestion
                 self._log_api_ingestion(conn, status, days)
@@ -335,121 +335,217 @@ class DataUpdater:
             logger.error(f"openFDA update failed: {e}")
 
         status.completed_at = datetime.now()
+        if status.timings:
+            logger.info(
+                "openFDA update timings: "
+                + ", ".join(f"{stage} {seconds:.2f}s" for stage, seconds in status.timings.items())
+            )
         return status
 
-    def _insert_record(
+    def _stage_openfda_records(
         self,
-        conn: duckdb.DuckDBPyConnection,
-        transformed: Dict[str, Any],
-    ) -> None:
-        """Insert a new record from openFDA."""
-        master = transformed["master"]
-
-        # Clean manufacturer name
-        manufacturer_clean = self._clean_manufacturer(master.get("manufacturer_name"))
-
-        # Insert master record
-        conn.execute("""
-            INSERT INTO master_events (
-                mdr_report_key, event_key, report_number, date_received, date_of_event,
-                manufacturer_name, manufacturer_clean, product_code, event_type,
-                type_of_report, product_problem_flag, adverse_event_flag,
-                report_source_code, event_location, pma_pmn_number,
-                received_year, received_month, source_file
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            master.get("mdr_report_key"),
-            master.get("event_key"),
-            master.get("report_number"),
-            master.get("date_received"),
-            master.get("date_of_event"),
-            master.get("manufacturer_name"),
-            manufacturer_clean,
-            master.get("product_code"),
-            master.get("event_type"),
-            master.get("type_of_report"),
-            master.get("product_problem_flag"),
-            master.get("adverse_event_flag"),
-            master.get("report_source_code"),
-            master.get("event_location"),
-            master.get("pma_pmn_number"),
-            master.get("date_received").year if master.get("date_received") else None,
-            master.get("date_received").month if master.get("date_received") else None,
-            "openfda_api",
-        ))
-
-        # Insert device record
-        device = transformed["device"]
-        if device.get("mdr_report_key"):
-            device_clean = self._clean_manufacturer(device.get("manufacturer_d_name"))
-            conn.execute("""
-                INSERT INTO devices (
-                    mdr_report_key, device_event_key, device_sequence_number,
-                    brand_name, generic_name, manufacturer_d_name, manufacturer_d_clean,
-                    manufacturer_d_city, manufacturer_d_state, manufacturer_d_country,
-                    device_report_product_code, model_number, catalog_number, lot_number,
-                    device_availability, device_age_text, source_file
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                device.get("mdr_report_key"),
-                device.get("device_event_key"),
-                device.get("device_sequence_number"),
-                device.get("brand_name"),
-                device.get("generic_name"),
-                device.get("manufacturer_d_name"),
-                device_clean,
-                device.get("manufacturer_d_city"),
-                device.get("manufacturer_d_state"),
-                device.get("manufacturer_d_country"),
-                device.get("device_report_product_code"),
-                device.get("model_number"),
-                device.get("catalog_number"),
-                device.get("lot_number"),
-                device.get("device_availability"),
-                device.get("device_age_text"),
-                "openfda_api",
-            ))
+        records: List[Dict[str, Any]],
+        status: UpdateStatus,
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Transform openFDA records into master, device and text staging rows.
+
+        Each row carries the record's position in the fetch (``ordinal``) so
+        the merge can tell the first occurrence of a key from later ones.
+        Records that fail to transform or have no MDR key are skipped.
+
+        Returns:
+            (master rows, device rows, text rows).
+        """
+        masters, devices, texts = [], [], []
+
+        for ordinal, record in enumerate(records):
+            try:
+                transformed = self.openfda_client.transform_to_maude_format(record)
+            except Exception as e:
+                status.records_skipped += 1
+                if len(status.errors) < 10:
+                    status.errors.append(str(e))
+                continue
+
+            master = transformed["master"]
+            mdr_key = master.get("mdr_report_key")
+            if not mdr_key:
+                status.records_skipped += 1
+                continue
 
-        # Insert text records
-        for text in transformed.get("text", []):
-            if text.get("mdr_report_key") and text.get("text_content"):
-                conn.execute("""
-                    INSERT INTO mdr_text (mdr_report_key, text_type_code, text_content, source_file)
-                    VALUES (?, ?, ?, ?)
-                """, (
-                    text.get("mdr_report_key"),
-                    text.get("text_type_code"),
-                    text.get("text_content"),
-                    "openfda_api",
-                ))
-
-    def _update_record(
+            master_row = {c: master.get(c) for c in OPENFDA_MASTER_COLUMNS}
+            master_row["manufacturer_clean"] = self._clean_manufacturer(master.get("manufacturer_name"))
+            for col in ("date_received", "date_of_event"):
+                if isinstance(master_row[col], date):
+                    master_row[col] = master_row[col].isoformat()
+            master_row["ordinal"] = ordinal
+            masters.append(master_row)
+
+            device = transformed["device"]
+            if device.get("mdr_report_key"):
+                device_row = {c: device.get(c) for c in OPENFDA_DEVICE_COLUMNS}
+                device_row["manufacturer_d_clean"] = self._clean_manufacturer(
+                    device.get("manufacturer_d_name")
+                )
+                device_row["ordinal"] = ordinal
+                devices.append(device_row)
+
+            for position, text in enumerate(transformed.get("text", [])):
+                if not (text.get("mdr_report_key") and text.get("text_content")):
+                    continue
+                type_code = text.get("text_type_code")
+                type_code = OPENFDA_TEXT_TYPE_CODES.get(type_code, type_code)
+                texts.append({
+                    "mdr_report_key": mdr_key,
+                    "text_type_code": type_code if type_code in MAUDE_TEXT_TYPE_CODES else None,
+                    "text_content": text.get("text_content"),
+                    "ordinal": ordinal,
+                    "position": position,
+                })
+
+        return masters, devices, texts
+
+    def _merge_openfda_records(
         self,
         conn: duckdb.DuckDBPyConnection,
-        transformed: Dict[str, Any],
+        records: List[Dict[str, Any]],
+        status: UpdateStatus,
     ) -> None:
-        """Update an existing record from openFDA."""
-        # For now, just update the text if new narratives exist
-        mdr_key = transformed["master"].get("mdr_report_key")
-
-        for text in transformed.get("text", []):
-            if text.get("text_content"):
-                # Check if text exists
-                existing = conn.execute("""
-                    SELECT 1 FROM mdr_text
-                    WHERE mdr_report_key = ? AND text_type_code = ?
-                """, [mdr_key, text.get("text_type_code")]).fetchone()
-
-                if not existing:
-                    conn.execute("""
-                        INSERT INTO mdr_text (mdr_report_key, text_type_code, text_content, source_file)
-                        VALUES (?, ?, ?, ?)
-                    """, (
-                        mdr_key,
-                        text.get("text_type_code"),
-                        text.get("text_content"),
-                        "openfda_api",
-                    ))
+        """
+        Merge fetched openFDA records with set-based statements.
+
+        The records are staged in temp tables and merged in one transaction:
+
+        - master_events and devices: keys not yet in master_events are
+          inserted (``ON CONFLICT DO NOTHING``); existing records are left
+          as they are, since openFDA only carries a subset of the fields.
+        - mdr_text: new records get all their narratives; existing records
+          get narratives whose (key, text type) is not stored yet.
+
+        A key that appears more than once in a fetch is inserted from its
+        first occurrence; later occurrences count as updates, as they did
+        when records were written one at a time.
+
+        Args:
+            conn: Database connection.
+            records: Records returned by OpenFDAClient.
+            status: UpdateStatus receiving counts and timings.
+        """
+        import pandas as pd
+
+        started = time.perf_counter()
+        masters, devices, texts = self._stage_openfda_records(records, status)
+        status.timings["transform"] = time.perf_counter() - started
+        if not masters:
+            return
+
+        started = time.perf_counter()
+        staging = {
+            "_openfda_master": pd.DataFrame(masters, columns=OPENFDA_MASTER_COLUMNS + ["ordinal"]),
+            "_openfda_devices": pd.DataFrame(devices, columns=OPENFDA_DEVICE_COLUMNS + ["ordinal"]),
+            "_openfda_text": pd.DataFrame(
+                texts, columns=OPENFDA_TEXT_COLUMNS + ["ordinal", "position"]
+            ).astype({"text_type_code": "object"}),
+        }
+        for name, df in staging.items():
+            conn.register(f"{name}_df", df)
+            conn.execute(f"CREATE OR REPLACE TEMP TABLE {name} AS SELECT * FROM {name}_df")
+            conn.unregister(f"{name}_df")
+
+        master_cols = ", ".join(OPENFDA_MASTER_COLUMNS)
+        device_cols = ", ".join(OPENFDA_DEVICE_COLUMNS)
+        first_occurrence = "QUALIFY ROW_NUMBER() OVER (PARTITION BY mdr_report_key ORDER BY ordinal) = 1"
+
+        conn.execute("BEGIN TRANSACTION")
+        try:
+            # Keys to insert, fixed before anything is written
+            conn.execute(f"""
+                CREATE OR REPLACE TEMP TABLE _openfda_new AS
+                SELECT mdr_report_key, ordinal AS first_ordinal, date_received
+                FROM _openfda_master s
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM master_events m WHERE m.mdr_report_key = s.mdr_report_key
+                )
+                {first_occurrence}
+            """)
+
+            # Narratives to insert: all of a new record's, plus unseen types
+            conn.execute("""
+                CREATE OR REPLACE TEMP TABLE _openfda_text_new AS
+                WITH staged AS (
+                    SELECT t.*, (n.first_ordinal IS NOT NULL AND t.ordinal = n.first_ordinal) AS is_new
+                    FROM _openfda_text t
+                    LEFT JOIN _openfda_new n USING (mdr_report_key)
+                )
+                SELECT mdr_report_key, text_type_code, text_content
+                FROM staged WHERE is_new
+                UNION ALL
+                SELECT mdr_report_key, text_type_code, text_content
+                FROM (
+                    SELECT * FROM staged t
+                    WHERE NOT is_new
+                      AND NOT EXISTS (
+                          SELECT 1 FROM mdr_text m
+                          WHERE m.mdr_report_key = t.mdr_report_key
+                            AND m.text_type_code IS NOT DISTINCT FROM t.text_type_code
+                      )
+                      AND NOT EXISTS (
+                          SELECT 1 FROM staged n
+                          WHERE n.is_new
+                            AND n.mdr_report_key = t.mdr_report_key
+                            AND n.text_type_code IS NOT DISTINCT FROM t.text_type_code
+                      )
+                    QUALIFY ROW_NUMBER() OVER (
+                        PARTITION BY mdr_report_key, text_type_code ORDER BY ordinal, position
+                    ) = 1
+                )
+            """)
+
+            inserted = conn.execute(f"""
+                INSERT INTO master_events (
+                    {master_cols}, received_year, received_month, source_file
+                )
+                SELECT {master_cols},
+                       YEAR(CAST(date_received AS DATE)), MONTH(CAST(date_received AS DATE)),
+                       'openfda_api'
+                FROM _openfda_master
+                WHERE mdr_report_key IN (SELECT mdr_report_key FROM _openfda_new)
+                {first_occurrence}
+                ON CONFLICT (mdr_report_key) DO NOTHING
+            """).fetchone()[0]
+
+            conn.execute(f"""
+                INSERT INTO devices ({device_cols}, source_file)
+                SELECT {device_cols}, 'openfda_api'
+                FROM _openfda_devices
+                WHERE mdr_report_key IN (SELECT mdr_report_key FROM _openfda_new)
+                {first_occurrence}
+            """)
+
+            conn.execute("""
+                INSERT INTO mdr_text (mdr_report_key, text_type_code, text_content, source_file)
+                SELECT mdr_report_key, text_type_code, text_content, 'openfda_api'
+                FROM _openfda_text_new
+            """)
+
+            if self.track_changes:
+                run_id = start_run(conn)
+                record_changes(conn, run_id, "master_events", "_openfda_new", OP_INSERT)
+                record_changes(conn, run_id, "devices", "_openfda_new", OP_INSERT)
+                record_changes(conn, run_id, "mdr_text", "_openfda_text_new", OP_INSERT)
+
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            for name in list(staging) + ["_openfda_new", "_openfda_text_new"]:
+                conn.execute(f"DROP TABLE IF EXISTS {name}")
+
+        status.records_added += inserted
+        status.records_updated += len(masters) - inserted
+        status.timings["merge"] = time.perf_counter() - started
 
     def _clean_manufacturer(self, name: Optional[str]) -> Optional[str]:
         """Clean and standardize manufacturer name."""
@@ -173,6 +173,64 @@ VALID_EVENT_TYPES = {"D", "IN", "M", "O", "*", "", None}
 VALID_SEX_VALUES = {"M", "F", "U", "Male", "Female", "Unknown", "", None}
 
 
+# =============================================================================
+# POST-LOAD VALIDATION SCOPE
+# =============================================================================
+
+# Post-load checks run either against the rows of the file just loaded
+# ("file", the default for per-file loads) or against the whole database
+# ("full", for nightly integrity runs).
+SCOPE_FILE = "file"
+SCOPE_FULL = "full"
+
+# Temp table holding the MDR keys of the file being validated
+SCOPE_KEY_TABLE = "_validation_scope_keys"
+
+CHILD_TABLES = {
+    "device": "devices",
+    "patient": "patients",
+    "text": "mdr_text",
+    "problem": "device_problems",
+}
+
+
+def create_scope_key_table(
+    conn,
+    table_name: str,
+    source_file: str,
+) -> int:
+    """
+    Materialize the MDR keys loaded from a source file into a temp table.
+
+    Scoped checks join against this table so their cost is proportional to
+    the rows loaded from the file rather than to the size of the database.
+
+    Args:
+        conn: Database connection.
+        table_name: Table the file was loaded into.
+        source_file: Value of source_file for the loaded rows.
+
+    Returns:
+        Number of distinct MDR keys in scope.
+    """
+    conn.execute(f"""
+        CREATE OR REPLACE TEMP TABLE {SCOPE_KEY_TABLE} AS
+        SELECT DISTINCT mdr_report_key
+        FROM {table_name}
+        WHERE source_file = ?
+          AND mdr_report_key IS NOT NULL
+    """, [source_file])
+    return conn.execute(f"SELECT COUNT(*) FROM {SCOPE_KEY_TABLE}").fetchone()[0]
+
+
+def drop_scope_key_table(conn) -> None:
+    """Drop the temp scope key table if it exists."""
+    try:
+        conn.execute(f"DROP TABLE IF EXISTS {SCOPE_KEY_TABLE}")
+    except Exception as e:
+        logger.debug(f"Could not drop scope key table: {e}")
+
+
 # =============================================================================
 # VALIDATION PIPELINE
 # =============================================================================
@@ -566,6 +624,8 @@ class ValidationPipeline:
         expected_count: int,
         loaded_count: int,
         physical_line_count: int = 0,
+        conn=None,
+        scope: str = SCOPE_FILE,
     ) -> StageValidationResult:
         """
         Stage 3: Post-Load Validation.
@@ -584,6 +644,9 @@ class ValidationPipeline:
             expected_count: Expected record count from CSV parsing (may be wrong).
             loaded_count: Actual records loaded.
             physical_line_count: Physical lines in source file (ground truth).
+            conn: Open connection to check against (opens db_path read-only if None).
+            scope: SCOPE_FILE to check only the keys loaded from this file,
+                SCOPE_FULL to check the whole child table.
 
         Returns:
             StageValidationResult with issues found.
@@ -639,8 +702,8 @@ class ValidationPipeline:
                 ))
 
         # Check for orphan records (only if db_path is set)
-        if self.db_path and file_type in ("device", "patient", "text", "problem"):
-            orphan_result = self._check_orphan_records(filename, file_type)
+        if (self.db_path or conn is not None) and file_type in CHILD_TABLES:
+            orphan_result = self._check_orphan_records(filename, file_type, conn=conn, scope=scope)
             if orphan_result:
                 result.add_issue(orphan_result)
                 result.metrics["orphan_count"] = orphan_result.actual_value
@@ -654,57 +717,87 @@ class ValidationPipeline:
         self,
         filename: str,
         file_type: str,
+        conn=None,
+        scope: str = SCOPE_FILE,
     ) -> Optional[ValidationIssue]:
         """
         Check for orphan records created by this file load.
 
+        In file scope only the MDR keys loaded from ``filename`` are checked
+        against master_events; in full scope every key in the child table is.
+
         Args:
             filename: Name of the loaded file.
             file_type: Type of file.
+            conn: Open connection to check against (opens db_path read-only if None).
+            scope: SCOPE_FILE or SCOPE_FULL.
 
         Returns:
             ValidationIssue if orphans found, None otherwise.
         """
-        table_map = {
-            "device": "devices",
-            "patient": "patients",
-            "text": "mdr_text",
-            "problem": "device_problems",
-        }
-
-        table_name = table_map.get(file_type)
+        table_name = CHILD_TABLES.get(file_type)
         if not table_name:
             return None
 
         try:
-            with get_connection(self.db_path, read_only=True) as conn:
-                # Count orphan records from this file
-                orphan_count = conn.execute(f"""
-                    SELECT COUNT(DISTINCT c.mdr_report_key)
-                    FROM {table_name} c
-                    WHERE c.source_file LIKE ?
-                      AND NOT EXISTS (
-                          SELECT 1 FROM master_events m
-                          WHERE m.mdr_report_key = c.mdr_report_key
-                      )
-                """, [f"%{filename}%"]).fetchone()[0]
-
-                if orphan_count > 0:
-                    return ValidationIssue(
-                        stage=3,
-                        category="referential_integrity",
-                        severity="WARNING",
-                        code="ORPHAN_RECORDS_CREATED",
-                        message=f"{orphan_count} orphan {file_type} records created",
-                        actual_value=orphan_count,
-                    )
+            if conn is not None:
+                orphan_count = self._count_orphans(conn, table_name, filename, scope)
+            else:
+                with get_connection(self.db_path, read_only=True) as own_conn:
+                    orphan_count = self._count_orphans(own_conn, table_name, filename, scope)
+
+            if orphan_count > 0:
+                return ValidationIssue(
+                    stage=3,
+                    category="referential_integrity",
+                    severity="WARNING",
+                    code="ORPHAN_RECORDS_CREATED",
+                    message=f"{orphan_count} orphan {file_type} records created",
+                    actual_value=orphan_count,
+                )
 
         except Exception as e:
             logger.warning(f"Could not check orphan records: {e}")
 
         return None
 
-    def validate_cross_table_integrity(self) -> StageValidationResult:
+    def _count_orphans(
+        self,
+        conn,
+        table_name: str,
+        filename: Optional[str],
+        scope: str,
+    ) -> int:
+        """Count distinct child MDR keys with no master_events parent."""
+        if scope == SCOPE_FULL or not filename:
+            return conn.execute(f"""
+                SELECT COUNT(DISTINCT c.mdr_report_key)
+                FROM {table_name} c
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM master_events m
+                    WHERE m.mdr_report_key = c.mdr_report_key
+                )
+            """).fetchone()[0]
+
+        try:
+            create_scope_key_table(conn, table_name, filename)
+            return self._count_scope_orphans(conn)
+        finally:
+            drop_scope_key_table(conn)
+
+    def _count_scope_orphans(self, conn) -> int:
+        """Count keys in the scope key table with no master_events parent."""
+        return conn.execute(f"""
+            SELECT COUNT(*)
+            FROM {SCOPE_KEY_TABLE} k
+            ANTI JOIN master_events m ON m.mdr_report_key = k.mdr_report_key
+        """).fetchone()[0]
+
+    def validate_cross_table_integrity(
+        self,
+        source_file: Optional[str] = None,
+        conn=None,
+    ) -> StageValidationResult:
         """
         Validate cross-table referential integrity.
 
@@ -713,6 +806,14 @@ class ValidationPipeline:
         - No orphan records exist
         - Coverage metrics are within thresholds
 
+        With ``source_file`` set, only the MDR keys loaded from that file are
+        checked (incremental mode). Without it every child table is scanned
+        in full, which is the mode nightly integrity runs should use.
+
+        Args:
+            source_file: Restrict checks to rows loaded from this file.
+            conn: Open connection to check against (opens db_path read-only if None).
+
         Returns:
             StageValidationResult with integrity issues.
         """
@@ -720,8 +821,9 @@ class ValidationPipeline:
             stage=3,
             stage_name="Cross-Table Integrity",
         )
+        result.metrics["scope"] = SCOPE_FILE if source_file else SCOPE_FULL
 
-        if not self.db_path:
+        if not self.db_path and conn is None:
             result.add_issue(ValidationIssue(
                 stage=3,
                 category="configuration",
@@ -731,55 +833,12 @@ class ValidationPipeline:
             ))
             return result
 
-        child_tables = [
-            ("devices", "device"),
-            ("patients", "patient"),
-            ("mdr_text", "text"),
-            ("device_problems", "problem"),
-        ]
-
         try:
-            with get_connection(self.db_path, read_only=True) as conn:
-                master_count = conn.execute(
-                    "SELECT COUNT(*) FROM master_events"
-                ).fetchone()[0]
-
-                result.metrics["master_count"] = master_count
-
-                for table_name, file_type in child_tables:
-                    try:
-                        # Count total and orphan records
-                        total = conn.execute(
-                            f"SELECT COUNT(DISTINCT mdr_report_key) FROM {table_name}"
-                        ).fetchone()[0]
-
-                        orphans = conn.execute(f"""
-                            SELECT COUNT(DISTINCT c.mdr_report_key)
-                            FROM {table_name} c
-                            WHERE NOT EXISTS (
-                                SELECT 1 FROM master_events m
-                                WHERE m.mdr_report_key = c.mdr_report_key
-                            )
-                        """).fetchone()[0]
-
-                        orphan_pct = (orphans / total * 100) if total > 0 else 0
-
-                        result.metrics[f"{file_type}_total"] = total
-                        result.metrics[f"{file_type}_orphans"] = orphans
-                        result.metrics[f"{file_type}_orphan_pct"] = round(orphan_pct, 2)
-
-                        if orphan_pct > 1.0:
-                            result.add_issue(ValidationIssue(
-                                stage=3,
-                                category="referential_integrity",
-                                severity="ERROR" if orphan_pct > 5.0 else "WARNING",
-                                code="HIGH_ORPHAN_RATE",
-                                message=f"{table_name}: {orphan_pct:.2f}% orphan records ({orphans:,} of {total:,})",
-                                actual_value=orphan_pct,
-                            ))
-
-                    except Exception as e:
-                        logger.warning(f"Could not check {table_name}: {e}")
+            if conn is not None:
+                self._check_cross_table(conn, result, source_file)
+            else:
+                with get_connection(self.db_path, read_only=True) as own_conn:
+                    self._check_cross_table(own_conn, result, source_file)
 
         except Exception as e:
             result.add_issue(ValidationIssue(
@@ -792,6 +851,55 @@ class ValidationPipeline:
 
         return result
 
+    def _check_cross_table(
+        self,
+        conn,
+        result: StageValidationResult,
+        source_file: Optional[str],
+    ) -> None:
+        """Populate orphan metrics and issues for each child table."""
+        if source_file is None:
+            master_count = conn.execute(
+                "SELECT COUNT(*) FROM master_events"
+            ).fetchone()[0]
+            result.metrics["master_count"] = master_count
+
+        for file_type, table_name in CHILD_TABLES.items():
+            try:
+                if source_file is None:
+                    # Count total and orphan records
+                    total = conn.execute(
+                        f"SELECT COUNT(DISTINCT mdr_report_key) FROM {table_name}"
+                    ).fetchone()[0]
+                    orphans = self._count_orphans(conn, table_name, None, SCOPE_FULL)
+                else:
+                    total = create_scope_key_table(conn, table_name, source_file)
+                    if total == 0:
+                        continue
+                    orphans = self._count_scope_orphans(conn)
+
+                orphan_pct = (orphans / total * 100) if total > 0 else 0
+
+                result.metrics[f"{file_type}_total"] = total
+                result.metrics[f"{file_type}_orphans"] = orphans
+                result.metrics[f"{file_type}_orphan_pct"] = round(orphan_pct, 2)
+
+                if orphan_pct > 1.0:
+                    result.add_issue(ValidationIssue(
+                        stage=3,
+                        category="referential_integrity",
+                        severity="ERROR" if orphan_pct > 5.0 else "WARNING",
+                        code="HIGH_ORPHAN_RATE",
+                        message=f"{table_name}: {orphan_pct:.2f}% orphan records ({orphans:,} of {total:,})",
+                        actual_value=orphan_pct,
+                    ))
+
+            except Exception as e:
+                logger.warning(f"Could not check {table_name}: {e}")
+            finally:
+                if source_file is not None:
+                    drop_scope_key_table(conn)
+
     def get_validation_summary(self) -> Dict[str, Any]:
         """Get summary of all validation statistics."""
         return {
@@ -109,3 +109,34 @@ def temp_data_dir(tmp_path):
     raw_dir.mkdir()
     processed_dir.mkdir()
     return tmp_path
+
+
+@pytest.fixture
+def mirror(tmp_path):
+    """Serve a directory over HTTP on localhost (see tests/fda_mirror.py)."""
+    from tests.fda_mirror import LocalMirror
+
+    root = tmp_path / "mirror"
+    root.mkdir()
+    local = LocalMirror(root).start()
+    yield local
+    local.stop()
+
+
+@pytest.fixture
+def maude_mirror(mirror):
+    """Local mirror publishing a generated week of MAUDE ADD and CHANGE files."""
+    from tests.fda_mirror import build_maude_tree
+
+    mirror.tree = build_maude_tree(mirror.root)
+    return mirror
+
+
+@pytest.fixture
+def openfda_server():
+    """Local fake of the openFDA device event endpoint (see tests/fake_openfda.py)."""
+    from tests.fake_openfda import FakeOpenFDA
+
+    server = FakeOpenFDA().start()
+    yield server
+    server.stop()
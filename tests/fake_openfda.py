@@ -0,0 +1,144 @@
+"""
+Local stand-in for the openFDA device event endpoint.
+
+FakeOpenFDA serves generated records with openFDA's response envelope,
+date_received range filtering, skip ceiling, 404-on-empty and optional 429
+throttling, and records every request so tests can check concurrency and
+request pacing. Responses carry an ETag and honour If-None-Match.
+"""
+
+import hashlib
+import http.server
+import json
+import re
+import threading
+import time
+from datetime import date, timedelta
+from urllib.parse import parse_qs, urlparse
+
+DATE_RANGE = re.compile(r"date_received:\[(\d{8}|\*) TO (\d{8}|\*)\]")
+
+
+class OpenFDAHandler(http.server.BaseHTTPRequestHandler):
+    """GET handler for /device/event.json."""
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        query = parse_qs(urlparse(self.path).query)
+        search = query.get("search", [""])[0]
+        skip = int(query.get("skip", ["0"])[0])
+        limit = int(query.get("limit", ["1"])[0])
+
+        with server.lock:
+            server.requests.append((time.monotonic(), search, skip, limit))
+            server.active += 1
+            server.peak_active = max(server.peak_active, server.active)
+            throttled = server.throttle > 0
+            if throttled:
+                server.throttle -= 1
+        try:
+            if server.delay:
+                time.sleep(server.delay)
+
+            if throttled:
+                self._send_json(429, {"error": {"code": "TOO_MANY_REQUESTS"}}, {"Retry-After": "1"})
+                return
+
+            if skip > server.max_skip:
+                self._send_json(400, {"error": {
+                    "code": "BAD_REQUEST",
+                    "message": f"Skip value must {server.max_skip} or less.",
+                }})
+                return
+
+            matches = self._matching(search)
+            if not matches:
+                self._send_json(404, {"error": {"code": "NOT_FOUND", "message": "No matches found!"}})
+                return
+
+            payload = {
+                "meta": {"results": {"skip": skip, "limit": limit, "total": len(matches)}},
+                "results": matches[skip:skip + limit],
+            }
+            etag = '"' + hashlib.md5(json.dumps(payload).encode()).hexdigest() + '"'
+            if self.headers.get("If-None-Match") == etag:
+                with server.lock:
+                    server.not_modified += 1
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+
+            self._send_json(200, payload, {"ETag": etag})
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def _matching(self, search):
+        match = DATE_RANGE.search(search)
+        if not match:
+            return self.server.records
+        low, high = match.groups()
+        low = "" if low == "*" else low
+        high = "99999999" if high == "*" else high
+        return [r for r in self.server.records if low <= r["date_received"] <= high]
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class FakeOpenFDA:
+    """Handle on a running OpenFDAHandler server."""
+
+    def __init__(self):
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), OpenFDAHandler)
+        self.server.daemon_threads = True
+        self.server.lock = threading.Lock()
+        self.server.records = []
+        self.server.requests = []
+        self.server.active = 0
+        self.server.peak_active = 0
+        self.server.delay = 0.0
+        self.server.throttle = 0
+        self.server.not_modified = 0
+        self.server.max_skip = 25000
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}/device/event.json"
+
+    @property
+    def requests(self):
+        return self.server.requests
+
+    def add_records(self, start: date, days: int, per_day: int):
+        """Publish per_day records for each of ``days`` days from ``start``."""
+        records = self.server.records
+        for day in range(days):
+            received = (start + timedelta(days=day)).strftime("%Y%m%d")
+            for _ in range(per_day):
+                key = str(1000001 + len(records))
+                records.append({
+                    "mdr_report_key": key,
+                    "report_number": f"3000000-2025-{key}",
+                    "date_received": received,
+                    "event_type": "Malfunction",
+                    "device": [{"device_report_product_code": "GZB"}],
+                })
+        records.sort(key=lambda r: r["date_received"])
+
+    def start(self):
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,307 @@
+"""
+Local stand-in for the FDA MAUDE download area.
+
+LocalMirror serves a directory over HTTP with the validators and range
+support of the real file area, and build_maude_tree() fills it with a
+generated, MAUDE-shaped set of ADD and CHANGE zips. Together they let the
+downloader, discovery, weekly refresh and admin refresh paths run offline.
+"""
+
+import http.server
+import threading
+import time
+import zipfile
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from typing import List
+
+from config.schema_registry import get_fda_columns
+
+
+class MirrorHandler(http.server.BaseHTTPRequestHandler):
+    """
+    Static file handler with ETag, conditional, byte-range and
+    failure-injection support.
+
+    Behaviour is driven by attributes on the server (see LocalMirror).
+    """
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_HEAD(self):
+        self._serve(body=False)
+
+    def do_GET(self):
+        self._serve(body=True)
+
+    def _serve(self, body):
+        server = self.server
+        name = self.path.lstrip("/")
+        with server.lock:
+            server.requests.append((self.command, name, self.headers.get("Range")))
+            server.active += 1
+            server.peak_active = max(server.peak_active, server.active)
+        try:
+            if server.delay:
+                time.sleep(server.delay)
+
+            path = server.root / name
+            if not path.is_file():
+                self.send_error(404)
+                return
+
+            stat = path.stat()
+            size = stat.st_size
+            etag = f'"{size:x}-{stat.st_mtime_ns:x}"'
+            last_modified = formatdate(stat.st_mtime, usegmt=True)
+
+            if self._not_modified(etag, int(stat.st_mtime)):
+                with server.lock:
+                    server.not_modified += 1
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+
+            start = 0
+            range_header = self.headers.get("Range")
+            if_range = self.headers.get("If-Range")
+
+            if range_header and server.ranges and (
+                server.ignore_if_range or if_range in (None, etag, last_modified)
+            ):
+                start = int(range_header.split("=")[1].split("-")[0])
+                if start >= size:
+                    self.send_error(416)
+                    return
+                self.send_response(206)
+                self.send_header("Content-Range", f"bytes {start}-{size - 1}/{size}")
+            else:
+                self.send_response(200)
+
+            self.send_header("Content-Length", str(size - start))
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", last_modified)
+            if server.ranges:
+                self.send_header("Accept-Ranges", "bytes")
+            self.end_headers()
+
+            if not body:
+                return
+
+            remaining = size - start
+            cut = server.fail_after.pop(name, None)
+            if cut is not None:
+                # Drop the connection part way through the body
+                remaining = min(cut, remaining)
+                self.close_connection = True
+
+            with open(path, "rb") as f:
+                f.seek(start)
+                while remaining > 0:
+                    chunk = f.read(min(64 * 1024, remaining))
+                    if not chunk:
+                        break
+                    self.wfile.write(chunk)
+                    remaining -= len(chunk)
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def _not_modified(self, etag, mtime):
+        """Evaluate If-None-Match / If-Modified-Since (RFC 9110 precedence)."""
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match:
+            return etag in [tag.strip() for tag in if_none_match.split(",")]
+
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if if_modified_since:
+            try:
+                since = parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return mtime <= since
+
+        return False
+
+
+class LocalMirror:
+    """Handle on a running MirrorHandler server."""
+
+    def __init__(self, root):
+        self.root = root
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), MirrorHandler)
+        self.server.daemon_threads = True
+        self.server.root = root
+        self.server.lock = threading.Lock()
+        self.server.requests = []
+        self.server.active = 0
+        self.server.peak_active = 0
+        self.server.not_modified = 0
+        self.server.ranges = True
+        self.server.ignore_if_range = False
+        self.server.delay = 0.0
+        self.server.fail_after = {}
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}/"
+
+    @property
+    def requests(self):
+        return self.server.requests
+
+    def url(self, name):
+        return self.base_url + name
+
+    def reset_counters(self):
+        with self.server.lock:
+            self.server.requests.clear()
+            self.server.peak_active = 0
+            self.server.not_modified = 0
+
+
+    def start(self):
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+# Weekly files published by FDA, by file type
+ADD_FILES = {
+    "master": "mdrfoiAdd",
+    "device": "foidevAdd",
+    "patient": "patientAdd",
+    "text": "foitextAdd",
+}
+CHANGE_FILES = {
+    "master": "mdrfoiChange",
+    "patient": "patientChange",
+}
+
+MANUFACTURERS = ["ABBOTT NEUROMODULATION", "MEDTRONIC, INC.", "BOSTON SCIENTIFIC CORP", "NEVRO CORP"]
+PRODUCT_CODES = ["GZB", "LGW", "PMP"]
+EVENT_TYPES = ["M", "IN", "O"]
+
+
+@dataclass
+class MaudeTree:
+    """What build_maude_tree() published."""
+
+    keys: List[str]
+    changed_keys: List[str]
+    files: List[str] = field(default_factory=list)
+
+
+def _fda_date(d: date) -> str:
+    return d.strftime("%m/%d/%Y")
+
+
+def _write_zip(root: Path, stem: str, file_type: str, rows: List[dict]) -> str:
+    """Write rows as a pipe-delimited member of <stem>.zip, FDA style."""
+    columns = get_fda_columns(file_type)
+    lines = ["|".join(columns)]
+    lines.extend("|".join(row.get(c, "") for c in columns) for row in rows)
+
+    zip_name = f"{stem}.zip"
+    with zipfile.ZipFile(root / zip_name, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr(f"{stem}.txt", ("\r\n".join(lines) + "\r\n").encode("latin-1"))
+    return zip_name
+
+
+def build_maude_tree(
+    root: Path,
+    reports: int = 500,
+    changes: int = 50,
+    first_key: int = 1000001,
+    received: date = date(2025, 1, 2),
+) -> MaudeTree:
+    """
+    Generate a week of MAUDE ADD and CHANGE files under root.
+
+    Every report gets one master, device, patient and narrative row. The
+    first ``changes`` reports are re-published in mdrfoiChange (event type
+    becomes death) and patientChange (patient sex becomes unknown).
+
+    Args:
+        root: Directory to write the zips into.
+        reports: Number of reports in the ADD files.
+        changes: Number of those reports corrected by the CHANGE files.
+        first_key: First MDR report key.
+        received: Date received for the first report.
+
+    Returns:
+        MaudeTree describing the generated keys and files.
+    """
+    keys = [str(first_key + i) for i in range(reports)]
+    tree = MaudeTree(keys=keys, changed_keys=keys[:changes])
+
+    master, devices, patients, texts = [], [], [], []
+    for i, key in enumerate(keys):
+        day = received + timedelta(days=i % 28)
+        manufacturer = MANUFACTURERS[i % len(MANUFACTURERS)]
+        product_code = PRODUCT_CODES[i % len(PRODUCT_CODES)]
+
+        master.append({
+            "MDR_REPORT_KEY": key,
+            "EVENT_KEY": str(5000000 + i),
+            "REPORT_NUMBER": f"{3000000 + i}-2025-{i:05d}",
+            "REPORT_SOURCE_CODE": "M",
+            "NUMBER_DEVICES_IN_EVENT": "1",
+            "NUMBER_PATIENTS_IN_EVENT": "1",
+            "DATE_RECEIVED": _fda_date(day),
+            "ADVERSE_EVENT_FLAG": "Y" if i % 2 else "N",
+            "PRODUCT_PROBLEM_FLAG": "Y",
+            "DATE_OF_EVENT": _fda_date(day - timedelta(days=7)),
+            "EVENT_TYPE": EVENT_TYPES[i % len(EVENT_TYPES)],
+            "MANUFACTURER_NAME": manufacturer,
+            "TYPE_OF_REPORT": "I",
+            "DATE_ADDED": _fda_date(day),
+        })
+        devices.append({
+            "MDR_REPORT_KEY": key,
+            "DEVICE_EVENT_KEY": str(7000000 + i),
+            "DEVICE_SEQUENCE_NO": "1",
+            "DATE_RECEIVED": _fda_date(day),
+            "BRAND_NAME": f"STIMULATOR {product_code}",
+            "GENERIC_NAME": "SPINAL CORD STIMULATOR",
+            "MANUFACTURER_D_NAME": manufacturer,
+            "MODEL_NUMBER": f"M{i:05d}",
+            "DEVICE_REPORT_PRODUCT_CODE": product_code,
+        })
+        patients.append({
+            "MDR_REPORT_KEY": key,
+            "PATIENT_SEQUENCE_NUMBER": "1",
+            "DATE_RECEIVED": _fda_date(day),
+            "SEQUENCE_NUMBER_OUTCOME": "1. H",
+            "PATIENT_AGE": f"{30 + i % 50} YR",
+            "PATIENT_SEX": "F" if i % 2 else "M",
+        })
+        texts.append({
+            "MDR_REPORT_KEY": key,
+            "MDR_TEXT_KEY": str(9000000 + i),
+            "TEXT_TYPE_CODE": "D",
+            "PATIENT_SEQUENCE_NUMBER": "1",
+            "DATE_REPORT": _fda_date(day),
+            "FOI_TEXT": f"IT WAS REPORTED THAT THE PATIENT EXPERIENCED PAIN AT THE IPG SITE ({key}).",
+        })
+
+    for file_type, rows in (
+        ("master", master), ("device", devices), ("patient", patients), ("text", texts)
+    ):
+        tree.files.append(_write_zip(root, ADD_FILES[file_type], file_type, rows))
+
+    changed = slice(0, changes)
+    master_changes = [
+        dict(row, EVENT_TYPE="D", DATE_CHANGED=_fda_date(received + timedelta(days=30)))
+        for row in master[changed]
+    ]
+    patient_changes = [dict(row, PATIENT_SEX="U") for row in patients[changed]]
+    tree.files.append(_write_zip(root, CHANGE_FILES["master"], "master", master_changes))
+    tree.files.append(_write_zip(root, CHANGE_FILES["patient"], "patient", patient_changes))
+
+    return tree
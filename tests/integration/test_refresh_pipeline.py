@@ -0,0 +1,197 @@
+"""
+End-to-end refresh pipeline against a local FDA mirror.
+
+Runs discovery, download, ADD load and CHANGE processing from
+scripts/weekly_refresh.py (and the /api/admin refresh task) against a
+generated MAUDE tree served on localhost, so the whole refresh can be
+regression-tested and timed offline.
+
+Per-stage timings are appended to .benchmarks/refresh_pipeline.jsonl
+(override the directory with MAUDE_BENCHMARK_DIR) for comparing runs.
+
+Usage:
+    pytest tests/integration/test_refresh_pipeline.py -v
+"""
+
+import json
+import logging
+import os
+import platform
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from src.database import get_connection
+from src.database.schema import initialize_database
+from src.ingestion.download import MAUDEDownloader
+from src.ingestion.fda_discovery import FDADiscovery
+from scripts.weekly_refresh import (
+    check_for_updates,
+    download_files,
+    load_data_files,
+    process_change_files,
+)
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+BENCHMARK_DIR = Path(os.getenv("MAUDE_BENCHMARK_DIR", PROJECT_ROOT / ".benchmarks"))
+
+# Generous ceiling for the generated tree; catches pathological regressions
+# (e.g. serial requests, row-at-a-time updates) without being flaky.
+PIPELINE_BUDGET_SECONDS = 60
+
+logger = logging.getLogger("test_refresh_pipeline")
+
+
+class StageTimer:
+    """Collects wall-clock time per pipeline stage."""
+
+    def __init__(self):
+        self.stages = {}
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = round(time.perf_counter() - start, 4)
+
+    @property
+    def total(self):
+        return sum(self.stages.values())
+
+    def record(self, benchmark, **extra):
+        """Append this run to the benchmark log."""
+        BENCHMARK_DIR.mkdir(parents=True, exist_ok=True)
+        entry = {
+            "benchmark": benchmark,
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "stages": self.stages,
+            "total_seconds": round(self.total, 4),
+            **extra,
+        }
+        with open(BENCHMARK_DIR / "refresh_pipeline.jsonl", "a") as f:
+            f.write(json.dumps(entry) + "\n")
+
+
+@pytest.fixture
+def refresh_db(tmp_path):
+    """Empty, initialized database file."""
+    db_path = tmp_path / "maude.duckdb"
+    with get_connection(db_path) as conn:
+        initialize_database(conn)
+    return db_path
+
+
+def fetch_all(db_path, sql):
+    with get_connection(db_path, read_only=True) as conn:
+        return conn.execute(sql).fetchall()
+
+
+class TestWeeklyRefreshPipeline:
+    """scripts/weekly_refresh.py stages against the local mirror."""
+
+    def test_full_refresh(self, maude_mirror, refresh_db, tmp_path):
+        tree = maude_mirror.tree
+        raw_dir = tmp_path / "raw"
+        timer = StageTimer()
+
+        discovery = FDADiscovery(
+            state_file=tmp_path / "discovery_state.json", base_url=maude_mirror.base_url
+        )
+        downloader = MAUDEDownloader(output_dir=raw_dir, base_url=maude_mirror.base_url)
+
+        with timer.stage("discovery"):
+            discovered = check_for_updates(discovery, logger)
+        with timer.stage("download"):
+            downloaded = download_files(discovery, discovered, downloader, False, logger)
+        with timer.stage("load_add"):
+            load_stats = load_data_files(raw_dir, refresh_db, None, logger)
+        with timer.stage("apply_changes"):
+            change_results = process_change_files(
+                raw_dir, refresh_db, logger, run_id=load_stats["run_id"]
+            )
+
+        # Discovery and download saw exactly the published files
+        assert sorted(f.filename for f in discovered.files_needing_download) == sorted(tree.files)
+        results = [r for category in downloaded.values() for r in category]
+        assert all(r.success for r in results)
+        assert len(results) == len(tree.files)
+
+        # ADD files loaded in full
+        reports = len(tree.keys)
+        assert load_stats["records_errors"] == 0
+        assert load_stats["records_loaded"] == 4 * reports
+        for table in ("master_events", "devices", "patients", "mdr_text"):
+            assert fetch_all(refresh_db, f"SELECT COUNT(*) FROM {table}") == [(reports,)]
+
+        # CHANGE files corrected the published keys
+        changed = len(tree.changed_keys)
+        assert sum(r.records_updated for r in change_results) == 2 * changed
+        assert sum(r.records_not_found for r in change_results) == 0
+        assert fetch_all(
+            refresh_db, "SELECT mdr_report_key FROM master_events WHERE event_type = 'D' ORDER BY 1"
+        ) == [(k,) for k in tree.changed_keys]
+        assert fetch_all(
+            refresh_db, "SELECT COUNT(*) FROM patients WHERE patient_sex = 'U'"
+        ) == [(changed,)]
+
+        # The whole refresh is one change_log run
+        log = dict(fetch_all(refresh_db, """
+            SELECT operation || ':' || table_name, COUNT(*)
+            FROM change_log WHERE run_id = (SELECT MAX(run_id) FROM change_log)
+            GROUP BY 1
+        """))
+        assert log["insert:master_events"] == reports
+        assert log["update:master_events"] == changed
+        assert log["update:patients"] == changed
+
+        # A second check against an unchanged mirror costs only 304s
+        maude_mirror.reset_counters()
+        with timer.stage("rediscovery"):
+            rediscovered = check_for_updates(discovery, logger)
+
+        assert rediscovered.files_needing_download == []
+        assert maude_mirror.server.not_modified == len(tree.files)
+
+        timer.record(
+            "weekly_refresh",
+            reports=reports,
+            changes=changed,
+            bytes_downloaded=sum(r.size_bytes for r in results),
+        )
+        assert timer.total < PIPELINE_BUDGET_SECONDS, timer.stages
+
+
+class TestAdminRefreshTask:
+    """The /api/admin/refresh background task against the local mirror."""
+
+    def test_refresh_task_loads_add_files(self, maude_mirror, refresh_db, tmp_path, monkeypatch):
+        from api.routers import admin
+
+        status_file = tmp_path / "refresh_status.json"
+        monkeypatch.setenv("FDA_DOWNLOAD_BASE", maude_mirror.base_url)
+        monkeypatch.setenv("RAW_DATA_PATH", str(tmp_path / "raw"))
+        monkeypatch.setattr(admin, "REFRESH_STATUS_FILE", status_file)
+        monkeypatch.setattr(admin, "get_settings", lambda: SimpleNamespace(database_path=refresh_db))
+        monkeypatch.setattr(admin, "swap_db", lambda: True)
+
+        timer = StageTimer()
+        with timer.stage("admin_refresh"):
+            admin._run_refresh_task()
+
+        status = json.loads(status_file.read_text())
+        assert status["status"] == "completed", status["message"]
+        assert fetch_all(refresh_db, "SELECT COUNT(*) FROM master_events") == [
+            (len(maude_mirror.tree.keys),)
+        ]
+        downloads = {name for method, name, _ in maude_mirror.requests if method == "GET"}
+        assert downloads == {"mdrfoiAdd.zip", "foidevAdd.zip", "foitextAdd.zip", "patientAdd.zip"}
+
+        timer.record("admin_refresh", reports=len(maude_mirror.tree.keys))
+        assert timer.total < PIPELINE_BUDGET_SECONDS, timer.stages
@@ -1,9 +1,24 @@
 """Pytest fixtures for API tests."""
 
+import duckdb
 import pytest
 from fastapi.testclient import TestClient
 
+import api.services.database as database
+from api.config import get_settings
 from api.main import app
+from api.services.cache import clear_all_caches
+from api.services.database import DatabaseService
+from src.database import create_snapshot, get_connection, publish_snapshot, validate_snapshot
+from src.database.schema import initialize_database
+
+
+@pytest.fixture(scope="session", autouse=True)
+def no_warmup():
+    """Keep background cache warming from racing tests (see test_warmup)."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(get_settings(), "warmup_enabled", False)
+        yield
 
 
 @pytest.fixture(scope="module")
@@ -38,3 +53,63 @@ def sample_event_key(client):
     if response.status_code == 200 and response.json().get("events"):
         return response.json()["events"][0]["mdr_report_key"]
     return None
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Temporary database with 1,000 events (half D, half M)."""
+    path = tmp_path / "maude.duckdb"
+    conn = duckdb.connect(str(path))
+    initialize_database(conn)
+    conn.execute("""
+        INSERT INTO master_events (mdr_report_key, event_type)
+        SELECT CAST(i AS VARCHAR), CASE WHEN i % 2 = 0 THEN 'D' ELSE 'M' END
+        FROM range(1000) t(i)
+    """)
+    conn.close()
+    return path
+
+
+@pytest.fixture
+def db(db_path):
+    """DatabaseService on the temporary database."""
+    service = DatabaseService(db_path=db_path, pool_size=4, pool_timeout=5)
+    yield service
+    service.close()
+
+
+@pytest.fixture
+def api_db(db, monkeypatch):
+    """Point the API's global database service at the test database."""
+    monkeypatch.setattr(database, "_db_service", db)
+    return db
+
+
+@pytest.fixture
+def api_client(api_db):
+    """TestClient on the test database, with empty result caches."""
+    clear_all_caches()
+    with TestClient(app) as c:
+        yield c
+    clear_all_caches()
+
+
+@pytest.fixture
+def publish_events(db_path):
+    """Simulate a refresh: publish a snapshot with ``count`` more events."""
+    batches = []
+
+    def publish(count):
+        snapshot = create_snapshot(db_path)
+        baseline = validate_snapshot(snapshot)
+        with get_connection(snapshot) as conn:
+            conn.execute(f"""
+                INSERT INTO master_events (mdr_report_key, event_type)
+                SELECT 'NEW{len(batches)}-' || i, 'D' FROM range({count}) t(i)
+            """)
+        validate_snapshot(snapshot, baseline)
+        publish_snapshot(snapshot, db_path)
+        batches.append(snapshot)
+        return snapshot
+
+    return publish
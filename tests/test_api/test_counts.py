@@ -0,0 +1,144 @@
+"""Tests for cached, estimated and skipped event list counts."""
+
+from datetime import date
+
+import duckdb
+import pytest
+
+import api.services.database as database
+import api.services.queries as queries
+from api.services.cache import clear_all_caches, count_cache
+from api.services.database import DatabaseService
+from api.services.queries import QueryService
+
+
+@pytest.fixture(autouse=True)
+def empty_caches():
+    clear_all_caches()
+    yield
+    clear_all_caches()
+
+
+class TestCountCache:
+    """Totals are cached per normalized filter set."""
+
+    def test_second_page_reuses_count(self, api_client):
+        first = api_client.get("/api/events", params={"event_types": "D", "page": 1})
+        hits = count_cache.stats()["hits"]
+        second = api_client.get("/api/events", params={"event_types": "D", "page": 2})
+
+        assert first.json()["pagination"]["total"] == 500
+        assert second.json()["pagination"]["total"] == 500
+        assert count_cache.stats()["hits"] == hits + 1
+
+    def test_equivalent_filters_share_entry(self, api_db):
+        first = QueryService().count_events(event_types=["M", "D"])
+        size = count_cache.stats()["size"]
+        checkouts = api_db.pool_stats()["checkouts"]
+
+        second = QueryService().count_events(event_types=["D", " M", "D"])
+
+        assert second == first == {"total": 1000, "count_mode": "exact"}
+        assert count_cache.stats()["size"] == size
+        assert api_db.pool_stats()["checkouts"] == checkouts
+
+
+class TestCountModes:
+    """count_mode=exact|estimate|none."""
+
+    def test_default_modes(self, api_client):
+        numbered = api_client.get("/api/events", params={"page_size": 10}).json()["pagination"]
+        cursor = api_client.get(
+            "/api/events", params={"page_size": 10, "cursor": numbered["next_cursor"]}
+        ).json()["pagination"]
+
+        assert numbered["count_mode"] == "exact"
+        assert cursor["count_mode"] == "none"
+        assert cursor["total"] is None
+
+    def test_none(self, api_client):
+        pagination = api_client.get(
+            "/api/events", params={"count_mode": "none", "page_size": 100}
+        ).json()["pagination"]
+
+        assert pagination["total"] is None
+        assert pagination["total_pages"] is None
+        assert pagination["next_cursor"]
+
+    def test_exact_on_cursor_page(self, api_client):
+        first = api_client.get("/api/events", params={"page_size": 10}).json()["pagination"]
+        second = api_client.get("/api/events", params={
+            "page_size": 10, "cursor": first["next_cursor"], "count_mode": "exact",
+        }).json()["pagination"]
+
+        assert second["total"] == 1000
+        assert second["count_mode"] == "exact"
+
+    def test_estimate_on_small_table_is_exact(self, api_client):
+        pagination = api_client.get(
+            "/api/events", params={"count_mode": "estimate", "event_types": "D"}
+        ).json()["pagination"]
+
+        assert pagination["total"] == 500
+        assert pagination["count_mode"] == "exact"
+
+    def test_arrow_headers(self, api_client):
+        response = api_client.get(
+            "/api/events", params={"format": "arrow", "count_mode": "estimate"}
+        )
+
+        assert response.headers["x-total-count"] == "1000"
+        assert response.headers["x-count-mode"] == "exact"
+
+    def test_invalid_mode(self, api_client):
+        response = api_client.get("/api/events", params={"count_mode": "approximate"})
+
+        assert response.status_code == 400
+
+
+class TestEstimate:
+    """Sampled estimates on a large table."""
+
+    ROWS = 1_000_000
+
+    @pytest.fixture
+    def large_db(self, tmp_path, monkeypatch):
+        path = tmp_path / "large.duckdb"
+        conn = duckdb.connect(str(path))
+        conn.execute(f"""
+            CREATE TABLE master_events AS
+            SELECT CAST(i AS VARCHAR) AS mdr_report_key,
+                   ['D', 'IN', 'M', 'O'][i % 4 + 1] AS event_type,
+                   DATE '2000-01-01' + CAST(i % 9000 AS INTEGER) AS date_received
+            FROM range({self.ROWS}) t(i)
+        """)
+        conn.close()
+        monkeypatch.setattr(queries, "ESTIMATE_MIN_ROWS", self.ROWS)
+        service = DatabaseService(db_path=path, pool_size=2, pool_timeout=5)
+        monkeypatch.setattr(database, "_db_service", service)
+        yield service
+        service.close()
+
+    @pytest.fixture
+    def query_service(self, large_db):
+        return QueryService()
+
+    def test_estimate_close_to_exact(self, query_service):
+        estimate = query_service.count_events(event_types=["D", "M"], count_mode="estimate")
+        exact = query_service.count_events(event_types=["D", "M"], count_mode="exact")
+
+        assert estimate["count_mode"] == "estimate"
+        assert exact == {"total": 500_000, "count_mode": "exact"}
+        assert abs(estimate["total"] - exact["total"]) < 0.05 * exact["total"]
+
+    def test_rare_filter_counted_exactly(self, query_service):
+        day = date(2000, 1, 1)
+        counted = query_service.count_events(date_from=day, date_to=day, count_mode="estimate")
+
+        # One day in 9,000: about 11 sampled matches, too few to scale
+        assert counted == {"total": 112, "count_mode": "exact"}
+
+    def test_unfiltered_counted_exactly(self, query_service):
+        counted = query_service.count_events(count_mode="estimate")
+
+        assert counted == {"total": self.ROWS, "count_mode": "exact"}
@@ -0,0 +1,169 @@
+"""Tests for the API's pooled DuckDB cursors."""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import duckdb
+import pytest
+from fastapi.testclient import TestClient
+
+import api.services.database as database
+from api.main import app
+from api.services.database import CursorPool, DatabaseService, PoolTimeout, RequestSession
+
+
+class TestCursorPool:
+    """CursorPool bounds and metrics."""
+
+    def test_bounded_and_times_out(self, db):
+        pool = db.pool
+        cursors = [pool.acquire() for _ in range(pool.size)]
+
+        with pytest.raises(PoolTimeout):
+            pool.acquire(timeout=0.05)
+
+        stats = pool.stats()
+        assert stats["created"] == stats["in_use"] == 4
+        assert stats["timeouts"] == 1
+        for cursor in cursors:
+            pool.release(cursor)
+        assert pool.stats()["idle"] == 4
+
+    def test_waiter_gets_released_cursor(self, db):
+        pool = db.pool
+        cursors = [pool.acquire() for _ in range(pool.size)]
+        threading.Timer(0.1, pool.release, args=[cursors.pop()]).start()
+
+        cursor = pool.acquire(timeout=5)
+
+        stats = pool.stats()
+        assert stats["waits"] == 1
+        assert stats["wait_seconds_max"] >= 0.05
+        assert stats["created"] == 4
+        for c in cursors + [cursor]:
+            pool.release(c)
+
+    def test_cursors_reused(self, db):
+        for _ in range(10):
+            db.fetch_one("SELECT 1")
+
+        stats = db.pool_stats()
+        assert stats["checkouts"] == 10
+        assert stats["created"] == 1
+        assert stats["in_use"] == 0
+
+    def test_release_after_close(self, db_path):
+        conn = duckdb.connect(str(db_path), read_only=True)
+        pool = CursorPool(conn, size=2, timeout=1)
+        cursor = pool.acquire()
+        pool.close()
+
+        pool.release(cursor)
+
+        with pytest.raises(PoolTimeout):
+            pool.acquire()
+        conn.close()
+
+
+class TestDatabaseService:
+    """DatabaseService queries run on pooled cursors."""
+
+    def test_concurrent_queries(self, db):
+        def count(event_type):
+            return event_type, db.fetch_one(
+                "SELECT COUNT(*) FROM master_events WHERE event_type = ?", [event_type]
+            )[0]
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(count, ["D", "M", "X"] * 20))
+
+        assert set(results) == {("D", 500), ("M", 500), ("X", 0)}
+        stats = db.pool_stats()
+        assert stats["created"] <= 4
+        assert stats["checkouts"] == 60
+        assert stats["in_use"] == 0
+
+    def test_execute_outside_request(self, db):
+        result = db.execute("SELECT mdr_report_key FROM master_events ORDER BY 1 LIMIT 2")
+
+        assert result.fetchone() == ("0",)
+        assert result.fetchall() == [("1",)]
+        assert db.pool_stats()["in_use"] == 0
+
+    def test_execute_in_request_survives_later_queries(self, db):
+        session = RequestSession()
+        token = database._request_session.set(session)
+        try:
+            result = db.execute("SELECT mdr_report_key FROM master_events ORDER BY 1 LIMIT 2")
+            assert db.fetch_one("SELECT COUNT(*) FROM master_events") == (1000,)
+            rows = result.fetchall()
+        finally:
+            database._request_session.reset(token)
+            session.release()
+
+        assert rows == [("0",), ("1",)]
+        assert db.pool_stats()["checkouts"] == 1
+
+
+class TestRequestSession:
+    """db_session holds one cursor per request."""
+
+    def test_one_checkout_per_request(self, api_db):
+        with TestClient(app) as client:
+            response = client.get("/api/admin/table-counts")
+            assert response.status_code == 200
+            assert response.json()["master_events"] == 1000
+
+            stats = client.get("/api/admin/db-pool").json()
+
+        # table-counts runs seven queries on one cursor
+        assert stats["checkouts"] == 1
+        assert stats["in_use"] == 0
+        assert stats["size"] == 4
+
+    def test_exhausted_pool_returns_503(self, db_path, monkeypatch):
+        service = DatabaseService(db_path=db_path, pool_size=1, pool_timeout=0.05)
+        monkeypatch.setattr(database, "_db_service", service)
+        held = service.pool.acquire()
+        try:
+            with TestClient(app) as client:
+                response = client.get("/api/admin/history")
+        finally:
+            service.pool.release(held)
+            service.close()
+
+        assert response.status_code == 503
+
+    def test_no_checkout_after_release(self, db):
+        session = RequestSession()
+        session.release()
+
+        with pytest.raises(RuntimeError):
+            session.get_cursor(db)
+        assert db.pool.stats()["checkouts"] == 0
+
+
+@pytest.mark.skipif((os.cpu_count() or 1) < 2, reason="needs more than one CPU to scale")
+class TestThroughputScaling:
+    """Pooled cursors let concurrent queries run in parallel."""
+
+    QUERY = "SELECT SUM(hash(i)) FROM range(3000000) t(i)"
+
+    def throughput(self, db, workers, requests=16):
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(lambda _: db.fetch_one(self.QUERY), range(requests)))
+        return requests / (time.perf_counter() - started)
+
+    def test_throughput_scales_with_workers(self, db_path):
+        db = DatabaseService(db_path=db_path, pool_size=4)
+        db.connect().execute("SET threads = 1")
+        try:
+            single = self.throughput(db, 1)
+            concurrent = self.throughput(db, min(4, os.cpu_count()))
+        finally:
+            db.close()
+
+        assert concurrent > single * 1.3
@@ -0,0 +1,60 @@
+"""Tests for data-version ETags and conditional GETs."""
+
+from api.middleware.etag import etag_matches
+from api.services.cache import get_cache_stats
+
+
+class TestConditionalGet:
+    """If-None-Match is answered without running the endpoint."""
+
+    def test_second_request_is_304_without_query(self, api_client, api_db):
+        first = api_client.get("/api/events/stats", params={"event_types": "D"})
+        etag = first.headers["ETag"]
+        checkouts = api_db.pool_stats()["checkouts"]
+        lookups = get_cache_stats()["stats_cache"]
+
+        second = api_client.get(
+            "/api/events/stats", params={"event_types": "D"}, headers={"If-None-Match": etag}
+        )
+
+        assert first.status_code == 200
+        assert second.status_code == 304
+        assert second.content == b""
+        assert second.headers["ETag"] == etag
+        assert api_db.pool_stats()["checkouts"] == checkouts
+        assert get_cache_stats()["stats_cache"] == lookups
+
+    def test_etag_depends_on_parameters_not_order(self, api_client):
+        a = api_client.get("/api/analytics/trends?group_by=year&event_types=D").headers["ETag"]
+        b = api_client.get("/api/analytics/trends?event_types=D&group_by=year").headers["ETag"]
+        c = api_client.get("/api/analytics/trends?group_by=month&event_types=D").headers["ETag"]
+
+        assert a == b
+        assert a != c
+
+    def test_refresh_changes_etag(self, api_client, api_db, publish_events):
+        etag = api_client.get("/api/filters/brand-names").headers["ETag"]
+
+        publish_events(10)
+        api_db.swap(drain_timeout=5)
+        response = api_client.get("/api/filters/brand-names", headers={"If-None-Match": etag})
+
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+
+    def test_other_paths_untagged(self, api_client):
+        response = api_client.get("/api/admin/table-counts")
+
+        assert response.status_code == 200
+        assert "ETag" not in response.headers
+
+
+class TestEtagMatching:
+    """If-None-Match header parsing."""
+
+    def test_lists_wildcard_and_weak_tags(self):
+        assert etag_matches('"a", "b"', '"b"')
+        assert etag_matches("*", '"b"')
+        assert etag_matches('W/"b"', '"b"')
+        assert not etag_matches('"a"', '"b"')
+        assert not etag_matches(None, '"b"')
@@ -0,0 +1,169 @@
+"""Tests for running endpoint database work on bounded executors."""
+
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+
+import api.routers.analytics as analytics
+from api.main import app
+from api.services.executor import db_endpoint, executor_stats, run_db, shutdown_executors
+
+
+class SlowDB:
+    """Database proxy whose fetch_all blocks like a heavy aggregation."""
+
+    def __init__(self, db, delay):
+        self.db = db
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak_active = 0
+
+    def fetch_all(self, query, params=None):
+        with self.lock:
+            self.active += 1
+            self.peak_active = max(self.peak_active, self.active)
+        try:
+            time.sleep(self.delay)
+            return self.db.fetch_all(query, params)
+        finally:
+            with self.lock:
+                self.active -= 1
+
+    def __getattr__(self, name):
+        return getattr(self.db, name)
+
+
+@pytest.fixture(autouse=True)
+def fresh_executors():
+    shutdown_executors()
+    yield
+    shutdown_executors()
+
+
+@pytest.fixture
+def slow_db(api_db, monkeypatch):
+    slow = SlowDB(api_db, delay=1.0)
+    monkeypatch.setattr(analytics, "get_db", lambda: slow)
+    return slow
+
+
+async def timed_get(client, path):
+    started = time.perf_counter()
+    response = await client.get(path)
+    return response, time.perf_counter() - started
+
+
+def make_client():
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+class TestEventLoopStaysFree:
+    """Heavy endpoints do not block light ones."""
+
+    def test_health_latency_flat_during_signals(self, slow_db):
+        async def scenario():
+            async with make_client() as client:
+                _, idle = await timed_get(client, "/api/health")
+
+                signals = asyncio.create_task(timed_get(client, "/api/analytics/signals"))
+                await asyncio.sleep(0.1)
+                during = []
+                while not signals.done():
+                    response, latency = await timed_get(client, "/api/health")
+                    assert response.json()["status"] == "healthy"
+                    during.append(latency)
+                    await asyncio.sleep(0.05)
+                return idle, during, await signals
+
+        idle, during, (signals_response, signals_latency) = asyncio.run(scenario())
+
+        assert signals_response.status_code == 200
+        assert signals_latency >= 1.0
+        assert len(during) >= 5
+        assert max(during) < 0.5
+
+    def test_heavy_concurrency_bounded(self, slow_db):
+        slow_db.delay = 0.2
+
+        async def scenario():
+            async with make_client() as client:
+                # Distinct parameters, so the requests are not coalesced
+                return await asyncio.gather(*[
+                    client.get(f"/api/analytics/signals?lookback_months={months}")
+                    for months in range(1, 6)
+                ])
+
+        responses = asyncio.run(scenario())
+
+        assert [r.status_code for r in responses] == [200] * 5
+        assert slow_db.peak_active == 2
+        heavy = executor_stats()["heavy"]
+        assert heavy["max_workers"] == 2
+        assert heavy["completed"] == 5
+        assert heavy["queue_seconds_max"] > 0.1
+
+
+class TestDBEndpoint:
+    """db_endpoint and run_db behaviour."""
+
+    def test_runs_off_event_loop_thread(self):
+        @db_endpoint("light")
+        def handler(value: int):
+            return value, threading.current_thread().name
+
+        value, thread_name = asyncio.run(handler(value=3))
+
+        assert value == 3
+        assert thread_name.startswith("db-light")
+
+    def test_errors_propagate_and_are_counted(self):
+        def fail():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError, match="boom"):
+            asyncio.run(run_db("export", fail))
+
+        assert executor_stats()["export"]["failed"] == 1
+
+    def test_unknown_workload(self):
+        with pytest.raises(ValueError):
+            db_endpoint("bulk")
+
+
+class TestCancellation:
+    """A cancelled request's database work finishes before its session ends."""
+
+    def test_cancelled_request_returns_cursor(self, api_db, monkeypatch):
+        started, release = threading.Event(), threading.Event()
+        fetch_one = api_db.fetch_one
+
+        def gated_fetch_one(query, *args, **kwargs):
+            started.set()
+            release.wait(5)
+            return fetch_one(query, *args, **kwargs)
+
+        monkeypatch.setattr(api_db, "fetch_one", gated_fetch_one)
+
+        async def scenario():
+            async with make_client() as client:
+                request = asyncio.create_task(client.get("/api/admin/table-counts"))
+                assert await asyncio.to_thread(started.wait, 5)
+                request.cancel()
+                threading.Timer(0.2, release.set).start()
+                with pytest.raises(asyncio.CancelledError):
+                    await request
+                return executor_stats()["light"]
+
+        light = asyncio.run(scenario())
+        shutdown_executors()
+
+        # The cancellation waited for the handler, which queried on the
+        # request's cursor; it was then returned with the session
+        assert light["active"] == 0
+        assert light["completed"] == 1
+        assert api_db.pool_stats()["checkouts"] == 1
+        assert api_db.pool_stats()["in_use"] == 0
@@ -0,0 +1,89 @@
+"""Tests for EXPLAIN ANALYZE profiles of API requests."""
+
+import pytest
+
+from api.services.explain import ProfileStore, profile_store
+from api.services.metrics import capture_queries
+
+
+@pytest.fixture(autouse=True)
+def empty_store():
+    profile_store.clear()
+    yield
+    profile_store.clear()
+
+
+def explain(api_client, path, params=None):
+    return api_client.post("/api/admin/explain", json={"path": path, "params": params or {}})
+
+
+class TestExplain:
+    """POST /api/admin/explain."""
+
+    def test_event_list_profile(self, api_client):
+        response = explain(api_client, "/api/events", {"event_types": "D", "page_size": "5"})
+
+        profile = response.json()
+        queries = {q["name"]: q for q in profile["queries"]}
+        page = queries["QueryService.get_events"]
+        assert response.status_code == 200
+        assert profile["status_code"] == 200
+        assert page["params"][0] == "D"
+        assert "ORDER BY" in page["sql"]
+        assert page["rows_returned"] == 5
+        assert page["latency_seconds"] > 0
+        assert {"ORDER_BY", "TABLE_SCAN"} <= {op["operator"] for op in page["operators"]}
+        assert all(op["cardinality"] is not None for op in page["operators"])
+        assert queries["QueryService._count_events"]["rows_returned"] == 1
+
+    def test_cached_results_are_bypassed(self, api_client):
+        api_client.get("/api/analytics/signals")
+        profile = explain(api_client, "/api/analytics/signals").json()
+
+        assert profile["status_code"] == 200
+        assert [q["name"] for q in profile["queries"]] == ["detect_signals"]
+
+    def test_admin_paths_rejected(self, api_client):
+        assert explain(api_client, "/api/admin/status").status_code == 400
+        assert explain(api_client, "/health").status_code == 400
+
+
+class TestProfileStore:
+    """Recent profiles are kept for comparison."""
+
+    def test_list_and_get(self, api_client):
+        first = explain(api_client, "/api/events", {"event_types": "D"}).json()
+        second = explain(api_client, "/api/events", {"event_types": "M"}).json()
+
+        summaries = api_client.get("/api/admin/explain").json()
+        stored = api_client.get(f"/api/admin/explain/{first['id']}").json()
+
+        assert [s["id"] for s in summaries] == [second["id"], first["id"]]
+        assert summaries[0]["params"] == {"event_types": "M"}
+        assert "plan" not in summaries[0]["queries"][0]
+        assert stored["queries"][0]["operators"] == first["queries"][0]["operators"]
+        assert api_client.get("/api/admin/explain/999").status_code == 404
+
+    def test_keeps_last_n(self):
+        store = ProfileStore(maxsize=2)
+        for n in range(3):
+            store.add({"path": f"/api/{n}", "params": {}, "captured_at": "", "status_code": 200,
+                       "latency_seconds": 0, "queries": []})
+
+        assert [s["path"] for s in store.summaries()] == ["/api/2", "/api/1"]
+        assert store.get(1) is None
+
+
+class TestCapture:
+    """capture_queries records the queries run in its block."""
+
+    def test_records_sql_and_params(self, api_db):
+        with capture_queries() as captured:
+            api_db.fetch_all("SELECT * FROM master_events WHERE event_type = ?", ["D"], name="by_type")
+        api_db.fetch_all("SELECT 1")
+
+        assert captured == [{
+            "name": "by_type",
+            "sql": "SELECT * FROM master_events WHERE event_type = ?",
+            "params": ["D"],
+        }]
@@ -0,0 +1,164 @@
+"""Tests for streamed CSV and Excel exports."""
+
+import asyncio
+import csv
+import io
+import os
+import tempfile
+import threading
+import time
+import tracemalloc
+
+import duckdb
+import pytest
+from openpyxl import load_workbook
+
+import api.services.database as database
+from api.main import app
+from api.services.database import DatabaseService
+
+
+def exported_temp_files():
+    return [f for f in os.listdir(tempfile.gettempdir()) if f.startswith("maude_export_")]
+
+
+class TestExport:
+    """/api/events/export output."""
+
+    def test_csv_all_records(self, api_client, api_db):
+        response = api_client.get("/api/events/export", params={"event_types": "D"})
+
+        rows = list(csv.reader(io.StringIO(response.text)))
+        assert response.headers["content-type"].startswith("text/csv")
+        assert rows[0][0] == "MDR Report Key"
+        assert len(rows[0]) == 7
+        assert len(rows) == 501
+        assert {row[4] for row in rows[1:]} == {"D"}
+        assert api_db.pool_stats()["in_use"] == 0
+
+    def test_csv_max_records(self, api_client):
+        response = api_client.get("/api/events/export", params={"max_records": 120})
+
+        assert len(response.text.strip().splitlines()) == 121
+
+    def test_no_record_cap(self, api_client):
+        response = api_client.get("/api/events/export", params={"max_records": 1_000_000})
+
+        assert response.status_code == 200
+        assert len(response.text.strip().splitlines()) == 1001
+
+    def test_xlsx(self, api_client, api_db):
+        before = exported_temp_files()
+        response = api_client.get("/api/events/export", params={"format": "xlsx"})
+
+        ws = load_workbook(io.BytesIO(response.content), read_only=True).active
+        rows = list(ws.iter_rows(values_only=True))
+        assert response.headers["content-disposition"].endswith(".xlsx")
+        assert rows[0][0] == "MDR Report Key"
+        assert len(rows) == 1001
+        assert exported_temp_files() == before
+        assert api_db.pool_stats()["in_use"] == 0
+
+
+def rss_bytes() -> int:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+async def drain(path: str, query_string: bytes) -> int:
+    """Request ``path`` straight through the ASGI app, counting body bytes
+    without keeping them (test clients buffer the whole body)."""
+    received = 0
+    done = asyncio.Event()
+
+    async def receive():
+        await done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal received
+        if message["type"] == "http.response.body":
+            received += len(message.get("body", b""))
+            if not message.get("more_body", False):
+                done.set()
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+        "root_path": "", "query_string": query_string, "headers": [],
+        "client": ("test", 1), "server": ("test", 80),
+    }
+    await app(scope, receive, send)
+    return received
+
+
+class LimitedDatabaseService(DatabaseService):
+    """DatabaseService with a small DuckDB memory limit."""
+
+    memory_limit_mb = 100
+
+    def _configure(self, connection):
+        super()._configure(connection)
+        connection.execute(f"SET memory_limit = '{self.memory_limit_mb}MB'")
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/statm"), reason="needs /proc")
+class TestExportMemory:
+    """Exports stream with flat memory."""
+
+    ROWS = 500_000
+    # DuckDB's own budget; it spills the export's sort beyond this
+    DUCKDB_MEMORY_LIMIT_MB = 100
+
+    @pytest.fixture
+    def large_db(self, tmp_path, monkeypatch):
+        path = tmp_path / "large.duckdb"
+        conn = duckdb.connect(str(path))
+        # Only the exported columns, without keys, so the load is quick
+        conn.execute(f"""
+            CREATE TABLE master_events AS
+            SELECT CAST(i AS VARCHAR) AS mdr_report_key,
+                   'RPT-' || i AS report_number,
+                   DATE '2000-01-01' + CAST(i % 9000 AS INTEGER) AS date_received,
+                   CAST(NULL AS DATE) AS date_of_event,
+                   'M' AS event_type,
+                   'MANUFACTURER ' || (i % 500) AS manufacturer_clean,
+                   'LGW' AS product_code,
+                   'Manufacturer ' || (i % 500) AS manufacturer_name
+            FROM range({self.ROWS}) t(i)
+        """)
+        conn.close()
+        service = LimitedDatabaseService(db_path=path, pool_size=2, pool_timeout=5)
+        service.memory_limit_mb = self.DUCKDB_MEMORY_LIMIT_MB
+        monkeypatch.setattr(database, "_db_service", service)
+        yield service
+        service.close()
+
+    def test_csv_export_memory_bounded(self, large_db):
+        large_db.fetch_one("SELECT COUNT(*) FROM master_events")
+        baseline = rss_bytes()
+        peak = baseline
+        stop = threading.Event()
+
+        def sample():
+            nonlocal peak
+            while not stop.is_set():
+                peak = max(peak, rss_bytes())
+                time.sleep(0.01)
+
+        sampler = threading.Thread(target=sample)
+        sampler.start()
+        tracemalloc.start()
+        try:
+            sent = asyncio.run(drain("/api/events/export", b"format=csv"))
+            _, python_peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+            stop.set()
+            sampler.join()
+
+        # Python holds a few chunks at a time, and the process grows by at
+        # most DuckDB's budget plus slack, however large the export
+        assert sent > 25 * 1024 * 1024
+        assert python_peak < 16 * 1024 * 1024
+        assert peak - baseline < (self.DUCKDB_MEMORY_LIMIT_MB + 64) * 1024 * 1024
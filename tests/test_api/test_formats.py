@@ -0,0 +1,107 @@
+"""Tests for Arrow IPC and Parquet responses."""
+
+import io
+
+import duckdb
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from api.services.formats import ARROW_MEDIA_TYPE, PARQUET_MEDIA_TYPE
+from src.database.schema import initialize_database
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Temporary database with 1,000 dated events over 1,000 days."""
+    path = tmp_path / "maude.duckdb"
+    conn = duckdb.connect(str(path))
+    initialize_database(conn)
+    conn.execute("""
+        INSERT INTO master_events (mdr_report_key, event_type, date_received, manufacturer_clean)
+        SELECT CAST(i AS VARCHAR), CASE WHEN i % 2 = 0 THEN 'D' ELSE 'M' END,
+               DATE '2020-01-01' + CAST(i AS INTEGER), 'MFR ' || (i % 3)
+        FROM range(1000) t(i)
+    """)
+    conn.close()
+    return path
+
+
+def read_arrow(content: bytes) -> pd.DataFrame:
+    return pa.ipc.open_stream(content).read_pandas()
+
+
+class TestEventFormats:
+    """/api/events and /api/events/export in Arrow and Parquet."""
+
+    def test_arrow_by_accept_header(self, api_client):
+        response = api_client.get(
+            "/api/events", params={"page_size": 1000}, headers={"Accept": ARROW_MEDIA_TYPE}
+        )
+        json_events = api_client.get("/api/events", params={"page_size": 1000}).json()["events"]
+
+        df = read_arrow(response.content)
+        assert response.headers["content-type"] == ARROW_MEDIA_TYPE
+        assert response.headers["x-total-count"] == "1000"
+        assert len(df) == 1000
+        assert list(df["mdr_report_key"]) == [e["mdr_report_key"] for e in json_events]
+        assert list(df["manufacturer"]) == [e["manufacturer"] for e in json_events]
+        assert (df["event_type"] == "D").sum() == 500
+
+    def test_parquet_page(self, api_client):
+        response = api_client.get(
+            "/api/events", params={"format": "parquet", "page": 2, "page_size": 300}
+        )
+
+        df = pd.read_parquet(io.BytesIO(response.content))
+        assert response.headers["content-type"] == PARQUET_MEDIA_TYPE
+        assert len(df) == 300
+        # Newest first (2022-09-26), so page 2 starts 300 days earlier
+        assert df["date_received"].iloc[0] == pd.Timestamp("2021-11-30").date()
+
+    def test_export_parquet(self, api_client, api_db):
+        response = api_client.get(
+            "/api/events/export", params={"format": "parquet", "event_types": "D"}
+        )
+
+        df = pd.read_parquet(io.BytesIO(response.content))
+        assert response.headers["content-disposition"].endswith(".parquet")
+        assert len(df) == 500
+        assert set(df["event_type"]) == {"D"}
+        assert api_db.pool_stats()["in_use"] == 0
+
+    def test_empty_result_has_schema(self, api_client):
+        response = api_client.get("/api/events", params={"format": "arrow", "event_types": "O"})
+
+        df = read_arrow(response.content)
+        assert len(df) == 0
+        assert "mdr_report_key" in df.columns
+
+    def test_unknown_format(self, api_client):
+        assert api_client.get("/api/events", params={"format": "xml"}).status_code == 400
+
+
+class TestTrendFormats:
+    """/api/analytics/trends in Arrow and Parquet."""
+
+    @pytest.mark.parametrize("fmt", ["arrow", "parquet"])
+    def test_round_trip_matches_json(self, api_client, fmt):
+        params = {"group_by": "year", "format": fmt}
+        response = api_client.get("/api/analytics/trends", params=params)
+        expected = api_client.get("/api/analytics/trends", params={"group_by": "year"}).json()
+
+        if fmt == "arrow":
+            df = read_arrow(response.content)
+        else:
+            df = pd.read_parquet(io.BytesIO(response.content))
+        assert df["total"].tolist() == [e["total"] for e in expected]
+        assert df["deaths"].tolist() == [e["deaths"] for e in expected]
+        assert df["total"].sum() == 1000
+        assert pd.Timestamp(df["period"].iloc[0]).year == 2020
+
+    def test_etag_varies_with_accept(self, api_client):
+        json_etag = api_client.get("/api/analytics/trends").headers["etag"]
+        arrow = api_client.get("/api/analytics/trends", headers={"Accept": ARROW_MEDIA_TYPE})
+
+        assert arrow.headers["etag"] != json_etag
+        assert "accept" in arrow.headers["vary"].lower()
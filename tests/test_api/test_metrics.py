@@ -0,0 +1,114 @@
+"""Tests for query timing, the slow-query log and /api/admin/metrics."""
+
+import logging
+import re
+
+import duckdb
+import pytest
+
+import api.services.database as database
+from api.config import get_settings
+from api.services.cache import clear_all_caches
+from api.services.database import RequestSession
+from api.services.metrics import LATENCY_BUCKETS, query_metrics, render_prometheus
+from api.services.queries import QueryService
+
+SAMPLE = re.compile(r'^[a-z_]+(\{([a-z_]+="([^"\\]|\\.)*",?)+\})? -?[0-9.e+-]+(inf)?$')
+
+
+@pytest.fixture(autouse=True)
+def empty_metrics():
+    clear_all_caches()
+    query_metrics.clear()
+    yield
+    query_metrics.clear()
+    clear_all_caches()
+
+
+@pytest.fixture
+def slow_threshold(monkeypatch):
+    """Log every query as slow."""
+    monkeypatch.setattr(get_settings(), "slow_query_seconds", 1e-9)
+
+
+class TestQueryTiming:
+    """DatabaseService records every query under its caller's name."""
+
+    def test_named_by_caller(self, api_db):
+        QueryService().get_events(event_types=["D"], page_size=20)
+
+        stats = query_metrics.stats()
+        assert stats["QueryService.get_events"]["count"] == 1
+        assert stats["QueryService.get_events"]["rows_total"] == 20
+        assert stats["QueryService._count_events"]["rows_total"] == 1
+
+    def test_execute_rows_in_request(self, api_db):
+        session = RequestSession()
+        token = database._request_session.set(session)
+        try:
+            api_db.execute("SELECT * FROM master_events LIMIT 3", name="first_three")
+        finally:
+            database._request_session.reset(token)
+            session.release()
+
+        assert query_metrics.stats()["first_three"]["rows_total"] == 3
+
+    def test_histogram(self, api_db):
+        for _ in range(3):
+            api_db.fetch_all("SELECT * FROM master_events", name="all_events")
+
+        stats = query_metrics.stats()["all_events"]
+        assert stats["count"] == 3
+        assert stats["rows_total"] == 3000
+        assert stats["buckets"][LATENCY_BUCKETS[-1]] <= 3
+        assert stats["seconds_total"] > 0
+
+    def test_errors_counted(self, api_db):
+        with pytest.raises(duckdb.Error):
+            api_db.fetch_one("SELECT * FROM no_such_table", name="broken")
+
+        assert query_metrics.stats()["broken"]["errors"] == 1
+
+    def test_slow_query_log(self, api_db, slow_threshold, caplog):
+        with caplog.at_level(logging.WARNING, logger="maude_analyzer.api_slow_queries"):
+            api_db.fetch_all(
+                "SELECT *\n  FROM master_events WHERE event_type = ?", ["D"], name="by_type"
+            )
+
+        assert query_metrics.stats()["by_type"]["slow"] == 1
+        message = caplog.records[-1].getMessage()
+        assert "by_type" in message
+        assert "SELECT * FROM master_events WHERE event_type = ?" in message
+        assert "['D']" in message
+
+    def test_slow_log_disabled(self, api_db, monkeypatch, caplog):
+        monkeypatch.setattr(get_settings(), "slow_query_seconds", 0)
+        with caplog.at_level(logging.WARNING, logger="maude_analyzer.api_slow_queries"):
+            api_db.fetch_all("SELECT * FROM master_events", name="fast")
+
+        assert query_metrics.stats()["fast"]["slow"] == 0
+        assert not caplog.records
+
+
+class TestMetricsEndpoint:
+    """/api/admin/metrics in Prometheus text format."""
+
+    def test_prometheus_text(self, api_client):
+        api_client.get("/api/events", params={"event_types": "D"})
+        response = api_client.get("/api/admin/metrics")
+
+        lines = response.text.splitlines()
+        samples = [line for line in lines if not line.startswith("#")]
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "# TYPE maude_db_query_duration_seconds histogram" in lines
+        assert 'maude_db_query_duration_seconds_count{query="QueryService.get_events"} 1' in lines
+        assert 'maude_db_query_duration_seconds_bucket{query="QueryService.get_events",le="+Inf"} 1' in lines
+        assert 'maude_db_query_rows_total{query="QueryService.get_events"} 50' in lines
+        assert any(line.startswith("maude_db_pool_in_use ") for line in samples)
+        assert any(line.startswith('maude_cache_hits_total{cache="count_cache"}') for line in samples)
+        assert all(SAMPLE.match(line) for line in samples)
+
+    def test_label_escaping(self, api_db):
+        api_db.fetch_one("SELECT 1", name='odd "name"\\')
+
+        assert 'query="odd \\"name\\"\\\\"' in render_prometheus()
@@ -0,0 +1,109 @@
+"""Tests for the response header and compression middleware."""
+
+import asyncio
+import gzip
+import zlib
+
+from starlette.applications import Starlette
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import StreamingResponse
+from starlette.routing import Route
+
+from api.main import app
+from api.middleware.headers import cache_control
+from config.unified_schema import SCHEMA_VERSION
+
+
+class TestResponseHeaders:
+    """X-Schema-Version, Cache-Control and ETag headers."""
+
+    def test_headers(self, api_client):
+        health = api_client.get("/api/health")
+        stats = api_client.get("/api/events/stats")
+
+        assert health.headers["x-schema-version"] == SCHEMA_VERSION
+        assert health.headers["cache-control"] == "no-cache"
+        assert stats.headers["cache-control"] == "public, max-age=300"
+        assert stats.headers["etag"]
+
+    def test_not_modified_keeps_headers(self, api_client):
+        etag = api_client.get("/api/events/stats").headers["etag"]
+        response = api_client.get("/api/events/stats", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.headers["x-schema-version"] == SCHEMA_VERSION
+        assert response.headers["cache-control"] == "public, max-age=300"
+
+    def test_non_get_has_no_cache_control(self, api_client):
+        response = api_client.post("/api/admin/explain", json={"path": "/health"})
+
+        assert response.headers["x-schema-version"] == SCHEMA_VERSION
+        assert "cache-control" not in response.headers
+
+    def test_cache_control(self):
+        assert cache_control("/api/filters/brand-names") == "public, max-age=1800"
+        assert cache_control("/api/events") == "no-cache"
+
+    def test_no_base_http_middleware(self):
+        assert not any(issubclass(m.cls, BaseHTTPMiddleware) for m in app.user_middleware)
+
+
+async def stream_through_middleware(accept_encoding: str) -> list:
+    """Body messages of a gated streaming response sent through the app's
+    middleware stack. The endpoint only produces its second chunk once the
+    client has decoded all of the first, so a middleware that buffers the
+    body stalls until the timeout."""
+    first = b"first chunk\n" * 10
+    first_received = asyncio.Event()
+    decoder = zlib.decompressobj(16 + zlib.MAX_WBITS) if accept_encoding == "gzip" else None
+    decoded = b""
+
+    async def body():
+        yield first
+        await asyncio.wait_for(first_received.wait(), timeout=5)
+        yield b"second chunk\n" * 10
+
+    async def endpoint(request):
+        return StreamingResponse(body(), media_type="text/csv")
+
+    stack = Starlette(routes=[Route("/stream", endpoint)], middleware=app.user_middleware)
+    messages = []
+
+    async def receive():
+        await asyncio.sleep(10)
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal decoded
+        if message["type"] == "http.response.body":
+            messages.append(message)
+            chunk = message.get("body", b"")
+            decoded += decoder.decompress(chunk) if decoder else chunk
+            if decoded.startswith(first):
+                first_received.set()
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": "/stream", "raw_path": b"/stream",
+        "root_path": "", "query_string": b"", "client": ("test", 1), "server": ("test", 80),
+        "headers": [(b"accept-encoding", accept_encoding.encode())],
+    }
+    await stack(scope, receive, send)
+    return messages
+
+
+class TestStreaming:
+    """Streaming responses flush chunk by chunk through the middleware."""
+
+    def test_flushes_incrementally(self):
+        messages = asyncio.run(stream_through_middleware("identity"))
+
+        bodies = [m["body"] for m in messages if m.get("body")]
+        assert bodies == [b"first chunk\n" * 10, b"second chunk\n" * 10]
+
+    def test_compressed_flushes_incrementally(self):
+        messages = asyncio.run(stream_through_middleware("gzip"))
+
+        bodies = [m["body"] for m in messages if m.get("body")]
+        assert len(bodies) >= 2
+        assert gzip.decompress(b"".join(bodies)) == b"first chunk\n" * 10 + b"second chunk\n" * 10
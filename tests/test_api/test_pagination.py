@@ -0,0 +1,111 @@
+"""Tests for offset and keyset (cursor) pagination of the events list."""
+
+from datetime import date
+
+import duckdb
+import pytest
+
+from api.services.filters import decode_cursor, encode_cursor
+from src.database.schema import initialize_database
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """1,000 events over 50 days (20 per day), every tenth without a date."""
+    path = tmp_path / "maude.duckdb"
+    conn = duckdb.connect(str(path))
+    initialize_database(conn)
+    conn.execute("""
+        INSERT INTO master_events (mdr_report_key, event_type, date_received)
+        SELECT 'K' || lpad(CAST(i AS VARCHAR), 4, '0'),
+               CASE WHEN i % 2 = 0 THEN 'D' ELSE 'M' END,
+               CASE WHEN i % 10 = 0 THEN NULL ELSE DATE '2020-01-01' + CAST(i % 50 AS INTEGER) END
+        FROM range(1000) t(i)
+    """)
+    conn.close()
+    return path
+
+
+def keys(response):
+    return [e["mdr_report_key"] for e in response.json()["events"]]
+
+
+def walk_cursors(api_client, params, page_size):
+    """All pages from page 1 on, following next_cursor."""
+    response = api_client.get("/api/events", params={**params, "page_size": page_size})
+    pages = [response]
+    while response.json()["pagination"]["next_cursor"]:
+        cursor = response.json()["pagination"]["next_cursor"]
+        response = api_client.get(
+            "/api/events", params={**params, "page_size": page_size, "cursor": cursor}
+        )
+        pages.append(response)
+    return pages
+
+
+class TestKeysetPagination:
+    """Cursor pages match offset pages."""
+
+    def test_cursor_walk_matches_offset_pages(self, api_client):
+        offset_keys = []
+        for page in range(1, 29):
+            offset_keys += keys(api_client.get("/api/events", params={"page": page, "page_size": 37}))
+
+        pages = walk_cursors(api_client, {}, 37)
+        cursor_keys = [key for response in pages for key in keys(response)]
+
+        assert len(pages) == 28
+        assert cursor_keys == offset_keys
+        assert len(set(cursor_keys)) == 1000
+
+    def test_order_is_total(self, api_client):
+        events = []
+        for response in walk_cursors(api_client, {}, 100):
+            events += response.json()["events"]
+
+        dated = [e for e in events if e["date_received"]]
+        assert events[-len(events) // 10:] == [e for e in events if not e["date_received"]]
+        assert dated == sorted(
+            dated, key=lambda e: (e["date_received"], e["mdr_report_key"]), reverse=True
+        )
+
+    def test_cursor_page_metadata(self, api_client):
+        first = api_client.get("/api/events", params={"page_size": 10}).json()["pagination"]
+        second = api_client.get(
+            "/api/events", params={"page_size": 10, "cursor": first["next_cursor"]}
+        ).json()["pagination"]
+
+        assert first["total"] == 1000
+        assert first["total_pages"] == 100
+        assert second["page"] is None
+        assert second["total"] is None
+        assert second["next_cursor"]
+
+    def test_filters_apply(self, api_client):
+        pages = walk_cursors(api_client, {"event_types": "D"}, 64)
+        events = [e for response in pages for e in response.json()["events"]]
+
+        assert len(events) == 500
+        assert {e["event_type"] for e in events} == {"D"}
+
+    def test_last_page_has_no_cursor(self, api_client):
+        last = api_client.get("/api/events", params={"page": 10, "page_size": 100})
+
+        assert last.json()["pagination"]["next_cursor"] is None
+
+    def test_invalid_cursor(self, api_client):
+        response = api_client.get("/api/events", params={"cursor": "not-a-cursor"})
+
+        assert response.status_code == 400
+
+
+class TestCursorTokens:
+    """encode_cursor / decode_cursor."""
+
+    def test_round_trip(self):
+        assert decode_cursor(encode_cursor(date(2024, 3, 1), "123")) == (date(2024, 3, 1), "123")
+        assert decode_cursor(encode_cursor(None, "K0")) == (None, "K0")
+
+    def test_malformed(self):
+        with pytest.raises(ValueError):
+            decode_cursor("eyJ4IjoxfQ")
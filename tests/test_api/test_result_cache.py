@@ -0,0 +1,212 @@
+"""Tests for the data-version-aware result cache."""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+import api.routers.analytics as analytics
+from api.main import app
+from api.services.cache import (
+    SingleFlight,
+    SingleFlightTimeout,
+    TTLCache,
+    cached,
+    clear_all_caches,
+    flight,
+    get_cache_stats,
+    stats_cache,
+)
+from api.services.queries import QueryService
+
+
+@pytest.fixture(autouse=True)
+def empty_caches():
+    clear_all_caches()
+    yield
+    clear_all_caches()
+
+
+class TestQueryServiceCaching:
+    """QueryService read paths are served from the cache."""
+
+    def test_second_call_skips_duckdb(self, api_db):
+        hits = stats_cache.stats()["hits"]
+        first = QueryService().get_event_stats(event_types=["D"])
+        checkouts = api_db.pool_stats()["checkouts"]
+
+        second = QueryService().get_event_stats(event_types=["D"])
+
+        assert second == first
+        assert first["total"] == first["deaths"] == 500
+        assert api_db.pool_stats()["checkouts"] == checkouts
+        assert stats_cache.stats()["hits"] == hits + 1
+
+    def test_different_arguments_miss(self, api_db):
+        misses = stats_cache.stats()["misses"]
+        QueryService().get_event_stats(event_types=["D"])
+        other = QueryService().get_event_stats(event_types=["M"])
+
+        assert other["malfunctions"] == 500
+        assert stats_cache.stats()["misses"] == misses + 2
+
+    def test_refresh_invalidates_exactly(self, api_db, publish_events):
+        version = api_db.data_version
+        assert QueryService().get_event_stats()["total"] == 1000
+
+        publish_events(100)
+        api_db.swap(drain_timeout=5)
+
+        assert api_db.data_version != version
+        assert QueryService().get_event_stats()["total"] == 1100
+
+
+class TestEndpointCaching:
+    """Cached endpoints and cache stats over HTTP."""
+
+    def test_filter_options_cached(self, api_db):
+        before = get_cache_stats()["filter_cache"]
+        with TestClient(app) as client:
+            first = client.get("/api/filters/brand-names")
+            checkouts = api_db.pool_stats()["checkouts"]
+            second = client.get("/api/filters/brand-names")
+
+            assert second.json() == first.json()
+            assert api_db.pool_stats()["checkouts"] == checkouts
+
+            stats = client.get("/api/admin/cache").json()
+
+        assert stats["data_version"] == api_db.data_version
+        assert stats["caches"]["filter_cache"]["hits"] == before["hits"] + 1
+        assert stats["caches"]["filter_cache"]["misses"] == before["misses"] + 1
+
+
+class TestCachedDecorator:
+    """cached() key construction."""
+
+    def test_methods_share_entries_across_instances(self, api_db):
+        calls = []
+        cache = TTLCache(maxsize=10, ttl=60)
+
+        class Service:
+            @cached(cache, "svc")
+            def compute(self, value):
+                calls.append(value)
+                return value * 2
+
+        assert Service().compute(2) == 4
+        assert Service().compute(2) == 4
+        assert calls == [2]
+        assert cache.stats()["hit_rate"] == 0.5
+
+    def test_stats_cover_all_caches(self):
+        assert {"stats_cache", "trends_cache", "filter_cache", "signals_cache"} <= set(
+            get_cache_stats()
+        )
+
+
+class CountingDB:
+    """Database proxy that counts (slow) fetch_all queries."""
+
+    def __init__(self, db, delay):
+        self.db = db
+        self.delay = delay
+        self.queries = 0
+        self.lock = threading.Lock()
+
+    def fetch_all(self, query, params=None):
+        with self.lock:
+            self.queries += 1
+        time.sleep(self.delay)
+        return self.db.fetch_all(query, params)
+
+    def __getattr__(self, name):
+        return getattr(self.db, name)
+
+
+class TestSingleFlight:
+    """Concurrent identical calls share one execution."""
+
+    def run_concurrently(self, group, func, callers=8):
+        barrier = threading.Barrier(callers)
+
+        def call():
+            barrier.wait()
+            try:
+                return group.do("key", func)
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=callers) as executor:
+            return list(executor.map(lambda _: call(), range(callers)))
+
+    def test_one_execution_shared(self):
+        group = SingleFlight(timeout=5)
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.2)
+            return {"total": 42}
+
+        results = self.run_concurrently(group, compute)
+
+        assert calls == [1]
+        assert results == [{"total": 42}] * 8
+        assert group.stats()["shared"] == 7
+        assert group.stats()["in_flight"] == 0
+
+    def test_error_propagates_to_waiters(self):
+        group = SingleFlight(timeout=5)
+
+        def fail():
+            time.sleep(0.2)
+            raise ValueError("query failed")
+
+        results = self.run_concurrently(group, fail)
+
+        assert all(isinstance(r, ValueError) for r in results)
+        assert group.stats()["executions"] == 1
+        # The failure is not remembered
+        assert group.do("key", lambda: "ok") == "ok"
+
+    def test_waiter_times_out(self):
+        group = SingleFlight(timeout=0.05)
+        release = threading.Event()
+        leader = threading.Thread(target=group.do, args=("key", release.wait))
+        leader.start()
+        time.sleep(0.05)
+
+        with pytest.raises(SingleFlightTimeout):
+            group.do("key", lambda: "never runs")
+
+        release.set()
+        leader.join()
+        assert group.stats()["timeouts"] == 1
+
+
+class TestRequestCoalescing:
+    """Identical concurrent requests run their query once."""
+
+    def test_concurrent_signals_requests_run_one_query(self, api_db, monkeypatch):
+        counting = CountingDB(api_db, delay=0.3)
+        monkeypatch.setattr(analytics, "get_db", lambda: counting)
+        executions = flight.stats()["executions"]
+
+        async def scenario():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await asyncio.gather(
+                    *[client.get("/api/analytics/signals?lookback_months=6") for _ in range(8)]
+                )
+
+        responses = asyncio.run(scenario())
+
+        assert [r.status_code for r in responses] == [200] * 8
+        assert len({r.text for r in responses}) == 1
+        assert counting.queries == 1
+        assert flight.stats()["executions"] == executions + 1
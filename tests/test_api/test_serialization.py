@@ -0,0 +1,112 @@
+"""Tests for fast JSON rendering and response compression."""
+
+import gzip
+import json
+from datetime import date
+from decimal import Decimal
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from api.config import get_settings
+from api.middleware.compression import CompressionMiddleware, choose_encoding
+from api.models.schemas import TrendData
+from api.services.cache import clear_all_caches
+from api.services.serialization import render_json
+
+
+class TestFastJSON:
+    """fast_json endpoints return the same JSON as FastAPI's encoder."""
+
+    @pytest.mark.parametrize("path", [
+        "/api/events?page_size=500",
+        "/api/analytics/trends?group_by=year",
+        "/api/analytics/signals",
+    ])
+    def test_matches_default_serialization(self, api_client, path, monkeypatch):
+        fast = api_client.get(path)
+        clear_all_caches()
+        monkeypatch.setattr(get_settings(), "fast_json", False)
+        default = api_client.get(path)
+
+        assert fast.status_code == default.status_code == 200
+        assert fast.json() == default.json()
+        assert fast.headers["content-type"] == "application/json"
+
+    def test_render_json_types(self):
+        content = {
+            "trend": TrendData(period="2024", total=3, deaths=1, injuries=1, malfunctions=1),
+            "day": date(2024, 1, 2),
+            "ratio": Decimal("1.5"),
+            "count": np.int64(7),
+            "codes": ("A", "B"),
+        }
+
+        assert json.loads(render_json(content)) == {
+            "trend": {"period": "2024", "total": 3, "deaths": 1, "injuries": 1, "malfunctions": 1},
+            "day": "2024-01-02",
+            "ratio": 1.5,
+            "count": 7,
+            "codes": ["A", "B"],
+        }
+
+
+class TestCompression:
+    """Large responses are compressed for clients that accept it."""
+
+    def test_large_response_gzipped(self, api_client):
+        response = api_client.get(
+            "/api/events", params={"page_size": 500}, headers={"Accept-Encoding": "gzip"}
+        )
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert "accept-encoding" in response.headers["vary"].lower()
+        assert len(response.json()["events"]) == 500
+
+    def test_identity_when_not_accepted(self, api_client):
+        response = api_client.get(
+            "/api/events", params={"page_size": 500}, headers={"Accept-Encoding": "identity"}
+        )
+
+        assert "content-encoding" not in response.headers
+        assert int(response.headers["content-length"]) == len(response.content)
+
+    def test_small_response_not_compressed(self, api_client):
+        response = api_client.get("/api/events/stats", headers={"Accept-Encoding": "gzip"})
+
+        assert "content-encoding" not in response.headers
+
+    def test_streaming_export_compressed(self, api_client):
+        with api_client.stream(
+            "GET", "/api/events/export", params={"format": "csv"},
+            headers={"Accept-Encoding": "gzip"},
+        ) as response:
+            raw = b"".join(response.iter_raw())
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert gzip.decompress(raw).decode().count("\n") > 1000
+
+    def test_compressed_etag_is_weak_and_revalidates(self, api_client):
+        tagged = Starlette(routes=[
+            Route("/", lambda request: PlainTextResponse("x" * 100, headers={"ETag": '"abc"'}))
+        ])
+        tagged.add_middleware(CompressionMiddleware, minimum_size=0)
+        compressed = TestClient(tagged).get("/", headers={"Accept-Encoding": "gzip"})
+
+        url = "/api/analytics/trends?group_by=year"
+        etag = api_client.get(url).headers["etag"]
+        revalidated = api_client.get(url, headers={"If-None-Match": f"W/{etag}"})
+
+        assert compressed.headers["etag"] == 'W/"abc"'
+        assert compressed.text == "x" * 100
+        assert revalidated.status_code == 304
+
+    def test_choose_encoding(self):
+        assert choose_encoding("gzip, deflate") == "gzip"
+        assert choose_encoding("deflate, gzip;q=0") is None
+        assert choose_encoding("*") == "gzip"
+        assert choose_encoding("") is None
@@ -0,0 +1,173 @@
+"""Tests for background cache warming after startup and refreshes."""
+
+import asyncio
+import json
+import subprocess
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+import api.routers.admin as admin
+from api.config import get_settings
+from api.main import app
+from api.services.cache import clear_all_caches, filter_cache, get_cache_stats
+from api.services.warmup import CacheWarmer, DEFAULT_WARMUP_REQUESTS, cache_warmer
+
+
+@pytest.fixture(autouse=True)
+def warmup_enabled(monkeypatch):
+    monkeypatch.setattr(get_settings(), "warmup_enabled", True)
+    clear_all_caches()
+    yield
+    clear_all_caches()
+
+
+def wait_for_warmup(client, reason="startup", timeout=30):
+    """Poll /api/admin/status until the warm-up for ``reason`` has finished."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        warmup = client.get("/api/admin/status").json()["warmup"]
+        if warmup["reason"] == reason and warmup["state"] == "completed":
+            return warmup
+        time.sleep(0.05)
+    raise AssertionError(f"warm-up did not finish: {warmup}")
+
+
+class TestStartupWarmup:
+    """The warm-up list is replayed after startup."""
+
+    def test_fills_caches(self, api_db):
+        with TestClient(app) as client:
+            warmup = wait_for_warmup(client)
+            hits = get_cache_stats()["stats_cache"]["hits"]
+            client.get("/api/events/stats")
+
+            assert warmup["total"] == len(DEFAULT_WARMUP_REQUESTS)
+            assert warmup["completed"] == warmup["total"]
+            assert warmup["failed"] == 0
+            assert warmup["finished_at"] >= warmup["started_at"]
+            assert filter_cache.stats()["size"] > 0
+            assert get_cache_stats()["stats_cache"]["hits"] == hits + 1
+
+    def test_does_not_block_startup(self, api_db, monkeypatch):
+        release = threading.Event()
+        warm = CacheWarmer._warm
+
+        async def blocked_warm(self, client, request):
+            while not release.is_set():
+                await asyncio.sleep(0.01)
+            await warm(self, client, request)
+
+        monkeypatch.setattr(CacheWarmer, "_warm", blocked_warm)
+
+        with TestClient(app) as client:
+            health = client.get("/api/health")
+            warmup = client.get("/api/admin/status").json()["warmup"]
+            release.set()
+            done = wait_for_warmup(client)
+
+        assert health.status_code == 200
+        assert warmup["state"] == "running"
+        assert warmup["completed"] == 0
+        assert done["completed"] == done["total"]
+
+    def test_custom_list(self, api_db, monkeypatch, tmp_path):
+        warmup_file = tmp_path / "warmup.json"
+        warmup_file.write_text(json.dumps([
+            {"path": "/api/analytics/trends", "params": {"group_by": "year"}},
+            {"path": "/api/events/nope"},
+            {"path": "/health"},
+        ]))
+        monkeypatch.setattr(get_settings(), "warmup_file", str(warmup_file))
+
+        with TestClient(app) as client:
+            warmup = wait_for_warmup(client)
+
+        assert warmup["total"] == 2
+        assert warmup["completed"] == 1
+        assert warmup["failed"] == 1
+        assert warmup["errors"] == ["/api/events/nope: HTTP 404"]
+
+    def test_disabled(self, api_db, monkeypatch):
+        monkeypatch.setattr(get_settings(), "warmup_enabled", False)
+        monkeypatch.setattr(cache_warmer, "_status", {"state": "idle"})
+
+        with TestClient(app) as client:
+            warmup = client.get("/api/admin/status").json()["warmup"]
+
+        assert warmup["state"] == "idle"
+        assert filter_cache.stats()["size"] == 0
+
+
+@pytest.fixture
+def gated_warmup(api_db, monkeypatch, tmp_path):
+    """Warm-up list whose first request blocks in its handler until released."""
+    warmup_file = tmp_path / "warmup.json"
+    warmup_file.write_text(json.dumps([
+        {"path": "/api/admin/table-counts"},
+        {"path": "/api/events/stats"},
+    ]))
+    monkeypatch.setattr(get_settings(), "warmup_file", str(warmup_file))
+
+    started, release = threading.Event(), threading.Event()
+    fetch_one = api_db.fetch_one
+
+    def gated_fetch_one(query, *args, **kwargs):
+        started.set()
+        release.wait(5)
+        return fetch_one(query, *args, **kwargs)
+
+    monkeypatch.setattr(api_db, "fetch_one", gated_fetch_one)
+    return started, release
+
+
+class TestStopWarmup:
+    """Runs stop between requests, so no cursor outlives its request."""
+
+    def test_restart_mid_request(self, api_db, gated_warmup):
+        started, release = gated_warmup
+
+        with TestClient(app) as client:
+            assert started.wait(5)
+            cache_warmer.start_threadsafe("refresh")
+            threading.Timer(0.2, release.set).start()
+            warmup = wait_for_warmup(client, reason="refresh")
+
+        assert warmup["completed"] == warmup["total"] == 2
+        assert api_db.pool_stats()["in_use"] == 0
+
+    def test_shutdown_mid_request(self, api_db, gated_warmup):
+        started, release = gated_warmup
+
+        with TestClient(app):
+            assert started.wait(5)
+            threading.Timer(0.2, release.set).start()
+
+        assert cache_warmer.status()["state"] == "cancelled"
+        assert cache_warmer.status()["completed"] == 1
+        assert api_db.pool_stats()["in_use"] == 0
+
+
+class TestRefreshWarmup:
+    """A successful refresh warms the caches for the new snapshot."""
+
+    def test_rewarms_after_refresh(self, api_db, db_path, monkeypatch, tmp_path):
+        def load_add_files(*args, **kwargs):
+            return subprocess.CompletedProcess(args, 0, stdout='{"records_loaded": 0}\n', stderr="")
+
+        monkeypatch.setattr(get_settings(), "database_path", db_path)
+        monkeypatch.setattr(admin, "REFRESH_STATUS_FILE", tmp_path / "refresh.json")
+        monkeypatch.setattr(admin.subprocess, "run", load_add_files)
+
+        with TestClient(app) as client:
+            wait_for_warmup(client)
+            refresh = threading.Thread(target=admin._run_refresh_task)
+            refresh.start()
+            refresh.join(timeout=30)
+            warmup = wait_for_warmup(client, reason="refresh")
+
+            assert admin._get_refresh_status()["status"] == "completed"
+            assert warmup["completed"] == warmup["total"]
+            assert filter_cache.stats()["size"] > 0
@@ -176,3 +176,77 @@ class TestMaintenance:
         assert isinstance(stats, dict)
         assert "master_events" in stats
         assert stats["master_events"]["row_count"] == 1
+
+
+class TestSnapshots:
+    """Tests for blue/green database snapshots."""
+
+    def make_db(self, tmp_path, events=1):
+        from src.database import get_connection, initialize_database
+
+        db_path = tmp_path / "maude.duckdb"
+        with get_connection(db_path) as conn:
+            initialize_database(conn)
+            for i in range(events):
+                conn.execute("INSERT INTO master_events (mdr_report_key) VALUES (?)", [f"K{i}"])
+        return db_path
+
+    def test_publish_repoints_database_path(self, tmp_path):
+        """Test that a loaded snapshot replaces the live database atomically."""
+        from src.database import create_snapshot, get_connection, publish_snapshot, resolve_snapshot
+
+        db_path = self.make_db(tmp_path)
+        snapshot = create_snapshot(db_path)
+        with get_connection(snapshot) as conn:
+            conn.execute("INSERT INTO master_events (mdr_report_key) VALUES ('NEW')")
+
+        live = db_path.resolve()
+        previous = publish_snapshot(snapshot, db_path)
+
+        assert previous == live
+        assert db_path.is_symlink()
+        assert resolve_snapshot(db_path) == snapshot.resolve()
+        with get_connection(db_path, read_only=True) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM master_events").fetchone()[0] == 2
+
+    def test_validate_rejects_shrunk_snapshot(self, tmp_path):
+        """Test that a snapshot with fewer events than the live one is rejected."""
+        from src.database import (
+            SnapshotError, create_snapshot, get_connection, validate_snapshot,
+        )
+
+        db_path = self.make_db(tmp_path, events=3)
+        snapshot = create_snapshot(db_path)
+        baseline = validate_snapshot(snapshot)
+        with get_connection(snapshot) as conn:
+            conn.execute("DELETE FROM master_events")
+
+        assert baseline["master_events"] == 3
+        with pytest.raises(SnapshotError, match="fewer"):
+            validate_snapshot(snapshot, baseline)
+
+    def test_validate_rejects_missing_tables(self, tmp_path):
+        """Test that a snapshot without the core tables is rejected."""
+        from src.database import SnapshotError, get_connection, validate_snapshot
+
+        snapshot = tmp_path / "maude.20250101_000000_000000.duckdb"
+        with get_connection(snapshot) as conn:
+            conn.execute("CREATE TABLE master_events (mdr_report_key VARCHAR)")
+
+        with pytest.raises(SnapshotError, match="missing tables"):
+            validate_snapshot(snapshot)
+
+    def test_prune_keeps_live_and_previous(self, tmp_path):
+        """Test that pruning keeps the live snapshot and the newest other one."""
+        from src.database import create_snapshot, list_snapshots, prune_snapshots, publish_snapshot
+
+        db_path = self.make_db(tmp_path)
+        snapshots = []
+        for _ in range(3):
+            snapshots.append(create_snapshot(db_path))
+            publish_snapshot(snapshots[-1], db_path)
+
+        deleted = prune_snapshots(db_path, keep=2)
+
+        assert deleted == [snapshots[0]]
+        assert list_snapshots(db_path) == snapshots[1:]
@@ -0,0 +1,168 @@
+"""Tests for the change_log change-data-capture table."""
+
+import duckdb
+import pytest
+
+from src.database.change_log import (
+    OP_INSERT,
+    OP_UPDATE,
+    start_run,
+    record_changes,
+    get_latest_run_id,
+    get_changed_keys,
+)
+from src.database.schema import initialize_database
+from src.ingestion.change_processor import ChangeProcessor
+from src.ingestion.loader import MAUDELoader
+from tests.test_ingestion.test_change_processor import write_change_file
+
+
+@pytest.fixture
+def log_db():
+    """Initialized in-memory database."""
+    conn = duckdb.connect(":memory:")
+    initialize_database(conn)
+    yield conn
+    conn.close()
+
+
+def master_record(key, received="2024-01-05"):
+    return {"mdr_report_key": key, "date_received": received, "event_type": "M"}
+
+
+def log_rows(conn):
+    return conn.execute("""
+        SELECT run_id, table_name, mdr_report_key, operation, date_received::VARCHAR
+        FROM change_log ORDER BY run_id, table_name, mdr_report_key
+    """).fetchall()
+
+
+def conflicting_patient_file(conn, tmp_path):
+    """Patient file whose second record violates a unique index, failing its
+    batch (and that record again when the batch is salvaged record by record)."""
+    conn.execute("""
+        INSERT INTO patients (mdr_report_key, patient_sequence_number, patient_age)
+        VALUES ('0000001', 1, '99 YR')
+    """)
+    conn.execute("CREATE UNIQUE INDEX patient_age_seq ON patients (patient_sequence_number, patient_age)")
+    return write_change_file(tmp_path / "patient.txt", [
+        "1000001|1|01/05/2024|||45 YR|F|||",
+        "1000002|1|01/05/2024|||99 YR|F|||",
+    ])
+
+
+class TestLoaderChangeLog:
+    """MAUDELoader logs each batch in its transaction."""
+
+    def test_insert_then_update(self, log_db):
+        loader = MAUDELoader(enable_validation=False, run_id=start_run(log_db))
+        loader._insert_batch(log_db, "master", [master_record("1000001")])
+
+        second = MAUDELoader(enable_validation=False, run_id=start_run(log_db))
+        second._insert_batch(log_db, "master", [
+            master_record("1000001"),
+            master_record("1000002", "2024-02-01"),
+        ])
+
+        assert log_rows(log_db) == [
+            (1, "master_events", "1000001", OP_INSERT, "2024-01-05"),
+            (2, "master_events", "1000001", OP_UPDATE, "2024-01-05"),
+            (2, "master_events", "1000002", OP_INSERT, "2024-02-01"),
+        ]
+
+    def test_child_rows_dated_from_master(self, log_db):
+        loader = MAUDELoader(enable_validation=False, run_id=start_run(log_db))
+        loader._insert_batch(log_db, "master", [master_record("1000001")])
+        loader._insert_batch(log_db, "text", [
+            {"mdr_report_key": "1000001", "mdr_text_key": "1", "text_content": "a"},
+            {"mdr_report_key": "1000001", "mdr_text_key": "2", "text_content": "b"},
+        ])
+
+        rows = log_db.execute(
+            "SELECT operation, date_received::VARCHAR FROM change_log WHERE table_name = 'mdr_text'"
+        ).fetchall()
+        assert rows == [(OP_INSERT, "2024-01-05")]
+
+    def test_rollback_discards_log_rows(self, log_db):
+        loader = MAUDELoader(enable_validation=False, run_id=start_run(log_db))
+        log_db.execute("BEGIN TRANSACTION")
+        loader._insert_batch(log_db, "master", [master_record("1000001")], in_transaction=True)
+        log_db.execute("ROLLBACK")
+
+        assert log_rows(log_db) == []
+
+    def test_salvaged_batch_logs_only_written_records(self, log_db, tmp_path):
+        patient_file = conflicting_patient_file(log_db, tmp_path)
+
+        loader = MAUDELoader(enable_validation=False, run_id=start_run(log_db))
+        result = loader.load_file(patient_file, "patient", conn=log_db)
+
+        assert result.batch_insert_errors == 1
+        assert result.records_loaded == 1
+        assert get_changed_keys(log_db, 0, table_name="patients") == ["1000001"]
+
+    def test_failed_batch_without_transaction_safety_logs_nothing(self, log_db, tmp_path):
+        patient_file = conflicting_patient_file(log_db, tmp_path)
+
+        loader = MAUDELoader(
+            enable_validation=False, enable_transaction_safety=False, run_id=start_run(log_db)
+        )
+        result = loader.load_file(patient_file, "patient", conn=log_db)
+
+        assert result.batch_insert_errors == 1
+        assert result.records_loaded == 0
+        assert get_changed_keys(log_db, 0, table_name="patients") == []
+
+    def test_tracking_disabled(self, log_db):
+        loader = MAUDELoader(enable_validation=False, track_changes=False, run_id=1)
+        loader._insert_batch(log_db, "master", [master_record("1000001")])
+
+        assert log_rows(log_db) == []
+
+
+class TestChangeProcessorChangeLog:
+    """ChangeProcessor logs the keys it actually updated."""
+
+    def test_updates_logged_under_shared_run(self, log_db, tmp_path):
+        log_db.execute("""
+            INSERT INTO patients (id, mdr_report_key, patient_sequence_number, patient_sex)
+            VALUES (1, '1000001', 1, 'M'), (2, '1000002', 1, 'F')
+        """)
+        run_id = start_run(log_db)
+        change_file = write_change_file(tmp_path / "patientChange.txt", [
+            "1000001|1|01/05/2024|||45 YR|F|||",
+            "1000002|1|01/05/2024|||||||",  # nothing to update
+            "9999999|1|01/05/2024|||30 YR|M|||",  # not in database
+        ])
+
+        ChangeProcessor(run_id=run_id).process_change_file(change_file, "patient", log_db)
+
+        # No master row to take date_received from
+        assert log_rows(log_db) == [
+            (run_id, "patients", "1000001", OP_UPDATE, None),
+        ]
+
+
+class TestChangedKeysQuery:
+    """Consumers query keys changed since a run."""
+
+    def test_changed_since_run(self, log_db):
+        log_db.execute(
+            "CREATE TEMP TABLE keys AS SELECT * FROM (VALUES ('1000001'), ('1000002')) t(mdr_report_key)"
+        )
+        first = start_run(log_db)
+        record_changes(log_db, first, "master_events", "keys", operation=OP_INSERT)
+        second = start_run(log_db)
+        record_changes(log_db, second, "devices", "(SELECT '1000003' AS mdr_report_key)")
+
+        assert get_latest_run_id(log_db) == second
+        assert get_changed_keys(log_db, 0) == ["1000001", "1000002", "1000003"]
+        assert get_changed_keys(log_db, first) == ["1000003"]
+        assert get_changed_keys(log_db, 0, table_name="master_events") == ["1000001", "1000002"]
+        assert get_changed_keys(log_db, 0, operations=[OP_UPDATE]) == []
+        assert get_changed_keys(log_db, second) == []
+
+    def test_latest_run_without_table(self):
+        conn = duckdb.connect(":memory:")
+        assert get_latest_run_id(conn) is None
+        conn.close()
@@ -0,0 +1,98 @@
+"""Tests for set-based CHANGE file processing."""
+
+import duckdb
+import pytest
+
+from src.database.schema import initialize_database
+from src.ingestion.change_processor import ChangeProcessor, STAGING_TABLE
+
+
+PATIENT_HEADER = (
+    "MDR_REPORT_KEY|PATIENT_SEQUENCE_NUMBER|DATE_RECEIVED|SEQUENCE_NUMBER_TREATMENT|"
+    "SEQUENCE_NUMBER_OUTCOME|PATIENT_AGE|PATIENT_SEX|PATIENT_WEIGHT|"
+    "PATIENT_ETHNICITY|PATIENT_RACE"
+)
+
+
+@pytest.fixture
+def change_db():
+    """Database with a few patient rows, one with a NULL sequence number."""
+    conn = duckdb.connect(":memory:")
+    initialize_database(conn)
+    conn.execute("ALTER TABLE patients ADD COLUMN updated_at TIMESTAMP")
+    conn.execute("""
+        INSERT INTO patients (id, mdr_report_key, patient_sequence_number, patient_sex, patient_weight)
+        VALUES
+        (1, '1000001', 1, 'M', '70'),
+        (2, '1000002', 1, 'F', '60'),
+        (3, '1000003', NULL, 'U', '50')
+    """)
+    yield conn
+    conn.close()
+
+
+def write_change_file(path, rows):
+    path.write_text(PATIENT_HEADER + "\n" + "\n".join(rows) + "\n", encoding="latin-1")
+    return path
+
+
+class TestChangeProcessor:
+    """ChangeProcessor applies staged changes with set-based updates."""
+
+    def test_counts_and_values(self, change_db, tmp_path):
+        change_file = write_change_file(tmp_path / "patientChange.txt", [
+            "1000001|1|01/05/2024|||45 YR|F|||",
+            "1000002|1|01/05/2024|||||||",  # found, but nothing to update
+            "1000003|1|01/05/2024|||80 YR||||",  # matches NULL-sequence row
+            "9999999|1|01/05/2024|||30 YR|M|||",  # not in database
+        ])
+
+        result = ChangeProcessor(batch_size=2).process_change_file(
+            change_file, "patient", change_db
+        )
+
+        assert result.records_processed == 4
+        assert result.records_updated == 2
+        assert result.records_not_found == 1
+
+        rows = dict(change_db.execute(
+            "SELECT mdr_report_key, patient_sex FROM patients"
+        ).fetchall())
+        assert rows == {"1000001": "F", "1000002": "F", "1000003": "U"}
+
+        age = change_db.execute(
+            "SELECT patient_age FROM patients WHERE mdr_report_key = '1000003'"
+        ).fetchone()[0]
+        assert age == "80 YR"
+
+        updated = change_db.execute(
+            "SELECT COUNT(updated_at) FROM patients"
+        ).fetchone()[0]
+        assert updated == 2
+
+    def test_repeated_key_keeps_last_non_null_value(self, change_db, tmp_path):
+        change_file = write_change_file(tmp_path / "patientChange.txt", [
+            "1000001|1|01/05/2024|||45 YR|F|||",
+            "1000001|1|01/05/2024||||M|||",
+        ])
+
+        result = ChangeProcessor().process_change_file(change_file, "patient", change_db)
+
+        assert result.records_updated == 2
+        row = change_db.execute(
+            "SELECT patient_age, patient_sex FROM patients WHERE mdr_report_key = '1000001'"
+        ).fetchone()
+        assert row == ("45 YR", "M")
+
+    def test_staging_table_is_dropped(self, change_db, tmp_path):
+        change_file = write_change_file(tmp_path / "patientChange.txt", [
+            "1000001|1|01/05/2024|||45 YR|F|||",
+        ])
+
+        ChangeProcessor().process_change_file(change_file, "patient", change_db)
+
+        tables = change_db.execute(
+            "SELECT table_name FROM duckdb_tables() WHERE table_name = ?",
+            [STAGING_TABLE],
+        ).fetchall()
+        assert tables == []
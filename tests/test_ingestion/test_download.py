@@ -0,0 +1,208 @@
+"""Tests for streaming MAUDE downloads against a local HTTP stand-in."""
+
+import hashlib
+import os
+import tracemalloc
+import zipfile
+from types import SimpleNamespace
+
+import pytest
+
+import src.ingestion.download as download
+from src.ingestion.download import MAUDEDownloader, PARTIAL_SUFFIX, RETRY_BACKOFF_SECONDS
+
+
+# Large enough that buffering the response would dwarf the memory budget
+PAYLOAD_MB = 48
+MEMORY_BUDGET_MB = 12
+
+
+@pytest.fixture
+def large_zip(mirror):
+    """Generate a stored (uncompressed) zip with a large text member."""
+    zip_path = mirror.root / "foitextthru2023.zip"
+    line = b"1000001|1|N|Patient reported device malfunction during use.\n"
+    block = line * (1024 * 1024 // len(line) + 1)
+
+    with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_STORED) as zf:
+        with zf.open("foitextthru2023.txt", "w", force_zip64=True) as member:
+            for _ in range(PAYLOAD_MB):
+                member.write(block)
+
+    return zip_path, mirror.url(zip_path.name)
+
+
+@pytest.fixture
+def payload(mirror):
+    """A 3 MB file on the mirror; returns its bytes."""
+    data = os.urandom(3 * 1024 * 1024)
+    (mirror.root / "foidevAdd.txt").write_bytes(data)
+    return data
+
+
+@pytest.fixture
+def downloader(tmp_path):
+    return MAUDEDownloader(output_dir=tmp_path / "raw")
+
+
+class TestStreamingDownload:
+    """_download_file streams to disk with bounded memory."""
+
+    def test_large_zip_bounded_memory(self, downloader, large_zip):
+        zip_path, url = large_zip
+
+        tracemalloc.start()
+        try:
+            result = downloader._download_file(url, "text", force=True)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        assert result.success, result.error
+        assert result.size_bytes == zip_path.stat().st_size
+        assert result.checksum == hashlib.md5(zip_path.read_bytes()).hexdigest()
+        assert peak < MEMORY_BUDGET_MB * 1024 * 1024
+
+        extracted = downloader.output_dir / "foitextthru2023.txt"
+        assert result.extracted_files == ["foitextthru2023.txt"]
+        with zipfile.ZipFile(zip_path) as zf:
+            assert extracted.stat().st_size == zf.getinfo("foitextthru2023.txt").file_size
+
+        # Neither the archive nor any temp files are left behind
+        assert sorted(p.name for p in downloader.output_dir.glob("*.txt*")) == [
+            "foitextthru2023.txt"
+        ]
+        assert not list(downloader.output_dir.glob(f"*{PARTIAL_SUFFIX}"))
+
+    def test_plain_file_renamed_into_place(self, downloader, mirror):
+        (mirror.root / "mdrfoiAdd.txt").write_bytes(b"MDR_REPORT_KEY|EVENT_KEY\n1000001|1\n")
+
+        result = downloader._download_file(mirror.url("mdrfoiAdd.txt"), "master", force=True)
+
+        assert result.success
+        assert result.extracted_files == ["mdrfoiAdd.txt"]
+        assert (downloader.output_dir / "mdrfoiAdd.txt").read_bytes() == (
+            mirror.root / "mdrfoiAdd.txt"
+        ).read_bytes()
+
+    def test_failed_download_leaves_existing_file(self, downloader, mirror):
+        existing = downloader.output_dir / "mdrfoiAdd.txt"
+        existing.write_text("previous contents")
+
+        result = downloader._download_file(mirror.url("mdrfoiAdd.txt"), "master", force=True)
+
+        assert not result.success
+        assert existing.read_text() == "previous contents"
+        assert not list(downloader.output_dir.glob(f"*{PARTIAL_SUFFIX}"))
+
+
+class TestResumableDownload:
+    """Interrupted downloads resume with Range requests."""
+
+    def test_resumes_after_dropped_connection(self, downloader, mirror, payload, monkeypatch):
+        sleeps = []
+        monkeypatch.setattr(download, "time", SimpleNamespace(sleep=sleeps.append))
+        mirror.server.fail_after["foidevAdd.txt"] = 1024 * 1024
+
+        result = downloader._download_file(mirror.url("foidevAdd.txt"), "device", force=True)
+
+        assert result.success, result.error
+        assert result.checksum == hashlib.md5(payload).hexdigest()
+        assert (downloader.output_dir / "foidevAdd.txt").read_bytes() == payload
+
+        ranges = [r for method, _, r in mirror.requests if method == "GET"]
+        assert len(ranges) == 2
+        assert ranges[0] is None
+        assert ranges[1].startswith("bytes=") and ranges[1] != "bytes=0-"
+        assert downloader.tracker.get_partial("foidevAdd.txt") == {}
+        assert sleeps == [RETRY_BACKOFF_SECONDS]
+
+    def test_restarts_when_server_has_no_ranges(self, downloader, mirror, payload):
+        mirror.server.ranges = False
+        mirror.server.fail_after["foidevAdd.txt"] = 1024 * 1024
+
+        result = downloader._download_file(mirror.url("foidevAdd.txt"), "device", force=True)
+
+        assert result.success, result.error
+        assert (downloader.output_dir / "foidevAdd.txt").read_bytes() == payload
+        assert [r for _, _, r in mirror.requests] == [None, None]
+
+    def test_partial_progress_survives_between_runs(self, tmp_path, mirror, payload):
+        output_dir = tmp_path / "raw"
+        mirror.server.fail_after["foidevAdd.txt"] = 1024 * 1024
+
+        first = MAUDEDownloader(output_dir=output_dir, max_attempts=1)
+        failed = first._download_file(mirror.url("foidevAdd.txt"), "device", force=True)
+
+        assert not failed.success
+        partial = first.tracker.get_partial("foidevAdd.txt")
+        assert partial["accept_ranges"] is True
+        assert partial["content_length"] == len(payload)
+        assert 0 < partial["bytes_downloaded"] < len(payload)
+        assert partial["bytes_downloaded"] == (output_dir / f"foidevAdd.txt{PARTIAL_SUFFIX}").stat().st_size
+
+        # A fresh downloader picks the partial file up from the state file
+        second = MAUDEDownloader(output_dir=output_dir)
+        result = second._download_file(mirror.url("foidevAdd.txt"), "device")
+
+        assert result.success, result.error
+        assert result.checksum == hashlib.md5(payload).hexdigest()
+        assert mirror.requests[-1][2] == f"bytes={partial['bytes_downloaded']}-"
+
+    def test_changed_remote_file_restarts(self, tmp_path, mirror, payload):
+        output_dir = tmp_path / "raw"
+        mirror.server.fail_after["foidevAdd.txt"] = 1024 * 1024
+        MAUDEDownloader(output_dir=output_dir, max_attempts=1)._download_file(
+            mirror.url("foidevAdd.txt"), "device", force=True
+        )
+
+        changed = os.urandom(2 * 1024 * 1024)
+        (mirror.root / "foidevAdd.txt").write_bytes(changed)
+
+        result = MAUDEDownloader(output_dir=output_dir)._download_file(
+            mirror.url("foidevAdd.txt"), "device"
+        )
+
+        assert result.success, result.error
+        assert (output_dir / "foidevAdd.txt").read_bytes() == changed
+
+    def test_range_of_changed_file_restarts(self, tmp_path, mirror, payload):
+        output_dir = tmp_path / "raw"
+        mirror.server.fail_after["foidevAdd.txt"] = 1024 * 1024
+        MAUDEDownloader(output_dir=output_dir, max_attempts=1)._download_file(
+            mirror.url("foidevAdd.txt"), "device", force=True
+        )
+
+        # The server answers the stale If-Range with a 206 of the new version
+        changed = os.urandom(3 * 1024 * 1024 + 1)
+        (mirror.root / "foidevAdd.txt").write_bytes(changed)
+        mirror.server.ignore_if_range = True
+        mirror.reset_counters()
+
+        downloader = MAUDEDownloader(output_dir=output_dir, max_attempts=1)
+        result = downloader._download_file(mirror.url("foidevAdd.txt"), "device")
+
+        assert result.success, result.error
+        assert result.checksum == hashlib.md5(changed).hexdigest()
+        assert (output_dir / "foidevAdd.txt").read_bytes() == changed
+        assert [r for _, _, r in mirror.requests][-1] is None
+        assert downloader.tracker.get_partial("foidevAdd.txt") == {}
+
+
+class TestParallelDownload:
+    """download_many fetches files on a bounded pool."""
+
+    def test_bounded_concurrency_and_order(self, tmp_path, mirror):
+        names = [f"file{i}.txt" for i in range(6)]
+        for name in names:
+            (mirror.root / name).write_text(name)
+        mirror.server.delay = 0.2
+
+        downloader = MAUDEDownloader(output_dir=tmp_path / "raw", max_workers=3)
+        results = downloader.download_many([(mirror.url(n), "master") for n in names])
+
+        assert [r.filename for r in results] == names
+        assert all(r.success for r in results)
+        assert mirror.server.peak_active == 3
+        for name in names:
+            assert (downloader.output_dir / name).read_text() == name
@@ -0,0 +1,99 @@
+"""Tests for concurrent, conditional FDA freshness checks."""
+
+import os
+import time
+
+import pytest
+
+from src.ingestion.download import MAUDEDownloader
+from src.ingestion.fda_discovery import FDADiscovery
+
+
+PUBLISHED = ["mdrfoi.zip", "foidev.zip", "patient.zip", "foitext.zip", "mdrfoiAdd.zip", "foidevAdd.zip"]
+
+
+@pytest.fixture
+def fda_mirror(mirror):
+    """Mirror publishing a subset of the discoverable files."""
+    for name in PUBLISHED:
+        (mirror.root / name).write_bytes(name.encode() * 100)
+    return mirror
+
+
+def head_requests(mirror):
+    return [name for method, name, _ in mirror.requests if method == "HEAD"]
+
+
+def mark_all_downloaded(discovery, result):
+    for f in result.files_needing_download:
+        discovery.mark_downloaded(f.filename, f.last_modified_remote, f.size_bytes, etag=f.etag)
+
+
+class TestDiscoveryChecks:
+    """FDADiscovery.check_for_updates."""
+
+    def test_checks_run_concurrently(self, fda_mirror, tmp_path):
+        fda_mirror.server.delay = 0.1
+        discovery = FDADiscovery(
+            state_file=tmp_path / "state.json", max_workers=4, base_url=fda_mirror.base_url
+        )
+
+        result = discovery.check_for_updates()
+
+        assert sorted(f.filename for f in result.new_files) == sorted(PUBLISHED)
+        assert len(head_requests(fda_mirror)) == result.files_checked
+        assert fda_mirror.server.peak_active == 4
+        assert all(f.etag for f in result.new_files)
+
+    def test_unchanged_files_cost_304(self, fda_mirror, tmp_path):
+        discovery = FDADiscovery(state_file=tmp_path / "state.json", base_url=fda_mirror.base_url)
+        mark_all_downloaded(discovery, discovery.check_for_updates())
+        fda_mirror.reset_counters()
+
+        # A new instance reads the validators back from the state file
+        result = FDADiscovery(
+            state_file=tmp_path / "state.json", base_url=fda_mirror.base_url
+        ).check_for_updates()
+
+        assert result.files_needing_download == []
+        assert sorted(f.filename for f in result.unchanged_files) == sorted(PUBLISHED)
+        assert fda_mirror.server.not_modified == len(PUBLISHED)
+        assert len(head_requests(fda_mirror)) == result.files_checked
+
+    def test_changed_file_is_reported(self, fda_mirror, tmp_path):
+        discovery = FDADiscovery(state_file=tmp_path / "state.json", base_url=fda_mirror.base_url)
+        mark_all_downloaded(discovery, discovery.check_for_updates())
+
+        changed = fda_mirror.root / "mdrfoiAdd.zip"
+        changed.write_bytes(b"new weekly contents")
+        later = time.time() + 3600
+        os.utime(changed, (later, later))
+
+        result = discovery.check_for_updates()
+
+        assert [f.filename for f in result.updated_files] == ["mdrfoiAdd.zip"]
+        assert fda_mirror.server.not_modified >= len(PUBLISHED) - 1
+
+
+class TestDownloaderFreshness:
+    """MAUDEDownloader.check_remote_freshness."""
+
+    def test_conditional_after_download(self, fda_mirror, tmp_path):
+        downloader = MAUDEDownloader(
+            output_dir=tmp_path / "raw", max_workers=4, base_url=fda_mirror.base_url
+        )
+        downloaded = downloader._download_file(
+            fda_mirror.url("foidevAdd.zip"), "device", extract=False
+        )
+        assert downloaded.success
+        fda_mirror.reset_counters()
+
+        info = downloader.check_remote_freshness(["foidevAdd.zip", "mdrfoi.zip", "missing.zip"])
+
+        assert set(info) == {"foidevAdd.zip", "mdrfoi.zip"}
+        assert info["foidevAdd.zip"]["not_modified"] is True
+        assert info["foidevAdd.zip"]["needs_update"] is False
+        assert info["mdrfoi.zip"]["not_modified"] is False
+        assert info["mdrfoi.zip"]["needs_update"] is True
+        assert len(head_requests(fda_mirror)) == 3
+        assert fda_mirror.server.not_modified == 1
@@ -0,0 +1,156 @@
+"""Tests for concurrent, rate-limited openFDA pagination."""
+
+import time
+from datetime import date
+
+import pytest
+
+from src.ingestion.openfda import OpenFDAClient, RateLimiter, RateLimitExceeded
+
+
+START = date(2025, 1, 1)
+END = date(2025, 1, 10)
+
+
+@pytest.fixture
+def fast_limiter():
+    """Limiter that never gets in the way of a test."""
+    return RateLimiter(per_minute=60000, per_day=100000, burst=1000)
+
+
+def make_client(server, limiter, **kwargs):
+    kwargs.setdefault("max_workers", 4)
+    return OpenFDAClient(
+        api_key="test",
+        base_url=server.base_url,
+        rate_limiter=limiter,
+        use_cache=False,
+        **kwargs,
+    )
+
+
+def page_requests(server):
+    return [(search, skip, limit) for _, search, skip, limit in server.requests if limit > 1]
+
+
+class TestRateLimiter:
+    """Token-bucket limits shared by all workers."""
+
+    def test_burst_then_refill_rate(self):
+        limiter = RateLimiter(per_minute=600, per_day=100000, burst=5)
+
+        started = time.monotonic()
+        for _ in range(15):
+            limiter.acquire()
+        elapsed = time.monotonic() - started
+
+        # 5 immediately, then 10 more at 10 per second
+        assert 0.9 <= elapsed < 3
+
+    def test_daily_quota(self):
+        limiter = RateLimiter(per_minute=60000, per_day=3)
+        for _ in range(3):
+            limiter.acquire()
+
+        with pytest.raises(RateLimitExceeded):
+            limiter.acquire()
+
+    def test_pause_holds_back_callers(self):
+        limiter = RateLimiter(per_minute=60000, per_day=100000)
+        limiter.pause(0.3)
+
+        started = time.monotonic()
+        limiter.acquire()
+        assert time.monotonic() - started >= 0.25
+
+
+class TestConcurrentSearch:
+    """OpenFDAClient.search against the fake endpoint."""
+
+    def test_pages_fetched_concurrently_in_order(self, openfda_server, fast_limiter):
+        openfda_server.add_records(START, days=10, per_day=100)
+        openfda_server.server.delay = 0.05
+        client = make_client(openfda_server, fast_limiter)
+
+        result = client.search(date_received_start=START, date_received_end=END, max_records=1000)
+
+        assert result.error is None
+        assert result.total_records == 1000
+        assert result.records_fetched == 1000
+        assert result.records == openfda_server.server.records
+        assert len(page_requests(openfda_server)) == 10
+        assert openfda_server.server.peak_active == 4
+
+    def test_max_records_limits_pages(self, openfda_server, fast_limiter):
+        openfda_server.add_records(START, days=10, per_day=100)
+        client = make_client(openfda_server, fast_limiter)
+
+        result = client.search(date_received_start=START, date_received_end=END, max_records=250)
+
+        assert result.records_fetched == 250
+        assert sorted((skip, limit) for _, skip, limit in page_requests(openfda_server)) == [
+            (0, 100), (100, 100), (200, 50),
+        ]
+
+    def test_large_range_split_under_skip_ceiling(self, openfda_server, fast_limiter):
+        openfda_server.add_records(START, days=10, per_day=100)
+        openfda_server.server.max_skip = 200
+        client = make_client(openfda_server, fast_limiter, max_skip=200)
+
+        result = client.search(date_received_start=START, date_received_end=END, max_records=5000)
+
+        assert result.error is None
+        assert result.total_records == 1000
+        assert sorted(r["mdr_report_key"] for r in result.records) == sorted(
+            r["mdr_report_key"] for r in openfda_server.server.records
+        )
+        # Sub-windows are walked in date order
+        assert [r["date_received"] for r in result.records] == sorted(
+            r["date_received"] for r in result.records
+        )
+        assert max(skip for _, _, skip, _ in openfda_server.requests) <= 200
+        assert len({search for search, _, _ in page_requests(openfda_server)}) > 1
+
+    def test_unbounded_query_capped_at_skip_ceiling(self, openfda_server, fast_limiter):
+        openfda_server.add_records(START, days=5, per_day=100)
+        openfda_server.server.max_skip = 200
+        client = make_client(openfda_server, fast_limiter, max_skip=200)
+
+        result = client.search(max_records=5000)
+
+        assert result.error is None
+        assert result.total_records == 500
+        assert result.records_fetched == 300
+
+    def test_no_matches(self, openfda_server, fast_limiter):
+        client = make_client(openfda_server, fast_limiter)
+
+        result = client.search(date_received_start=START, date_received_end=END)
+
+        assert result.error is None
+        assert result.total_records == 0
+        assert len(openfda_server.requests) == 1
+
+    def test_throttled_requests_retried(self, openfda_server, fast_limiter):
+        openfda_server.add_records(START, days=3, per_day=100)
+        openfda_server.server.throttle = 2
+        client = make_client(openfda_server, fast_limiter)
+
+        result = client.search(date_received_start=START, date_received_end=END)
+
+        assert result.error is None
+        assert result.records_fetched == 300
+
+    def test_workers_share_rate_limit(self, openfda_server):
+        openfda_server.add_records(START, days=10, per_day=100)
+        limiter = RateLimiter(per_minute=600, per_day=100000, burst=2)
+        client = make_client(openfda_server, limiter, max_workers=8)
+
+        started = time.monotonic()
+        result = client.search(date_received_start=START, date_received_end=END)
+        elapsed = time.monotonic() - started
+
+        # 11 requests (count + 10 pages): 2 in the burst, 9 more at 10 per second
+        assert result.records_fetched == 1000
+        assert len(openfda_server.requests) == 11
+        assert elapsed >= 0.8
@@ -0,0 +1,164 @@
+"""Tests for the persistent openFDA response cache."""
+
+import os
+from datetime import date
+
+import pytest
+
+from src.ingestion.openfda import OpenFDAClient, RateLimiter
+from src.ingestion.openfda_cache import OpenFDACache, make_cache_key, normalize_search
+
+
+START = date(2025, 1, 1)
+END = date(2025, 1, 3)
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return tmp_path / "openfda.sqlite"
+
+
+def make_client(server, cache):
+    return OpenFDAClient(
+        api_key="test",
+        base_url=server.base_url,
+        rate_limiter=RateLimiter(per_minute=60000, per_day=100000, burst=1000),
+        max_workers=2,
+        cache=cache,
+    )
+
+
+def search(client):
+    return client.search(
+        product_codes=["GZB"], date_received_start=START, date_received_end=END
+    )
+
+
+class TestCacheKeys:
+    """Equivalent queries share a cache entry."""
+
+    def test_normalize_search(self):
+        assert normalize_search(None) == ""
+        assert normalize_search("  event_type:D   AND  date_received:[20250101 TO 20250131] ") == (
+            "date_received:[20250101 TO 20250131] AND event_type:D"
+        )
+        # AND inside parentheses or quotes is not a clause boundary
+        assert normalize_search('(a:1 AND b:2) AND c:"x AND y"') == '(a:1 AND b:2) AND c:"x AND y"'
+        assert normalize_search('c:"x AND y" AND (a:1 AND b:2)') == '(a:1 AND b:2) AND c:"x AND y"'
+
+    def test_key_components(self):
+        key = make_cache_key("u", "a:1 AND b:2", 0, 100)
+        assert key == make_cache_key("u", "b:2  AND a:1", 0, 100)
+        assert key != make_cache_key("u", "a:1 AND b:2", 100, 100)
+        assert key != make_cache_key("u", "a:1 AND b:2", 0, 1)
+        assert key != make_cache_key("v", "a:1 AND b:2", 0, 100)
+
+
+class TestOpenFDACache:
+    """OpenFDACache storage, TTL and size cap."""
+
+    def test_round_trip_and_persistence(self, cache_path):
+        cache = OpenFDACache(cache_path, ttl=60)
+        cache.put("k", {"results": [1, 2]}, etag='"abc"')
+        cache.close()
+
+        entry = OpenFDACache(cache_path, ttl=60).get("k")
+
+        assert entry.data == {"results": [1, 2]}
+        assert entry.etag == '"abc"'
+        assert entry.is_fresh(60)
+        assert not entry.is_fresh(0)
+
+    def test_size_cap_evicts_least_recently_used(self, cache_path):
+        body = {"results": [os.urandom(16).hex() for _ in range(100)]}
+        probe = OpenFDACache(cache_path.with_name("probe.sqlite"))
+        probe.put("probe", body)
+        entry_size = probe.stats()["size_bytes"]
+
+        # Room for three entries
+        cache = OpenFDACache(cache_path, ttl=60, max_bytes=3 * entry_size + entry_size // 2)
+        for key in "abc":
+            cache.put(key, body)
+        cache.get("a")  # a becomes most recently used
+        cache.put("d", body)
+
+        stats = cache.stats()
+        assert stats["entries"] == 3
+        assert stats["size_bytes"] <= cache.max_bytes
+        assert cache.get("a") is not None
+        assert cache.get("d") is not None
+        assert cache.get("b") is None
+
+
+class TestClientCaching:
+    """OpenFDAClient serves repeated pages from the cache."""
+
+    def test_repeat_search_served_from_cache(self, openfda_server, cache_path):
+        openfda_server.add_records(START, days=3, per_day=100)
+        client = make_client(openfda_server, OpenFDACache(cache_path, ttl=3600))
+
+        first = search(client)
+        requests_after_first = len(openfda_server.requests)
+        second = search(client)
+
+        assert second.records == first.records
+        assert len(openfda_server.requests) == requests_after_first == 4
+        stats = client.cache_stats()
+        assert stats["misses"] == 4
+        assert stats["hits"] == 4
+        assert stats["requests"] == 4
+        assert stats["hit_rate"] == 0.5
+        assert stats["entries"] == 4
+
+    def test_cache_shared_across_clients(self, openfda_server, cache_path):
+        openfda_server.add_records(START, days=3, per_day=100)
+        search(make_client(openfda_server, OpenFDACache(cache_path, ttl=3600)))
+        openfda_server.requests.clear()
+
+        # A new process would reopen the same file
+        result = search(make_client(openfda_server, OpenFDACache(cache_path, ttl=3600)))
+
+        assert result.records_fetched == 300
+        assert openfda_server.requests == []
+
+    def test_stale_entries_revalidated(self, openfda_server, cache_path):
+        openfda_server.add_records(START, days=3, per_day=100)
+        client = make_client(openfda_server, OpenFDACache(cache_path, ttl=0))
+
+        first = search(client)
+        second = search(client)
+
+        assert second.records == first.records
+        assert openfda_server.server.not_modified == 4
+        assert client.cache_stats()["revalidated"] == 4
+
+    def test_changed_response_replaces_entry(self, openfda_server, cache_path):
+        openfda_server.add_records(START, days=3, per_day=100)
+        client = make_client(openfda_server, OpenFDACache(cache_path, ttl=0))
+        search(client)
+
+        openfda_server.add_records(END, days=1, per_day=50)
+        result = search(client)
+
+        assert result.total_records == 350
+        assert result.records_fetched == 350
+
+    def test_empty_results_cached(self, openfda_server, cache_path):
+        client = make_client(openfda_server, OpenFDACache(cache_path, ttl=3600))
+
+        search(client)
+        search(client)
+
+        assert len(openfda_server.requests) == 1
+        assert client.cache_stats()["hits"] == 1
+
+    def test_cache_disabled(self, openfda_server):
+        openfda_server.add_records(START, days=1, per_day=10)
+        client = OpenFDAClient(api_key="test", base_url=openfda_server.base_url, use_cache=False)
+
+        search(client)
+        search(client)
+
+        assert client.cache is None
+        assert len(openfda_server.requests) == 4
+        assert client.cache_stats()["hits"] == 0
@@ -0,0 +1,144 @@
+"""Tests for the set-based openFDA merge in DataUpdater."""
+
+from datetime import date, timedelta
+
+import pytest
+
+from src.database import get_connection
+from src.database.schema import initialize_database
+from src.ingestion.openfda import OpenFDAClient, RateLimiter
+from src.ingestion.updater import DataUpdater
+
+
+RECEIVED = date.today() - timedelta(days=3)
+
+
+def api_record(key, texts=(), brand="SENZA"):
+    return {
+        "mdr_report_key": key,
+        "report_number": f"3000000-2025-{key}",
+        "date_received": RECEIVED.strftime("%Y%m%d"),
+        "event_type": "Injury",
+        "adverse_event_flag": "Y",
+        "type_of_report": ["Initial submission"],
+        "device": [{
+            "brand_name": brand,
+            "manufacturer_d_name": "NEVRO CORP",
+            "device_report_product_code": "GZB",
+            "device_sequence_number": "1",
+        }],
+        "mdr_text": [{"text_type_code": code, "text": text} for code, text in texts],
+    }
+
+
+@pytest.fixture
+def updater(tmp_path, openfda_server):
+    db_path = tmp_path / "maude.duckdb"
+    with get_connection(db_path) as conn:
+        initialize_database(conn)
+        conn.execute("""
+            INSERT INTO master_events (mdr_report_key, manufacturer_name, event_type, source_file)
+            VALUES ('2000002', 'FROM DOWNLOAD FILE', 'M', 'mdrfoi.txt')
+        """)
+        conn.execute("""
+            INSERT INTO mdr_text (mdr_report_key, text_type_code, text_content)
+            VALUES ('2000002', 'D', 'existing narrative')
+        """)
+
+    updater = DataUpdater(db_path=db_path, data_dir=tmp_path / "raw")
+    updater.openfda_client = OpenFDAClient(
+        api_key="test",
+        base_url=openfda_server.base_url,
+        rate_limiter=RateLimiter(per_minute=60000, per_day=100000, burst=1000),
+        use_cache=False,
+    )
+    return updater
+
+
+def fetch_all(updater, sql):
+    with get_connection(updater.db_path, read_only=True) as conn:
+        return conn.execute(sql).fetchall()
+
+
+class TestOpenFDAMerge:
+    """update_from_openfda merges fetched records set-wise."""
+
+    def test_inserts_new_and_keeps_existing(self, updater, openfda_server):
+        openfda_server.server.records = [
+            api_record("2000001", texts=[
+                ("Description of Event or Problem", "pain at implant site"),
+                ("Additional Manufacturer Narrative", "device returned"),
+            ]),
+            api_record("2000002", texts=[
+                ("Description of Event or Problem", "duplicate narrative"),
+                ("Additional Manufacturer Narrative", "new narrative"),
+            ]),
+            # Same report again later in the fetch
+            api_record("2000001", brand="OTHER", texts=[
+                ("Description of Event or Problem", "repeat"),
+                ("Manufacturer Evaluation Summary", "evaluation"),
+            ]),
+            {"date_received": RECEIVED.strftime("%Y%m%d")},  # no MDR key
+        ]
+
+        with pytest.warns(DeprecationWarning):
+            status = updater.update_from_openfda(days=30)
+
+        assert status.success, status.errors
+        assert status.records_added == 1
+        assert status.records_updated == 2
+        assert status.records_skipped == 1
+        assert set(status.timings) == {"fetch", "transform", "merge"}
+
+        assert fetch_all(updater, """
+            SELECT mdr_report_key, manufacturer_name, event_type, received_year, source_file
+            FROM master_events ORDER BY 1
+        """) == [
+            ("2000001", "NEVRO CORP", "IN", RECEIVED.year, "openfda_api"),
+            ("2000002", "FROM DOWNLOAD FILE", "M", None, "mdrfoi.txt"),
+        ]
+        # One device row, from the first occurrence
+        assert fetch_all(updater, "SELECT mdr_report_key, brand_name FROM devices") == [
+            ("2000001", "SENZA"),
+        ]
+        assert fetch_all(updater, """
+            SELECT mdr_report_key, text_type_code, text_content FROM mdr_text ORDER BY 1, 2
+        """) == [
+            ("2000001", "D", "pain at implant site"),
+            ("2000001", "E", "evaluation"),
+            ("2000001", "N", "device returned"),
+            ("2000002", "D", "existing narrative"),
+            ("2000002", "N", "new narrative"),
+        ]
+
+    def test_inserts_logged_to_change_log(self, updater, openfda_server):
+        openfda_server.server.records = [api_record("2000001"), api_record("2000002")]
+
+        with pytest.warns(DeprecationWarning):
+            updater.update_from_openfda(days=30)
+
+        assert fetch_all(updater, """
+            SELECT table_name, mdr_report_key, operation, date_received FROM change_log ORDER BY 1
+        """) == [
+            ("devices", "2000001", "insert", RECEIVED),
+            ("master_events", "2000001", "insert", RECEIVED),
+        ]
+
+    def test_rerun_is_idempotent(self, updater, openfda_server):
+        openfda_server.server.records = [
+            api_record(str(3000000 + i), texts=[("Description of Event or Problem", f"event {i}")])
+            for i in range(2000)
+        ]
+
+        with pytest.warns(DeprecationWarning):
+            first = updater.update_from_openfda(days=30, max_records=2000)
+            second = updater.update_from_openfda(days=30, max_records=2000)
+
+        assert (first.records_added, first.records_updated) == (2000, 0)
+        assert (second.records_added, second.records_updated) == (0, 2000)
+        assert fetch_all(updater, """
+            SELECT
+                (SELECT COUNT(*) FROM master_events WHERE source_file = 'openfda_api'),
+                (SELECT COUNT(*) FROM devices),
+                (SELECT COUNT(*) FROM mdr_text)
+        """) == [(2000, 2000, 2001)]
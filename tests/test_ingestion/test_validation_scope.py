@@ -0,0 +1,137 @@
+"""Tests for file-scoped vs full post-load validation."""
+
+import duckdb
+import pytest
+
+from src.ingestion.loader import validate_after_file_load
+from src.ingestion.validation_framework import (
+    ValidationPipeline,
+    SCOPE_FILE,
+    SCOPE_FULL,
+    SCOPE_KEY_TABLE,
+)
+
+
+@pytest.fixture
+def scope_db():
+    """In-memory DB with orphans in an old file and in a newly loaded file."""
+    conn = duckdb.connect(":memory:")
+    conn.execute("""
+        CREATE TABLE master_events (
+            mdr_report_key VARCHAR PRIMARY KEY,
+            date_received DATE,
+            source_file VARCHAR
+        )
+    """)
+    for table in ("devices", "patients", "mdr_text", "device_problems"):
+        conn.execute(f"""
+            CREATE TABLE {table} (
+                mdr_report_key VARCHAR,
+                device_report_product_code VARCHAR,
+                source_file VARCHAR
+            )
+        """)
+
+    conn.execute("""
+        INSERT INTO master_events VALUES
+        ('1', '2024-01-01', 'mdrfoiThru2023.txt'),
+        ('2', '2024-01-02', 'mdrfoiThru2023.txt'),
+        ('3', '2024-06-01', 'mdrfoiAdd.txt')
+    """)
+    # Historical file: keys 90-94 are orphans
+    conn.execute("""
+        INSERT INTO patients
+        SELECT CAST(k AS VARCHAR), NULL, 'patientThru2023.txt'
+        FROM range(90, 95) t(k)
+    """)
+    conn.execute("INSERT INTO patients VALUES ('1', NULL, 'patientThru2023.txt')")
+    # Weekly file: key 3 matches master, key 99 is an orphan
+    conn.execute("""
+        INSERT INTO patients VALUES
+        ('3', NULL, 'patientAdd.txt'),
+        ('99', NULL, 'patientAdd.txt')
+    """)
+
+    yield conn
+    conn.close()
+
+
+class TestScopedOrphanCheck:
+    """Stage 3 orphan checks only count keys from the loaded file."""
+
+    def test_file_scope_counts_only_loaded_keys(self, scope_db):
+        pipeline = ValidationPipeline()
+        issue = pipeline._check_orphan_records(
+            "patientAdd.txt", "patient", conn=scope_db, scope=SCOPE_FILE
+        )
+        assert issue is not None
+        assert issue.actual_value == 1
+
+    def test_full_scope_counts_all_orphans(self, scope_db):
+        pipeline = ValidationPipeline()
+        issue = pipeline._check_orphan_records(
+            "patientAdd.txt", "patient", conn=scope_db, scope=SCOPE_FULL
+        )
+        assert issue.actual_value == 6
+
+    def test_scope_table_is_dropped(self, scope_db):
+        pipeline = ValidationPipeline()
+        pipeline._check_orphan_records("patientAdd.txt", "patient", conn=scope_db)
+        tables = scope_db.execute(
+            "SELECT table_name FROM duckdb_tables() WHERE table_name = ?",
+            [SCOPE_KEY_TABLE],
+        ).fetchall()
+        assert tables == []
+
+    def test_stage3_uses_passed_connection(self, scope_db):
+        pipeline = ValidationPipeline()
+        result = pipeline.validate_stage3_post_load(
+            filename="patientAdd.txt",
+            file_type="patient",
+            expected_count=2,
+            loaded_count=2,
+            conn=scope_db,
+        )
+        assert result.metrics["orphan_count"] == 1
+
+
+class TestCrossTableIntegrity:
+    """Cross-table integrity in incremental and full mode."""
+
+    def test_incremental_mode(self, scope_db):
+        pipeline = ValidationPipeline()
+        result = pipeline.validate_cross_table_integrity(
+            source_file="patientAdd.txt", conn=scope_db
+        )
+        assert result.metrics["scope"] == SCOPE_FILE
+        assert result.metrics["patient_total"] == 2
+        assert result.metrics["patient_orphans"] == 1
+        # Tables with no rows from the file are skipped
+        assert "device_total" not in result.metrics
+
+    def test_full_mode(self, scope_db):
+        pipeline = ValidationPipeline()
+        result = pipeline.validate_cross_table_integrity(conn=scope_db)
+        assert result.metrics["scope"] == SCOPE_FULL
+        assert result.metrics["master_count"] == 3
+        assert result.metrics["patient_total"] == 8
+        assert result.metrics["patient_orphans"] == 6
+
+
+class TestValidateAfterFileLoad:
+    """validate_after_file_load in both scopes."""
+
+    @pytest.mark.parametrize("scope", [SCOPE_FILE, SCOPE_FULL])
+    def test_master_checks_pass(self, scope_db, scope):
+        passed, issues = validate_after_file_load(
+            scope_db, "master", "mdrfoiAdd.txt", scope=scope
+        )
+        assert passed
+        assert issues == []
+
+    def test_expected_min_uses_table_total(self, scope_db):
+        passed, issues = validate_after_file_load(
+            scope_db, "master", "mdrfoiAdd.txt", expected_min=10
+        )
+        assert not passed
+        assert issues[0].startswith("CRITICAL")